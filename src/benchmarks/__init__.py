@@ -0,0 +1,6 @@
+"""
+Benchmarks de rendimiento de Work_Comfort
+
+- generador: datos sintéticos deterministas en el formato de src/data
+- runner: mide cargadores, búsquedas, estadísticas y reportes
+"""
@@ -0,0 +1,99 @@
+"""
+Benchmark del arranque en frío contra el arranque desde la instantánea
+
+Genera datos sintéticos, los carga desde el texto (empleados, actividades,
+registros y la tabla de participación), guarda la instantánea y vuelve a
+cargar todo desde ella en un estado limpio. Verifica que ambas cargas den
+los mismos datos e informa el tiempo de cada paso.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.arranque --registros 1000000
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from modules import actividad, empleado, instantanea, registro, vectorizado
+
+from . import generador
+
+
+def _cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def _cargar_todo(base):
+    """Carga como lo hacen las opciones del menú; devuelve tiempos y datos"""
+    vectorizado.olvidar_tabla(os.path.join(base, 'participacion.txt'))
+    pasos = [
+        ('empleados', lambda: empleado.cargar_empleados(os.path.join(base, 'empleados.txt'))),
+        ('actividades', lambda: actividad.cargar_actividades(os.path.join(base, 'actividades.txt'))),
+        ('registros', lambda: registro.cargar_registros(os.path.join(base, 'participacion.txt'))),
+        ('tabla', lambda: vectorizado.tabla_de_archivo(os.path.join(base, 'participacion.txt'))),
+    ]
+    return [(nombre, *_cronometrar(funcion)) for nombre, funcion in pasos]
+
+
+def _comparable(nombre, datos):
+    if nombre == 'tabla':
+        return [list(map(int, getattr(datos, c))) for c in instantanea.COLUMNAS_PARTICIPACION]
+    return [o.to_string() for o in datos]
+
+
+def comparar(registros=1_000_000, semilla=7):
+    """
+    Mide la carga desde el texto y desde la instantánea sobre los mismos archivos
+
+    Args:
+        registros (int): Número aproximado de registros de participación
+        semilla (int): Semilla del generador
+
+    Returns:
+        list: Nombres de los datos que no coinciden
+    """
+    base = tempfile.mkdtemp(prefix='wc_arranque_')
+    archivo = os.path.join(base, 'instantanea.bin')
+    try:
+        empleados = max(100, registros // 50)
+        actividades = max(10, registros // 200)
+        generador.generar_datos(base, empleados=empleados, actividades=actividades,
+                                densidad=registros / (empleados * actividades), semilla=semilla)
+
+        instantanea.cerrar()
+        frio = _cargar_todo(base)
+        t_guardar, _ = _cronometrar(lambda: instantanea.guardar(archivo, base))
+        t_restaurar, _ = _cronometrar(lambda: instantanea.restaurar(archivo))
+        caliente = _cargar_todo(base)
+
+        print(f"  Guardar instantánea: {t_guardar:.3f}s ({os.path.getsize(archivo) / 2**20:.1f} MB)")
+        print(f"  Restaurar (arranque): {t_restaurar * 1000:.1f} ms")
+        diferentes = []
+        for (nombre, t_texto, datos_texto), (_, t_inst, datos_inst) in zip(frio, caliente):
+            iguales = _comparable(nombre, datos_texto) == _comparable(nombre, datos_inst)
+            if not iguales:
+                diferentes.append(nombre)
+            print(f"  {'✓' if iguales else '✗'} {nombre:<12} {len(datos_texto):>9} filas   "
+                  f"texto {t_texto:>7.3f}s   instantánea {t_inst:>7.3f}s   x{t_texto / max(t_inst, 1e-6):.1f}")
+        return diferentes
+    finally:
+        instantanea.cerrar()
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Arranque desde texto vs desde la instantánea")
+    parser.add_argument('--registros', type=int, default=1_000_000)
+    parser.add_argument('--semilla', type=int, default=7)
+    args = parser.parse_args()
+
+    diferentes = comparar(args.registros, args.semilla)
+    if diferentes:
+        print(f"✗ Resultados distintos: {', '.join(diferentes)}")
+    sys.exit(1 if diferentes else 0)
@@ -0,0 +1,116 @@
+"""
+Generador de carga para el servidor de ingesta
+
+Levanta un ServidorIngesta sobre datos sintéticos en una carpeta temporal
+y lo satura con varias conexiones que envían lotes de asistencias por
+HTTP/1.1 (keep-alive). Informa asistencias por segundo y latencias.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.carga_ingesta --total 100000 --conexiones 20 --lote 50
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from modules import ingesta
+
+from . import generador
+
+
+async def _cliente(puerto, pares, lote, latencias, respuestas):
+    reader, writer = await asyncio.open_connection('127.0.0.1', puerto)
+    try:
+        for inicio in range(0, len(pares), lote):
+            cuerpo = json.dumps([
+                {'empleado_id': e, 'actividad_id': a, 'asistio': True, 'calificacion': 1 + (e + a) % 5}
+                for e, a in pares[inicio:inicio + lote]
+            ]).encode('utf-8')
+            peticion = (f"POST /api/checkins HTTP/1.1\r\nHost: localhost\r\n"
+                        f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n")
+            t0 = time.perf_counter()
+            writer.write(peticion.encode('latin-1') + cuerpo)
+            await writer.drain()
+
+            encabezado = await reader.readuntil(b'\r\n\r\n')
+            longitud = 0
+            for linea in encabezado.split(b'\r\n'):
+                if linea.lower().startswith(b'content-length:'):
+                    longitud = int(linea.split(b':')[1])
+            respuesta = json.loads(await reader.readexactly(longitud))
+            latencias.append(time.perf_counter() - t0)
+            estado = int(encabezado.split(b' ', 2)[1])
+            respuestas[estado] = respuestas.get(estado, 0) + 1
+            if estado == 200:
+                respuestas['aceptados'] = respuestas.get('aceptados', 0) + respuesta['aceptados']
+    finally:
+        writer.close()
+
+
+async def medir_ingesta(carpeta, total=100_000, conexiones=20, lote=50):
+    """
+    Envía `total` asistencias distintas y mide el rendimiento
+
+    Args:
+        carpeta (str): Carpeta con empleados y actividades (se escribe participacion.txt)
+        total (int): Asistencias a enviar
+        conexiones (int): Conexiones simultáneas
+        lote (int): Asistencias por petición
+
+    Returns:
+        dict: Asistencias por segundo, latencias y conteo de respuestas por estado
+    """
+    servidor = ingesta.ServidorIngesta(carpeta)
+    puerto = await servidor.iniciar('127.0.0.1', 0)
+
+    # Pares distintos que no están en los datos generados (participación vacía)
+    empleados = sorted(servidor.ids.empleados)
+    actividades = sorted(servidor.ids.actividades)
+    pares = [(e, a) for a in actividades for e in empleados][:total]
+    reparto = [pares[i::conexiones] for i in range(conexiones)]
+
+    latencias, respuestas = [], {}
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(puerto, p, lote, latencias, respuestas) for p in reparto))
+    segundos = time.perf_counter() - inicio
+    await servidor.detener()
+
+    latencias.sort()
+    return {
+        'asistencias': len(pares),
+        'segundos': round(segundos, 3),
+        'asistencias_por_segundo': round(len(pares) / segundos),
+        'peticiones': len(latencias),
+        'latencia_p50_ms': round(latencias[len(latencias) // 2] * 1000, 2),
+        'latencia_p99_ms': round(latencias[int(len(latencias) * 0.99)] * 1000, 2),
+        'lotes_escritos': servidor.anexador.lotes,
+        'respuestas': respuestas,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Carga sobre el servidor de ingesta")
+    parser.add_argument('--total', type=int, default=100_000)
+    parser.add_argument('--conexiones', type=int, default=20)
+    parser.add_argument('--lote', type=int, default=50)
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix='wc_ingesta_')
+    try:
+        # Suficientes empleados x actividades para no repetir pares
+        actividades = max(10, args.total // 1_000 + 1)
+        generador.generar_datos(base, empleados=1_000, actividades=actividades, densidad=0)
+        open(os.path.join(base, 'participacion.txt'), 'w').close()
+
+        resultado = asyncio.run(medir_ingesta(base, args.total, args.conexiones, args.lote))
+        for clave, valor in resultado.items():
+            print(f"  {clave:<24} {valor}")
+        with open(os.path.join(base, 'participacion.txt'), encoding='utf-8') as f:
+            print(f"  {'lineas_en_archivo':<24} {sum(1 for _ in f)}")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
@@ -0,0 +1,103 @@
+"""
+Benchmark de consultas de cohortes: mapas de bits contra conjuntos de Python
+
+Genera datos sintéticos, arma el IndiceAsistencia y responde consultas al
+azar ("asistieron a estas dos, a alguna de estas N y a ninguna de estas M")
+con mapas de bits y recorriendo los registros con sets. Verifica que ambos
+den los mismos empleados e informa el tiempo de cada consulta.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.cohortes --registros 2000000 --consultas 5
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from modules import cohortes, vectorizado
+
+from . import generador
+
+
+def _cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def _por_conjuntos(tabla, todas, alguna, ninguna):
+    """La misma consulta recorriendo los registros una vez por consulta"""
+    todas, alguna, ninguna = set(todas), set(alguna), set(ninguna)
+    vistas, en_alguna, en_ninguna = {}, set(), set()
+    for empleado_id, actividad_id, asistio in zip(tabla.empleado_id, tabla.actividad_id, tabla.asistio):
+        if not asistio:
+            continue
+        if actividad_id in todas:
+            vistas.setdefault(empleado_id, set()).add(actividad_id)
+        if actividad_id in alguna:
+            en_alguna.add(empleado_id)
+        if actividad_id in ninguna:
+            en_ninguna.add(empleado_id)
+    resultado = {e for e, acts in vistas.items() if len(acts) == len(todas)} & en_alguna
+    return sorted(int(e) for e in resultado - en_ninguna)
+
+
+def comparar(registros=2_000_000, consultas=5, semilla=7):
+    """
+    Mide consultas de cohortes con mapas de bits y con conjuntos sobre los mismos datos
+
+    Args:
+        registros (int): Número aproximado de registros de participación
+        consultas (int): Número de consultas al azar
+        semilla (int): Semilla del generador y de las consultas
+
+    Returns:
+        int: Cantidad de consultas con resultados distintos
+    """
+    base = tempfile.mkdtemp(prefix='wc_cohortes_')
+    try:
+        empleados = max(100, registros // 20)
+        actividades = max(10, registros // 2000)
+        generador.generar_datos(base, empleados=empleados, actividades=actividades,
+                                densidad=registros / (empleados * actividades), semilla=semilla)
+        archivo = os.path.join(base, 'participacion.txt')
+        tabla = vectorizado.tabla_de_archivo(archivo)
+        t_indice, indice = _cronometrar(lambda: cohortes.IndiceAsistencia(tabla))
+        print(f"  Índice de {len(indice.por_actividad)} actividades y {len(indice.ids)} empleados: {t_indice:.3f}s")
+
+        azar = random.Random(semilla)
+        ids_actividad = sorted(indice.por_actividad)
+        distintas = 0
+        for numero in range(1, consultas + 1):
+            todas = azar.sample(ids_actividad, 2)
+            alguna = azar.sample(ids_actividad, len(ids_actividad) // 2)
+            ninguna = azar.sample(ids_actividad, len(ids_actividad) // 4)
+            t_mapas, con_mapas = _cronometrar(
+                lambda: indice.ids_de(indice.cohorte(todas, alguna, ninguna)))
+            t_sets, con_sets = _cronometrar(lambda: _por_conjuntos(tabla, todas, alguna, ninguna))
+            iguales = con_mapas == con_sets
+            distintas += not iguales
+            print(f"  {'✓' if iguales else '✗'} consulta {numero}: {len(con_mapas):>7} empleados   "
+                  f"mapas {t_mapas * 1000:>8.1f} ms   sets {t_sets * 1000:>8.1f} ms")
+        return distintas
+    finally:
+        vectorizado.olvidar_tabla(os.path.join(base, 'participacion.txt'))
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cohortes con mapas de bits vs con conjuntos")
+    parser.add_argument('--registros', type=int, default=2_000_000)
+    parser.add_argument('--consultas', type=int, default=5)
+    parser.add_argument('--semilla', type=int, default=7)
+    args = parser.parse_args()
+
+    distintas = comparar(args.registros, args.consultas, args.semilla)
+    if distintas:
+        print(f"✗ {distintas} consultas con resultados distintos")
+    sys.exit(1 if distintas else 0)
@@ -0,0 +1,125 @@
+"""
+Generador determinista de datos sintéticos para benchmarks
+
+Escribe empleados.txt, actividades.txt y participacion.txt con el mismo
+formato que usan los módulos, de modo que los cargadores reales los lean.
+"""
+
+import os
+import random
+from datetime import date, timedelta
+
+NOMBRES = ["Ana", "Carlos", "Laura", "Miguel", "Sandra", "Daniel", "Mariana",
+           "Beicker", "Sarah", "José", "Lucía", "Andrés", "Valentina", "Jorge"]
+APELLIDOS = ["Martínez", "Gómez", "Pérez", "Torres", "Ruiz", "Luque", "Castri",
+             "Valderrama", "López", "García", "Rodríguez", "Hernández"]
+AREAS = ["Recursos Humanos", "Tecnología", "Ventas", "Marketing",
+         "Finanzas", "Operaciones", "Administración"]
+CARGOS = ["Analista", "Coordinador", "Desarrollador", "Ejecutivo",
+          "Contador", "Director", "Asistente"]
+TIPOS = ["Pausa activa", "Taller", "Jornada deportiva", "Capacitación",
+         "Conferencia", "Actividad recreativa", "Programa de salud"]
+
+# Pesos de las calificaciones 1..5 (sesgada hacia satisfacción alta)
+DISTRIBUCION_CALIFICACIONES = (0.05, 0.10, 0.20, 0.35, 0.30)
+
+# Escalas predefinidas según el número aproximado de registros de participación
+ESCALAS = {
+    '1k': {'empleados': 100, 'actividades': 50, 'densidad': 0.2},
+    '100k': {'empleados': 5_000, 'actividades': 200, 'densidad': 0.1},
+    '10M': {'empleados': 100_000, 'actividades': 1_000, 'densidad': 0.1},
+}
+
+
+def generar_datos(directorio, empleados=100, areas=7, actividades=50, densidad=0.2,
+                  prob_asistencia=0.8, distribucion=DISTRIBUCION_CALIFICACIONES,
+                  fecha_inicio=date(2025, 1, 1), semilla=42):
+    """
+    Genera los tres archivos de datos en un directorio
+
+    Args:
+        directorio (str): Carpeta destino (se crea si no existe)
+        empleados (int): Número de empleados
+        areas (int): Número de áreas distintas
+        actividades (int): Número de actividades
+        densidad (float): Fracción de empleados registrados en cada actividad
+        prob_asistencia (float): Probabilidad de que un registro sea asistencia
+        distribucion (tuple): Pesos de las calificaciones 1 a 5
+        fecha_inicio (date): Fecha de la primera actividad
+        semilla (int): Semilla para que la generación sea reproducible
+
+    Returns:
+        dict: Conteo de filas escritas por archivo
+    """
+    rng = random.Random(semilla)
+    os.makedirs(directorio, exist_ok=True)
+
+    nombres_areas = AREAS[:areas] + [f"Área {i}" for i in range(len(AREAS) + 1, areas + 1)]
+
+    with open(os.path.join(directorio, 'empleados.txt'), 'w', encoding='utf-8') as f:
+        for id_emp in range(1, empleados + 1):
+            nombre = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+            f.write(f"{id_emp}|{nombre}|{rng.choice(nombres_areas)}|{rng.choice(CARGOS)}\n")
+
+    with open(os.path.join(directorio, 'actividades.txt'), 'w', encoding='utf-8') as f:
+        for id_act in range(1, actividades + 1):
+            tipo = rng.choice(TIPOS)
+            fecha = fecha_inicio + timedelta(days=rng.randrange(365))
+            f.write(f"{id_act}|{tipo} {id_act}|{fecha.isoformat()}|{tipo}|Actividad sintética\n")
+
+    # Cada actividad recibe una muestra sin repetición de empleados,
+    # así no hay pares (empleado, actividad) duplicados
+    por_actividad = min(empleados, round(empleados * densidad))
+    calificaciones = (1, 2, 3, 4, 5)
+    total_registros = 0
+    with open(os.path.join(directorio, 'participacion.txt'), 'w', encoding='utf-8') as f:
+        for id_act in range(1, actividades + 1):
+            participantes = rng.sample(range(1, empleados + 1), por_actividad)
+            notas = rng.choices(calificaciones, distribucion, k=por_actividad)
+            lineas = []
+            for id_emp, nota in zip(participantes, notas):
+                if rng.random() < prob_asistencia:
+                    lineas.append(f"{id_emp}|{id_act}|True|{nota}\n")
+                else:
+                    lineas.append(f"{id_emp}|{id_act}|False|0\n")
+            f.writelines(lineas)
+            total_registros += por_actividad
+
+    return {'empleados': empleados, 'actividades': actividades, 'registros': total_registros}
+
+
+def generar_escala(directorio, escala, semilla=42):
+    """
+    Genera los datos de una de las escalas predefinidas
+
+    Args:
+        directorio (str): Carpeta destino
+        escala (str): Clave de ESCALAS ('1k', '100k', '10M')
+        semilla (int): Semilla de generación
+
+    Returns:
+        dict: Conteo de filas escritas por archivo
+    """
+    return generar_datos(directorio, semilla=semilla, **ESCALAS[escala])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de Work_Comfort")
+    parser.add_argument('directorio', help="Carpeta donde escribir los archivos")
+    parser.add_argument('--escala', choices=sorted(ESCALAS), help="Escala predefinida")
+    parser.add_argument('--empleados', type=int, default=100)
+    parser.add_argument('--areas', type=int, default=7)
+    parser.add_argument('--actividades', type=int, default=50)
+    parser.add_argument('--densidad', type=float, default=0.2)
+    parser.add_argument('--asistencia', type=float, default=0.8)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.escala:
+        conteo = generar_escala(args.directorio, args.escala, args.semilla)
+    else:
+        conteo = generar_datos(args.directorio, args.empleados, args.areas, args.actividades,
+                               args.densidad, args.asistencia, semilla=args.semilla)
+    print(f"✓ Datos generados en {args.directorio}: {conteo}")
@@ -0,0 +1,202 @@
+"""
+Prueba de paridad entre los reportes de reporte.py y los de la versión original
+
+Los reportes general, por área y resumen ejecutivo se arman sobre el
+cubo (modules/cubo.py); acá se comparan contra los recorridos objeto por
+objeto que usaban antes, con datos sintéticos a los que se agregan
+empleados y actividades con ids repetidos (copias en la misma área, en
+otra área y actividades con otro nombre). Se compara con NumPy y sin
+NumPy; el resumen ejecutivo se compara sin la fila de fecha.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.paridad_reportes --registros 100000
+"""
+
+import contextlib
+import csv
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+from modules import actividad, empleado, registro, reporte, vectorizado
+
+from . import generador
+
+
+# ---------------------------------------------------------
+# REPORTES ORIGINALES (referencia)
+# ---------------------------------------------------------
+
+def _general_original(empleados, actividades, registros):
+    filas = []
+    for act in actividades:
+        registros_act = [r for r in registros if r.actividad_id == act.id_actividad]
+        total_registros = len(registros_act)
+        asistencias = sum(1 for r in registros_act if r.asistio)
+        calificaciones = [r.calificacion for r in registros_act if r.asistio and r.calificacion > 0]
+        satisfaccion = round(sum(calificaciones) / len(calificaciones), 2) if calificaciones else 0
+        tasa = round((asistencias / total_registros * 100), 2) if total_registros > 0 else 0
+        filas.append([act.id_actividad, act.nombre, act.fecha, act.tipo, asistencias,
+                      total_registros, f"{tasa}%", f"{satisfaccion}/5"])
+    return [reporte.COLUMNAS_REPORTE_GENERAL] + filas
+
+
+def _por_area_original(empleados, actividades, registros):
+    areas = {}
+    for emp in empleados:
+        datos = areas.setdefault(emp.area, {'empleados': [], 'participaciones': [], 'calificaciones': []})
+        datos['empleados'].append(emp.id_empleado)
+        participaciones = [r for r in registros if r.empleado_id == emp.id_empleado and r.asistio]
+        datos['participaciones'].extend(participaciones)
+        datos['calificaciones'].extend(r.calificacion for r in participaciones if r.calificacion > 0)
+    filas = []
+    for area, datos in areas.items():
+        total_empleados = len(datos['empleados'])
+        total_participaciones = len(datos['participaciones'])
+        activos = len(set(p.empleado_id for p in datos['participaciones']))
+        calificaciones = datos['calificaciones']
+        satisfaccion = round(sum(calificaciones) / len(calificaciones), 2) if calificaciones else 0
+        promedio = round(total_participaciones / total_empleados, 2) if total_empleados > 0 else 0
+        filas.append([area, total_empleados, activos, total_participaciones, promedio, f"{satisfaccion}/5"])
+    filas.sort(key=lambda x: x[3], reverse=True)
+    return [reporte.COLUMNAS_REPORTE_POR_AREA] + filas
+
+
+def _resumen_original(empleados, actividades, registros):
+    total_registros = len(registros)
+    total_asistencias = sum(1 for r in registros if r.asistio)
+    tasa = round((total_asistencias / total_registros * 100), 2) if total_registros > 0 else 0
+    calificaciones = [r.calificacion for r in registros if r.asistio and r.calificacion > 0]
+    satisfaccion = round(sum(calificaciones) / len(calificaciones), 2) if calificaciones else 0
+    activos = len(set(r.empleado_id for r in registros if r.asistio))
+    por_nombre = {
+        act.nombre: sum(1 for r in registros if r.actividad_id == act.id_actividad and r.asistio)
+        for act in actividades
+    }
+    destacada = max(por_nombre, key=por_nombre.get) if por_nombre else "N/A"
+    return [
+        ['Métrica', 'Valor'],
+        ['Total empleados', len(empleados)],
+        ['Total actividades', len(actividades)],
+        ['Total registros', total_registros],
+        ['Total asistencias', total_asistencias],
+        ['Participación global', f"{tasa}%"],
+        ['Satisfacción global', f"{satisfaccion}/5"],
+        ['Empleados activos', activos],
+        ['% Activos', f"{round((activos / len(empleados) * 100), 2)}%" if empleados else "0%"],
+        ['Actividad destacada', destacada],
+    ]
+
+
+# Sin invitaciones: la versión original no calculaba ausencias
+REPORTES = [
+    ('reporte_general.csv', reporte.generar_reporte_general, _general_original, {'invitaciones': {}}),
+    ('reporte_por_area.csv', reporte.generar_reporte_por_area, _por_area_original, {}),
+    ('resumen_ejecutivo.csv', reporte.generar_resumen_ejecutivo, _resumen_original, {'invitaciones': {}}),
+]
+
+
+# ---------------------------------------------------------
+# COMPARACIÓN
+# ---------------------------------------------------------
+
+def _leer(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        # La fila 'Fecha' del resumen cambia en cada ejecución
+        return [linea for linea in f if not linea.startswith('Fecha,')]
+
+
+def _escribir(ruta, filas):
+    with open(ruta, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(filas)
+
+
+@contextlib.contextmanager
+def _sin_numpy():
+    """Fuerza la ruta de Python puro de vectorizado y cubo"""
+    np, vectorizado.np = vectorizado.np, None
+    try:
+        yield
+    finally:
+        vectorizado.np = np
+
+
+def _repetir_ids(carpeta, azar, copias):
+    """Agrega empleados y actividades con ids ya usados"""
+    with open(os.path.join(carpeta, 'empleados.txt'), 'r+', encoding='utf-8') as f:
+        lineas = f.read().splitlines()
+        areas = sorted({linea.split('|')[2] for linea in lineas})
+        for linea in azar.sample(lineas, copias):
+            id_emp, nombre, area, cargo = linea.split('|')
+            # La mitad en la misma área y la otra mitad en otra
+            otra = azar.choice(areas) if azar.random() < 0.5 else area
+            f.write(f"{id_emp}|{nombre} (copia)|{otra}|{cargo}\n")
+    with open(os.path.join(carpeta, 'actividades.txt'), 'r+', encoding='utf-8') as f:
+        lineas = f.read().splitlines()
+        for linea in azar.sample(lineas, max(1, copias // 10)):
+            id_act, nombre, fecha, tipo, descripcion = linea.split('|')
+            f.write(f"{id_act}|{nombre} (copia)|{fecha}|{tipo}|{descripcion}\n")
+
+
+def verificar_paridad(registros=100_000, semilla=7):
+    """
+    Compara los reportes actuales con los originales sobre datos con ids repetidos
+
+    Args:
+        registros (int): Número aproximado de registros de participación
+        semilla (int): Semilla del generador y de las copias
+
+    Returns:
+        list: Reportes que no coinciden (con '[sin NumPy]' si falla esa ruta)
+    """
+    base = tempfile.mkdtemp(prefix='wc_paridad_reportes_')
+    try:
+        empleados = max(100, registros // 50)
+        actividades = max(10, registros // 500)
+        generador.generar_datos(base, empleados=empleados, actividades=actividades,
+                                densidad=registros / (empleados * actividades), semilla=semilla)
+        _repetir_ids(base, random.Random(semilla), max(2, empleados // 50))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            emps = empleado.cargar_empleados(os.path.join(base, 'empleados.txt'))
+            acts = actividad.cargar_actividades(os.path.join(base, 'actividades.txt'))
+            regs = registro.cargar_registros(os.path.join(base, 'participacion.txt'))
+        print(f"Datos: {len(emps)} empleados, {len(acts)} actividades, {len(regs)} registros "
+              f"({len(emps) - len({e.id_empleado for e in emps})} empleados y "
+              f"{len(acts) - len({a.id_actividad for a in acts})} actividades con id repetido)")
+
+        diferentes = []
+        rutas = [('', contextlib.nullcontext)]
+        if vectorizado.np is not None:
+            rutas.append((' [sin NumPy]', _sin_numpy))
+        for sufijo, contexto in rutas:
+            for nombre, actual, original, opciones in REPORTES:
+                ruta = os.path.join(base, 'reportes', nombre)
+                with contexto(), contextlib.redirect_stdout(io.StringIO()):
+                    actual(emps, acts, regs, ruta, **opciones)
+                ruta_original = os.path.join(base, 'reportes', 'original_' + nombre)
+                _escribir(ruta_original, original(emps, acts, regs))
+                iguales = _leer(ruta) == _leer(ruta_original)
+                if not iguales:
+                    diferentes.append(nombre + sufijo)
+                print(f"  {'✓' if iguales else '✗'} {nombre}{sufijo}")
+        return diferentes
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Paridad de reportes con la versión original")
+    parser.add_argument('--registros', type=int, default=100_000)
+    parser.add_argument('--semilla', type=int, default=7)
+    args = parser.parse_args()
+
+    diferentes = verificar_paridad(args.registros, args.semilla)
+    if diferentes:
+        print(f"✗ Reportes distintos: {', '.join(diferentes)}")
+    sys.exit(1 if diferentes else 0)
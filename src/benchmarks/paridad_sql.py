@@ -0,0 +1,97 @@
+"""
+Prueba de paridad entre los reportes en memoria y los reportes en SQL
+
+Genera datos sintéticos, los carga en un BackendSQLite y compara byte a
+byte los CSV de reporte.py contra los de reporte_sql.py (el resumen
+ejecutivo se compara sin la fila de fecha de generación).
+
+Uso (desde la carpeta src):
+    python -m benchmarks.paridad_sql --registros 1000000
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from modules import actividad, almacenamiento, empleado, registro, reporte, reporte_sql
+
+from . import generador
+
+REPORTES = [
+    ('reporte_general.csv', reporte.generar_reporte_general, reporte_sql.generar_reporte_general_sql),
+    ('reporte_por_area.csv', reporte.generar_reporte_por_area, reporte_sql.generar_reporte_por_area_sql),
+    ('reporte_detallado.csv', reporte.generar_reporte_detallado, reporte_sql.generar_reporte_detallado_sql),
+    ('resumen_ejecutivo.csv', reporte.generar_resumen_ejecutivo, reporte_sql.generar_resumen_ejecutivo_sql),
+]
+
+
+def _leer(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        # La fila 'Fecha' del resumen cambia en cada ejecución
+        return [linea for linea in f if not linea.startswith('Fecha,')]
+
+
+def verificar_paridad(registros=1_000_000, semilla=7):
+    """
+    Compara los reportes de ambas implementaciones sobre los mismos datos
+
+    Args:
+        registros (int): Número aproximado de registros de participación
+        semilla (int): Semilla del generador
+
+    Returns:
+        list: Nombres de los reportes que no coinciden
+    """
+    base = tempfile.mkdtemp(prefix='wc_paridad_')
+    try:
+        actividades = max(10, registros // 1000)
+        carpeta = os.path.join(base, 'data')
+        generador.generar_datos(carpeta, empleados=10_000, actividades=actividades,
+                                densidad=registros / (10_000 * actividades), semilla=semilla)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            emps = empleado.cargar_empleados(os.path.join(carpeta, 'empleados.txt'))
+            acts = actividad.cargar_actividades(os.path.join(carpeta, 'actividades.txt'))
+            regs = registro.cargar_registros(os.path.join(carpeta, 'participacion.txt'))
+        backend = almacenamiento.BackendSQLite(os.path.join(base, 'paridad.db'))
+        backend.importar(emps, acts, regs)
+        print(f"Datos: {len(emps)} empleados, {len(acts)} actividades, {len(regs)} registros")
+
+        diferentes = []
+        for nombre, en_memoria, en_sql in REPORTES:
+            ruta_memoria = os.path.join(base, 'memoria', nombre)
+            ruta_sql = os.path.join(base, 'sql', nombre)
+            with contextlib.redirect_stdout(io.StringIO()):
+                inicio = time.perf_counter()
+                en_memoria(emps, acts, regs, ruta_memoria)
+                t_memoria = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                en_sql(backend, ruta_sql)
+                t_sql = time.perf_counter() - inicio
+
+            iguales = _leer(ruta_memoria) == _leer(ruta_sql)
+            if not iguales:
+                diferentes.append(nombre)
+            print(f"  {'✓' if iguales else '✗'} {nombre:<24} memoria {t_memoria:8.2f}s   sql {t_sql:8.2f}s")
+        backend.cerrar()
+        return diferentes
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Paridad de reportes en memoria vs SQL")
+    parser.add_argument('--registros', type=int, default=1_000_000)
+    parser.add_argument('--semilla', type=int, default=7)
+    args = parser.parse_args()
+
+    diferentes = verificar_paridad(args.registros, args.semilla)
+    if diferentes:
+        print(f"✗ Reportes distintos: {', '.join(diferentes)}")
+    sys.exit(1 if diferentes else 0)
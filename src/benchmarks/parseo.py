@@ -0,0 +1,106 @@
+"""
+Benchmark del parseo por lotes contra la conversión línea a línea
+
+Genera datos sintéticos y convierte participacion.txt de dos formas: con
+from_string por cada línea (la ruta con validación, la que usaban los
+cargadores) y con parseo_rapido. Verifica que ambas den los mismos
+objetos e informa líneas por segundo y la aceleración. Empleados y
+actividades no se miden: se siguen convirtiendo línea a línea.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.parseo --registros 1000000
+"""
+
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from modules import diagnostico, parseo_rapido, registro
+
+from . import generador
+
+ARCHIVOS = [
+    ('participacion.txt', 'registro', registro.Registro),
+]
+
+
+def linea_a_linea(ruta, clase):
+    """Conversión original: strip, from_string y try/except por línea"""
+    objetos = []
+    with diagnostico.sesion_carga(ruta), open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                objeto = clase.from_string(linea)
+                if objeto:
+                    objetos.append(objeto)
+    return objetos
+
+
+def medir(funcion, repeticiones):
+    """Mejor tiempo de varias ejecuciones y el último resultado"""
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        resultado = None
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        transcurrido = time.perf_counter() - inicio
+        mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+    return mejor, resultado
+
+
+def comparar(registros=1_000_000, repeticiones=3, semilla=7):
+    """
+    Mide ambas conversiones sobre los mismos archivos
+
+    Args:
+        registros (int): Número aproximado de registros de participación
+        repeticiones (int): Ejecuciones por medición (se toma la mejor)
+        semilla (int): Semilla del generador
+
+    Returns:
+        list: Nombres de los archivos cuyos objetos no coinciden
+    """
+    base = tempfile.mkdtemp(prefix='wc_parseo_')
+    try:
+        empleados = max(100, registros // 50)
+        actividades = max(10, registros // 200)
+        generador.generar_datos(base, empleados=empleados, actividades=actividades,
+                                densidad=registros / (empleados * actividades), semilla=semilla)
+        diferentes = []
+        for nombre, entidad, clase in ARCHIVOS:
+            ruta = os.path.join(base, nombre)
+            t_lento, lentos = medir(lambda: linea_a_linea(ruta, clase), repeticiones)
+            lentos = [o.to_string() for o in lentos]
+            t_rapido, rapidos = medir(lambda: parseo_rapido.leer_archivo(ruta, entidad), repeticiones)
+            rapidos = [o.to_string() for o in rapidos]
+
+            iguales = lentos == rapidos
+            if not iguales:
+                diferentes.append(nombre)
+            lineas = len(lentos)
+            print(f"  {'✓' if iguales else '✗'} {nombre:<18} {lineas:>9} líneas   "
+                  f"línea a línea {lineas / t_lento:>11,.0f}/s   "
+                  f"por lotes {lineas / t_rapido:>11,.0f}/s   x{t_lento / t_rapido:.1f}")
+        return diferentes
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parseo por lotes vs línea a línea")
+    parser.add_argument('--registros', type=int, default=1_000_000)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--semilla', type=int, default=7)
+    args = parser.parse_args()
+
+    diferentes = comparar(args.registros, args.repeticiones, args.semilla)
+    if diferentes:
+        print(f"✗ Resultados distintos: {', '.join(diferentes)}")
+    sys.exit(1 if diferentes else 0)
@@ -0,0 +1,269 @@
+"""
+Ejecutor de benchmarks de Work_Comfort
+
+Genera (o reutiliza) datos sintéticos, mide cargadores, búsquedas,
+estadísticas y reportes, y guarda los tiempos en JSON para comparar
+contra ejecuciones anteriores.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.runner --escala 1k
+    python -m benchmarks.runner --escala 100k --referencia benchmarks/resultados/100k.json
+    python -m benchmarks.runner --escala 1k --escala 100k --datos /tmp/bench  # reutiliza /tmp/bench/<escala>
+"""
+
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from modules import empleado, actividad, registro, reporte, series, vectorizado, cubo
+
+from . import generador
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), 'resultados')
+
+# Operaciones estimadas por encima de las cuales se omite una medición
+PRESUPUESTO_OPERACIONES = 2_000_000_000
+
+
+def definir_benchmarks(datos, rutas, reportes_dir):
+    """
+    Lista los casos a medir con su costo estimado en operaciones
+
+    Args:
+        datos (dict): Empleados, actividades y registros ya cargados
+        rutas (dict): Rutas de los archivos de datos
+        reportes_dir (str): Carpeta donde escribir los CSV de prueba
+
+    Returns:
+        list: Tuplas (nombre, funcion, costo_estimado)
+    """
+    emps, acts, regs = datos['empleados'], datos['actividades'], datos['registros']
+    E, A, R = len(emps), len(acts), len(regs)
+    ultimo_emp = emps[-1].id_empleado if emps else 0
+    ultima_act = acts[-1].id_actividad if acts else 0
+    primera_act = acts[0].id_actividad if acts else 0
+
+    def csv(nombre):
+        return os.path.join(reportes_dir, f"{nombre}.csv")
+
+    @functools.lru_cache(maxsize=None)
+    def tabla():
+        # Se arma una sola vez (afecta la media, no el mejor tiempo)
+        return vectorizado.TablaParticipacion.desde_registros(regs)
+
+    def rollup_completo():
+        # Sin archivo persistido se reconstruyen todos los agregados
+        archivo_rollup = os.path.join(reportes_dir, 'rollups.json')
+        if os.path.exists(archivo_rollup):
+            os.remove(archivo_rollup)
+        return series.obtener_rollup(emps, acts, rutas['participacion'], archivo_rollup)
+
+    return [
+        # Cargadores
+        ('empleado.cargar_empleados', lambda: empleado.cargar_empleados(rutas['empleados']), E),
+        ('actividad.cargar_actividades', lambda: actividad.cargar_actividades(rutas['actividades']), A),
+        ('registro.cargar_registros', lambda: registro.cargar_registros(rutas['participacion']), R),
+        # Búsquedas (usan las rutas por defecto relativas al directorio de trabajo)
+        ('empleado.obtener_empleado_por_id', lambda: empleado.obtener_empleado_por_id(ultimo_emp), E),
+        ('empleado.validar_id_unico', lambda: empleado.validar_id_unico(ultimo_emp), E),
+        ('actividad.obtener_actividad_por_id', lambda: actividad.obtener_actividad_por_id(ultima_act), A),
+        ('actividad.validar_id_unico', lambda: actividad.validar_id_unico(ultima_act), A),
+        ('actividad.obtener_actividades_por_fecha',
+         lambda: actividad.obtener_actividades_por_fecha('2025-06-01', '2025-06-30'), A),
+        ('actividad.obtener_actividades_por_tipo',
+         lambda: actividad.obtener_actividades_por_tipo('Taller'), A),
+        ('registro.obtener_participantes_actividad',
+         lambda: registro.obtener_participantes_actividad(primera_act, regs), R),
+        ('registro.obtener_actividades_empleado',
+         lambda: registro.obtener_actividades_empleado(ultimo_emp, regs), R),
+        # Estadísticas
+        ('registro.calcular_estadisticas', lambda: registro.calcular_estadisticas(regs), R),
+        ('registro.calcular_estadisticas[actividad]',
+         lambda: registro.calcular_estadisticas(regs, primera_act), R),
+        ('series.obtener_rollup[completo]', lambda: rollup_completo(), R),
+        # Reportes
+        ('reporte.generar_reporte_general',
+         lambda: reporte.generar_reporte_general(emps, acts, regs, csv('general')), A + R),
+        ('reporte.generar_reporte_por_area',
+         lambda: reporte.generar_reporte_por_area(emps, acts, regs, csv('area')), E + R),
+        ('reporte.generar_reporte_detallado',
+         lambda: reporte.generar_reporte_detallado(emps, acts, regs, csv('detallado')), R * 20),
+        ('reporte.generar_resumen_ejecutivo',
+         lambda: reporte.generar_resumen_ejecutivo(emps, acts, regs, csv('resumen')), A + R),
+        # Agregados por columnas (NumPy si está instalado)
+        ('vectorizado.TablaParticipacion.desde_archivo',
+         lambda: vectorizado.TablaParticipacion.desde_archivo(rutas['participacion']), R),
+        ('vectorizado.estadisticas[tabla]', lambda: vectorizado.estadisticas(tabla()), R),
+        ('vectorizado.agregados_por_actividad[tabla]',
+         lambda: vectorizado.agregados_por_actividad(tabla()), R),
+        ('cubo.consultar[area,tipo,mes]',
+         lambda: cubo.consultar(emps, acts, tabla(), ('area', 'tipo', 'mes')), E + A + R),
+    ]
+
+
+def medir(funcion, repeticiones):
+    """
+    Mide el mejor tiempo de varias ejecuciones silenciando la consola
+
+    Args:
+        funcion (callable): Función sin argumentos a medir
+        repeticiones (int): Número de ejecuciones
+
+    Returns:
+        dict: Mejor tiempo, media y número de filas devueltas (si aplica)
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            tiempos.append(time.perf_counter() - inicio)
+
+    medicion = {
+        'segundos': round(min(tiempos), 6),
+        'media_segundos': round(sum(tiempos) / len(tiempos), 6),
+        'repeticiones': repeticiones,
+    }
+    if isinstance(resultado, (list, dict)):
+        medicion['filas'] = len(resultado)
+    return medicion
+
+
+def ejecutar(escala, directorio_datos=None, repeticiones=3,
+             presupuesto=PRESUPUESTO_OPERACIONES, filtro=None):
+    """
+    Ejecuta la suite completa para una escala
+
+    Args:
+        escala (str): Clave de generador.ESCALAS
+        directorio_datos (str): Carpeta donde guardar y reutilizar los datos
+            (opcional); cada escala usa su subcarpeta <directorio_datos>/<escala>
+        repeticiones (int): Ejecuciones por caso
+        presupuesto (int): Costo máximo estimado de un caso antes de omitirlo
+        filtro (str): Solo ejecutar casos cuyo nombre contenga este texto
+
+    Returns:
+        dict: Resultados listos para serializar en JSON
+    """
+    temporal = directorio_datos is None
+    # Una subcarpeta por escala: con varias --escala cada una mide sus propios datos
+    base = tempfile.mkdtemp(prefix='wc_bench_') if temporal else os.path.join(directorio_datos, escala)
+    carpeta = os.path.join(base, 'src', 'data')
+    rutas = {n: os.path.join(carpeta, f"{n}.txt")
+             for n in ('empleados', 'actividades', 'participacion')}
+
+    directorio_original = os.getcwd()
+    try:
+        if temporal or not os.path.exists(rutas['participacion']):
+            inicio = time.perf_counter()
+            conteo = generador.generar_escala(carpeta, escala)
+            print(f"Datos generados en {time.perf_counter() - inicio:.1f}s: {conteo}")
+
+        # Las funciones que no reciben ruta leen 'src/data/...' relativo al cwd
+        os.chdir(base)
+        with contextlib.redirect_stdout(io.StringIO()):
+            datos = {
+                'empleados': empleado.cargar_empleados(rutas['empleados']),
+                'actividades': actividad.cargar_actividades(rutas['actividades']),
+                'registros': registro.cargar_registros(rutas['participacion']),
+            }
+
+        reportes_dir = os.path.join(base, 'reportes')
+        os.makedirs(reportes_dir, exist_ok=True)
+        resultados = {}
+        for nombre, funcion, costo in definir_benchmarks(datos, rutas, reportes_dir):
+            if filtro and filtro not in nombre:
+                continue
+            if costo > presupuesto:
+                resultados[nombre] = {'omitido': True, 'costo_estimado': costo}
+                print(f"  {nombre:<45} omitido (costo estimado {costo:.2e})")
+                continue
+            resultados[nombre] = medir(funcion, repeticiones)
+            print(f"  {nombre:<45} {resultados[nombre]['segundos']:>10.4f}s")
+    finally:
+        os.chdir(directorio_original)
+        if temporal:
+            shutil.rmtree(base, ignore_errors=True)
+
+    return {
+        'escala': escala,
+        'parametros': generador.ESCALAS[escala],
+        'filas': {k: len(v) for k, v in datos.items()},
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+
+
+def comparar(actual, referencia, tolerancia=0.10):
+    """
+    Compara dos ejecuciones e informa regresiones
+
+    Args:
+        actual (dict): Resultados de esta ejecución
+        referencia (dict): Resultados guardados previamente
+        tolerancia (float): Aumento relativo permitido antes de marcar regresión
+
+    Returns:
+        list: Nombres de los casos que empeoraron más que la tolerancia
+    """
+    regresiones = []
+    for nombre, medicion in actual['resultados'].items():
+        previa = referencia.get('resultados', {}).get(nombre)
+        if not previa or 'segundos' not in previa or 'segundos' not in medicion:
+            continue
+        razon = medicion['segundos'] / previa['segundos'] if previa['segundos'] else 1.0
+        marca = "✗" if razon > 1 + tolerancia else "✓"
+        print(f"  {marca} {nombre:<45} x{razon:.2f}")
+        if razon > 1 + tolerancia:
+            regresiones.append(nombre)
+    return regresiones
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmarks de Work_Comfort")
+    parser.add_argument('--escala', choices=list(generador.ESCALAS), action='append',
+                        help="Escala a medir; se puede repetir (por defecto 1k)")
+    parser.add_argument('--datos', help="Carpeta donde guardar y reutilizar los datos (una subcarpeta por escala)")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--presupuesto', type=float, default=PRESUPUESTO_OPERACIONES,
+                        help="Omitir casos con costo estimado mayor a este número de operaciones")
+    parser.add_argument('--filtro', help="Solo casos cuyo nombre contenga este texto")
+    parser.add_argument('--salida', default=DIRECTORIO_RESULTADOS,
+                        help="Carpeta donde guardar <escala>.json")
+    parser.add_argument('--referencia', help="JSON previo contra el cual comparar")
+    args = parser.parse_args()
+
+    escalas = args.escala or ['1k']
+    os.makedirs(args.salida, exist_ok=True)
+    hay_regresiones = False
+
+    for escala in escalas:
+        print(f"\n=== Escala {escala} ===")
+        resultado = ejecutar(escala, args.datos, args.repeticiones, args.presupuesto, args.filtro)
+        ruta = os.path.join(args.salida, f"{escala}.json")
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"✓ Resultados guardados: {ruta}")
+
+        if args.referencia:
+            with open(args.referencia, 'r', encoding='utf-8') as f:
+                hay_regresiones |= bool(comparar(resultado, json.load(f)))
+
+    sys.exit(1 if hay_regresiones else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import argparse
 import sys
 import os
 
@@ -5,7 +6,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
 
 # Importar módulos
-from modules import empleado, actividad, registro, reporte
+from modules import empleado, actividad, registro, reporte, series, instrumentacion, diagnostico, almacenamiento, reporte_sql, cubo, cache_reportes, cambios, planilla, invitacion, instantanea, cohortes
 
 
 def limpiar_pantalla():
@@ -27,16 +28,21 @@ def mostrar_menu_principal():
     print("  1. Registrar empleado")
     print("  2. Registrar actividad de bienestar")
     print("  3. Registrar participación en actividad")
+    print(" 14. Registrar participación de toda una actividad (planilla)")
+    print(" 15. Convocar empleados a una actividad (invitación)")
     print("-" * 70)
     print("  4. Ver lista de empleados")
     print("  5. Ver lista de actividades")
     print("  6. Ver estadísticas de participación")
+    print(" 16. Consultar cohortes de asistencia")
     print("-" * 70)
     print("  7. Generar reporte general (CSV)")
     print("  8. Generar reporte por área (CSV)")
     print("  9. Generar reporte detallado (CSV)")
     print(" 10. Generar todos los reportes (CSV)")
     print(" 11. Generar resumen ejecutivo (CSV)")
+    print(" 12. Generar reporte por periodo (CSV)")
+    print(" 13. Generar reporte cruzado (CSV)")
     print("-" * 70)
     print("  0. Salir del sistema")
     print("-" * 70)
@@ -65,42 +71,69 @@ def opcion_registrar_participacion():
     limpiar_pantalla()
     mostrar_banner()
 
+    # Solo la primera página: el resto se encuentra buscando por nombre
     print("\n--- EMPLEADOS DISPONIBLES ---")
-    empleados = empleado.cargar_empleados()
-    if empleados:
-        for emp in empleados:
-            print(f"  ID {emp.id_empleado}: {emp.nombre}")
-    else:
-        print("No hay empleados registrados")
-
+    empleados = empleado.listar_empleados(tamano=10)
     print("\n--- ACTIVIDADES DISPONIBLES ---")
-    actividades = actividad.cargar_actividades()
-    if actividades:
-        for act in actividades:
-            print(f"  ID {act.id_actividad}: {act.nombre} ({act.fecha})")
-    else:
-        print("No hay actividades registradas")
+    actividades = actividad.listar_actividades(tamano=10)
 
     if not empleados or not actividades:
         print("Debe registrar empleados y actividades primero")
         pausar()
         return
 
+    while True:
+        texto = input("\nBuscar empleado o actividad por nombre (Enter para continuar): ").strip()
+        if not texto:
+            break
+        print("Empleados:")
+        empleado.buscar_empleados(texto)
+        print("Actividades:")
+        actividad.buscar_actividades(texto)
+
     registro.registrar_participacion_interactiva()
     pausar()
 
 
+def opcion_registrar_planilla():
+    limpiar_pantalla()
+    mostrar_banner()
+
+    print("\n--- ACTIVIDADES RECIENTES ---")
+    if not actividad.listar_actividades(tamano=10):
+        print("Debe registrar actividades primero")
+        pausar()
+        return
+
+    planilla.registrar_planilla_interactiva()
+    pausar()
+
+
+def opcion_registrar_invitacion():
+    limpiar_pantalla()
+    mostrar_banner()
+
+    print("\n--- ACTIVIDADES RECIENTES ---")
+    if not actividad.listar_actividades(tamano=10):
+        print("Debe registrar actividades primero")
+        pausar()
+        return
+
+    invitacion.registrar_invitacion_interactiva()
+    pausar()
+
+
 def opcion_ver_empleados():
     limpiar_pantalla()
     mostrar_banner()
-    empleado.listar_empleados()
+    empleado.explorar_empleados()
     pausar()
 
 
 def opcion_ver_actividades():
     limpiar_pantalla()
     mostrar_banner()
-    actividad.listar_actividades()
+    actividad.explorar_actividades()
     pausar()
 
 
@@ -131,41 +164,105 @@ def opcion_ver_estadisticas():
     pausar()
 
 
-def opcion_generar_reporte_general():
+def opcion_consultar_cohortes():
     limpiar_pantalla()
     mostrar_banner()
-    print("\nGenerando reporte general...")
+    cohortes.consultar_cohorte_interactiva()
+    pausar()
 
-    empleados = empleado.cargar_empleados()
-    actividades = actividad.cargar_actividades()
-    registros = registro.cargar_registros()
+
+# CSV de los reportes de las opciones 7 a 11
+ARCHIVOS_REPORTE = {
+    'general': 'src/data/reportes/reporte_general.csv',
+    'por_area': 'src/data/reportes/reporte_por_area.csv',
+    'detallado': 'src/data/reportes/reporte_detallado.csv',
+    'resumen': 'src/data/reportes/resumen_ejecutivo.csv',
+}
+
+
+def cargar_datos():
+    """Carga empleados, actividades y registros del backend activo"""
+    return empleado.cargar_empleados(), actividad.cargar_actividades(), registro.cargar_registros()
+
+
+def generar_reporte_general(datos=cargar_datos):
+    # Con base de datos los agregados se calculan en SQL, sin cargar los registros
+    backend = reporte_sql.backend_sql()
+    if backend is not None:
+        return reporte_sql.generar_reporte_general_sql(backend)
+
+    empleados, actividades, registros = datos()
 
     if not actividades:
         print("No hay actividades registradas para generar el reporte")
     elif not registros:
         print("No hay registros de participación para generar el reporte")
     else:
-        reporte.generar_reporte_general(empleados, actividades, registros)
+        return reporte.generar_reporte_general(empleados, actividades, registros)
+    return False
 
-    pausar()
 
+def generar_reporte_por_area(datos=cargar_datos):
+    # Con base de datos los agregados se calculan en SQL, sin cargar los registros
+    backend = reporte_sql.backend_sql()
+    if backend is not None:
+        return reporte_sql.generar_reporte_por_area_sql(backend)
 
-def opcion_generar_reporte_por_area():
-    limpiar_pantalla()
-    mostrar_banner()
-    print("\nGenerando reporte por área...")
-
-    empleados = empleado.cargar_empleados()
-    actividades = actividad.cargar_actividades()
-    registros = registro.cargar_registros()
+    empleados, actividades, registros = datos()
 
     if not empleados:
         print("No hay empleados registrados para generar el reporte")
     elif not registros:
         print("No hay registros de participación para generar el reporte")
     else:
-        reporte.generar_reporte_por_area(empleados, actividades, registros)
+        return reporte.generar_reporte_por_area(empleados, actividades, registros)
+    return False
+
+
+def generar_reporte_detallado(datos=cargar_datos):
+    # Con base de datos los agregados se calculan en SQL, sin cargar los registros
+    backend = reporte_sql.backend_sql()
+    if backend is not None:
+        return reporte_sql.generar_reporte_detallado_sql(backend)
+
+    empleados, actividades, registros = datos()
+
+    if not registros:
+        print("No hay registros de participación para generar el reporte")
+    else:
+        return reporte.generar_reporte_detallado(empleados, actividades, registros)
+    return False
+
+
+def generar_resumen_ejecutivo(datos=cargar_datos):
+    # Con base de datos los agregados se calculan en SQL, sin cargar los registros
+    backend = reporte_sql.backend_sql()
+    if backend is not None:
+        return reporte_sql.generar_resumen_ejecutivo_sql(backend)
+
+    empleados, actividades, registros = datos()
+
+    if not empleados or not actividades or not registros:
+        print("Faltan datos para generar el resumen")
+    else:
+        return reporte.generar_resumen_ejecutivo(empleados, actividades, registros)
+    return False
+
+
+def opcion_generar_reporte_general():
+    limpiar_pantalla()
+    mostrar_banner()
+    print("\nGenerando reporte general...")
+    # Si los datos no cambiaron desde la última vez se reutiliza el CSV
+    cache_reportes.generar('general', ARCHIVOS_REPORTE['general'], generar_reporte_general)
+    pausar()
+
 
+def opcion_generar_reporte_por_area():
+    limpiar_pantalla()
+    mostrar_banner()
+    print("\nGenerando reporte por área...")
+    cache_reportes.generar('por_area', ARCHIVOS_REPORTE['por_area'], generar_reporte_por_area)
     pausar()
 
 
@@ -173,54 +270,86 @@ def opcion_generar_reporte_detallado():
     limpiar_pantalla()
     mostrar_banner()
     print("\nGenerando reporte detallado...")
+    cache_reportes.generar('detallado', ARCHIVOS_REPORTE['detallado'], generar_reporte_detallado)
+    pausar()
 
-    empleados = empleado.cargar_empleados()
-    actividades = actividad.cargar_actividades()
-    registros = registro.cargar_registros()
 
-    if not registros:
-        print("No hay registros de participación para generar el reporte")
-    else:
-        reporte.generar_reporte_detallado(empleados, actividades, registros)
+def opcion_generar_todos_reportes():
+    limpiar_pantalla()
+    mostrar_banner()
+    print("\n" + "=" * 60)
+    print("  GENERANDO TODOS LOS REPORTES")
+    print("=" * 60)
 
+    # Los datos se cargan una sola vez y solo si algún reporte no está en la caché
+    cargados = []
+
+    def datos():
+        if not cargados:
+            cargados.append(cargar_datos())
+        return cargados[0]
+
+    generadores = (('general', generar_reporte_general), ('por_area', generar_reporte_por_area),
+                   ('detallado', generar_reporte_detallado))
+    total_exitosos = sum(
+        cache_reportes.generar(nombre, ARCHIVOS_REPORTE[nombre], lambda g=generar: g(datos))
+        for nombre, generar in generadores
+    )
+    print(f"\n✓ Reportes generados: {total_exitosos}/3")
     pausar()
 
 
-def opcion_generar_todos_reportes():
+def opcion_generar_resumen_ejecutivo():
+    limpiar_pantalla()
+    mostrar_banner()
+    print("\nGenerando resumen ejecutivo...")
+    cache_reportes.generar('resumen', ARCHIVOS_REPORTE['resumen'], generar_resumen_ejecutivo)
+    pausar()
+
+
+def opcion_generar_reporte_por_periodo():
     limpiar_pantalla()
     mostrar_banner()
 
+    granularidades = {"1": "dia", "2": "semana", "3": "mes", "4": "trimestre"}
+    print("\nAgrupar por: 1. Día  2. Semana  3. Mes  4. Trimestre")
+    granularidad = granularidades.get(input("Seleccione una opción (Enter = mes): ").strip(), "mes")
+
+    rango = []
+    for etiqueta in ("Desde", "Hasta"):
+        fecha = input(f"{etiqueta} (YYYY-MM-DD, Enter para omitir): ").strip()
+        if fecha and not actividad.validar_fecha(fecha):
+            print("Formato de fecha inválido, se omite el filtro")
+            fecha = ""
+        rango.append(actividad.parsear_fecha(fecha) if fecha else None)
+
+    print("\nGenerando reporte por periodo...")
     empleados = empleado.cargar_empleados()
     actividades = actividad.cargar_actividades()
-    registros = registro.cargar_registros()
-
-    if not empleados or not actividades or not registros:
-        print("Faltan datos para generar los reportes:")
-        if not empleados:
-            print("  - No hay empleados registrados")
-        if not actividades:
-            print("  - No hay actividades registradas")
-        if not registros:
-            print("  - No hay registros de participación")
-    else:
-        reporte.generar_todos_los_reportes(empleados, actividades, registros)
+    rollup = series.obtener_rollup(empleados, actividades)
+    reporte.generar_reporte_por_periodo(rollup, granularidad, rango[0], rango[1])
 
     pausar()
 
 
-def opcion_generar_resumen_ejecutivo():
+def opcion_generar_reporte_cruzado():
     limpiar_pantalla()
     mostrar_banner()
-    print("\nGenerando resumen ejecutivo...")
 
+    print(f"\nDimensiones disponibles: {', '.join(cubo.DIMENSIONES)}")
+    texto = input("Dimensiones separadas por coma (Enter = area,tipo,mes): ").strip()
+    dimensiones = tuple(d.strip() for d in (texto or "area,tipo,mes").split(",") if d.strip())
+    columna = input("Dimensión a mostrar en columnas (Enter = ninguna): ").strip() or None
+
+    print("\nGenerando reporte cruzado...")
     empleados = empleado.cargar_empleados()
     actividades = actividad.cargar_actividades()
     registros = registro.cargar_registros()
 
-    if not empleados or not actividades or not registros:
-        print("Faltan datos para generar el resumen")
+    if not registros:
+        print("No hay registros de participación")
     else:
-        reporte.generar_resumen_ejecutivo(empleados, actividades, registros)
+        reporte.generar_reporte_cruzado(empleados, actividades, registros, dimensiones, columna=columna)
 
     pausar()
 
@@ -239,12 +368,18 @@ def menu_principal():
             opcion_registrar_actividad()
         elif opcion == "3":
             opcion_registrar_participacion()
+        elif opcion == "14":
+            opcion_registrar_planilla()
+        elif opcion == "15":
+            opcion_registrar_invitacion()
         elif opcion == "4":
             opcion_ver_empleados()
         elif opcion == "5":
             opcion_ver_actividades()
         elif opcion == "6":
             opcion_ver_estadisticas()
+        elif opcion == "16":
+            opcion_consultar_cohortes()
         elif opcion == "7":
             opcion_generar_reporte_general()
         elif opcion == "8":
@@ -255,6 +390,10 @@ def menu_principal():
             opcion_generar_todos_reportes()
         elif opcion == "11":
             opcion_generar_resumen_ejecutivo()
+        elif opcion == "12":
+            opcion_generar_reporte_por_periodo()
+        elif opcion == "13":
+            opcion_generar_reporte_cruzado()
         elif opcion == "0":
             limpiar_pantalla()
             mostrar_banner()
@@ -322,6 +461,21 @@ def cargar_datos_de_prueba():
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Sistema de Gestión de Bienestar Laboral")
+    parser.add_argument('--force', action='store_true',
+                        help="Regenera los reportes aunque los datos no hayan cambiado")
+    args = parser.parse_args()
+    cache_reportes.configurar(forzar=args.force)
+
+    # Métricas opcionales: WORK_COMFORT_METRICAS=metricas.json (o .prom)
+    instrumentacion.configurar_desde_entorno()
+    # Avisos de datos (líneas inválidas, archivos faltantes) van al log, no a la consola
+    diagnostico.configurar_registro()
+    # Backend de datos: archivos de texto o WORK_COMFORT_BACKEND=sqlite:<ruta.db>
+    almacenamiento.configurar_desde_entorno()
+    # Eventos de cambio opcionales: WORK_COMFORT_CAMBIOS=jsonl[:<ruta>]
+    cambios.configurar_desde_entorno()
+
     try:
         limpiar_pantalla()
         mostrar_banner()
@@ -329,8 +483,13 @@ def main():
         print("Desarrollado para optimizar la gestión de actividades de bienestar\n")
         print("=" * 70)
 
-        empleados_existentes = empleado.cargar_empleados()
-        if not empleados_existentes:
+        # Estado guardado al salir la vez anterior: solo se lee su encabezado
+        estado = instantanea.restaurar()
+        if estado is not None and estado.vigente('empleados'):
+            hay_empleados = estado.filas['empleados'] > 0
+        else:
+            hay_empleados = bool(empleado.cargar_empleados())
+        if not hay_empleados:
             cargar_datos_de_prueba()
 
         menu_principal()
@@ -341,6 +500,9 @@ def main():
     except Exception as e:
         print(f"Error inesperado: {e}")
         print("Por favor, contacte al administrador del sistema.\n")
+    finally:
+        # Para el próximo arranque, si los datos cambiaron en esta sesión
+        instantanea.actualizar()
 
 
 if __name__ == "__main__":
@@ -2,6 +2,27 @@ from . import empleado
 from . import actividad
 from . import registro
 from . import reporte
+from . import series
+from . import instrumentacion
+from . import diagnostico
+from . import almacenamiento
+from . import reporte_sql
+from . import vectorizado
+from . import histograma
+from . import codificacion
+from . import cubo
+from . import cache_reportes
+from . import seguimiento
+from . import cambios
+from . import parseo_rapido
+from . import directorio
+from . import listados
+from . import planilla
+from . import invitacion
+from . import instantanea
+from . import mapa_bits
+from . import cohortes
+# mantenimiento, servidor_http e ingesta no se importan aquí porque se ejecutan con python -m
 
-__all__ = ['empleado', 'actividad', 'registro', 'reporte']
+__all__ = ['empleado', 'actividad', 'registro', 'reporte', 'series', 'instrumentacion', 'diagnostico', 'almacenamiento', 'reporte_sql', 'vectorizado', 'histograma', 'codificacion', 'cubo', 'cache_reportes', 'seguimiento', 'cambios', 'parseo_rapido', 'directorio', 'listados', 'planilla', 'invitacion', 'instantanea', 'mapa_bits', 'cohortes', 'mantenimiento', 'servidor_http', 'ingesta']
 __version__ = '1.0.0'
\ No newline at end of file
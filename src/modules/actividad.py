@@ -1,10 +1,16 @@
 
 
 import os
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+
+from . import almacenamiento, cambios, codificacion, diagnostico, instantanea, instrumentacion, listados
 
 class Actividad:
     """Clase que representa una actividad de bienestar laboral"""
+
+    # El tipo se guarda como código de codificacion.TIPOS
+    __slots__ = ('id_actividad', 'nombre', 'fecha', 'codigo_tipo', 'descripcion')
     
     def __init__(self, id_actividad, nombre, fecha, tipo, descripcion=""):
         """
@@ -13,21 +19,34 @@ class Actividad:
         Args:
             id_actividad (int): Identificador único de la actividad
             nombre (str): Nombre de la actividad
-            fecha (str): Fecha en formato YYYY-MM-DD
+            fecha (str | date): Fecha en formato YYYY-MM-DD o ya convertida
             tipo (str): Tipo de actividad (Pausa activa, Taller, etc.)
             descripcion (str): Descripción opcional de la actividad
+            
+        Raises:
+            ValueError: Si la fecha no es válida
         """
         self.id_actividad = id_actividad
         self.nombre = nombre
-        self.fecha = fecha
+        self.fecha = parsear_fecha(fecha)  # datetime.date, se convierte una sola vez
         self.tipo = tipo
         self.descripcion = descripcion
+
+    @property
+    def tipo(self):
+        """Tipo de actividad (etiqueta del código)"""
+        return codificacion.TIPOS.etiquetas[self.codigo_tipo]
+
+    @tipo.setter
+    def tipo(self, valor):
+        self.codigo_tipo = codificacion.TIPOS.codigo(valor)
     
     def to_string(self):
         """Convierte la actividad a formato de texto para guardar"""
         return f"{self.id_actividad}|{self.nombre}|{self.fecha}|{self.tipo}|{self.descripcion}"
     
     @staticmethod
+    @instrumentacion.medir(filas=instrumentacion.una_fila)
     def from_string(linea):
         """
         Crea un objeto Actividad desde una línea de texto
@@ -51,7 +70,7 @@ class Actividad:
             
             return Actividad(id_act, nombre, fecha, tipo, descripcion)
         except Exception as e:
-            print(f"Error al leer actividad: {e}")
+            diagnostico.error_parseo('actividad', linea, e)
             return None
     
     def __str__(self):
@@ -59,6 +78,38 @@ class Actividad:
         return f"[{self.id_actividad}] {self.nombre} ({self.tipo}) - {self.fecha}"
 
 
+@lru_cache(maxsize=4096)
+def _parsear_fecha_strptime(fecha_str):
+    """Ruta lenta y memorizada para fechas no canónicas (ej: 2025-1-5)"""
+    return datetime.strptime(fecha_str, '%Y-%m-%d').date()
+
+
+def parsear_fecha(fecha):
+    """
+    Convierte una fecha YYYY-MM-DD a datetime.date
+    
+    Las fechas canónicas se convierten con date.fromisoformat; el resto
+    pasa por strptime con memoria, así cada fecha distinta se analiza una vez.
+    
+    Args:
+        fecha (str | date): Fecha a convertir
+        
+    Returns:
+        date: Fecha convertida
+        
+    Raises:
+        ValueError: Si la fecha no tiene formato YYYY-MM-DD válido
+    """
+    if isinstance(fecha, date):
+        return fecha
+    if len(fecha) == 10 and fecha[4] == '-' and fecha[7] == '-':
+        try:
+            return date.fromisoformat(fecha)
+        except ValueError:
+            pass
+    return _parsear_fecha_strptime(fecha)
+
+
 def validar_fecha(fecha_str):
     """
     Valida que una fecha tenga formato YYYY-MM-DD
@@ -70,9 +121,9 @@ def validar_fecha(fecha_str):
         bool: True si la fecha es válida, False en caso contrario
     """
     try:
-        datetime.strptime(fecha_str, '%Y-%m-%d')
+        parsear_fecha(fecha_str)
         return True
-    except ValueError:
+    except (ValueError, TypeError):
         return False
 
 
@@ -82,23 +133,60 @@ def agregar_actividad(actividad, archivo='src/data/actividades.txt'):
     
     Args:
         actividad (Actividad): Objeto actividad a guardar
-        archivo (str): Ruta del archivo de actividades
+        archivo (str): Ruta del archivo de actividades (backend de texto)
     """
     try:
-        # Crear directorio si no existe
-        os.makedirs(os.path.dirname(archivo), exist_ok=True)
-        
-        # Agregar al archivo
-        with open(archivo, 'a', encoding='utf-8') as f:
-            f.write(actividad.to_string() + '\n')
+        backend = almacenamiento.obtener_backend()
+        # El estado anterior solo se busca si alguien consume los eventos de cambio
+        anterior = _anterior(actividad.id_actividad, archivo) if cambios.activo() else None
+        # El índice de listados y búsqueda se actualiza en lugar de rearmarse
+        with listados.alta('actividades', actividad, archivo):
+            if backend is not None:
+                backend.agregar_actividad(actividad)
+            else:
+                # Crear directorio si no existe
+                os.makedirs(os.path.dirname(archivo), exist_ok=True)
+                
+                # Agregar al archivo
+                with open(archivo, 'a', encoding='utf-8') as f:
+                    f.write(actividad.to_string() + '\n')
+        cambios.publicar('actividad', 'update' if anterior else 'insert', anterior, actividad)
         print(f"✓ Actividad '{actividad.nombre}' registrada exitosamente")
     except Exception as e:
         print(f"✗ Error al guardar actividad: {e}")
 
 
+def _anterior(id_actividad, archivo):
+    """Versión vigente de una actividad: la misma que devuelve obtener_actividad_por_id"""
+    if (almacenamiento.obtener_backend() is not None
+            or os.path.normpath(archivo) == os.path.normpath('src/data/actividades.txt')):
+        return obtener_actividad_por_id(id_actividad)
+    # Otro archivo: no hay índice, vale la primera línea con ese id
+    return next((a for a in leer_actividades_texto(archivo) if a.id_actividad == id_actividad), None)
+
+
+@instrumentacion.medir()
 def cargar_actividades(archivo='src/data/actividades.txt'):
     """
-    Carga todas las actividades desde el archivo
+    Carga todas las actividades desde el backend activo (por defecto el archivo)
+    
+    Args:
+        archivo (str): Ruta del archivo de actividades (backend de texto)
+        
+    Returns:
+        list: Lista de objetos Actividad
+    """
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.cargar_actividades()
+    # Instantánea del arranque si el archivo no cambió desde que se guardó
+    actividades = instantanea.actividades(archivo)
+    return actividades if actividades is not None else leer_actividades_texto(archivo)
+
+
+def leer_actividades_texto(archivo='src/data/actividades.txt'):
+    """
+    Lee todas las actividades de un archivo de texto
     
     Args:
         archivo (str): Ruta del archivo de actividades
@@ -109,38 +197,100 @@ def cargar_actividades(archivo='src/data/actividades.txt'):
     actividades = []
     try:
         if not os.path.exists(archivo):
-            print(f"⚠ El archivo {archivo} no existe. Se creará al agregar actividades.")
+            diagnostico.archivo_inexistente(archivo)
             return actividades
         
-        with open(archivo, 'r', encoding='utf-8') as f:
+        instrumentacion.contar('actividad.cargar_actividades', bytes_leidos=os.path.getsize(archivo))
+        with diagnostico.sesion_carga(archivo), open(archivo, 'r', encoding='utf-8') as f:
             for linea in f:
                 if linea.strip():  # Ignorar líneas vacías
                     act = Actividad.from_string(linea)
                     if act:
                         actividades.append(act)
+    except diagnostico.ErrorDeParseo:
+        raise
     except Exception as e:
-        print(f"✗ Error al cargar actividades: {e}")
+        diagnostico.logger.error("Error al cargar %s: %s", archivo, e)
     
     return actividades
 
 
-def listar_actividades():
-    """Muestra en consola todas las actividades registradas"""
-    actividades = cargar_actividades()
-    
-    if not actividades:
+def listar_actividades(pagina=1, tamano=None, tipo=None, desde=None, hasta=None):
+    """
+    Muestra en consola una página de las actividades registradas
+
+    Args:
+        pagina (int): Número de página (desde 1)
+        tamano (int): Actividades por página (por defecto listados.TAMANO_PAGINA)
+        tipo (str): Mostrar solo este tipo
+        desde (str | date): Mostrar solo desde esta fecha
+        hasta (str | date): Mostrar solo hasta esta fecha
+
+    Returns:
+        Pagina: Página mostrada o None si no hay actividades registradas
+    """
+    indice = listados.indice_actividades()
+    if not indice.actividades:
         print("\n⚠ No hay actividades registradas")
-        return
+        return None
+    resultado = indice.pagina(pagina, tamano or listados.TAMANO_PAGINA, tipo, desde, hasta)
     
     print("\n" + "="*70)
     print("  LISTA DE ACTIVIDADES DE BIENESTAR")
+    filtros = [f"tipo {tipo}" if tipo else "", f"desde {desde}" if desde else "",
+               f"hasta {hasta}" if hasta else ""]
+    if any(filtros):
+        print("  Filtro: " + ", ".join(f for f in filtros if f))
     print("="*70)
-    for act in actividades:
+    for act in resultado.elementos:
         print(f"{act}")
         if act.descripcion:
             print(f"    → {act.descripcion}")
     print("="*70)
-    print(f"Total de actividades: {len(actividades)}")
+    print(resultado.pie())
+    print(f"Total de actividades: {len(indice.actividades)}")
+    return resultado
+
+
+def _pedir_filtros_actividades():
+    indice = listados.indice_actividades()
+    print("\nTipos: " + ", ".join(indice.tipos()))
+    tipo = input("Tipo (Enter = todos): ").strip()
+    while True:
+        try:
+            desde = listados.fecha_opcional(input("Desde (YYYY-MM-DD, Enter = sin límite): "))
+            hasta = listados.fecha_opcional(input("Hasta (YYYY-MM-DD, Enter = sin límite): "))
+            break
+        except ValueError:
+            print("✗ Fecha inválida")
+    return {'tipo': tipo or None, 'desde': desde, 'hasta': hasta}
+
+
+def buscar_actividades(texto, limite=None):
+    """
+    Muestra las actividades cuyo nombre o descripción se parece a lo escrito
+
+    No distingue mayúsculas ni acentos y tolera errores de tipeo.
+
+    Args:
+        texto (str): Una o más palabras (completas o no)
+        limite (int): Resultados máximos (por defecto listados.RESULTADOS_BUSQUEDA)
+
+    Returns:
+        list: Actividades encontradas, las más parecidas primero
+    """
+    encontradas = listados.indice_actividades().buscar(texto, limite or listados.RESULTADOS_BUSQUEDA)
+    if not encontradas:
+        print(f"Sin actividades que coincidan con '{texto}'")
+    for act in encontradas:
+        print(f"  {act}")
+    return encontradas
+
+
+def explorar_actividades():
+    """Recorre el listado de actividades por páginas, con filtros y búsqueda"""
+    listados.navegar(lambda numero, filtros: listar_actividades(numero, **filtros),
+                     _pedir_filtros_actividades, buscar_actividades)
 
 
 def obtener_actividad_por_id(id_actividad):
@@ -153,11 +303,12 @@ def obtener_actividad_por_id(id_actividad):
     Returns:
         Actividad: Objeto actividad encontrado o None
     """
-    actividades = cargar_actividades()
-    for act in actividades:
-        if act.id_actividad == id_actividad:
-            return act
-    return None
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.obtener_actividad_por_id(id_actividad)
+    
+    # El índice compartido se reusa mientras los datos no cambien
+    return listados.indice_actividades().obtener(id_actividad)
 
 
 def validar_id_unico(id_actividad):
@@ -170,6 +321,10 @@ def validar_id_unico(id_actividad):
     Returns:
         bool: True si el ID es único, False si ya existe
     """
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.obtener_actividad_por_id(id_actividad) is None
+    
     actividades = cargar_actividades()
     for act in actividades:
         if act.id_actividad == id_actividad:
@@ -255,27 +410,26 @@ def obtener_actividades_por_fecha(fecha_inicio, fecha_fin=None):
     Obtiene actividades dentro de un rango de fechas
     
     Args:
-        fecha_inicio (str): Fecha inicial en formato YYYY-MM-DD
-        fecha_fin (str): Fecha final en formato YYYY-MM-DD (opcional)
+        fecha_inicio (str | date): Fecha inicial en formato YYYY-MM-DD
+        fecha_fin (str | date): Fecha final en formato YYYY-MM-DD (opcional)
         
     Returns:
         list: Lista de actividades en el rango
     """
-    actividades = cargar_actividades()
-    resultado = []
-    
     try:
-        fecha_ini = datetime.strptime(fecha_inicio, '%Y-%m-%d')
-        fecha_f = datetime.strptime(fecha_fin, '%Y-%m-%d') if fecha_fin else fecha_ini
-        
-        for act in actividades:
-            fecha_act = datetime.strptime(act.fecha, '%Y-%m-%d')
-            if fecha_ini <= fecha_act <= fecha_f:
-                resultado.append(act)
+        fecha_ini = parsear_fecha(fecha_inicio)
+        fecha_f = parsear_fecha(fecha_fin) if fecha_fin else fecha_ini
     except ValueError:
         print("✗ Error en el formato de fechas")
+        return []
     
-    return resultado
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.obtener_actividades_por_fecha(fecha_ini, fecha_f)
+    
+    # Las fechas de las actividades ya vienen convertidas desde la carga
+    actividades = cargar_actividades()
+    return [act for act in actividades if fecha_ini <= act.fecha <= fecha_f]
 
 
 def obtener_actividades_por_tipo(tipo):
@@ -288,6 +442,10 @@ def obtener_actividades_por_tipo(tipo):
     Returns:
         list: Lista de actividades del tipo especificado
     """
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.obtener_actividades_por_tipo(tipo)
+    
     actividades = cargar_actividades()
     return [act for act in actividades if act.tipo.lower() == tipo.lower()]
 
@@ -0,0 +1,457 @@
+"""
+Módulo de almacenamiento: backends intercambiables para los datos
+
+- BackendTexto: los archivos con formato id|campo|... de src/data (por defecto)
+- BackendSQLite: base de datos sqlite3 con índices, transacciones y modo WAL
+
+Mientras no se configure un backend, cargar_*, agregar_* y obtener_*
+trabajan directamente sobre los archivos de texto. Con un backend activo
+delegan en él y las búsquedas y agregados se resuelven en SQL.
+"""
+
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+from . import actividad, empleado, registro
+
+_backend = None
+
+
+def obtener_backend():
+    """
+    Devuelve el backend configurado
+
+    Returns:
+        BackendAlmacenamiento: Backend activo o None si se usan los archivos de texto
+    """
+    return _backend
+
+
+def configurar_backend(backend):
+    """
+    Activa un backend para todo el sistema
+
+    Args:
+        backend (BackendAlmacenamiento): Backend a usar (None vuelve a los archivos de texto)
+    """
+    global _backend
+    _backend = backend
+
+
+def configurar_desde_entorno(variable='WORK_COMFORT_BACKEND'):
+    """
+    Configura el backend según una variable de entorno
+
+    Valores aceptados: 'texto' (por defecto) o 'sqlite:<ruta.db>'.
+
+    Args:
+        variable (str): Nombre de la variable de entorno
+
+    Returns:
+        BackendAlmacenamiento: Backend configurado o None
+    """
+    valor = os.environ.get(variable, 'texto')
+    if valor.startswith('sqlite:'):
+        configurar_backend(crear_backend(valor))
+    return _backend
+
+
+def crear_backend(especificacion):
+    """
+    Crea un backend a partir de una especificación 'tipo:ruta'
+
+    Args:
+        especificacion (str): 'texto[:carpeta]' o 'sqlite[:ruta.db]'
+
+    Returns:
+        BackendAlmacenamiento: Backend creado
+
+    Raises:
+        ValueError: Si el tipo de backend no existe
+    """
+    tipo, _, ruta = especificacion.partition(':')
+    if tipo == 'texto':
+        return BackendTexto(ruta or 'src/data')
+    if tipo == 'sqlite':
+        return BackendSQLite(ruta or 'src/data/work_comfort.db')
+    raise ValueError(f"Backend desconocido: {especificacion}")
+
+
+class BackendAlmacenamiento(ABC):
+    """Interfaz común de los backends de almacenamiento"""
+
+    @abstractmethod
+    def cargar_empleados(self):
+        """Lista de empleados en orden de alta"""
+
+    @abstractmethod
+    def cargar_actividades(self):
+        """Lista de actividades en orden de alta"""
+
+    @abstractmethod
+    def cargar_registros(self):
+        """Lista de registros de participación en orden de escritura"""
+
+    @abstractmethod
+    def agregar_empleado(self, emp):
+        """Agrega un empleado"""
+
+    @abstractmethod
+    def agregar_actividad(self, act):
+        """Agrega una actividad"""
+
+    @abstractmethod
+    def guardar_registro(self, reg):
+        """Inserta un registro o reemplaza el del mismo empleado y actividad"""
+
+    def guardar_registros(self, registros):
+        """Como guardar_registro para varios registros, en una sola escritura"""
+        for reg in registros:
+            self.guardar_registro(reg)
+
+    @abstractmethod
+    def importar(self, empleados, actividades, registros):
+        """Agrega en bloque los datos de otro backend"""
+
+    # Recorridos sin armar la lista completa (por defecto sobre cargar_*)
+
+    def iterar_empleados(self):
+        return iter(self.cargar_empleados())
+
+    def iterar_actividades(self):
+        return iter(self.cargar_actividades())
+
+    def iterar_registros(self):
+        return iter(self.cargar_registros())
+
+    # Las operaciones siguientes tienen una versión genérica sobre las listas
+    # cargadas; los backends con índices las reemplazan por consultas directas.
+
+    def obtener_empleado_por_id(self, id_empleado):
+        return next((e for e in self.cargar_empleados() if e.id_empleado == id_empleado), None)
+
+    def obtener_actividad_por_id(self, id_actividad):
+        return next((a for a in self.cargar_actividades() if a.id_actividad == id_actividad), None)
+
+    def obtener_actividades_por_fecha(self, fecha_inicio, fecha_fin):
+        return [a for a in self.cargar_actividades() if fecha_inicio <= a.fecha <= fecha_fin]
+
+    def obtener_actividades_por_tipo(self, tipo):
+        return [a for a in self.cargar_actividades() if a.tipo.lower() == tipo.lower()]
+
+    def existe_registro(self, empleado_id, actividad_id):
+        return any(r.empleado_id == empleado_id and r.actividad_id == actividad_id
+                   for r in self.cargar_registros())
+
+    def obtener_registro(self, empleado_id, actividad_id):
+        return next((r for r in self.cargar_registros()
+                     if r.empleado_id == empleado_id and r.actividad_id == actividad_id), None)
+
+    def obtener_registros_actividad(self, actividad_id):
+        return [r for r in self.cargar_registros() if r.actividad_id == actividad_id]
+
+    def obtener_participantes_actividad(self, actividad_id):
+        return [r.empleado_id for r in self.cargar_registros()
+                if r.actividad_id == actividad_id and r.asistio]
+
+    def obtener_actividades_empleado(self, empleado_id):
+        return [r.actividad_id for r in self.cargar_registros()
+                if r.empleado_id == empleado_id and r.asistio]
+
+    def contar_participacion(self, actividad_id=None):
+        """
+        Agregados básicos de participación
+
+        Args:
+            actividad_id (int): Limitar a una actividad (None para todas)
+
+        Returns:
+            tuple: (total_registros, asistencias, {calificacion: cantidad})
+        """
+        total = asistencias = 0
+        calificaciones = {}
+        for r in self.cargar_registros():
+            if actividad_id is not None and r.actividad_id != actividad_id:
+                continue
+            total += 1
+            if r.asistio:
+                asistencias += 1
+                if r.calificacion > 0:
+                    calificaciones[r.calificacion] = calificaciones.get(r.calificacion, 0) + 1
+        return total, asistencias, calificaciones
+
+
+class BackendTexto(BackendAlmacenamiento):
+    """Archivos de texto delimitados por '|' (formato original de src/data)"""
+
+    def __init__(self, carpeta='src/data'):
+        self.carpeta = carpeta
+        self.rutas = {
+            'empleados': os.path.join(carpeta, 'empleados.txt'),
+            'actividades': os.path.join(carpeta, 'actividades.txt'),
+            'participacion': os.path.join(carpeta, 'participacion.txt'),
+        }
+
+    def cargar_empleados(self):
+        return empleado.leer_empleados_texto(self.rutas['empleados'])
+
+    def cargar_actividades(self):
+        return actividad.leer_actividades_texto(self.rutas['actividades'])
+
+    def cargar_registros(self):
+        return registro.leer_registros_texto(self.rutas['participacion'])
+
+    def _anexar(self, ruta, objetos):
+        os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+        with open(ruta, 'a', encoding='utf-8') as f:
+            f.writelines(obj.to_string() + '\n' for obj in objetos)
+
+    def agregar_empleado(self, emp):
+        self._anexar(self.rutas['empleados'], [emp])
+
+    def agregar_actividad(self, act):
+        self._anexar(self.rutas['actividades'], [act])
+
+    def guardar_registro(self, reg):
+        # Un reemplazo reescribe el archivo con temporal + os.replace (ver guardar_registros)
+        self.guardar_registros([reg])
+
+    def guardar_registros(self, registros):
+        # Un solo recorrido del archivo: se reescribe una vez si hay reemplazos
+        claves = {(r.empleado_id, r.actividad_id) for r in registros}
+        existentes = self.cargar_registros()
+        restantes = [r for r in existentes if (r.empleado_id, r.actividad_id) not in claves]
+        if len(restantes) != len(existentes):
+            # Archivo temporal + os.replace: o quedan todos los cambios o ninguno
+            temporal = self.rutas['participacion'] + '.tmp'
+            with open(temporal, 'w', encoding='utf-8') as f:
+                f.writelines(r.to_string() + '\n' for r in restantes + list(registros))
+            os.replace(temporal, self.rutas['participacion'])
+        else:
+            self._anexar(self.rutas['participacion'], registros)
+
+    def importar(self, empleados, actividades, registros):
+        self._anexar(self.rutas['empleados'], empleados)
+        self._anexar(self.rutas['actividades'], actividades)
+        self._anexar(self.rutas['participacion'], registros)
+
+
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS empleados (
+    id INTEGER NOT NULL UNIQUE,
+    nombre TEXT NOT NULL,
+    area TEXT NOT NULL,
+    cargo TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_empleados_area ON empleados(area);
+
+CREATE TABLE IF NOT EXISTS actividades (
+    id INTEGER NOT NULL UNIQUE,
+    nombre TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    descripcion TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_actividades_fecha ON actividades(fecha);
+CREATE INDEX IF NOT EXISTS idx_actividades_tipo ON actividades(tipo COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS participacion (
+    empleado_id INTEGER NOT NULL,
+    actividad_id INTEGER NOT NULL,
+    asistio INTEGER NOT NULL,
+    calificacion INTEGER NOT NULL,
+    UNIQUE (empleado_id, actividad_id)
+);
+CREATE INDEX IF NOT EXISTS idx_participacion_actividad ON participacion(actividad_id);
+"""
+
+
+class BackendSQLite(BackendAlmacenamiento):
+    """
+    Base de datos sqlite3 en modo WAL
+
+    Las tablas conservan el orden de inserción (rowid) para que las listas
+    cargadas salgan en el mismo orden que con los archivos de texto. Cada
+    hilo usa su propia conexión; WAL permite lectores concurrentes con un
+    escritor.
+    """
+
+    def __init__(self, ruta='src/data/work_comfort.db'):
+        self.ruta = ruta
+        self._local = threading.local()
+        if os.path.dirname(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with self.conexion() as con:
+            con.executescript(ESQUEMA_SQLITE)
+
+    def conexion(self):
+        """
+        Conexión del hilo actual (se crea la primera vez)
+
+        Returns:
+            sqlite3.Connection: Conexión lista para usar
+        """
+        con = getattr(self._local, 'conexion', None)
+        if con is None:
+            con = sqlite3.connect(self.ruta)
+            con.execute('PRAGMA journal_mode=WAL')
+            con.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexion = con
+        return con
+
+    def cerrar(self):
+        """Cierra la conexión del hilo actual"""
+        con = getattr(self._local, 'conexion', None)
+        if con is not None:
+            con.close()
+            self._local.conexion = None
+
+    # --- Conversión fila <-> objeto ---
+
+    @staticmethod
+    def _empleado(fila):
+        return empleado.Empleado(*fila)
+
+    @staticmethod
+    def _actividad(fila):
+        return actividad.Actividad(*fila)
+
+    @staticmethod
+    def _registro(fila):
+        return registro.Registro(fila[0], fila[1], bool(fila[2]), fila[3])
+
+    # --- Lectura completa ---
+
+    def iterar_empleados(self):
+        filas = self.conexion().execute(
+            'SELECT id, nombre, area, cargo FROM empleados ORDER BY rowid')
+        return map(self._empleado, filas)
+
+    def iterar_actividades(self):
+        filas = self.conexion().execute(
+            'SELECT id, nombre, fecha, tipo, descripcion FROM actividades ORDER BY rowid')
+        return map(self._actividad, filas)
+
+    def iterar_registros(self):
+        filas = self.conexion().execute(
+            'SELECT empleado_id, actividad_id, asistio, calificacion FROM participacion ORDER BY rowid')
+        return map(self._registro, filas)
+
+    def cargar_empleados(self):
+        return list(self.iterar_empleados())
+
+    def cargar_actividades(self):
+        return list(self.iterar_actividades())
+
+    def cargar_registros(self):
+        return list(self.iterar_registros())
+
+    # --- Escritura ---
+
+    def agregar_empleado(self, emp):
+        with self.conexion() as con:
+            con.execute('INSERT INTO empleados (id, nombre, area, cargo) VALUES (?, ?, ?, ?)',
+                        (emp.id_empleado, emp.nombre, emp.area, emp.cargo))
+
+    def agregar_actividad(self, act):
+        with self.conexion() as con:
+            con.execute('INSERT INTO actividades (id, nombre, fecha, tipo, descripcion) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        (act.id_actividad, act.nombre, act.fecha.isoformat(), act.tipo, act.descripcion))
+
+    def guardar_registro(self, reg):
+        # REPLACE borra la fila anterior y la inserta al final, igual que el backend de texto
+        with self.conexion() as con:
+            con.execute('INSERT OR REPLACE INTO participacion '
+                        '(empleado_id, actividad_id, asistio, calificacion) VALUES (?, ?, ?, ?)',
+                        (reg.empleado_id, reg.actividad_id, int(reg.asistio), reg.calificacion))
+
+    def guardar_registros(self, registros):
+        # Una sola transacción: se guardan todos o ninguno
+        with self.conexion() as con:
+            con.executemany('INSERT OR REPLACE INTO participacion '
+                            '(empleado_id, actividad_id, asistio, calificacion) VALUES (?, ?, ?, ?)',
+                            ((r.empleado_id, r.actividad_id, int(r.asistio), r.calificacion)
+                             for r in registros))
+
+    def importar(self, empleados, actividades, registros):
+        # Una sola transacción; ante ids repetidos gana la última fila
+        with self.conexion() as con:
+            con.executemany('INSERT OR REPLACE INTO empleados (id, nombre, area, cargo) VALUES (?, ?, ?, ?)',
+                            ((e.id_empleado, e.nombre, e.area, e.cargo) for e in empleados))
+            con.executemany('INSERT OR REPLACE INTO actividades (id, nombre, fecha, tipo, descripcion) '
+                            'VALUES (?, ?, ?, ?, ?)',
+                            ((a.id_actividad, a.nombre, a.fecha.isoformat(), a.tipo, a.descripcion)
+                             for a in actividades))
+            con.executemany('INSERT OR REPLACE INTO participacion '
+                            '(empleado_id, actividad_id, asistio, calificacion) VALUES (?, ?, ?, ?)',
+                            ((r.empleado_id, r.actividad_id, int(r.asistio), r.calificacion)
+                             for r in registros))
+
+    # --- Consultas con índice ---
+
+    def obtener_empleado_por_id(self, id_empleado):
+        fila = self.conexion().execute(
+            'SELECT id, nombre, area, cargo FROM empleados WHERE id = ?', (id_empleado,)).fetchone()
+        return self._empleado(fila) if fila else None
+
+    def obtener_actividad_por_id(self, id_actividad):
+        fila = self.conexion().execute(
+            'SELECT id, nombre, fecha, tipo, descripcion FROM actividades WHERE id = ?',
+            (id_actividad,)).fetchone()
+        return self._actividad(fila) if fila else None
+
+    def obtener_actividades_por_fecha(self, fecha_inicio, fecha_fin):
+        filas = self.conexion().execute(
+            'SELECT id, nombre, fecha, tipo, descripcion FROM actividades '
+            'WHERE fecha BETWEEN ? AND ? ORDER BY rowid',
+            (fecha_inicio.isoformat(), fecha_fin.isoformat()))
+        return [self._actividad(f) for f in filas]
+
+    def obtener_actividades_por_tipo(self, tipo):
+        filas = self.conexion().execute(
+            'SELECT id, nombre, fecha, tipo, descripcion FROM actividades '
+            'WHERE tipo = ? COLLATE NOCASE ORDER BY rowid', (tipo,))
+        return [self._actividad(f) for f in filas]
+
+    def existe_registro(self, empleado_id, actividad_id):
+        fila = self.conexion().execute(
+            'SELECT 1 FROM participacion WHERE empleado_id = ? AND actividad_id = ?',
+            (empleado_id, actividad_id)).fetchone()
+        return fila is not None
+
+    def obtener_registro(self, empleado_id, actividad_id):
+        fila = self.conexion().execute(
+            'SELECT empleado_id, actividad_id, asistio, calificacion FROM participacion '
+            'WHERE empleado_id = ? AND actividad_id = ?', (empleado_id, actividad_id)).fetchone()
+        return self._registro(fila) if fila else None
+
+    def obtener_registros_actividad(self, actividad_id):
+        filas = self.conexion().execute(
+            'SELECT empleado_id, actividad_id, asistio, calificacion FROM participacion '
+            'WHERE actividad_id = ? ORDER BY rowid', (actividad_id,))
+        return [self._registro(f) for f in filas]
+
+    def obtener_participantes_actividad(self, actividad_id):
+        filas = self.conexion().execute(
+            'SELECT empleado_id FROM participacion WHERE actividad_id = ? AND asistio ORDER BY rowid',
+            (actividad_id,))
+        return [f[0] for f in filas]
+
+    def obtener_actividades_empleado(self, empleado_id):
+        filas = self.conexion().execute(
+            'SELECT actividad_id FROM participacion WHERE empleado_id = ? AND asistio ORDER BY rowid',
+            (empleado_id,))
+        return [f[0] for f in filas]
+
+    def contar_participacion(self, actividad_id=None):
+        filtro, parametros = ('WHERE actividad_id = ?', (actividad_id,)) if actividad_id is not None else ('', ())
+        filas = self.conexion().execute(
+            f'SELECT asistio, calificacion, COUNT(*) FROM participacion {filtro} '
+            f'GROUP BY asistio, calificacion', parametros).fetchall()
+        total = sum(n for _, _, n in filas)
+        asistencias = sum(n for asistio, _, n in filas if asistio)
+        calificaciones = {c: n for asistio, c, n in filas if asistio and c > 0}
+        return total, asistencias, calificaciones
@@ -0,0 +1,302 @@
+"""
+Módulo cache_reportes: reutiliza los CSV ya generados si los datos no cambiaron
+
+Cada reporte se identifica por su nombre, sus parámetros y la huella de
+los archivos de datos (tamaño y hash del contenido; el hash solo se
+recalcula cuando cambian el tamaño o la fecha de modificación). Si la
+huella coincide con una generación anterior, el CSV guardado se enlaza
+(hard link) en la ruta del reporte en lugar de volver a calcularlo.
+
+Las copias viven en src/data/reportes/.cache con un índice JSON; cuando
+ocupan más que el presupuesto se borran las usadas hace más tiempo.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from . import almacenamiento, diagnostico, invitacion
+
+CARPETA_CACHE = 'src/data/reportes/.cache'
+CARPETA_DATOS = 'src/data'
+PRESUPUESTO_BYTES = 256 * 1024 * 1024
+TAMANO_BLOQUE = 1024 * 1024
+
+# Con True se regeneran siempre los reportes (opción --force de main.py)
+_forzar = False
+
+
+def configurar(forzar=False):
+    """
+    Activa o desactiva la regeneración forzada
+
+    Args:
+        forzar (bool): True para ignorar las copias guardadas
+    """
+    global _forzar
+    _forzar = forzar
+
+
+def archivos_de_datos(carpeta=CARPETA_DATOS):
+    """
+    Archivos de los que dependen los reportes según el backend activo
+
+    Args:
+        carpeta (str): Carpeta de los archivos de texto
+
+    Returns:
+        list: Rutas de los archivos de datos
+    """
+    backend = almacenamiento.obtener_backend()
+    if isinstance(backend, almacenamiento.BackendSQLite):
+        return [backend.ruta, backend.ruta + '-wal', invitacion.ruta_invitaciones()]
+    return [os.path.join(carpeta, nombre)
+            for nombre in ('empleados.txt', 'actividades.txt', 'participacion.txt', 'invitaciones.txt')]
+
+
+def _hash_archivo(ruta):
+    """SHA-1 del contenido, leído por bloques"""
+    h = hashlib.sha1()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _quitar(ruta):
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+
+def _enlazar(origen, destino):
+    """Hard link de origen en destino (copia si el sistema no lo permite)"""
+    _quitar(destino)
+    try:
+        os.link(origen, destino)
+    except OSError:
+        shutil.copyfile(origen, destino)
+
+
+def _desvincular(ruta):
+    """
+    Si el CSV es un hard link a una copia, lo reemplaza por un archivo propio
+
+    Los reportes se escriben abriendo la ruta en modo 'w', lo que
+    sobrescribiría también la copia guardada.
+    """
+    try:
+        if os.stat(ruta).st_nlink < 2:
+            return
+    except OSError:
+        return
+    temporal = ruta + '.tmp'
+    shutil.copyfile(ruta, temporal)
+    os.replace(temporal, ruta)
+
+
+class CacheReportes:
+    """Copias de reportes indexadas por huella de los datos"""
+
+    def __init__(self, carpeta=CARPETA_CACHE, presupuesto=PRESUPUESTO_BYTES):
+        """
+        Args:
+            carpeta (str): Carpeta donde se guardan las copias y el índice
+            presupuesto (int): Bytes máximos que pueden ocupar las copias
+        """
+        self.carpeta = carpeta
+        self.presupuesto = presupuesto
+        self.ruta_indice = os.path.join(carpeta, 'indice.json')
+        self.indice = self._cargar_indice()
+
+    def _cargar_indice(self):
+        try:
+            with open(self.ruta_indice, encoding='utf-8') as f:
+                indice = json.load(f)
+            if isinstance(indice.get('reportes'), dict) and isinstance(indice.get('archivos'), dict):
+                return indice
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {'reportes': {}, 'archivos': {}}
+
+    def _guardar_indice(self):
+        os.makedirs(self.carpeta, exist_ok=True)
+        temporal = self.ruta_indice + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.indice, f)
+        os.replace(temporal, self.ruta_indice)
+
+    def huella_datos(self, rutas):
+        """
+        Huella del contenido de los archivos de datos
+
+        El hash de cada archivo se recuerda junto a su tamaño y fecha de
+        modificación: mientras no cambien no se vuelve a leer el archivo.
+
+        Args:
+            rutas (list): Archivos de datos
+
+        Returns:
+            list: [ruta, tamaño, hash] por archivo (None si no existe)
+        """
+        huella = []
+        for ruta in rutas:
+            try:
+                st = os.stat(ruta)
+            except OSError:
+                huella.append([ruta, None, None])
+                continue
+            memoria = self.indice['archivos'].get(ruta)
+            if memoria is not None and memoria[:2] == [st.st_size, st.st_mtime_ns]:
+                contenido = memoria[2]
+            else:
+                contenido = _hash_archivo(ruta)
+                self.indice['archivos'][ruta] = [st.st_size, st.st_mtime_ns, contenido]
+            huella.append([ruta, st.st_size, contenido])
+        return huella
+
+    def clave(self, nombre, parametros, rutas):
+        """
+        Clave de un reporte: nombre, parámetros y huella de los datos
+
+        Args:
+            nombre (str): Nombre del reporte
+            parametros (list): Parámetros que cambian el resultado (serializables en JSON)
+            rutas (list): Archivos de datos
+
+        Returns:
+            str: Hash hexadecimal
+        """
+        texto = json.dumps([nombre, list(parametros), self.huella_datos(rutas)], default=str)
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+    def _ruta_copia(self, clave):
+        return os.path.join(self.carpeta, clave + '.csv')
+
+    def _copia_intacta(self, clave, entrada):
+        """La copia existe y nadie la modificó (un hard link comparte el contenido)"""
+        try:
+            st = os.stat(self._ruta_copia(clave))
+        except OSError:
+            return False
+        return [st.st_size, st.st_mtime_ns] == [entrada['bytes'], entrada['mtime_ns']]
+
+    def reutilizar(self, clave, archivo):
+        """
+        Deja en `archivo` la copia guardada para la clave, si existe
+
+        Args:
+            clave (str): Clave del reporte
+            archivo (str): Ruta donde debe quedar el CSV
+
+        Returns:
+            bool: True si se reutilizó una copia
+        """
+        entrada = self.indice['reportes'].get(clave)
+        if entrada is None:
+            return False
+        copia = self._ruta_copia(clave)
+        if not self._copia_intacta(clave, entrada):
+            self._descartar(clave)
+            return False
+        if not (os.path.exists(archivo) and os.path.samefile(copia, archivo)):
+            os.makedirs(os.path.dirname(archivo) or '.', exist_ok=True)
+            _enlazar(copia, archivo)
+        entrada['ultimo_uso'] = time.time()
+        return True
+
+    def guardar(self, clave, nombre, archivo):
+        """
+        Guarda una copia del CSV recién generado y aplica el presupuesto
+
+        Args:
+            clave (str): Clave del reporte
+            nombre (str): Nombre del reporte (informativo)
+            archivo (str): CSV generado
+        """
+        os.makedirs(self.carpeta, exist_ok=True)
+        copia = self._ruta_copia(clave)
+        _enlazar(archivo, copia)
+        st = os.stat(copia)
+        self.indice['reportes'][clave] = {
+            'nombre': nombre, 'bytes': st.st_size, 'mtime_ns': st.st_mtime_ns,
+            'ultimo_uso': time.time(),
+        }
+        self._liberar(conservar=clave)
+
+    def _descartar(self, clave):
+        self.indice['reportes'].pop(clave, None)
+        _quitar(self._ruta_copia(clave))
+
+    def _liberar(self, conservar=None):
+        """Borra las copias menos usadas hasta entrar en el presupuesto"""
+        reportes = self.indice['reportes']
+        ocupado = sum(entrada['bytes'] for entrada in reportes.values())
+        for clave in sorted(reportes, key=lambda c: reportes[c]['ultimo_uso']):
+            if ocupado <= self.presupuesto:
+                break
+            if clave == conservar:
+                continue
+            ocupado -= reportes[clave]['bytes']
+            self._descartar(clave)
+
+    def generar(self, nombre, archivo, generar, parametros=(), rutas=None, forzar=None):
+        """
+        Reutiliza el reporte si los datos no cambiaron; si no, lo genera y lo guarda
+
+        Args:
+            nombre (str): Nombre del reporte
+            archivo (str): Ruta del CSV
+            generar (callable): Función sin argumentos que escribe `archivo` y devuelve bool
+            parametros (list): Parámetros que cambian el resultado
+            rutas (list): Archivos de datos (por defecto, los del backend activo)
+            forzar (bool): Ignorar la copia guardada (por defecto, según configurar)
+
+        Returns:
+            bool: True si el reporte quedó disponible en `archivo`
+        """
+        forzar = _forzar if forzar is None else forzar
+        try:
+            clave = self.clave(nombre, parametros, rutas if rutas is not None else archivos_de_datos())
+            if not forzar and self.reutilizar(clave, archivo):
+                self._guardar_indice()
+                print(f"\n✓ Datos sin cambios, se reutiliza el reporte: {archivo}")
+                return True
+        except OSError as e:
+            diagnostico.logger.warning("Caché de reportes no disponible: %s", e)
+            return generar()
+
+        _desvincular(archivo)
+        exito = generar()
+        if exito and os.path.exists(archivo):
+            try:
+                self.guardar(clave, nombre, archivo)
+                self._guardar_indice()
+            except OSError as e:
+                diagnostico.logger.warning("No se pudo guardar %s en la caché: %s", archivo, e)
+        return exito
+
+
+_cache = None
+
+
+def generar(nombre, archivo, generar_reporte, parametros=()):
+    """
+    Atajo sobre la caché compartida (ver CacheReportes.generar)
+
+    Args:
+        nombre (str): Nombre del reporte
+        archivo (str): Ruta del CSV
+        generar_reporte (callable): Función sin argumentos que escribe `archivo` y devuelve bool
+        parametros (list): Parámetros que cambian el resultado
+
+    Returns:
+        bool: True si el reporte quedó disponible en `archivo`
+    """
+    global _cache
+    if _cache is None:
+        _cache = CacheReportes()
+    return _cache.generar(nombre, archivo, generar_reporte, parametros)
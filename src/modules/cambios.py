@@ -0,0 +1,441 @@
+"""
+Módulo cambios: eventos de cambio de datos (CDC) emitidos por las escrituras
+
+agregar_empleado, agregar_actividad y registrar_participacion (y el
+escritor por lotes de la ingesta) publican un evento por cada fila que
+escriben:
+
+    {"secuencia": 42, "momento": "2025-03-01T10:15:00", "entidad": "registro",
+     "operacion": "update", "clave": [7, 3],
+     "antes": {...}, "despues": {...}}
+
+La operación es 'insert', 'update' (la clave ya existía: sobrescritura
+de un registro o id repetido en los archivos de texto) o 'delete'. Los
+eventos van a uno o más sumideros:
+
+- SumideroJSONL: archivo JSON por línea que rota al superar un tamaño
+- SumideroCola: queue.Queue para consumidores dentro del mismo proceso
+
+El número de secuencia crece de a uno y continúa el último del archivo
+JSONL, también entre procesos (el archivo se bloquea al escribir en los
+sistemas con fcntl). Un consumidor guarda la última secuencia que
+procesó y retoma con leer_cambios(desde=...) en lugar de volver a
+comparar los archivos de datos.
+
+Sin sumideros configurados publicar no hace nada y las escrituras no
+buscan el estado anterior. Se activa con WORK_COMFORT_CAMBIOS=jsonl:<ruta>
+o con configurar().
+"""
+
+import contextlib
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+from . import diagnostico
+
+try:
+    import fcntl
+except ImportError:  # Windows: el bloqueo solo vale dentro del proceso
+    fcntl = None
+
+OPERACIONES = ('insert', 'update', 'delete')
+ARCHIVO_CAMBIOS = 'src/data/cambios/cambios.jsonl'
+MAX_BYTES = 10 * 1024 * 1024
+ARCHIVOS_ROTADOS = 5
+
+# Forma serializable y clave de cada entidad
+FORMATOS = {
+    'empleado': (
+        lambda e: {'id_empleado': e.id_empleado, 'nombre': e.nombre,
+                   'area': e.area, 'cargo': e.cargo},
+        lambda e: e.id_empleado,
+    ),
+    'actividad': (
+        lambda a: {'id_actividad': a.id_actividad, 'nombre': a.nombre,
+                   'fecha': a.fecha.isoformat(), 'tipo': a.tipo, 'descripcion': a.descripcion},
+        lambda a: a.id_actividad,
+    ),
+    'registro': (
+        lambda r: {'empleado_id': r.empleado_id, 'actividad_id': r.actividad_id,
+                   'asistio': r.asistio, 'calificacion': r.calificacion},
+        lambda r: [r.empleado_id, r.actividad_id],
+    ),
+}
+
+
+class Evento:
+    """Un cambio en una fila de empleados, actividades o participación"""
+
+    __slots__ = ('secuencia', 'momento', 'entidad', 'operacion', 'clave', 'antes', 'despues')
+
+    def __init__(self, entidad, operacion, clave, antes=None, despues=None, secuencia=None, momento=None):
+        """
+        Args:
+            entidad (str): 'empleado', 'actividad' o 'registro'
+            operacion (str): 'insert', 'update' o 'delete'
+            clave (int | list): Id del empleado o actividad, o [empleado_id, actividad_id]
+            antes (dict): Fila anterior (None en un insert)
+            despues (dict): Fila nueva (None en un delete)
+            secuencia (int): Número de secuencia (se asigna al publicar)
+            momento (str): Fecha y hora ISO (se asigna al publicar)
+        """
+        self.entidad = entidad
+        self.operacion = operacion
+        self.clave = clave
+        self.antes = antes
+        self.despues = despues
+        self.secuencia = secuencia
+        self.momento = momento
+
+    def to_dict(self):
+        """Evento como diccionario serializable en JSON"""
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, datos):
+        """Crea un evento a partir de to_dict() (o de una línea del JSONL)"""
+        return cls(datos['entidad'], datos['operacion'], datos['clave'], datos.get('antes'),
+                   datos.get('despues'), datos.get('secuencia'), datos.get('momento'))
+
+    def __repr__(self):
+        return f"Evento({self.secuencia}, {self.entidad} {self.operacion} {self.clave})"
+
+
+def _ultima_linea(ruta):
+    """Última línea completa de un archivo (b'' si no existe o está vacío)"""
+    try:
+        f = open(ruta, 'rb')
+    except FileNotFoundError:
+        return b''
+    with f:
+        fin = f.seek(0, os.SEEK_END)
+        bloque = 4096
+        datos = b''
+        posicion = fin
+        while posicion > 0:
+            posicion = max(0, posicion - bloque)
+            f.seek(posicion)
+            datos = f.read(fin - posicion)
+            lineas = datos.rstrip(b'\n').rsplit(b'\n', 1)
+            if len(lineas) == 2 or posicion == 0:
+                return lineas[-1]
+            bloque *= 2
+        return b''
+
+
+def _secuencia_de(linea):
+    try:
+        return json.loads(linea)['secuencia']
+    except (ValueError, KeyError, TypeError):
+        return 0
+
+
+class SumideroJSONL:
+    """
+    Archivo de eventos JSON por línea, con rotación por tamaño
+
+    Al superar max_bytes, cambios.jsonl pasa a cambios.jsonl.1, el .1 a
+    .2 y así hasta conservar `rotados` archivos viejos.
+    """
+
+    def __init__(self, ruta=ARCHIVO_CAMBIOS, max_bytes=MAX_BYTES, rotados=ARCHIVOS_ROTADOS):
+        """
+        Args:
+            ruta (str): Archivo activo de eventos
+            max_bytes (int): Tamaño a partir del cual se rota
+            rotados (int): Archivos rotados que se conservan
+        """
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self.rotados = rotados
+        # Tamaño y última secuencia tras la última escritura de este proceso:
+        # si el archivo sigue igual no hace falta releerlo
+        self._tamano = None
+        self._ultima = 0
+
+    def archivos(self):
+        """Archivos de eventos existentes, del más viejo al activo"""
+        rutas = [f"{self.ruta}.{i}" for i in range(self.rotados, 0, -1)] + [self.ruta]
+        return [ruta for ruta in rutas if os.path.exists(ruta)]
+
+    @contextlib.contextmanager
+    def bloqueo(self):
+        """Bloqueo exclusivo entre procesos mientras se asignan y escriben eventos"""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+        with open(self.ruta + '.lock', 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def ultima_secuencia(self):
+        """
+        Secuencia del último evento escrito (por cualquier proceso)
+
+        Returns:
+            int: Última secuencia o 0 si no hay eventos
+        """
+        try:
+            tamano = os.path.getsize(self.ruta)
+        except OSError:
+            tamano = None
+        if tamano is not None and tamano == self._tamano:
+            return self._ultima
+        for ruta in reversed(self.archivos()):
+            linea = _ultima_linea(ruta)
+            if linea:
+                return _secuencia_de(linea)
+        return 0
+
+    def _rotar(self):
+        for i in range(self.rotados - 1, 0, -1):
+            if os.path.exists(f"{self.ruta}.{i}"):
+                os.replace(f"{self.ruta}.{i}", f"{self.ruta}.{i + 1}")
+        if self.rotados:
+            os.replace(self.ruta, f"{self.ruta}.1")
+        else:
+            os.remove(self.ruta)
+
+    def enviar(self, eventos):
+        """
+        Agrega eventos al archivo (rota antes si ya superó el tamaño)
+
+        Args:
+            eventos (list): Eventos con secuencia asignada
+        """
+        os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+        if os.path.exists(self.ruta) and os.path.getsize(self.ruta) >= self.max_bytes:
+            self._rotar()
+        with open(self.ruta, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(e.to_dict(), ensure_ascii=False) + '\n' for e in eventos)
+            f.flush()
+            self._tamano = f.tell()
+        self._ultima = eventos[-1].secuencia
+
+    def leer_desde(self, secuencia=0):
+        """
+        Eventos posteriores a una secuencia, en orden
+
+        Los archivos rotados cuyo último evento es anterior se saltean sin leerlos.
+
+        Args:
+            secuencia (int): Última secuencia ya procesada (0 = todos)
+
+        Yields:
+            Evento: Eventos con secuencia > `secuencia`
+        """
+        primero = True
+        for ruta in self.archivos():
+            if ruta != self.ruta and _secuencia_de(_ultima_linea(ruta)) <= secuencia:
+                continue
+            with open(ruta, encoding='utf-8') as f:
+                for linea in f:
+                    if not linea.endswith('\n'):
+                        break
+                    try:
+                        evento = Evento.from_dict(json.loads(linea))
+                    except (ValueError, KeyError, TypeError):
+                        diagnostico.logger.warning("Evento inválido en %s: %r", ruta, linea[:80])
+                        continue
+                    if evento.secuencia <= secuencia:
+                        continue
+                    if primero and evento.secuencia > secuencia + 1:
+                        diagnostico.logger.warning(
+                            "Faltan eventos %d a %d (rotados y descartados)",
+                            secuencia + 1, evento.secuencia - 1)
+                    primero = False
+                    yield evento
+
+
+class SumideroCola:
+    """
+    Cola en memoria para consumidores del mismo proceso
+
+    Si la cola está llena el evento se descarta y se cuenta en
+    `descartados`; el consumidor puede recuperarlo del JSONL por secuencia.
+    """
+
+    def __init__(self, maximo=0):
+        """
+        Args:
+            maximo (int): Eventos en espera antes de descartar (0 = sin límite)
+        """
+        self.cola = queue.Queue(maximo)
+        self.descartados = 0
+
+    def bloqueo(self):
+        return contextlib.nullcontext()
+
+    def ultima_secuencia(self):
+        return 0
+
+    def enviar(self, eventos):
+        for evento in eventos:
+            try:
+                self.cola.put_nowait(evento)
+            except queue.Full:
+                self.descartados += 1
+                diagnostico.logger.warning("Cola de cambios llena: se descarta el evento %d",
+                                           evento.secuencia)
+
+    def drenar(self):
+        """
+        Saca todos los eventos en espera sin bloquear
+
+        Returns:
+            list: Eventos en orden de secuencia
+        """
+        eventos = []
+        while True:
+            try:
+                eventos.append(self.cola.get_nowait())
+            except queue.Empty:
+                return eventos
+
+
+_sumideros = []
+_secuencia = 0
+_lock = threading.Lock()
+
+
+def configurar(*sumideros):
+    """
+    Reemplaza los sumideros activos
+
+    Args:
+        *sumideros: SumideroJSONL, SumideroCola u objetos con enviar,
+            bloqueo y ultima_secuencia (ninguno desactiva los eventos)
+    """
+    global _sumideros
+    with _lock:
+        _sumideros = list(sumideros)
+
+
+def agregar_sumidero(sumidero):
+    """
+    Agrega un sumidero a los activos
+
+    Args:
+        sumidero: Sumidero a agregar
+
+    Returns:
+        El mismo sumidero
+    """
+    with _lock:
+        _sumideros.append(sumidero)
+    return sumidero
+
+
+def activo():
+    """True si hay algún sumidero configurado"""
+    return bool(_sumideros)
+
+
+def configurar_desde_entorno(variable='WORK_COMFORT_CAMBIOS'):
+    """
+    Activa un SumideroJSONL si la variable de entorno lo indica
+
+    Valores aceptados: 'jsonl' (archivo por defecto) o 'jsonl:<ruta>'.
+
+    Args:
+        variable (str): Nombre de la variable de entorno
+
+    Returns:
+        SumideroJSONL: Sumidero configurado o None
+    """
+    tipo, _, ruta = os.environ.get(variable, '').partition(':')
+    if tipo != 'jsonl':
+        return None
+    return agregar_sumidero(SumideroJSONL(ruta or ARCHIVO_CAMBIOS))
+
+
+def crear_evento(entidad, operacion, antes=None, despues=None):
+    """
+    Arma un evento a partir de los objetos anterior y nuevo
+
+    Args:
+        entidad (str): 'empleado', 'actividad' o 'registro'
+        operacion (str): 'insert', 'update' o 'delete'
+        antes: Objeto anterior (Empleado, Actividad o Registro) o None
+        despues: Objeto nuevo o None
+
+    Returns:
+        Evento: Evento sin secuencia
+
+    Raises:
+        ValueError: Si la entidad o la operación no existen
+    """
+    if entidad not in FORMATOS or operacion not in OPERACIONES:
+        raise ValueError(f"Cambio desconocido: {entidad} {operacion}")
+    como_dict, clave = FORMATOS[entidad]
+    return Evento(entidad, operacion, clave(despues if despues is not None else antes),
+                  como_dict(antes) if antes is not None else None,
+                  como_dict(despues) if despues is not None else None)
+
+
+def publicar_eventos(eventos):
+    """
+    Asigna secuencias consecutivas a los eventos y los envía a los sumideros
+
+    Un sumidero que falla se informa en el log sin interrumpir a los
+    demás: la fila ya quedó escrita.
+
+    Args:
+        eventos (list): Eventos sin secuencia
+
+    Returns:
+        list: Los mismos eventos, numerados (vacía si no hay sumideros)
+    """
+    global _secuencia
+    if not _sumideros or not eventos:
+        return []
+    momento = datetime.now().isoformat(timespec='seconds')
+    with _lock, contextlib.ExitStack() as pila:
+        for sumidero in _sumideros:
+            pila.enter_context(sumidero.bloqueo())
+        _secuencia = max([_secuencia] + [s.ultima_secuencia() for s in _sumideros])
+        for evento in eventos:
+            _secuencia += 1
+            evento.secuencia = _secuencia
+            evento.momento = momento
+        for sumidero in _sumideros:
+            try:
+                sumidero.enviar(eventos)
+            except Exception as e:
+                diagnostico.logger.error("No se pudieron enviar %d eventos a %r: %s",
+                                         len(eventos), sumidero, e)
+    return eventos
+
+
+def publicar(entidad, operacion, antes=None, despues=None):
+    """
+    Publica un cambio (ver crear_evento)
+
+    Returns:
+        Evento: Evento publicado o None si no hay sumideros
+    """
+    if not _sumideros:
+        return None
+    eventos = publicar_eventos([crear_evento(entidad, operacion, antes, despues)])
+    return eventos[0] if eventos else None
+
+
+def leer_cambios(desde=0, ruta=ARCHIVO_CAMBIOS):
+    """
+    Eventos de un archivo JSONL posteriores a una secuencia
+
+    Args:
+        desde (int): Última secuencia ya procesada
+        ruta (str): Archivo activo de eventos
+
+    Returns:
+        iterator: Eventos en orden de secuencia
+    """
+    return SumideroJSONL(ruta).leer_desde(desde)
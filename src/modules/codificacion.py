@@ -0,0 +1,106 @@
+"""
+Módulo codificacion: codificación por diccionario de áreas, cargos y tipos
+
+Las áreas, cargos y tipos de actividad se repiten miles de veces con muy
+pocos valores distintos. Cada etiqueta se guarda una sola vez en un
+diccionario y los objetos guardan solo su código entero; agrupar por
+código compara enteros en lugar de cadenas completas.
+
+Los códigos se asignan en orden de aparición y no cambian mientras el
+proceso está vivo; no se guardan en los archivos de datos (ahí sigue la
+etiqueta), así que pueden variar entre una ejecución y otra.
+"""
+
+import threading
+
+
+class Diccionario:
+    """Tabla código <-> etiqueta, solo de agregado"""
+
+    def __init__(self, nombre):
+        """
+        Args:
+            nombre (str): Nombre de lo que se codifica (para mensajes)
+        """
+        self.nombre = nombre
+        self.codigos = {}
+        self.etiquetas = []
+        self._lock = threading.Lock()
+
+    def codigo(self, etiqueta):
+        """
+        Código de una etiqueta; si es nueva se le asigna el siguiente
+
+        Args:
+            etiqueta (str): Texto a codificar
+
+        Returns:
+            int: Código de la etiqueta
+        """
+        codigo = self.codigos.get(etiqueta)
+        if codigo is None:
+            with self._lock:
+                codigo = self.codigos.get(etiqueta)
+                if codigo is None:
+                    codigo = len(self.etiquetas)
+                    self.etiquetas.append(etiqueta)
+                    self.codigos[etiqueta] = codigo
+        return codigo
+
+    def buscar(self, etiqueta):
+        """
+        Código de una etiqueta sin registrarla
+
+        Args:
+            etiqueta (str): Texto a buscar
+
+        Returns:
+            int: Código de la etiqueta o None si nunca apareció
+        """
+        return self.codigos.get(etiqueta)
+
+    def etiqueta(self, codigo):
+        """
+        Etiqueta de un código
+
+        Args:
+            codigo (int): Código asignado por este diccionario
+
+        Returns:
+            str: Etiqueta correspondiente
+
+        Raises:
+            KeyError: Si el código no existe
+        """
+        try:
+            return self.etiquetas[codigo]
+        except (IndexError, TypeError):
+            raise KeyError(f"Código de {self.nombre} inexistente: {codigo}") from None
+
+    def decodificar(self, por_codigo):
+        """
+        Cambia las claves de un diccionario {codigo: valor} por sus etiquetas
+
+        Args:
+            por_codigo (dict): Resultados agrupados por código
+
+        Returns:
+            dict: Mismos valores agrupados por etiqueta, en el mismo orden
+        """
+        etiquetas = self.etiquetas
+        return {etiquetas[codigo]: valor for codigo, valor in por_codigo.items()}
+
+    def __len__(self):
+        return len(self.etiquetas)
+
+    def __contains__(self, etiqueta):
+        return etiqueta in self.codigos
+
+    def __repr__(self):
+        return f"Diccionario({self.nombre!r}, {len(self.etiquetas)} etiquetas)"
+
+
+# Diccionarios compartidos por todo el proceso
+AREAS = Diccionario('área')
+CARGOS = Diccionario('cargo')
+TIPOS = Diccionario('tipo de actividad')
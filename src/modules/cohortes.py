@@ -0,0 +1,261 @@
+"""
+Módulo cohortes: preguntas de conjuntos sobre quién asistió a qué
+
+"Quiénes fueron al taller de estrés y a la jornada deportiva pero a
+ninguna pausa activa" obligaba a recorrer los registros una vez por
+actividad. El IndiceAsistencia guarda los asistentes de cada actividad
+como un MapaBits (modules/mapa_bits.py) sobre índices densos de empleado
+(la posición del id en la lista ordenada de ids conocidos) y responde
+cada pregunta con uniones, intersecciones y diferencias de mapas.
+
+El índice se arma en una pasada sobre la tabla de participación (con
+NumPy, ordenando las columnas y armando los bloques de bits con
+np.packbits) y se reutiliza mientras no cambien los datos, igual que los
+índices de listados.
+"""
+
+from . import (almacenamiento, invitacion, listados, registro, vectorizado)
+from .mapa_bits import BITS_BLOQUE, MASCARA_BLOQUE, MAXIMO_ARREGLO, TAMANO_BLOQUE, MapaBits
+
+# Resultados que se muestran en consola
+MUESTRA_CONSOLA = 20
+
+
+def _mapas_numpy(densos, actividades):
+    """actividad -> MapaBits a partir de columnas de NumPy (pares ya sin repetir y ordenados)"""
+    np = vectorizado.np
+    mapas = {}
+    if not len(densos):
+        return mapas
+    cortes = np.flatnonzero(np.diff(actividades)) + 1
+    inicios = np.concatenate(([0], cortes))
+    for actividad_id, grupo in zip(actividades[inicios].tolist(), np.split(densos, cortes)):
+        altos = grupo >> BITS_BLOQUE
+        cortes_bloque = np.flatnonzero(np.diff(altos)) + 1
+        bloques = {}
+        for clave, bajos in zip(altos[np.concatenate(([0], cortes_bloque))].tolist(),
+                                np.split(grupo & MASCARA_BLOQUE, cortes_bloque)):
+            if len(bajos) <= MAXIMO_ARREGLO:
+                bloques[clave] = bajos.tolist()
+            else:
+                marcas = np.zeros(TAMANO_BLOQUE, dtype=bool)
+                marcas[bajos] = True
+                bloques[clave] = int.from_bytes(np.packbits(marcas, bitorder='little').tobytes(), 'little')
+        mapas[actividad_id] = MapaBits.desde_bloques(bloques)
+    return mapas
+
+
+class IndiceAsistencia:
+    """Asistentes de cada actividad como mapas de bits sobre índices densos de empleado"""
+
+    def __init__(self, tabla, empleados=()):
+        """
+        Args:
+            tabla (TablaParticipacion): Registros de participación
+            empleados (iterable): Ids de empleado que forman parte aunque no tengan registros
+        """
+        np = vectorizado.np
+        if np is not None:
+            empleado_id = np.asarray(tabla.empleado_id, dtype=np.int64)
+            actividad_id = np.asarray(tabla.actividad_id, dtype=np.int64)
+            asistio = np.asarray(tabla.asistio, dtype=bool)
+            universo = np.union1d(empleado_id, np.fromiter(empleados, dtype=np.int64))
+            densos = np.searchsorted(universo, empleado_id[asistio])
+            actividades = actividad_id[asistio]
+            orden = np.lexsort((densos, actividades))
+            densos, actividades = densos[orden], actividades[orden]
+            if len(densos):
+                # Un empleado con dos registros de asistencia en la misma actividad cuenta una vez
+                distintos = np.ones(len(densos), dtype=bool)
+                distintos[1:] = (densos[1:] != densos[:-1]) | (actividades[1:] != actividades[:-1])
+                densos, actividades = densos[distintos], actividades[distintos]
+            self.ids = universo.tolist()
+            self.posicion = {id_empleado: p for p, id_empleado in enumerate(self.ids)}
+            self.por_actividad = _mapas_numpy(densos, actividades)
+        else:
+            self.ids = sorted(set(tabla.empleado_id).union(empleados))
+            self.posicion = {id_empleado: p for p, id_empleado in enumerate(self.ids)}
+            por_actividad = {}
+            for empleado_id, actividad_id, asistio in zip(tabla.empleado_id, tabla.actividad_id, tabla.asistio):
+                if asistio:
+                    por_actividad.setdefault(actividad_id, set()).add(self.posicion[empleado_id])
+            self.por_actividad = {actividad_id: MapaBits.desde_ordenados(sorted(densos))
+                                  for actividad_id, densos in por_actividad.items()}
+
+    def asistentes(self, actividad_id):
+        """
+        Asistentes de una actividad
+
+        Args:
+            actividad_id (int): ID de la actividad
+
+        Returns:
+            MapaBits: Índices densos de los asistentes (vacío si no hay)
+        """
+        return self.por_actividad.get(actividad_id) or MapaBits()
+
+    def todos(self):
+        """Mapa con todos los empleados conocidos"""
+        return MapaBits.rango(len(self.ids))
+
+    def mapa_de_ids(self, ids):
+        """
+        Mapa con los empleados de una lista de ids (los desconocidos se omiten)
+
+        Args:
+            ids (iterable): Ids de empleado
+
+        Returns:
+            MapaBits: Índices densos de esos empleados
+        """
+        posicion = self.posicion
+        return MapaBits(posicion[i] for i in ids if i in posicion)
+
+    def ids_de(self, mapa):
+        """
+        Ids de empleado de un mapa
+
+        Args:
+            mapa (MapaBits): Índices densos
+
+        Returns:
+            list: Ids de empleado en orden creciente
+        """
+        ids = self.ids
+        return [ids[p] for p in mapa]
+
+    def cohorte(self, todas=(), alguna=(), ninguna=()):
+        """
+        Empleados que asistieron a todas las de `todas`, al menos a una de
+        `alguna` y a ninguna de `ninguna`
+
+        Sin `todas` ni `alguna` se parte de todos los empleados conocidos.
+
+        Args:
+            todas (iterable): IDs de actividades a las que asistió a todas
+            alguna (iterable): IDs de actividades a las que asistió al menos a una
+            ninguna (iterable): IDs de actividades a las que no asistió
+
+        Returns:
+            MapaBits: Índices densos de la cohorte (ver ids_de)
+        """
+        todas, alguna, ninguna = list(todas), list(alguna), list(ninguna)
+        partes = []
+        if todas:
+            partes.append(MapaBits.interseccion_de(map(self.asistentes, todas)))
+        if alguna:
+            partes.append(MapaBits.union_de(map(self.asistentes, alguna)))
+        resultado = MapaBits.interseccion_de(partes) if partes else self.todos()
+        if ninguna and resultado:
+            resultado = resultado - MapaBits.union_de(map(self.asistentes, ninguna))
+        return resultado
+
+
+# ---------------------------------------------------------
+# ÍNDICE COMPARTIDO
+# ---------------------------------------------------------
+
+_guardado = None
+
+
+def _tabla_actual():
+    """Tabla de participación del backend activo"""
+    if almacenamiento.obtener_backend() is None:
+        # Columnas leídas del archivo y reutilizadas mientras no cambie
+        return vectorizado.tabla_de_archivo()
+    return vectorizado.TablaParticipacion.desde_registros(registro.cargar_registros())
+
+
+def indice_asistencia():
+    """
+    Índice de asistencia de los datos actuales (se vuelve a armar si cambiaron)
+
+    Returns:
+        IndiceAsistencia: Índice compartido
+    """
+    global _guardado
+    # Un alta de empleado agranda el universo aunque no cambie la participación
+    firma = (listados.firma_datos('participacion.txt'), listados.firma_datos('empleados.txt'))
+    guardado = _guardado
+    if None in firma or guardado is None or guardado[0] != firma:
+        empleados = listados.indice_empleados().empleados
+        indice = IndiceAsistencia(_tabla_actual(), (emp.id_empleado for emp in empleados))
+        guardado = _guardado = (firma, indice)
+    return guardado[1]
+
+
+def cohorte(todas=(), alguna=(), ninguna=()):
+    """
+    Ids de los empleados de una cohorte (ver IndiceAsistencia.cohorte)
+
+    Returns:
+        list: Ids de empleado en orden creciente
+    """
+    indice = indice_asistencia()
+    return indice.ids_de(indice.cohorte(todas, alguna, ninguna))
+
+
+# ---------------------------------------------------------
+# CONSOLA
+# ---------------------------------------------------------
+
+def actividades_de(texto):
+    """
+    Convierte '3,8,10-20' o el nombre de un tipo ('Pausa activa') en IDs de actividad
+
+    Args:
+        texto (str): Ids y rangos de actividad, o un tipo de actividad
+
+    Returns:
+        list: IDs de actividad
+
+    Raises:
+        ValueError: Si no son ids y no hay actividades de ese tipo
+    """
+    texto = texto.strip()
+    if not texto:
+        return []
+    indice = listados.indice_actividades()
+    try:
+        return invitacion.expandir_ids(texto, maximo=indice.mayor_id())
+    except ValueError:
+        # Sin letras no puede ser un tipo: el error de los ids es el que sirve
+        if not any(c.isalpha() for c in texto):
+            raise
+    posiciones = list(indice.filtrar(tipo=texto))
+    if not posiciones:
+        raise ValueError(f"'{texto}' no son ids ni un tipo de actividad ({', '.join(indice.tipos())})")
+    return [indice.actividades[p].id_actividad for p in posiciones]
+
+
+def consultar_cohorte_interactiva():
+    """Función interactiva para consultar quiénes asistieron a qué"""
+    print("\n" + "="*60)
+    print("  COHORTES DE ASISTENCIA")
+    print("="*60)
+    print("Actividades por ids (3,8,10-20) o por tipo (Pausa activa); Enter = ninguna")
+    try:
+        todas = actividades_de(input("Asistieron a todas estas: "))
+        alguna = actividades_de(input("Asistieron al menos a una de estas: "))
+        ninguna = actividades_de(input("No asistieron a ninguna de estas: "))
+    except ValueError as e:
+        print(f"✗ {e}")
+        return
+    except KeyboardInterrupt:
+        print("\n\n✗ Consulta cancelada por el usuario")
+        return
+    if not (todas or alguna or ninguna):
+        print("✗ Indique al menos una actividad")
+        return
+
+    indice = indice_asistencia()
+    ids = indice.ids_de(indice.cohorte(todas, alguna, ninguna))
+    print(f"\n✓ {len(ids)} empleados en la cohorte")
+    if ids:
+        directorio = listados.indice_empleados()
+        por_id = {emp.id_empleado: emp for emp in directorio.empleados}
+        for id_empleado in ids[:MUESTRA_CONSOLA]:
+            emp = por_id.get(id_empleado)
+            print(f"  {emp}" if emp is not None else f"  [{id_empleado}] (empleado inexistente)")
+        if len(ids) > MUESTRA_CONSOLA:
+            print(f"  ... y {len(ids) - MUESTRA_CONSOLA} más")
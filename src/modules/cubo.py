@@ -0,0 +1,350 @@
+"""
+Módulo cubo: tablas cruzadas de participación con dimensiones a elección
+
+Agrupa los registros por cualquier combinación de dimensiones del
+empleado (área, cargo, empleado) y de la actividad (tipo, actividad,
+día, semana, mes, trimestre) y calcula las medidas de los reportes
+(registros, asistencias, tasa, satisfacción, empleados activos) en una
+sola pasada.
+
+Cada lado se factoriza primero: los empleados (o actividades) con la
+misma combinación de claves reciben el mismo número de grupo, y cada
+registro cae en la celda grupo_empleado * grupos_actividad + grupo_actividad.
+Con NumPy las celdas se cuentan con np.bincount; sin NumPy, con un
+diccionario. Áreas, cargos y tipos se agrupan por código
+(modules/codificacion.py) y se traducen a texto al armar las filas.
+
+Un id repetido en la lista de empleados (o de actividades) cuenta una vez
+por objeto, como un JOIN: sus registros suman en el grupo de cada copia,
+igual que los reportes que recorrían objeto por objeto.
+"""
+
+from functools import partial
+from itertools import product
+
+from . import codificacion, series, vectorizado
+
+np = vectorizado.np
+
+
+def _periodo(granularidad, actividad):
+    return series.clave_periodo(actividad.fecha, granularidad)
+
+
+# Dimensión -> (lado, clave del objeto, traducción del código a texto, columna CSV)
+DIMENSIONES = {
+    'area': ('empleado', lambda e: e.codigo_area, codificacion.AREAS.etiqueta, 'Area'),
+    'cargo': ('empleado', lambda e: e.codigo_cargo, codificacion.CARGOS.etiqueta, 'Cargo'),
+    'empleado': ('empleado', lambda e: e.id_empleado, None, 'ID_Empleado'),
+    'tipo': ('actividad', lambda a: a.codigo_tipo, codificacion.TIPOS.etiqueta, 'Tipo'),
+    'actividad': ('actividad', lambda a: a.id_actividad, None, 'ID_Actividad'),
+}
+for _granularidad in series.GRANULARIDADES:
+    DIMENSIONES[_granularidad] = ('actividad', partial(_periodo, _granularidad), None,
+                                  _granularidad.capitalize())
+
+# Medida -> columna CSV
+MEDIDAS = {
+    'registros': 'Total_Registros',
+    'asistencias': 'Asistencias',
+    'tasa_participacion': 'Tasa_Participacion',
+    'satisfaccion_promedio': 'Satisfaccion_Promedio',
+    'calificados': 'Calificados',
+    'empleados': 'Total_Empleados',
+    'empleados_activos': 'Empleados_Activos',
+}
+MEDIDAS_POR_DEFECTO = ('registros', 'asistencias', 'tasa_participacion', 'satisfaccion_promedio')
+
+# Posiciones en cada celda: [registros, asistencias, suma, calificados, empleados, activos]
+_REGISTROS, _ASISTENCIAS, _SUMA, _CALIFICADOS, _EMPLEADOS, _ACTIVOS = range(6)
+
+
+class _Grupos:
+    """
+    Factorización de empleados o actividades según las dimensiones de su lado
+
+    capas[k] lleva cada id al grupo de su (k+1)-ésima aparición en la
+    lista: sin ids repetidos hay una sola capa.
+    """
+
+    def __init__(self, objetos, atributo_id, claves):
+        # Sin dimensiones de este lado todos caen en el grupo 0 y no se filtra
+        self.capas = [None]
+        self.claves = [()]
+        self.tamanos = [len(objetos)]
+        if not claves:
+            return
+
+        self.capas = [{}]
+        self.claves = []
+        self.tamanos = []
+        numero_de = {}
+        for objeto in objetos:
+            clave = tuple(f(objeto) for f in claves)
+            grupo = numero_de.get(clave)
+            if grupo is None:
+                grupo = numero_de[clave] = len(self.claves)
+                self.claves.append(clave)
+                self.tamanos.append(0)
+            self.tamanos[grupo] += 1
+            id_objeto = getattr(objeto, atributo_id)
+            for capa in self.capas:
+                if id_objeto not in capa:
+                    break
+            else:
+                capa = {}
+                self.capas.append(capa)
+            capa[id_objeto] = grupo
+
+    def __len__(self):
+        return len(self.claves)
+
+    def arreglo(self, ids, capa=0):
+        """Grupo de cada id de la columna en una capa (-1 si el id no está en ella)"""
+        indice = self.capas[capa]
+        if indice is None:
+            return np.zeros(len(ids), dtype=np.int64)
+        if not indice:
+            return np.full(len(ids), -1, dtype=np.int64)
+        conocidos = np.fromiter(indice.keys(), dtype=np.int64, count=len(indice))
+        grupos = np.fromiter(indice.values(), dtype=np.int64, count=len(indice))
+        minimo, maximo = int(conocidos.min()), int(conocidos.max())
+        if maximo - minimo < 4 * len(conocidos) + 1024:
+            # Ids casi consecutivos: tabla directa id -> grupo
+            directa = np.full(maximo - minimo + 1, -1, dtype=np.int64)
+            directa[conocidos - minimo] = grupos
+            posiciones = ids.astype(np.int64) - minimo
+            dentro = (posiciones >= 0) & (posiciones <= maximo - minimo)
+            return np.where(dentro, directa[np.where(dentro, posiciones, 0)], -1)
+        orden = np.argsort(conocidos)
+        conocidos, grupos = conocidos[orden], grupos[orden]
+        posiciones = np.searchsorted(conocidos, ids)
+        posiciones[posiciones == len(conocidos)] = 0
+        return np.where(conocidos[posiciones] == ids, grupos[posiciones], -1)
+
+
+def _validar(dimensiones, medidas):
+    for dimension in dimensiones:
+        if dimension not in DIMENSIONES:
+            raise ValueError(f"Dimensión desconocida: {dimension} (opciones: {', '.join(DIMENSIONES)})")
+    if len(set(dimensiones)) != len(dimensiones):
+        raise ValueError("Una dimensión no puede repetirse")
+    for medida in medidas:
+        if medida not in MEDIDAS:
+            raise ValueError(f"Medida desconocida: {medida} (opciones: {', '.join(MEDIDAS)})")
+
+
+def _contar_python(tabla, grupos_emp, grupos_act, distintos):
+    """Celdas con un diccionario (sin NumPy), una pasada por par de capas"""
+    ancho = len(grupos_act)
+    celdas = {}
+    activos = {}
+    for indice_emp, indice_act in product(grupos_emp.capas, grupos_act.capas):
+        for emp, act, asistio, calif in zip(tabla.empleado_id, tabla.actividad_id,
+                                            tabla.asistio, tabla.calificacion):
+            grupo_emp = 0 if indice_emp is None else indice_emp.get(emp)
+            grupo_act = 0 if indice_act is None else indice_act.get(act)
+            if grupo_emp is None or grupo_act is None:
+                continue
+            celda = grupo_emp * ancho + grupo_act
+            fila = celdas.get(celda)
+            if fila is None:
+                fila = celdas[celda] = [0, 0, 0, 0]
+            fila[0] += 1
+            if asistio:
+                fila[1] += 1
+                if calif > 0:
+                    fila[2] += calif
+                    fila[3] += 1
+                if distintos:
+                    activos.setdefault(celda, set()).add(emp)
+    return {celda: fila + [len(activos.get(celda, ()))] for celda, fila in celdas.items()}
+
+
+def _contar_numpy(tabla, grupos_emp, grupos_act, distintos):
+    """Celdas con np.bincount sobre el número de celda de cada registro"""
+    ancho = len(grupos_act)
+    total = len(grupos_emp) * ancho
+    # Un par de capas por combinación de copias; los ids repetidos suman en cada una
+    partes = []
+    for capa_emp, capa_act in product(range(len(grupos_emp.capas)), range(len(grupos_act.capas))):
+        grupo_emp = grupos_emp.arreglo(tabla.empleado_id, capa_emp)
+        grupo_act = grupos_act.arreglo(tabla.actividad_id, capa_act)
+        validos = (grupo_emp >= 0) & (grupo_act >= 0)
+        partes.append((grupo_emp[validos] * ancho + grupo_act[validos], tabla.empleado_id[validos],
+                       tabla.asistio[validos], tabla.calificacion[validos]))
+    if len(partes) == 1:
+        [(celda, empleado_id, asistio, calificacion)] = partes
+    else:
+        celda, empleado_id, asistio, calificacion = map(np.concatenate, zip(*partes))
+    calificacion = calificacion.astype(np.int64)
+    calificado = asistio & (calificacion > 0)
+
+    registros = np.bincount(celda, minlength=total)
+    asistencias = np.bincount(celda[asistio], minlength=total)
+    suma = np.bincount(celda[calificado], weights=calificacion[calificado],
+                       minlength=total).astype(np.int64)
+    calificados = np.bincount(celda[calificado], minlength=total)
+    if distintos:
+        # Pares (celda, empleado) distintos: se empaquetan en un solo entero por par
+        ids, empleado = np.unique(empleado_id[asistio], return_inverse=True)
+        celda_asistio = celda[asistio]
+        if ancho == 1 and len(grupos_emp.capas) == 1:
+            # Sin dimensiones de actividad ni ids repetidos cada empleado cae en una sola celda
+            celdas_distintas = grupos_emp.arreglo(ids)
+        elif total * max(len(ids), 1) < 2 ** 62:
+            celdas_distintas = np.unique(celda_asistio * len(ids) + empleado) // max(len(ids), 1)
+        else:
+            celdas_distintas = np.unique(np.stack([celda_asistio, empleado]), axis=1)[0]
+        activos = np.bincount(celdas_distintas, minlength=total)
+    else:
+        activos = np.zeros(total, dtype=np.int64)
+
+    ocupadas = np.flatnonzero(registros)
+    return dict(zip(ocupadas.tolist(), zip(registros[ocupadas].tolist(), asistencias[ocupadas].tolist(),
+                                           suma[ocupadas].tolist(), calificados[ocupadas].tolist(),
+                                           activos[ocupadas].tolist())))
+
+
+def agregar(empleados, actividades, datos, dimensiones, incluir_vacios=False, distintos=False):
+    """
+    Agrega los registros en celdas según las dimensiones pedidas
+
+    Solo cuentan los registros cuyo empleado (o actividad) está en la lista
+    cuando se pide alguna dimensión de ese lado.
+
+    Args:
+        empleados (list): Lista de empleados
+        actividades (list): Lista de actividades
+        datos: TablaParticipacion o lista de registros
+        dimensiones (tuple): Nombres de DIMENSIONES, en el orden de las columnas
+        incluir_vacios (bool): Incluir también las combinaciones sin registros
+        distintos (bool): Contar empleados distintos que asistieron (más costoso)
+
+    Returns:
+        dict: clave (tupla en el orden de dimensiones, con códigos) ->
+            [registros, asistencias, suma_calificaciones, calificados,
+            empleados, empleados_activos], en orden de aparición de los grupos
+    """
+    _validar(dimensiones, ())
+    dims_emp = [d for d in dimensiones if DIMENSIONES[d][0] == 'empleado']
+    dims_act = [d for d in dimensiones if DIMENSIONES[d][0] == 'actividad']
+    grupos_emp = _Grupos(empleados, 'id_empleado', [DIMENSIONES[d][1] for d in dims_emp])
+    grupos_act = _Grupos(actividades, 'id_actividad', [DIMENSIONES[d][1] for d in dims_act])
+
+    tabla = datos if isinstance(datos, vectorizado.TablaParticipacion) \
+        else vectorizado.TablaParticipacion.desde_registros(datos)
+    if vectorizado.np is None:
+        celdas = _contar_python(tabla, grupos_emp, grupos_act, distintos)
+    else:
+        celdas = _contar_numpy(tabla, grupos_emp, grupos_act, distintos)
+
+    # Reordena (claves de empleado + claves de actividad) según `dimensiones`
+    origen = dims_emp + dims_act
+    orden = [origen.index(d) for d in dimensiones]
+    ancho = len(grupos_act)
+    numeros = range(len(grupos_emp) * ancho) if incluir_vacios else sorted(celdas)
+
+    resultado = {}
+    for celda in numeros:
+        grupo_emp, grupo_act = divmod(celda, ancho)
+        clave = grupos_emp.claves[grupo_emp] + grupos_act.claves[grupo_act]
+        registros, asistencias, suma, calificados, activos = celdas.get(celda, (0, 0, 0, 0, 0))
+        resultado[tuple(clave[i] for i in orden)] = [
+            registros, asistencias, suma, calificados, grupos_emp.tamanos[grupo_emp], activos
+        ]
+    return resultado
+
+
+def _medida(medida, fila):
+    if medida == 'tasa_participacion':
+        registros, asistencias = fila[_REGISTROS], fila[_ASISTENCIAS]
+        return round((asistencias / registros * 100), 2) if registros > 0 else 0
+    if medida == 'satisfaccion_promedio':
+        calificados = fila[_CALIFICADOS]
+        return round(fila[_SUMA] / calificados, 2) if calificados else 0
+    return fila[{'registros': _REGISTROS, 'asistencias': _ASISTENCIAS, 'calificados': _CALIFICADOS,
+                 'empleados': _EMPLEADOS, 'empleados_activos': _ACTIVOS}[medida]]
+
+
+def consultar(empleados, actividades, datos, dimensiones, medidas=MEDIDAS_POR_DEFECTO,
+              incluir_vacios=False):
+    """
+    Tabla cruzada lista para mostrar o exportar
+
+    Args:
+        empleados (list): Lista de empleados
+        actividades (list): Lista de actividades
+        datos: TablaParticipacion o lista de registros
+        dimensiones (tuple): Nombres de DIMENSIONES (p. ej. ('area', 'tipo', 'mes'))
+        medidas (tuple): Nombres de MEDIDAS
+        incluir_vacios (bool): Incluir también las combinaciones sin registros
+
+    Returns:
+        list: Filas [valores de las dimensiones..., valores de las medidas...]
+
+    Raises:
+        ValueError: Si alguna dimensión o medida no existe
+    """
+    dimensiones, medidas = tuple(dimensiones), tuple(medidas)
+    _validar(dimensiones, medidas)
+    celdas = agregar(empleados, actividades, datos, dimensiones, incluir_vacios,
+                     distintos='empleados_activos' in medidas)
+    traducciones = [DIMENSIONES[d][2] for d in dimensiones]
+    return [
+        [t(v) if t else v for t, v in zip(traducciones, clave)] + [_medida(m, fila) for m in medidas]
+        for clave, fila in celdas.items()
+    ]
+
+
+def columnas(dimensiones, medidas=MEDIDAS_POR_DEFECTO):
+    """
+    Encabezados CSV de una consulta
+
+    Args:
+        dimensiones (tuple): Nombres de DIMENSIONES
+        medidas (tuple): Nombres de MEDIDAS
+
+    Returns:
+        list: Nombres de columna
+    """
+    return [DIMENSIONES[d][3] for d in dimensiones] + [MEDIDAS[m] for m in medidas]
+
+
+def pivotar(filas, dimensiones, columna, medida, medidas=MEDIDAS_POR_DEFECTO, vacio=0):
+    """
+    Pasa una dimensión a columnas (formato ancho) para una sola medida
+
+    Args:
+        filas (list): Resultado de consultar
+        dimensiones (tuple): Dimensiones usadas en la consulta
+        columna (str): Dimensión cuyos valores pasan a ser columnas
+        medida (str): Medida que se muestra en cada celda
+        medidas (tuple): Medidas usadas en la consulta
+        vacio: Valor para las combinaciones sin datos
+
+    Returns:
+        tuple: (encabezados, filas) con una fila por combinación de las demás dimensiones
+
+    Raises:
+        ValueError: Si la columna o la medida no están en la consulta
+    """
+    dimensiones, medidas = tuple(dimensiones), tuple(medidas)
+    if columna not in dimensiones or medida not in medidas:
+        raise ValueError("La columna y la medida deben estar en la consulta")
+    posicion_columna = dimensiones.index(columna)
+    posicion_medida = len(dimensiones) + medidas.index(medida)
+    resto = [i for i in range(len(dimensiones)) if i != posicion_columna]
+
+    valores_columna = {}
+    tabla = {}
+    for fila in filas:
+        valores_columna.setdefault(fila[posicion_columna], None)
+        clave = tuple(fila[i] for i in resto)
+        tabla.setdefault(clave, {})[fila[posicion_columna]] = fila[posicion_medida]
+
+    encabezados_columna = sorted(valores_columna, key=str)
+    encabezados = [DIMENSIONES[dimensiones[i]][3] for i in resto] + [str(v) for v in encabezados_columna]
+    salida = [list(clave) + [celdas.get(v, vacio) for v in encabezados_columna]
+              for clave, celdas in tabla.items()]
+    return encabezados, salida
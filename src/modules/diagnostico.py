@@ -0,0 +1,183 @@
+"""
+Módulo de diagnóstico: canal de logging para errores de lectura de datos
+
+Los errores de parseo se agregan por tipo (conteo + primeras muestras) y se
+informan con un solo mensaje por carga, en lugar de imprimir cada línea.
+En modo estricto el primer error detiene la carga con ErrorDeParseo.
+La consola queda reservada para la interfaz interactiva.
+"""
+
+import logging
+import os
+import threading
+
+logger = logging.getLogger('work_comfort')
+logger.addHandler(logging.NullHandler())
+
+# Configuración global
+_config = {
+    'estricto': os.environ.get('WORK_COMFORT_ESTRICTO') == '1',
+    'max_muestras': 5,
+}
+_local = threading.local()
+_archivos_avisados = set()
+
+
+class ErrorDeParseo(ValueError):
+    """Línea inválida encontrada en modo estricto"""
+
+
+def configurar(estricto=None, max_muestras=None):
+    """
+    Ajusta el comportamiento ante líneas inválidas
+
+    Args:
+        estricto (bool): True para detener la carga en el primer error
+        max_muestras (int): Muestras guardadas por tipo de error
+    """
+    if estricto is not None:
+        _config['estricto'] = estricto
+    if max_muestras is not None:
+        _config['max_muestras'] = max_muestras
+
+
+def es_estricto():
+    """Indica si el modo estricto está activo"""
+    return _config['estricto']
+
+
+def configurar_registro(archivo='src/data/logs/work_comfort.log', nivel=logging.INFO):
+    """
+    Envía el log del sistema a un archivo (la consola queda para el menú)
+
+    Args:
+        archivo (str): Ruta del archivo de log
+        nivel (int): Nivel mínimo de los mensajes
+    """
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    manejador = logging.FileHandler(archivo, encoding='utf-8')
+    manejador.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    logger.addHandler(manejador)
+    logger.setLevel(nivel)
+
+
+class ResumenErrores:
+    """Errores de parseo agregados por tipo: conteo y primeras muestras"""
+
+    def __init__(self, origen, max_muestras=None):
+        self.origen = origen
+        self.max_muestras = _config['max_muestras'] if max_muestras is None else max_muestras
+        self.conteos = {}
+        self.muestras = {}
+
+    def agregar(self, tipo, linea):
+        """
+        Registra un error y guarda la línea si aún no hay suficientes muestras
+
+        Args:
+            tipo (str): Tipo de error (ej: 'registro: Formato inválido de registro')
+            linea (str): Línea que produjo el error
+
+        Returns:
+            bool: True si es una de las primeras muestras de su tipo
+        """
+        self.conteos[tipo] = self.conteos.get(tipo, 0) + 1
+        muestras = self.muestras.setdefault(tipo, [])
+        if len(muestras) < self.max_muestras:
+            muestras.append(linea.rstrip('\n')[:200])
+            return True
+        return False
+
+    @property
+    def total(self):
+        """Total de líneas inválidas registradas"""
+        return sum(self.conteos.values())
+
+    def to_dict(self):
+        """Convierte el resumen a diccionario serializable"""
+        return {
+            'origen': self.origen,
+            'total': self.total,
+            'conteos': dict(self.conteos),
+            'muestras': {tipo: list(m) for tipo, m in self.muestras.items()},
+        }
+
+    def informar(self):
+        """Escribe en el log un único mensaje con el resumen"""
+        if not self.conteos:
+            return
+        detalle = '; '.join(f"{tipo} ×{n} (ej: {self.muestras[tipo][0]!r})"
+                            for tipo, n in sorted(self.conteos.items(), key=lambda x: -x[1]))
+        logger.warning("%d líneas inválidas en %s: %s", self.total, self.origen, detalle)
+
+
+# Resumen usado fuera de una carga (from_string llamado directamente)
+_resumen_global = ResumenErrores('from_string')
+
+
+class sesion_carga:
+    """
+    Contexto de una carga de archivo: agrupa los errores y los informa al final
+
+    Uso:
+        with diagnostico.sesion_carga(archivo) as resumen:
+            ...
+    """
+
+    def __init__(self, origen):
+        self.resumen = ResumenErrores(origen)
+
+    def __enter__(self):
+        pila = getattr(_local, 'pila', None)
+        if pila is None:
+            pila = _local.pila = []
+        pila.append(self.resumen)
+        return self.resumen
+
+    def __exit__(self, *exc):
+        _local.pila.pop()
+        self.resumen.informar()
+        return False
+
+
+def error_parseo(entidad, linea, error):
+    """
+    Informa una línea que no se pudo convertir en objeto
+
+    Args:
+        entidad (str): 'empleado', 'actividad' o 'registro'
+        linea (str): Línea original
+        error (Exception): Excepción producida al leerla
+
+    Raises:
+        ErrorDeParseo: Si el modo estricto está activo
+    """
+    # Se descarta el detalle variable (ej: el valor inválido) para agrupar por tipo
+    tipo = f"{entidad}: {str(error).split(':')[0]}"
+    if _config['estricto']:
+        raise ErrorDeParseo(f"{tipo} en la línea {linea.rstrip()!r}") from error
+
+    pila = getattr(_local, 'pila', None)
+    if pila:
+        pila[-1].agregar(tipo, linea)
+    elif _resumen_global.agregar(tipo, linea):
+        # Fuera de una carga se registran solo las primeras muestras de cada tipo
+        logger.warning("Línea inválida (%s): %r", tipo, linea.rstrip()[:200])
+
+
+def archivo_inexistente(archivo):
+    """
+    Informa que un archivo de datos no existe, una sola vez por ruta
+
+    Args:
+        archivo (str): Ruta del archivo buscado
+    """
+    if archivo in _archivos_avisados:
+        return
+    _archivos_avisados.add(archivo)
+    logger.warning("El archivo %s no existe. Se creará al agregar datos.", archivo)
+
+
+def obtener_resumen_global():
+    """Errores acumulados fuera de cargas de archivo"""
+    return _resumen_global.to_dict()
@@ -0,0 +1,165 @@
+"""
+Módulo directorio: acceso aleatorio al archivo de empleados con mmap
+
+Buscar un empleado por id ya no convierte todo empleados.txt en objetos.
+El archivo se mapea en memoria de solo lectura y la tabla id -> byte de
+inicio de la línea se arma de a poco: cada búsqueda continúa el recorrido
+desde donde terminó la anterior y se detiene al encontrar el id. Solo la
+línea pedida se decodifica en un Empleado (con la validación de
+from_string); el resto del archivo no se convierte.
+
+Igual que empleado.obtener_empleado_por_id, si un id aparece en varias
+líneas vale la primera válida. Si el archivo crece se sigue indexando lo
+nuevo; si se reescribe (otro inodo, menor tamaño o fecha distinta sin
+crecer) se vuelve a empezar.
+"""
+
+import mmap
+import os
+import re
+import threading
+
+from . import diagnostico, empleado
+
+# Inicio de línea con el id: '<id>|' (los espacios alrededor los acepta int())
+_ID_AL_INICIO = re.compile(rb'^[ \t]*(\d+)[ \t]*\|', re.MULTILINE)
+
+
+class DirectorioEmpleados:
+    """Vista de solo lectura de empleados.txt con decodificación a pedido"""
+
+    def __init__(self, archivo='src/data/empleados.txt'):
+        """
+        Args:
+            archivo (str): Ruta del archivo de empleados
+        """
+        self.archivo = archivo
+        self._lock = threading.Lock()
+        self._mapa = None
+        self._firma = None
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self._inicios = {}
+        self._escaneado = 0
+        self._completo = False
+
+    def _cerrar_mapa(self):
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+
+    def cerrar(self):
+        """Libera el mapeo del archivo"""
+        with self._lock:
+            self._cerrar_mapa()
+            self._firma = None
+            self._reiniciar()
+
+    def _al_dia(self):
+        """Vuelve a mapear el archivo si cambió desde la última consulta"""
+        try:
+            st = os.stat(self.archivo)
+        except FileNotFoundError:
+            diagnostico.archivo_inexistente(self.archivo)
+            self._cerrar_mapa()
+            self._firma = None
+            self._reiniciar()
+            return
+        firma = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if firma == self._firma:
+            return
+        anterior = self._firma
+        solo_crecio = (anterior is not None and anterior[0] == firma[0]
+                       and firma[1] > anterior[1])
+        if not solo_crecio:
+            self._reiniciar()
+        self._completo = False
+        self._cerrar_mapa()
+        if st.st_size:
+            with open(self.archivo, 'rb') as f:
+                self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._firma = firma
+
+    def _indexar(self, buscado=None):
+        """
+        Continúa el recorrido registrando el inicio de cada id nuevo
+
+        Args:
+            buscado (int): Detenerse al encontrar este id (None = hasta el final)
+        """
+        if self._completo or self._mapa is None:
+            return
+        inicios = self._inicios
+        for m in _ID_AL_INICIO.finditer(self._mapa, self._escaneado):
+            # '^' no coincide a mitad de línea: se puede retomar desde m.end()
+            id_empleado = int(m.group(1))
+            if id_empleado not in inicios:
+                inicios[id_empleado] = m.start()
+                if id_empleado == buscado:
+                    self._escaneado = m.end()
+                    return
+        self._escaneado = len(self._mapa)
+        self._completo = True
+
+    def _linea(self, inicio):
+        fin = self._mapa.find(b'\n', inicio)
+        return self._mapa[inicio:fin if fin >= 0 else len(self._mapa)].decode('utf-8')
+
+    def _decodificar(self, id_empleado):
+        """Empleado de la primera línea válida con ese id (None si no hay)"""
+        inicio = self._inicios[id_empleado]
+        with diagnostico.sesion_carga(self.archivo):
+            emp = empleado.Empleado.from_string(self._linea(inicio))
+            # Línea inválida: se busca la siguiente con el mismo id
+            patron = re.compile(rb'^[ \t]*0*' + str(id_empleado).encode() + rb'[ \t]*\|', re.MULTILINE)
+            while emp is None:
+                fin = self._mapa.find(b'\n', inicio)
+                m = patron.search(self._mapa, fin + 1) if fin >= 0 else None
+                if m is None:
+                    break
+                inicio = m.start()
+                emp = empleado.Empleado.from_string(self._linea(inicio))
+        return emp
+
+    def obtener(self, id_empleado):
+        """
+        Busca un empleado por id decodificando solo su línea
+
+        Args:
+            id_empleado (int): Id buscado
+
+        Returns:
+            Empleado: Empleado encontrado o None
+        """
+        with self._lock:
+            self._al_dia()
+            if id_empleado not in self._inicios:
+                self._indexar(id_empleado)
+                if id_empleado not in self._inicios:
+                    return None
+            return self._decodificar(id_empleado)
+
+    def __contains__(self, id_empleado):
+        return self.obtener(id_empleado) is not None
+
+
+_directorios = {}
+_lock_directorios = threading.Lock()
+
+
+def obtener_directorio(archivo='src/data/empleados.txt'):
+    """
+    Directorio compartido de un archivo de empleados
+
+    Args:
+        archivo (str): Ruta del archivo de empleados
+
+    Returns:
+        DirectorioEmpleados: Directorio (uno por ruta en todo el proceso)
+    """
+    with _lock_directorios:
+        directorio = _directorios.get(archivo)
+        if directorio is None:
+            directorio = _directorios[archivo] = DirectorioEmpleados(archivo)
+        return directorio
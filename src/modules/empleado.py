@@ -1,7 +1,12 @@
 import os
 
+from . import almacenamiento, cambios, codificacion, diagnostico, directorio, instantanea, instrumentacion, listados
+
 class Empleado:
     """Clase que representa un empleado de la organización"""
+
+    # Área y cargo se guardan como códigos de codificacion.AREAS / CARGOS
+    __slots__ = ('id_empleado', 'nombre', 'codigo_area', 'codigo_cargo')
     
     def __init__(self, id_empleado, nombre, area, cargo):
         """
@@ -17,12 +22,31 @@ class Empleado:
         self.nombre = nombre
         self.area = area
         self.cargo = cargo
+
+    @property
+    def area(self):
+        """Área o departamento (etiqueta del código)"""
+        return codificacion.AREAS.etiquetas[self.codigo_area]
+
+    @area.setter
+    def area(self, valor):
+        self.codigo_area = codificacion.AREAS.codigo(valor)
+
+    @property
+    def cargo(self):
+        """Cargo o posición (etiqueta del código)"""
+        return codificacion.CARGOS.etiquetas[self.codigo_cargo]
+
+    @cargo.setter
+    def cargo(self, valor):
+        self.codigo_cargo = codificacion.CARGOS.codigo(valor)
     
     def to_string(self):
         """Convierte el empleado a formato de texto para guardar"""
         return f"{self.id_empleado}|{self.nombre}|{self.area}|{self.cargo}"
     
     @staticmethod
+    @instrumentacion.medir(filas=instrumentacion.una_fila)
     def from_string(linea):
         """
         Crea un objeto Empleado desde una línea de texto
@@ -39,7 +63,7 @@ class Empleado:
                 raise ValueError("Formato inválido de empleado")
             return Empleado(int(partes[0]), partes[1], partes[2], partes[3])
         except Exception as e:
-            print(f"Error al leer empleado: {e}")
+            diagnostico.error_parseo('empleado', linea, e)
             return None
     
     def __str__(self):
@@ -53,23 +77,60 @@ def agregar_empleado(empleado, archivo='src/data/empleados.txt'):
     
     Args:
         empleado (Empleado): Objeto empleado a guardar
-        archivo (str): Ruta del archivo de empleados
+        archivo (str): Ruta del archivo de empleados (backend de texto)
     """
     try:
-        # Crear directorio si no existe
-        os.makedirs(os.path.dirname(archivo), exist_ok=True)
-        
-        # Agregar al archivo
-        with open(archivo, 'a', encoding='utf-8') as f:
-            f.write(empleado.to_string() + '\n')
+        backend = almacenamiento.obtener_backend()
+        # El estado anterior solo se busca si alguien consume los eventos de cambio
+        anterior = _anterior(empleado.id_empleado, archivo) if cambios.activo() else None
+        # El índice de listados y búsqueda se actualiza en lugar de rearmarse
+        with listados.alta('empleados', empleado, archivo):
+            if backend is not None:
+                backend.agregar_empleado(empleado)
+            else:
+                # Crear directorio si no existe
+                os.makedirs(os.path.dirname(archivo), exist_ok=True)
+                
+                # Agregar al archivo
+                with open(archivo, 'a', encoding='utf-8') as f:
+                    f.write(empleado.to_string() + '\n')
+        cambios.publicar('empleado', 'update' if anterior else 'insert', anterior, empleado)
         print(f"Empleado '{empleado.nombre}' registrado exitosamente")
     except Exception as e:
         print(f"Error al guardar empleado: {e}")
 
 
+def _anterior(id_empleado, archivo):
+    """Versión vigente de un empleado: la misma que devuelve obtener_empleado_por_id"""
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.obtener_empleado_por_id(id_empleado)
+    # El directorio del archivo no vuelve a leerlo entero en cada alta
+    return directorio.obtener_directorio(archivo).obtener(id_empleado)
+
+
+@instrumentacion.medir()
 def cargar_empleados(archivo='src/data/empleados.txt'):
     """
-    Carga todos los empleados desde el archivo
+    Carga todos los empleados desde el backend activo (por defecto el archivo)
+    
+    Args:
+        archivo (str): Ruta del archivo de empleados (backend de texto)
+        
+    Returns:
+        list: Lista de objetos Empleado
+    """
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.cargar_empleados()
+    # Instantánea del arranque si el archivo no cambió desde que se guardó
+    empleados = instantanea.empleados(archivo)
+    return empleados if empleados is not None else leer_empleados_texto(archivo)
+
+
+def leer_empleados_texto(archivo='src/data/empleados.txt'):
+    """
+    Lee todos los empleados de un archivo de texto
     
     Args:
         archivo (str): Ruta del archivo de empleados
@@ -80,36 +141,90 @@ def cargar_empleados(archivo='src/data/empleados.txt'):
     empleados = []
     try:
         if not os.path.exists(archivo):
-            print(f"El archivo {archivo} no existe. Se creará al agregar empleados.")
+            diagnostico.archivo_inexistente(archivo)
             return empleados
         
-        with open(archivo, 'r', encoding='utf-8') as f:
+        instrumentacion.contar('empleado.cargar_empleados', bytes_leidos=os.path.getsize(archivo))
+        with diagnostico.sesion_carga(archivo), open(archivo, 'r', encoding='utf-8') as f:
             for linea in f:
                 if linea.strip():  # Ignorar líneas vacías
                     emp = Empleado.from_string(linea)
                     if emp:
                         empleados.append(emp)
+    except diagnostico.ErrorDeParseo:
+        raise
     except Exception as e:
-        print(f"Error al cargar empleados: {e}")
+        diagnostico.logger.error("Error al cargar %s: %s", archivo, e)
     
     return empleados
 
 
-def listar_empleados():
-    """Muestra en consola todos los empleados registrados"""
-    empleados = cargar_empleados()
-    
-    if not empleados:
+def listar_empleados(pagina=1, tamano=None, area=None, prefijo=None):
+    """
+    Muestra en consola una página de los empleados registrados
+
+    Args:
+        pagina (int): Número de página (desde 1)
+        tamano (int): Empleados por página (por defecto listados.TAMANO_PAGINA)
+        area (str): Mostrar solo esta área
+        prefijo (str): Mostrar solo nombres que empiezan así
+
+    Returns:
+        Pagina: Página mostrada o None si no hay empleados registrados
+    """
+    indice = listados.indice_empleados()
+    if not indice.empleados:
         print("No hay empleados registrados")
-        return
+        return None
+    resultado = indice.pagina(pagina, tamano or listados.TAMANO_PAGINA, area, prefijo)
     
     print("\n" + "="*60)
     print("  LISTA DE EMPLEADOS")
+    filtros = [f"área {area}" if area else "", f"nombre '{prefijo}...'" if prefijo else ""]
+    if any(filtros):
+        print("  Filtro: " + ", ".join(f for f in filtros if f))
     print("="*60)
-    for emp in empleados:
+    for emp in resultado.elementos:
         print(emp)
     print("="*60)
-    print(f"Total de empleados: {len(empleados)}")
+    print(resultado.pie())
+    print(f"Total de empleados: {len(indice.empleados)}")
+    return resultado
+
+
+def _pedir_filtros_empleados():
+    indice = listados.indice_empleados()
+    print("\nÁreas: " + ", ".join(indice.areas()))
+    area = input("Área (Enter = todas): ").strip()
+    prefijo = input("Comienzo del nombre (Enter = todos): ").strip()
+    return {'area': area or None, 'prefijo': prefijo or None}
+
+
+def buscar_empleados(texto, limite=None):
+    """
+    Muestra los empleados cuyo nombre se parece a lo escrito
+
+    No distingue mayúsculas ni acentos y tolera errores de tipeo.
+
+    Args:
+        texto (str): Una o más palabras del nombre (completas o no)
+        limite (int): Resultados máximos (por defecto listados.RESULTADOS_BUSQUEDA)
+
+    Returns:
+        list: Empleados encontrados, los más parecidos primero
+    """
+    encontrados = listados.indice_empleados().buscar(texto, limite or listados.RESULTADOS_BUSQUEDA)
+    if not encontrados:
+        print(f"Sin empleados que coincidan con '{texto}'")
+    for emp in encontrados:
+        print(f"  {emp}")
+    return encontrados
+
+
+def explorar_empleados():
+    """Recorre el listado de empleados por páginas, con filtros y búsqueda"""
+    listados.navegar(lambda numero, filtros: listar_empleados(numero, **filtros),
+                     _pedir_filtros_empleados, buscar_empleados)
 
 
 def obtener_empleado_por_id(id_empleado):
@@ -122,11 +237,12 @@ def obtener_empleado_por_id(id_empleado):
     Returns:
         Empleado: Objeto empleado encontrado o None
     """
-    empleados = cargar_empleados()
-    for emp in empleados:
-        if emp.id_empleado == id_empleado:
-            return emp
-    return None
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.obtener_empleado_por_id(id_empleado)
+    
+    # Solo se decodifica la línea del empleado (ver modules/directorio.py)
+    return directorio.obtener_directorio().obtener(id_empleado)
 
 
 def validar_id_unico(id_empleado):
@@ -139,11 +255,11 @@ def validar_id_unico(id_empleado):
     Returns:
         bool: True si el ID es único, False si ya existe
     """
-    empleados = cargar_empleados()
-    for emp in empleados:
-        if emp.id_empleado == id_empleado:
-            return False
-    return True
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.obtener_empleado_por_id(id_empleado) is None
+    
+    return id_empleado not in directorio.obtener_directorio()
 
 
 def registrar_empleado_interactivo():
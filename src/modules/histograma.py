@@ -0,0 +1,202 @@
+"""
+Módulo histograma: distribución de calificaciones de satisfacción (1 a 5)
+
+Un histograma de 5 casillas reemplaza a la lista completa de
+calificaciones: ocupa lo mismo con 10 o con 10 millones de registros,
+se combina sumando casillas (por actividad, área, tipo o por partes del
+archivo) y de él salen en O(1) la media, la mediana, los cuartiles y la
+desviación estándar.
+"""
+
+import math
+
+# Calificaciones válidas
+MINIMO = 1
+MAXIMO = 5
+
+
+class HistogramaCalificaciones:
+    """
+    Conteo de calificaciones por valor
+
+    Además de las 5 casillas guarda la suma y la suma de cuadrados exactas,
+    así la media coincide con sum(lista) / len(lista) aunque aparezca algún
+    valor fuera de 1..5 (se cuenta en la casilla más cercana).
+    """
+
+    __slots__ = ('conteos', 'suma', 'suma_cuadrados')
+
+    def __init__(self, conteos=None, suma=None, suma_cuadrados=None):
+        """
+        Args:
+            conteos (list): Cantidad de calificaciones 1..5 (5 enteros)
+            suma (int): Suma de las calificaciones (por defecto, la de las casillas)
+            suma_cuadrados (int): Suma de los cuadrados (por defecto, la de las casillas)
+        """
+        self.conteos = list(conteos) if conteos is not None else [0] * (MAXIMO - MINIMO + 1)
+        if suma is None:
+            suma = sum(n * v for v, n in zip(range(MINIMO, MAXIMO + 1), self.conteos))
+        if suma_cuadrados is None:
+            suma_cuadrados = sum(n * v * v for v, n in zip(range(MINIMO, MAXIMO + 1), self.conteos))
+        self.suma = suma
+        self.suma_cuadrados = suma_cuadrados
+
+    @classmethod
+    def desde_conteos(cls, por_valor):
+        """
+        Crea un histograma a partir de {calificacion: cantidad}
+
+        Args:
+            por_valor (dict): Cantidad de veces que aparece cada calificación (> 0)
+
+        Returns:
+            HistogramaCalificaciones: Histograma equivalente
+        """
+        histograma = cls()
+        for valor, cantidad in por_valor.items():
+            histograma.agregar(valor, cantidad)
+        return histograma
+
+    @classmethod
+    def desde_valores(cls, calificaciones):
+        """
+        Crea un histograma a partir de una secuencia de calificaciones (> 0)
+
+        Args:
+            calificaciones (iterable): Calificaciones individuales
+
+        Returns:
+            HistogramaCalificaciones: Histograma de los valores
+        """
+        por_valor = {}
+        for valor in calificaciones:
+            por_valor[valor] = por_valor.get(valor, 0) + 1
+        return cls.desde_conteos(por_valor)
+
+    def agregar(self, calificacion, cantidad=1):
+        """
+        Suma una calificación (o varias iguales)
+
+        Args:
+            calificacion (int): Valor de la calificación
+            cantidad (int): Veces que se agrega
+        """
+        casilla = min(max(calificacion, MINIMO), MAXIMO) - MINIMO
+        self.conteos[casilla] += cantidad
+        self.suma += calificacion * cantidad
+        self.suma_cuadrados += calificacion * calificacion * cantidad
+
+    def combinar(self, otro):
+        """
+        Agrega en este histograma las casillas de otro (por ejemplo de otra parte)
+
+        Args:
+            otro (HistogramaCalificaciones): Histograma a sumar
+
+        Returns:
+            HistogramaCalificaciones: Este mismo histograma
+        """
+        for i, n in enumerate(otro.conteos):
+            self.conteos[i] += n
+        self.suma += otro.suma
+        self.suma_cuadrados += otro.suma_cuadrados
+        return self
+
+    def __add__(self, otro):
+        return HistogramaCalificaciones(self.conteos, self.suma, self.suma_cuadrados).combinar(otro)
+
+    def __eq__(self, otro):
+        return (isinstance(otro, HistogramaCalificaciones) and self.conteos == otro.conteos
+                and self.suma == otro.suma and self.suma_cuadrados == otro.suma_cuadrados)
+
+    @property
+    def total(self):
+        """Cantidad de calificaciones"""
+        return sum(self.conteos)
+
+    def media(self):
+        """Promedio exacto (0 si no hay calificaciones)"""
+        total = self.total
+        return self.suma / total if total else 0
+
+    def _valor_en(self, posicion):
+        """Valor de la calificación en una posición de la lista ordenada (desde 0)"""
+        acumulado = 0
+        for valor, n in zip(range(MINIMO, MAXIMO + 1), self.conteos):
+            acumulado += n
+            if posicion < acumulado:
+                return valor
+        return MAXIMO
+
+    def percentil(self, p):
+        """
+        Percentil con interpolación lineal entre posiciones vecinas
+
+        Da lo mismo que ordenar las calificaciones y aplicar el método
+        'linear' (el de numpy.percentile y statistics.quantiles inclusive).
+
+        Args:
+            p (float): Fracción entre 0 y 1 (0.5 = mediana)
+
+        Returns:
+            float: Percentil (0.0 si no hay calificaciones)
+        """
+        total = self.total
+        if not total:
+            return 0.0
+        posicion = (total - 1) * p
+        abajo = math.floor(posicion)
+        arriba = math.ceil(posicion)
+        valor_abajo = self._valor_en(abajo)
+        if arriba == abajo:
+            return float(valor_abajo)
+        return valor_abajo + (self._valor_en(arriba) - valor_abajo) * (posicion - abajo)
+
+    def mediana(self):
+        """Percentil 50"""
+        return self.percentil(0.5)
+
+    def desviacion_estandar(self):
+        """Desviación estándar poblacional (0.0 si no hay calificaciones)"""
+        total = self.total
+        if not total:
+            return 0.0
+        # Con enteros exactos: var = (n*Σx² - (Σx)²) / n²
+        return math.sqrt(max(total * self.suma_cuadrados - self.suma * self.suma, 0)) / total
+
+    def to_dict(self):
+        """Casillas como {calificacion: cantidad}"""
+        return {valor: n for valor, n in zip(range(MINIMO, MAXIMO + 1), self.conteos)}
+
+    def resumen(self):
+        """
+        Medidas derivadas, redondeadas a 2 decimales
+
+        Returns:
+            dict: mediana, p25, p75 y desviacion_estandar
+        """
+        return {
+            'mediana': round(self.mediana(), 2),
+            'p25': round(self.percentil(0.25), 2),
+            'p75': round(self.percentil(0.75), 2),
+            'desviacion_estandar': round(self.desviacion_estandar(), 2),
+        }
+
+    def __repr__(self):
+        return f"HistogramaCalificaciones({self.conteos})"
+
+
+def combinar(histogramas):
+    """
+    Suma varios histogramas (por ejemplo, uno por cada parte del archivo)
+
+    Args:
+        histogramas (iterable): Histogramas a combinar
+
+    Returns:
+        HistogramaCalificaciones: Histograma total
+    """
+    total = HistogramaCalificaciones()
+    for histograma in histogramas:
+        total.combinar(histograma)
+    return total
@@ -0,0 +1,438 @@
+"""
+Módulo de ingesta: recepción de asistencias desde kioscos por HTTP (asyncio)
+
+Los kioscos envían registros de participación con POST /api/checkins, uno
+solo o un lote por petición:
+
+    {"empleado_id": 7, "actividad_id": 3, "asistio": true, "calificacion": 4}
+    [{...}, {...}]
+
+Cada registro se valida contra los ids de empleados y actividades (en
+memoria, refrescados cada pocos segundos) y contra los pares ya registrados:
+una segunda marca del mismo empleado en la misma actividad se informa como
+duplicada y no se escribe. Los registros válidos pasan por una cola acotada
+a un escritor que los guarda por lotes con el archivo siempre abierto (o en
+una sola transacción con el backend SQLite). La respuesta sale cuando el
+lote quedó escrito; si la cola está llena se responde 503 con Retry-After.
+
+Uso (desde la raíz del proyecto):
+    PYTHONPATH=src python -m modules.ingesta --puerto 8081
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import actividad, almacenamiento, cambios, diagnostico, empleado, registro, seguimiento
+
+# Límites del protocolo
+MAX_CUERPO = 1 << 20
+MAX_REGISTROS_POR_PETICION = 5_000
+
+MENSAJES_ESTADO = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                   405: 'Method Not Allowed', 413: 'Payload Too Large',
+                   503: 'Service Unavailable'}
+
+
+def _par(empleado_id, actividad_id):
+    """Clave del par (empleado, actividad) en el conjunto de pares registrados"""
+    # Una tupla y no un entero empaquetado: ids negativos o de más de 32 bits no chocan
+    return empleado_id, actividad_id
+
+
+class CacheIds:
+    """
+    Ids válidos de empleados y actividades, y pares ya registrados
+
+    Los ids se recargan como máximo cada `intervalo` segundos y solo si
+    cambiaron los archivos. Los pares se leen una vez al iniciar; luego se
+    completan con lo que escribe el propio servidor y, con archivos de
+    texto, con las líneas que otros agreguen a participacion.txt.
+
+    Args:
+        carpeta (str): Carpeta de los archivos de datos (backend de texto)
+        intervalo (float): Segundos mínimos entre revisiones de los archivos
+    """
+
+    def __init__(self, carpeta='src/data', intervalo=2.0):
+        self.rutas = {
+            'empleados': os.path.join(carpeta, 'empleados.txt'),
+            'actividades': os.path.join(carpeta, 'actividades.txt'),
+            'participacion': os.path.join(carpeta, 'participacion.txt'),
+        }
+        self.intervalo = intervalo
+        self.empleados = set()
+        self.actividades = set()
+        self.pares = set()
+        self._version = None
+        self._revisado = 0.0
+        self._lector = seguimiento.LectorIncremental(self.rutas['participacion'])
+
+    def _version_actual(self):
+        backend = almacenamiento.obtener_backend()
+        rutas = ((backend.ruta, backend.ruta + '-wal')
+                 if isinstance(backend, almacenamiento.BackendSQLite)
+                 else (self.rutas['empleados'], self.rutas['actividades']))
+        version = []
+        for ruta in rutas:
+            try:
+                st = os.stat(ruta)
+                version.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    def cargar(self):
+        """Lee los ids y los pares registrados desde el backend activo"""
+        # Con archivos de texto refrescar lee todos los pares desde el principio
+        self._lector.reiniciar()
+        self.pares = set()
+        self.refrescar(forzar=True)
+        if almacenamiento.obtener_backend() is not None:
+            self.pares = {_par(r.empleado_id, r.actividad_id)
+                          for r in registro.cargar_registros(self.rutas['participacion'])}
+
+    def _seguir_participacion(self):
+        """Agrega los pares de las líneas nuevas de participacion.txt"""
+        nuevos, reinicio = self._lector.leer()
+        if reinicio:
+            self.pares = set()
+        self.pares.update(_par(r.empleado_id, r.actividad_id) for r in nuevos)
+
+    def refrescar(self, forzar=False):
+        """
+        Recarga los ids si pasó el intervalo y los archivos cambiaron
+
+        Args:
+            forzar (bool): Recargar sin mirar el intervalo ni la versión
+        """
+        ahora = time.monotonic()
+        if not forzar and ahora - self._revisado < self.intervalo:
+            return
+        self._revisado = ahora
+        if almacenamiento.obtener_backend() is None:
+            self._seguir_participacion()
+        version = self._version_actual()
+        if not forzar and version == self._version:
+            return
+        self._version = version
+        self.empleados = {e.id_empleado for e in empleado.cargar_empleados(self.rutas['empleados'])}
+        self.actividades = {a.id_actividad for a in actividad.cargar_actividades(self.rutas['actividades'])}
+
+    def validar(self, datos):
+        """
+        Convierte un diccionario recibido en Registro
+
+        Args:
+            datos (dict): Campos empleado_id, actividad_id, asistio y calificacion
+
+        Returns:
+            Registro: Registro válido
+
+        Raises:
+            ValueError: Con el motivo del rechazo
+        """
+        if not isinstance(datos, dict):
+            raise ValueError("Se esperaba un objeto")
+        try:
+            empleado_id = datos['empleado_id']
+            actividad_id = datos['actividad_id']
+            asistio = datos.get('asistio', True)
+            calificacion = datos.get('calificacion', 0)
+        except KeyError as e:
+            raise ValueError(f"Falta el campo {e.args[0]}")
+
+        if type(empleado_id) is not int or type(actividad_id) is not int:
+            raise ValueError("Los ids deben ser números enteros")
+        if type(asistio) is not bool:
+            raise ValueError("asistio debe ser true o false")
+        if type(calificacion) is not int:
+            raise ValueError("La calificación debe ser un número entero")
+        if empleado_id not in self.empleados:
+            raise ValueError(f"Empleado {empleado_id} no existe")
+        if actividad_id not in self.actividades:
+            raise ValueError(f"Actividad {actividad_id} no existe")
+        # Mismas reglas que el registro interactivo
+        if asistio and not 1 <= calificacion <= 5:
+            raise ValueError("La calificación debe ser un número entre 1 y 5")
+        if not asistio and calificacion != 0:
+            raise ValueError("Sin asistencia la calificación debe ser 0")
+        return registro.Registro(empleado_id, actividad_id, asistio, calificacion)
+
+
+class AnexadorLotes:
+    """
+    Escribe los registros recibidos por lotes
+
+    Con archivos de texto el archivo de participación queda abierto en modo
+    anexar y cada lote es un writelines + flush. Con SQLite cada lote es una
+    transacción. La escritura corre en un único hilo para no bloquear el
+    bucle de eventos.
+
+    Args:
+        archivo (str): Archivo de participación (backend de texto)
+        tamano_lote (int): Registros máximos por escritura
+        sincronizar (bool): Hacer fsync después de cada lote
+    """
+
+    def __init__(self, archivo='src/data/participacion.txt', tamano_lote=2_000, sincronizar=False):
+        self.archivo = archivo
+        self.tamano_lote = tamano_lote
+        self.sincronizar = sincronizar
+        self.escritos = 0
+        self.lotes = 0
+        self._hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix='anexador')
+        self._f = None
+
+    def _escribir(self, registros):
+        backend = almacenamiento.obtener_backend()
+        if backend is not None:
+            backend.importar((), (), registros)
+        else:
+            if self._f is None:
+                os.makedirs(os.path.dirname(self.archivo) or '.', exist_ok=True)
+                self._f = open(self.archivo, 'a', encoding='utf-8')
+            self._f.writelines(r.to_string() + '\n' for r in registros)
+            self._f.flush()
+            if self.sincronizar:
+                os.fsync(self._f.fileno())
+        # Los pares duplicados se rechazan antes de encolar: todo es insert
+        if cambios.activo():
+            cambios.publicar_eventos([cambios.crear_evento('registro', 'insert', despues=r)
+                                      for r in registros])
+
+    async def ejecutar(self, cola):
+        """
+        Consume la cola hasta recibir None
+
+        Cada elemento es (lista de registros, futuro a completar al escribirlos).
+        Se juntan todos los elementos disponibles hasta tamano_lote registros.
+        """
+        bucle = asyncio.get_running_loop()
+        terminar = False
+        while not terminar:
+            elemento = await cola.get()
+            if elemento is None:
+                break
+            pendientes = [elemento]
+            cantidad = len(elemento[0])
+            while cantidad < self.tamano_lote and not cola.empty():
+                elemento = cola.get_nowait()
+                if elemento is None:
+                    terminar = True
+                    break
+                pendientes.append(elemento)
+                cantidad += len(elemento[0])
+
+            registros = [r for regs, _ in pendientes for r in regs]
+            try:
+                await bucle.run_in_executor(self._hilo, self._escribir, registros)
+                self.escritos += len(registros)
+                self.lotes += 1
+                for regs, futuro in pendientes:
+                    if not futuro.done():
+                        futuro.set_result(len(regs))
+            except Exception as e:
+                diagnostico.logger.error("Error al escribir %d registros: %s", len(registros), e)
+                for _, futuro in pendientes:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+
+    def cerrar(self):
+        """Cierra el archivo y el hilo de escritura"""
+        def cerrar_archivo():
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+            backend = almacenamiento.obtener_backend()
+            if isinstance(backend, almacenamiento.BackendSQLite):
+                backend.cerrar()
+        self._hilo.submit(cerrar_archivo).result()
+        self._hilo.shutdown()
+
+
+class ServidorIngesta:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio para recibir asistencias
+
+    Args:
+        carpeta (str): Carpeta de los archivos de datos
+        max_cola (int): Peticiones en espera de escritura antes de rechazar
+        espera_cola (float): Segundos que una petición espera lugar en la cola
+    """
+
+    def __init__(self, carpeta='src/data', max_cola=1_000, espera_cola=1.0, tamano_lote=2_000):
+        self.ids = CacheIds(carpeta)
+        self.anexador = AnexadorLotes(os.path.join(carpeta, 'participacion.txt'), tamano_lote)
+        self.max_cola = max_cola
+        self.espera_cola = espera_cola
+        self.rechazados_por_carga = 0
+        self._cola = None
+        self._tarea_anexador = None
+        self._servidor = None
+
+    async def iniciar(self, host='127.0.0.1', puerto=8081):
+        """
+        Carga los ids y empieza a escuchar
+
+        Returns:
+            int: Puerto donde quedó escuchando
+        """
+        self.ids.cargar()
+        self._cola = asyncio.Queue(maxsize=self.max_cola)
+        self._tarea_anexador = asyncio.create_task(self.anexador.ejecutar(self._cola))
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def detener(self):
+        """Deja de aceptar conexiones y escribe lo que quede en la cola"""
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        await self._cola.put(None)
+        await self._tarea_anexador
+        self.anexador.cerrar()
+
+    # --- Protocolo HTTP ---
+
+    async def _atender(self, reader, writer):
+        try:
+            while True:
+                try:
+                    encabezado = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._responder(writer, 413, {'error': 'Encabezados demasiado largos'}, cerrar=True)
+                    return
+
+                lineas = encabezado.decode('latin-1').split('\r\n')
+                try:
+                    metodo, ruta, _ = lineas[0].split(' ', 2)
+                except ValueError:
+                    await self._responder(writer, 400, {'error': 'Petición inválida'}, cerrar=True)
+                    return
+                headers = {}
+                for linea in lineas[1:]:
+                    nombre, _, valor = linea.partition(':')
+                    if nombre:
+                        headers[nombre.strip().lower()] = valor.strip()
+                cerrar = headers.get('connection', '').lower() == 'close'
+
+                longitud = headers.get('content-length') or '0'
+                if not (longitud.isascii() and longitud.isdigit()):
+                    await self._responder(writer, 400, {'error': 'Content-Length inválido'}, cerrar=True)
+                    return
+                longitud = int(longitud)
+                if longitud > MAX_CUERPO:
+                    await self._responder(writer, 413, {'error': 'Cuerpo demasiado grande'}, cerrar=True)
+                    return
+                cuerpo = await reader.readexactly(longitud) if longitud else b''
+
+                estado, respuesta, extra = await self._procesar(metodo, ruta, cuerpo)
+                await self._responder(writer, estado, respuesta, cerrar, extra)
+                if cerrar:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _responder(self, writer, estado, datos, cerrar=False, extra=None):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        cabecera = [f"HTTP/1.1 {estado} {MENSAJES_ESTADO.get(estado, '')}",
+                    'Content-Type: application/json; charset=utf-8',
+                    f"Content-Length: {len(cuerpo)}"]
+        if cerrar:
+            cabecera.append('Connection: close')
+        for nombre, valor in (extra or {}).items():
+            cabecera.append(f"{nombre}: {valor}")
+        writer.write('\r\n'.join(cabecera).encode('latin-1') + b'\r\n\r\n' + cuerpo)
+        await writer.drain()
+
+    async def _procesar(self, metodo, ruta, cuerpo):
+        """
+        Atiende una petición ya leída
+
+        Returns:
+            tuple: (estado HTTP, datos de la respuesta, encabezados extra)
+        """
+        if ruta == '/api/salud':
+            return 200, {'estado': 'ok', 'en_cola': self._cola.qsize(),
+                         'escritos': self.anexador.escritos}, None
+        if ruta != '/api/checkins':
+            return 404, {'error': f"Ruta desconocida: {ruta}"}, None
+        if metodo != 'POST':
+            return 405, {'error': 'Use POST'}, {'Allow': 'POST'}
+
+        try:
+            datos = json.loads(cuerpo)
+        except ValueError:
+            return 400, {'error': 'JSON inválido'}, None
+        lote = datos if isinstance(datos, list) else [datos]
+        if len(lote) > MAX_REGISTROS_POR_PETICION:
+            return 413, {'error': f"Máximo {MAX_REGISTROS_POR_PETICION} registros por petición"}, None
+
+        self.ids.refrescar()
+        registros, rechazados, duplicados = [], [], 0
+        for indice, item in enumerate(lote):
+            try:
+                reg = self.ids.validar(item)
+            except ValueError as e:
+                rechazados.append({'indice': indice, 'error': str(e)})
+                continue
+            par = _par(reg.empleado_id, reg.actividad_id)
+            if par in self.ids.pares:
+                duplicados += 1
+                continue
+            # Se reserva el par de inmediato: otra petición con el mismo par queda duplicada
+            self.ids.pares.add(par)
+            registros.append(reg)
+
+        if registros:
+            futuro = asyncio.get_running_loop().create_future()
+            try:
+                # Contrapresión: si el escritor no da abasto, la petición espera lugar
+                await asyncio.wait_for(self._cola.put((registros, futuro)), self.espera_cola)
+            except asyncio.TimeoutError:
+                self.ids.pares.difference_update(_par(r.empleado_id, r.actividad_id) for r in registros)
+                self.rechazados_por_carga += 1
+                return 503, {'error': 'Servidor ocupado, reintente'}, {'Retry-After': '1'}
+            try:
+                await futuro
+            except Exception:
+                self.ids.pares.difference_update(_par(r.empleado_id, r.actividad_id) for r in registros)
+                return 503, {'error': 'No se pudo guardar, reintente'}, {'Retry-After': '1'}
+
+        return 200, {'aceptados': len(registros), 'duplicados': duplicados,
+                     'rechazados': rechazados}, None
+
+
+async def _servir(host, puerto, carpeta):
+    servidor = ServidorIngesta(carpeta)
+    puerto = await servidor.iniciar(host, puerto)
+    print(f"✓ Ingesta disponible en http://{host}:{puerto}/api/checkins")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.detener()
+        print(f"✓ Registros escritos: {servidor.anexador.escritos}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingesta de asistencias desde kioscos")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8081)
+    parser.add_argument('--carpeta', default='src/data')
+    args = parser.parse_args()
+
+    almacenamiento.configurar_desde_entorno()
+    cambios.configurar_desde_entorno()
+    diagnostico.configurar_registro()
+    try:
+        asyncio.run(_servir(args.host, args.puerto, args.carpeta))
+    except KeyboardInterrupt:
+        print("\nServidor detenido")
@@ -0,0 +1,419 @@
+"""
+Módulo instantanea: estado cargado guardado en binario para arrancar al instante
+
+Cada arranque de main.py (y cada opción del menú) vuelve a convertir los
+archivos de texto. Al salir se guarda en src/data/instantanea.bin lo que
+quedó cargado, junto con la firma (inodo, tamaño y fecha de modificación)
+de cada archivo de origen:
+
+- empleados en columnas: ids, códigos de área y cargo (con sus etiquetas)
+  y los nombres en un solo bloque de texto;
+- actividades como sus líneas de texto (son pocas);
+- la tabla de participación de vectorizado, columna por columna, con el
+  punto de control de seguimiento.LectorIncremental hasta donde llega.
+
+Al arrancar, restaurar() mapea el archivo (mmap) y solo lee el encabezado:
+tarda milisegundos. Cada parte se usa recién cuando se pide y solo si la
+firma de su archivo coincide; si no, se carga del texto como siempre. La
+participación admite además líneas agregadas: se retoma desde el punto de
+control y solo se convierte lo nuevo (si el archivo se reescribió, se lee
+completo). Con NumPy las columnas de participación se usan directamente
+sobre el mapa (np.frombuffer, sin copiar).
+
+Los índices de listados no se guardan: armarlos a partir de los empleados
+restaurados cuesta menos que deserializarlos.
+
+Formato: MAGIA, VERSION_FORMATO y el largo del encabezado ('<4sII'), el
+encabezado JSON y las secciones alineadas a 8 bytes. Una instantánea de
+otra versión, de otro orden de bytes o incompleta se ignora y se vuelve a
+escribir al salir. Solo se usa con el backend de texto por defecto.
+"""
+
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+
+from . import (actividad, almacenamiento, diagnostico, empleado, parseo_rapido,
+               registro, seguimiento, vectorizado)
+
+ARCHIVO_INSTANTANEA = 'src/data/instantanea.bin'
+CARPETA_DATOS = 'src/data'
+ARCHIVOS = {'empleados': 'empleados.txt', 'actividades': 'actividades.txt',
+            'participacion': 'participacion.txt'}
+
+MAGIA = b'WCIS'
+VERSION_FORMATO = 1
+CABECERA = struct.Struct('<4sII')
+ALINEACION = 8
+
+# dtype de NumPy -> código de array (lectura y escritura sin NumPy)
+TIPOS_ARRAY = {'<i4': 'i', '<i8': 'q', '|b1': 'B', '|u1': 'B'}
+
+# Columnas de la tabla de participación, en el orden de TablaParticipacion
+COLUMNAS_PARTICIPACION = ('empleado_id', 'actividad_id', 'asistio', 'calificacion')
+
+# Instantánea restaurada en este proceso
+_restaurada = None
+
+
+def firma_archivo(ruta):
+    """
+    Identifica la versión de un archivo sin leerlo
+
+    Returns:
+        list: [inodo, tamaño, fecha de modificación en ns] o None si no existe
+    """
+    try:
+        st = os.stat(ruta)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _mismo_archivo(a, b):
+    return os.path.normpath(a) == os.path.normpath(b)
+
+
+# ---------------------------------------------------------
+# ESCRITURA
+# ---------------------------------------------------------
+
+def _columna_a_bytes(valores):
+    """
+    Bytes y dtype de una columna (arreglo de NumPy o lista)
+
+    Sin NumPy asistió se guarda en un byte y el resto en 32 bits (64 si no cabe).
+    """
+    if vectorizado.np is not None and isinstance(valores, vectorizado.np.ndarray):
+        columna = vectorizado.np.ascontiguousarray(valores)
+        return columna.tobytes(), columna.dtype.str
+    if valores and isinstance(valores[0], bool):
+        return array.array('B', valores).tobytes(), '|b1'
+    try:
+        return array.array('i', valores).tobytes(), '<i4'
+    except OverflowError:
+        return array.array('q', valores).tobytes(), '<i8'
+
+
+def _secciones_empleados(empleados):
+    """Columnas de empleados y las etiquetas de sus códigos de área y cargo"""
+    etiquetas = {'area': {}, 'cargo': {}}
+    areas = [etiquetas['area'].setdefault(emp.area, len(etiquetas['area'])) for emp in empleados]
+    cargos = [etiquetas['cargo'].setdefault(emp.cargo, len(etiquetas['cargo'])) for emp in empleados]
+    secciones = {
+        'empleados.id': (array.array('q', [emp.id_empleado for emp in empleados]).tobytes(), '<i8'),
+        'empleados.area': (array.array('i', areas).tobytes(), '<i4'),
+        'empleados.cargo': (array.array('i', cargos).tobytes(), '<i4'),
+        'empleados.nombre': ('\n'.join(emp.nombre for emp in empleados).encode('utf-8'), 'utf-8'),
+    }
+    return secciones, {nombre: list(valores) for nombre, valores in etiquetas.items()}
+
+
+def guardar(archivo=None, carpeta=CARPETA_DATOS):
+    """
+    Guarda el estado cargado de los archivos de texto
+
+    Las firmas se toman antes de leer: si un archivo cambia mientras se
+    guarda, la instantánea queda vencida y no se usa.
+
+    Args:
+        archivo (str): Ruta de la instantánea (por defecto ARCHIVO_INSTANTANEA)
+        carpeta (str): Carpeta de los archivos de datos
+
+    Returns:
+        bool: True si se guardó
+    """
+    archivo = archivo or ARCHIVO_INSTANTANEA
+    if almacenamiento.obtener_backend() is not None:
+        return False
+    rutas = {nombre: os.path.join(carpeta, nombre_archivo) for nombre, nombre_archivo in ARCHIVOS.items()}
+    fuentes = {nombre: {'ruta': ruta, 'firma': firma_archivo(ruta)} for nombre, ruta in rutas.items()}
+    secciones = {}
+    filas = {}
+    etiquetas = {}
+    try:
+        if fuentes['empleados']['firma'] is not None:
+            empleados = empleado.cargar_empleados(rutas['empleados'])
+            secciones_empleados, etiquetas = _secciones_empleados(empleados)
+            secciones.update(secciones_empleados)
+            filas['empleados'] = len(empleados)
+        if fuentes['actividades']['firma'] is not None:
+            actividades = actividad.cargar_actividades(rutas['actividades'])
+            secciones['actividades'] = (
+                '\n'.join(act.to_string() for act in actividades).encode('utf-8'), 'utf-8')
+            filas['actividades'] = len(actividades)
+        if fuentes['participacion']['firma'] is not None:
+            tabla = vectorizado.tabla_de_archivo(rutas['participacion'])
+            fuentes['participacion']['lector'] = vectorizado.punto_de_control(rutas['participacion'])
+            for columna in COLUMNAS_PARTICIPACION:
+                secciones[f'participacion.{columna}'] = _columna_a_bytes(getattr(tabla, columna))
+            filas['participacion'] = len(tabla)
+
+        indice = {}
+        posicion = 0
+        for nombre, (datos, tipo) in secciones.items():
+            indice[nombre] = [posicion, len(datos), tipo]
+            posicion += -(-len(datos) // ALINEACION) * ALINEACION
+        encabezado = json.dumps({
+            'orden_bytes': sys.byteorder,
+            'fuentes': fuentes,
+            'filas': filas,
+            'etiquetas': etiquetas,
+            'secciones': indice,
+        }, ensure_ascii=False).encode('utf-8')
+
+        os.makedirs(os.path.dirname(archivo) or '.', exist_ok=True)
+        temporal = archivo + '.tmp'
+        with open(temporal, 'wb') as f:
+            f.write(CABECERA.pack(MAGIA, VERSION_FORMATO, len(encabezado)))
+            f.write(encabezado)
+            f.write(b'\0' * (-f.tell() % ALINEACION))
+            for datos, _ in secciones.values():
+                f.write(datos)
+                f.write(b'\0' * (-len(datos) % ALINEACION))
+        os.replace(temporal, archivo)
+        return True
+    except (OSError, OverflowError) as e:
+        diagnostico.logger.warning("No se pudo guardar la instantánea %s: %s", archivo, e)
+        return False
+
+
+# ---------------------------------------------------------
+# LECTURA
+# ---------------------------------------------------------
+
+class Instantanea:
+    """Instantánea mapeada en memoria; cada parte se decodifica al pedirla"""
+
+    def __init__(self, archivo, mapa, encabezado, inicio):
+        """
+        Args:
+            archivo (str): Ruta de la instantánea
+            mapa (mmap.mmap): Contenido mapeado
+            encabezado (dict): Encabezado JSON
+            inicio (int): Byte donde empiezan las secciones
+        """
+        self.archivo = archivo
+        self.mapa = mapa
+        self.fuentes = encabezado['fuentes']
+        self.filas = encabezado['filas']
+        self.etiquetas = encabezado['etiquetas']
+        self.secciones = encabezado['secciones']
+        self.inicio = inicio
+        self._tabla = None
+
+    @staticmethod
+    def abrir(archivo):
+        """
+        Mapea una instantánea y valida su encabezado
+
+        Returns:
+            Instantanea: Instantánea abierta o None si falta, es de otra versión o está incompleta
+        """
+        try:
+            with open(archivo, 'rb') as f:
+                tamano = os.fstat(f.fileno()).st_size
+                if tamano < CABECERA.size:
+                    return None
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            magia, version, largo = CABECERA.unpack_from(mapa, 0)
+            if magia != MAGIA or version != VERSION_FORMATO:
+                raise ValueError(f"formato {magia!r} v{version}")
+            encabezado = json.loads(mapa[CABECERA.size:CABECERA.size + largo].decode('utf-8'))
+            if encabezado['orden_bytes'] != sys.byteorder:
+                raise ValueError("otro orden de bytes")
+            inicio = -(-(CABECERA.size + largo) // ALINEACION) * ALINEACION
+            if any(inicio + posicion + n > tamano for posicion, n, _ in encabezado['secciones'].values()):
+                raise ValueError("archivo incompleto")
+            return Instantanea(archivo, mapa, encabezado, inicio)
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            diagnostico.logger.info("Instantánea %s descartada: %s", archivo, e)
+            mapa.close()
+            return None
+
+    def vigente(self, nombre, ruta=None):
+        """
+        La parte guardada corresponde al archivo actual
+
+        Args:
+            nombre (str): 'empleados', 'actividades' o 'participacion'
+            ruta (str): Archivo que se quiere cargar (None = el de la instantánea)
+
+        Returns:
+            bool: True si es el mismo archivo y su firma no cambió
+        """
+        fuente = self.fuentes.get(nombre)
+        if fuente is None or fuente['firma'] is None or nombre not in self.filas:
+            return False
+        if ruta is not None and not _mismo_archivo(ruta, fuente['ruta']):
+            return False
+        return firma_archivo(fuente['ruta']) == fuente['firma']
+
+    def al_dia(self):
+        """Ningún archivo de datos cambió desde que se guardó"""
+        return all(firma_archivo(fuente['ruta']) == fuente['firma'] for fuente in self.fuentes.values())
+
+    def _bytes(self, nombre):
+        posicion, largo, _ = self.secciones[nombre]
+        return self.mapa[self.inicio + posicion:self.inicio + posicion + largo]
+
+    def _columna(self, nombre):
+        """Columna como arreglo de NumPy sobre el mapa, o lista sin NumPy"""
+        posicion, largo, tipo = self.secciones[nombre]
+        np = vectorizado.np
+        if np is not None:
+            dtype = np.dtype(tipo)
+            return np.frombuffer(self.mapa, dtype=dtype, count=largo // dtype.itemsize,
+                                 offset=self.inicio + posicion)
+        columna = array.array(TIPOS_ARRAY[tipo])
+        columna.frombytes(self._bytes(nombre))
+        return list(map(bool, columna)) if tipo == '|b1' else columna.tolist()
+
+    def _lista(self, nombre):
+        columna = self._columna(nombre)
+        return columna if isinstance(columna, list) else columna.tolist()
+
+    def _texto(self, nombre):
+        texto = self._bytes(nombre).decode('utf-8')
+        return texto.split('\n') if texto else []
+
+    def empleados(self):
+        """
+        Empleados guardados (objetos nuevos en cada llamada)
+
+        Returns:
+            list: Empleados en el orden del archivo
+        """
+        areas = self._lista('empleados.area')
+        cargos = self._lista('empleados.cargo')
+        with parseo_rapido.sin_recolector():
+            return list(map(empleado.Empleado, self._lista('empleados.id'), self._texto('empleados.nombre'),
+                            map(self.etiquetas['area'].__getitem__, areas),
+                            map(self.etiquetas['cargo'].__getitem__, cargos)))
+
+    def actividades(self):
+        """
+        Actividades guardadas (objetos nuevos en cada llamada)
+
+        Returns:
+            list: Actividades en el orden del archivo
+        """
+        with diagnostico.sesion_carga(self.archivo):
+            return parseo_rapido.convertir_lineas(self._texto('actividades'), 'actividad')
+
+    def tabla(self):
+        """
+        Tabla de participación guardada y el lector posicionado donde termina
+
+        Returns:
+            tuple: (LectorIncremental, TablaParticipacion)
+        """
+        if self._tabla is None:
+            self._tabla = vectorizado.TablaParticipacion(
+                *(self._columna(f'participacion.{columna}') for columna in COLUMNAS_PARTICIPACION))
+        fuente = self.fuentes['participacion']
+        return seguimiento.LectorIncremental.desde_estado(fuente['ruta'], fuente['lector']), self._tabla
+
+    def registros(self):
+        """
+        Registros guardados más los agregados al archivo desde entonces
+
+        Returns:
+            list: Registros o None si el archivo se reescribió (hay que leerlo completo)
+        """
+        lector, tabla = self.tabla()
+        texto, reinicio = lector.leer_texto()
+        if reinicio:
+            # Ya no sirve para este archivo: no volver a intentarlo
+            self.filas.pop('participacion', None)
+            return None
+        columnas = (tabla.empleado_id, tabla.actividad_id, tabla.asistio, tabla.calificacion)
+        if vectorizado.np is not None:
+            columnas = [columna.tolist() for columna in columnas]
+        with parseo_rapido.sin_recolector():
+            registros = list(map(registro.Registro, *columnas))
+        if texto:
+            with diagnostico.sesion_carga(lector.archivo):
+                registros.extend(parseo_rapido.convertir_texto(texto, 'registro'))
+        return registros
+
+    def participacion_vigente(self, ruta):
+        """La tabla guardada es de este archivo (las líneas nuevas las verifica el lector)"""
+        fuente = self.fuentes.get('participacion')
+        return (fuente is not None and 'participacion' in self.filas
+                and _mismo_archivo(ruta, fuente['ruta']))
+
+
+def restaurar(archivo=None):
+    """
+    Abre la instantánea para que las cargas siguientes la usen
+
+    Args:
+        archivo (str): Ruta de la instantánea (por defecto ARCHIVO_INSTANTANEA)
+
+    Returns:
+        Instantanea: Instantánea restaurada o None si no hay una válida
+    """
+    global _restaurada
+    if almacenamiento.obtener_backend() is not None:
+        return None
+    _restaurada = Instantanea.abrir(archivo or ARCHIVO_INSTANTANEA)
+    return _restaurada
+
+
+def cerrar():
+    """Deja de usar la instantánea restaurada (las cargas vuelven al texto)"""
+    global _restaurada
+    _restaurada = None
+
+
+def actualizar(archivo=None, carpeta=CARPETA_DATOS):
+    """
+    Guarda una instantánea nueva si los datos cambiaron desde la restaurada
+
+    Returns:
+        bool: True si se escribió una instantánea nueva
+    """
+    if almacenamiento.obtener_backend() is not None:
+        return False
+    if _restaurada is not None and _restaurada.al_dia():
+        return False
+    return guardar(archivo, carpeta)
+
+
+# ---------------------------------------------------------
+# CARGAS DESDE LA INSTANTÁNEA (None = cargar del texto)
+# ---------------------------------------------------------
+
+def empleados(archivo):
+    """Empleados de la instantánea si corresponde a `archivo` y no cambió"""
+    if _restaurada is not None and _restaurada.vigente('empleados', archivo):
+        return _restaurada.empleados()
+    return None
+
+
+def actividades(archivo):
+    """Actividades de la instantánea si corresponde a `archivo` y no cambió"""
+    if _restaurada is not None and _restaurada.vigente('actividades', archivo):
+        return _restaurada.actividades()
+    return None
+
+
+def registros(archivo):
+    """Registros de la instantánea y las líneas agregadas a `archivo` después"""
+    if _restaurada is not None and _restaurada.participacion_vigente(archivo):
+        return _restaurada.registros()
+    return None
+
+
+def tabla(archivo):
+    """Lector y tabla de la instantánea para `archivo` (ver vectorizado.tabla_de_archivo)"""
+    if _restaurada is not None and _restaurada.participacion_vigente(archivo):
+        return _restaurada.tabla()
+    return None
@@ -0,0 +1,304 @@
+"""
+Módulo de instrumentación opcional de las rutas críticas
+
+Registra llamadas, tiempo real, tiempo de CPU, filas procesadas y bytes
+leídos/escritos por función o etapa. Está deshabilitado por defecto: en ese
+caso las funciones decoradas se ejecutan sin envoltura.
+
+Se habilita con habilitar() o con la variable de entorno
+WORK_COMFORT_METRICAS=<ruta.json|ruta.prom>, que además exporta las
+métricas al terminar el programa.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+_habilitado = False
+_metricas = {}
+# Pares (función original, versión medida) registrados con @medir
+_instrumentadas = []
+_candado = threading.Lock()
+
+
+class Metrica:
+    """Acumulado de una función o etapa instrumentada"""
+
+    def __init__(self):
+        self.llamadas = 0
+        self.segundos = 0.0
+        self.cpu_segundos = 0.0
+        self.filas = 0
+        self.bytes_leidos = 0
+        self.bytes_escritos = 0
+
+    def to_dict(self):
+        """Convierte la métrica a diccionario serializable"""
+        return {
+            'llamadas': self.llamadas,
+            'segundos': round(self.segundos, 6),
+            'cpu_segundos': round(self.cpu_segundos, 6),
+            'filas': self.filas,
+            'bytes_leidos': self.bytes_leidos,
+            'bytes_escritos': self.bytes_escritos,
+        }
+
+
+def habilitar():
+    """Activa la recolección de métricas"""
+    global _habilitado
+    if not _habilitado:
+        _habilitado = True
+        _aplicar(True)
+
+
+def deshabilitar():
+    """Desactiva la recolección de métricas (las acumuladas se conservan)"""
+    global _habilitado
+    if _habilitado:
+        _habilitado = False
+        _aplicar(False)
+
+
+def esta_habilitado():
+    """Indica si la recolección de métricas está activa"""
+    return _habilitado
+
+
+def reiniciar():
+    """Descarta todas las métricas acumuladas"""
+    with _candado:
+        _metricas.clear()
+
+
+def _registrar(nombre, llamadas=0, segundos=0.0, cpu_segundos=0.0,
+               filas=0, bytes_leidos=0, bytes_escritos=0):
+    with _candado:
+        metrica = _metricas.get(nombre)
+        if metrica is None:
+            metrica = _metricas[nombre] = Metrica()
+        metrica.llamadas += llamadas
+        metrica.segundos += segundos
+        metrica.cpu_segundos += cpu_segundos
+        metrica.filas += filas
+        metrica.bytes_leidos += bytes_leidos
+        metrica.bytes_escritos += bytes_escritos
+
+
+def contar(nombre, filas=0, bytes_leidos=0, bytes_escritos=0):
+    """
+    Suma filas o bytes a una métrica sin medir tiempo
+
+    Args:
+        nombre (str): Nombre de la métrica
+        filas (int): Filas procesadas
+        bytes_leidos (int): Bytes leídos de disco
+        bytes_escritos (int): Bytes escritos a disco
+    """
+    if _habilitado:
+        _registrar(nombre, filas=filas, bytes_leidos=bytes_leidos, bytes_escritos=bytes_escritos)
+
+
+def _filas_por_defecto(resultado):
+    return len(resultado) if isinstance(resultado, (list, dict)) else 0
+
+
+def una_fila(resultado):
+    """Cuenta una fila por cada objeto construido (para from_string)"""
+    return 0 if resultado is None else 1
+
+
+def _envolver(func, etiqueta, filas):
+    @functools.wraps(func)
+    def envoltura(*args, **kwargs):
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        resultado = func(*args, **kwargs)
+        _registrar(etiqueta, llamadas=1,
+                   segundos=time.perf_counter() - inicio,
+                   cpu_segundos=time.process_time() - inicio_cpu,
+                   filas=filas(resultado))
+        return resultado
+    return envoltura
+
+
+def _reemplazar(func, valor):
+    """Sustituye la función en su módulo o clase de origen"""
+    objetivo = sys.modules.get(func.__module__)
+    *ruta, nombre = func.__qualname__.split('.')
+    for parte in ruta:
+        objetivo = getattr(objetivo, parte, None)
+    if objetivo is None:
+        return
+    actual = objetivo.__dict__.get(nombre)
+    if isinstance(actual, staticmethod):
+        valor = staticmethod(valor)
+    setattr(objetivo, nombre, valor)
+
+
+def _aplicar(activar):
+    for func, envoltura in _instrumentadas:
+        _reemplazar(func, envoltura if activar else func)
+
+
+def medir(nombre=None, filas=_filas_por_defecto):
+    """
+    Decorador que mide llamadas, tiempo real y de CPU de una función
+
+    La función decorada se deja intacta; habilitar() la reemplaza en su
+    módulo (o clase) por la versión medida y deshabilitar() la restaura,
+    así la ruta deshabilitada no paga ningún costo por llamada. Solo se
+    miden las llamadas hechas a través del módulo o la clase
+    (ej: empleado.cargar_empleados, Empleado.from_string).
+
+    Args:
+        nombre (str): Nombre de la métrica (por defecto modulo.funcion)
+        filas (callable): Calcula las filas procesadas a partir del resultado
+
+    Returns:
+        callable: Decorador
+    """
+    def decorador(func):
+        etiqueta = nombre or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+        envoltura = _envolver(func, etiqueta, filas)
+        _instrumentadas.append((func, envoltura))
+        # Si ya está habilitada, el módulo recién importado queda medido
+        return envoltura if _habilitado else func
+    return decorador
+
+
+class Etapa:
+    """Administrador de contexto que mide una etapa dentro de una función"""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.filas = 0
+        self.bytes_leidos = 0
+        self.bytes_escritos = 0
+
+    def contar(self, filas=0, bytes_leidos=0, bytes_escritos=0):
+        """Suma filas o bytes procesados en la etapa"""
+        self.filas += filas
+        self.bytes_leidos += bytes_leidos
+        self.bytes_escritos += bytes_escritos
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        self._inicio_cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        _registrar(self.nombre, llamadas=1,
+                   segundos=time.perf_counter() - self._inicio,
+                   cpu_segundos=time.process_time() - self._inicio_cpu,
+                   filas=self.filas, bytes_leidos=self.bytes_leidos,
+                   bytes_escritos=self.bytes_escritos)
+        return False
+
+
+class _EtapaNula:
+    """Etapa sin efecto usada cuando la instrumentación está deshabilitada"""
+
+    def contar(self, filas=0, bytes_leidos=0, bytes_escritos=0):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_ETAPA_NULA = _EtapaNula()
+
+
+def etapa(nombre):
+    """
+    Crea el contexto de medición de una etapa
+
+    Args:
+        nombre (str): Nombre de la métrica (ej: 'reporte.general.escritura')
+
+    Returns:
+        Etapa: Contexto de medición (sin efecto si está deshabilitada)
+    """
+    return Etapa(nombre) if _habilitado else _ETAPA_NULA
+
+
+def obtener_metricas():
+    """
+    Devuelve una copia de las métricas acumuladas
+
+    Returns:
+        dict: nombre -> diccionario de la métrica
+    """
+    with _candado:
+        return {nombre: m.to_dict() for nombre, m in sorted(_metricas.items())}
+
+
+def exportar_json(archivo):
+    """Escribe las métricas acumuladas en formato JSON"""
+    os.makedirs(os.path.dirname(archivo) or '.', exist_ok=True)
+    with open(archivo, 'w', encoding='utf-8') as f:
+        json.dump(obtener_metricas(), f, ensure_ascii=False, indent=2)
+
+
+def formato_prometheus(prefijo='work_comfort'):
+    """
+    Genera las métricas en formato de texto de Prometheus
+
+    Args:
+        prefijo (str): Prefijo de los nombres de métrica
+
+    Returns:
+        str: Texto listo para un archivo .prom o un endpoint /metrics
+    """
+    metricas = obtener_metricas()
+    series = [
+        ('llamadas', 'llamadas_total', 'Número de llamadas'),
+        ('segundos', 'segundos_total', 'Tiempo real acumulado en segundos'),
+        ('cpu_segundos', 'cpu_segundos_total', 'Tiempo de CPU acumulado en segundos'),
+        ('filas', 'filas_total', 'Filas procesadas'),
+        ('bytes_leidos', 'bytes_leidos_total', 'Bytes leídos de disco'),
+        ('bytes_escritos', 'bytes_escritos_total', 'Bytes escritos a disco'),
+    ]
+    lineas = []
+    for campo, sufijo, ayuda in series:
+        nombre_serie = f"{prefijo}_{sufijo}"
+        lineas.append(f"# HELP {nombre_serie} {ayuda}")
+        lineas.append(f"# TYPE {nombre_serie} counter")
+        for nombre, valores in metricas.items():
+            lineas.append(f'{nombre_serie}{{funcion="{nombre}"}} {valores[campo]}')
+    return '\n'.join(lineas) + '\n'
+
+
+def exportar_prometheus(archivo):
+    """Escribe las métricas acumuladas en formato de texto de Prometheus"""
+    os.makedirs(os.path.dirname(archivo) or '.', exist_ok=True)
+    with open(archivo, 'w', encoding='utf-8') as f:
+        f.write(formato_prometheus())
+
+
+def configurar_desde_entorno(variable='WORK_COMFORT_METRICAS'):
+    """
+    Habilita la instrumentación si la variable de entorno indica un archivo
+
+    Al terminar el proceso se exportan las métricas en JSON o, si la ruta
+    termina en .prom, en formato Prometheus.
+
+    Args:
+        variable (str): Nombre de la variable de entorno
+
+    Returns:
+        str: Ruta de exportación configurada o None
+    """
+    archivo = os.environ.get(variable)
+    if not archivo:
+        return None
+    habilitar()
+    exportar = exportar_prometheus if archivo.endswith('.prom') else exportar_json
+    atexit.register(exportar, archivo)
+    return archivo
@@ -0,0 +1,353 @@
+"""
+Módulo invitacion: convocatorias de las actividades y ausencias calculadas
+
+La tasa de participación es asistencias / registros: para que refleje a
+quienes no fueron había que guardar una fila "No asistió" por cada
+ausente, y con actividades abiertas a áreas enteras eso multiplica el
+archivo de participación por la cantidad de convocados.
+
+Una invitación guarda a quién se convocó a una actividad en una sola
+línea de invitaciones.txt:
+
+    actividad_id|area1;area2|1-20,35,40-42
+
+(áreas completas y/o una lista de ids comprimida en rangos). Los ausentes
+no se escriben: al calcular estadísticas y reportes se obtienen como
+invitados - empleados con registro en la actividad. Las áreas se
+resuelven con los empleados actuales; una fila "No asistió" explícita
+sigue contando como ausencia y no se cuenta dos veces.
+
+Las invitaciones van siempre en un archivo de texto (en la carpeta del
+backend de texto o en src/data con SQLite); una actividad puede volver a
+invitarse y vale la última línea.
+"""
+
+import os
+
+from . import actividad, almacenamiento, codificacion, diagnostico, listados, vectorizado
+
+# Ids que puede expandir un texto ('1-999999999' agotaría la memoria)
+MAXIMO_IDS = 100_000
+
+
+def ruta_invitaciones():
+    """Archivo de invitaciones según el backend activo"""
+    backend = almacenamiento.obtener_backend()
+    if isinstance(backend, almacenamiento.BackendTexto):
+        return os.path.join(backend.carpeta, 'invitaciones.txt')
+    return 'src/data/invitaciones.txt'
+
+
+def expandir_ids(texto, maximo=None):
+    """
+    Convierte '3, 8, 10-12' en [3, 8, 10, 11, 12]
+
+    Args:
+        texto (str): Ids y rangos separados por coma o espacio
+        maximo (int): Id más alto conocido; uno mayor es un error (opcional)
+
+    Returns:
+        list: Ids en el orden escrito, sin repetir
+
+    Raises:
+        ValueError: Si algún elemento no es un id ni un rango válido, pasa
+            de `maximo` o el total pasa de MAXIMO_IDS
+    """
+    ids = {}
+    for parte in texto.replace(',', ' ').split():
+        desde, guion, hasta = parte.partition('-')
+        if not desde.isdigit() or (guion and not hasta.isdigit()):
+            raise ValueError(f"'{parte}' no es un id ni un rango (p. ej. 10-20)")
+        inicio, fin = int(desde), int(hasta) if guion else int(desde)
+        if fin < inicio:
+            raise ValueError(f"Rango invertido: '{parte}'")
+        if maximo is not None and fin > maximo:
+            raise ValueError(f"'{parte}' pasa del id más alto ({maximo})")
+        if len(ids) + fin - inicio + 1 > MAXIMO_IDS:
+            raise ValueError(f"'{parte}' supera el máximo de {MAXIMO_IDS} ids")
+        ids.update(dict.fromkeys(range(inicio, fin + 1)))
+    return list(ids)
+
+
+def comprimir_ids(ids):
+    """
+    Convierte [3, 8, 10, 11, 12] en '3,8,10-12'
+
+    Args:
+        ids (iterable): Ids de empleado
+
+    Returns:
+        str: Ids ordenados, con los consecutivos como rangos
+    """
+    partes = []
+    ordenados = sorted(set(ids))
+    i = 0
+    while i < len(ordenados):
+        j = i
+        while j + 1 < len(ordenados) and ordenados[j + 1] == ordenados[j] + 1:
+            j += 1
+        partes.append(str(ordenados[i]) if i == j else f"{ordenados[i]}-{ordenados[j]}")
+        i = j + 1
+    return ','.join(partes)
+
+
+class Invitacion:
+    """Empleados convocados a una actividad: áreas completas y/o ids sueltos"""
+
+    def __init__(self, actividad_id, areas=(), ids=()):
+        """
+        Args:
+            actividad_id (int): ID de la actividad
+            areas (iterable): Nombres de las áreas convocadas
+            ids (iterable): Ids de empleados convocados individualmente
+        """
+        self.actividad_id = actividad_id
+        self.areas = list(areas)
+        self.ids = sorted(set(ids))
+
+    def to_string(self):
+        """Convierte la invitación a formato de texto para guardar"""
+        return f"{self.actividad_id}|{';'.join(self.areas)}|{comprimir_ids(self.ids)}"
+
+    @staticmethod
+    def from_string(linea):
+        """
+        Crea una invitación desde una línea de texto
+
+        Args:
+            linea (str): Línea con formato: actividad_id|area1;area2|ids
+
+        Returns:
+            Invitacion: Invitación creada o None si la línea es inválida
+        """
+        try:
+            partes = linea.strip().split('|')
+            if len(partes) != 3:
+                raise ValueError("Formato inválido de invitación")
+            areas = [a.strip() for a in partes[1].split(';') if a.strip()]
+            return Invitacion(int(partes[0]), areas, expandir_ids(partes[2]))
+        except Exception as e:
+            diagnostico.error_parseo('invitacion', linea, e)
+            return None
+
+    def invitados(self, indice=None):
+        """
+        Ids de los empleados convocados que existen
+
+        Args:
+            indice (IndiceEmpleados): Índice de empleados (por defecto el compartido)
+
+        Returns:
+            set: Ids de empleado
+        """
+        indice = indice or listados.indice_empleados()
+        empleados = indice.empleados
+        resultado = set()
+        for area in self.areas:
+            codigo = codificacion.AREAS.buscar(area)
+            if codigo is not None:
+                resultado.update(empleados[p].id_empleado for p in indice.por_area.get(codigo, ()))
+        if self.ids:
+            existentes = {emp.id_empleado for emp in empleados}
+            resultado.update(i for i in self.ids if i in existentes)
+        return resultado
+
+    def __str__(self):
+        convocados = []
+        if self.areas:
+            convocados.append(f"áreas {', '.join(self.areas)}")
+        if self.ids:
+            convocados.append(f"ids {comprimir_ids(self.ids)}")
+        return f"Actividad {self.actividad_id}: {'; '.join(convocados) or 'sin convocados'}"
+
+
+def cargar_invitaciones(archivo=None):
+    """
+    Lee las invitaciones vigentes
+
+    Args:
+        archivo (str): Ruta del archivo (por defecto ruta_invitaciones())
+
+    Returns:
+        dict: actividad_id -> Invitacion (la última línea de cada actividad)
+    """
+    archivo = archivo or ruta_invitaciones()
+    invitaciones = {}
+    if not os.path.exists(archivo):
+        return invitaciones
+    with diagnostico.sesion_carga(archivo), open(archivo, 'r', encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                inv = Invitacion.from_string(linea)
+                if inv:
+                    invitaciones[inv.actividad_id] = inv
+    return invitaciones
+
+
+def obtener_invitacion(actividad_id, archivo=None):
+    """
+    Invitación vigente de una actividad
+
+    Returns:
+        Invitacion: Invitación o None si la actividad no tiene
+    """
+    return cargar_invitaciones(archivo).get(actividad_id)
+
+
+def guardar_invitacion(invitacion, archivo=None):
+    """
+    Guarda (o reemplaza) la invitación de una actividad
+
+    Args:
+        invitacion (Invitacion): Invitación a guardar
+        archivo (str): Ruta del archivo (por defecto ruta_invitaciones())
+    """
+    archivo = archivo or ruta_invitaciones()
+    try:
+        os.makedirs(os.path.dirname(archivo) or '.', exist_ok=True)
+        with open(archivo, 'a', encoding='utf-8') as f:
+            f.write(invitacion.to_string() + '\n')
+        print(f"✓ Invitación guardada ({invitacion})")
+    except Exception as e:
+        print(f"✗ Error al guardar la invitación: {e}")
+
+
+# ---------------------------------------------------------
+# AUSENCIAS CALCULADAS
+# ---------------------------------------------------------
+
+def registrados_por_actividad(actividad_ids, registros=None):
+    """
+    Empleados con algún registro (asistencia o ausencia) en cada actividad
+
+    Args:
+        actividad_ids (iterable): Actividades a consultar
+        registros: Lista de registros, TablaParticipacion o backend (por defecto el backend activo)
+
+    Returns:
+        dict: actividad_id -> set de ids de empleado
+    """
+    resultado = {actividad_id: set() for actividad_id in actividad_ids}
+    if not resultado:
+        return resultado
+    if registros is None:
+        registros = almacenamiento.obtener_backend()
+        if registros is None:
+            # Columnas leídas del archivo y reutilizadas mientras no cambie
+            registros = vectorizado.tabla_de_archivo()
+    if isinstance(registros, almacenamiento.BackendAlmacenamiento):
+        for actividad_id, empleados in resultado.items():
+            empleados.update(r.empleado_id for r in registros.obtener_registros_actividad(actividad_id))
+        return resultado
+    if isinstance(registros, vectorizado.TablaParticipacion):
+        if vectorizado.np is not None:
+            # Solo se pasan a Python las filas de las actividades consultadas
+            np = vectorizado.np
+            mascara = np.isin(registros.actividad_id, np.fromiter(resultado, dtype=np.int64))
+            pares = zip(registros.actividad_id[mascara].tolist(), registros.empleado_id[mascara].tolist())
+        else:
+            pares = zip(registros.actividad_id, registros.empleado_id)
+    else:
+        pares = ((r.actividad_id, r.empleado_id) for r in registros)
+    for actividad_id, empleado_id in pares:
+        empleados = resultado.get(actividad_id)
+        if empleados is not None:
+            empleados.add(empleado_id)
+    return resultado
+
+
+def ausentes(actividad_id=None, registros=None, invitaciones=None, empleados=None):
+    """
+    Invitados sin ningún registro en la actividad (ausencias no guardadas)
+
+    Quien pasa sus propios registros debe pasar también los empleados e
+    invitaciones de esos datos: los valores por defecto son los del
+    backend activo.
+
+    Args:
+        actividad_id (int): Limitar a una actividad (None = todas las invitadas)
+        registros: Lista de registros, TablaParticipacion o backend (por defecto el backend activo)
+        invitaciones (dict): Invitaciones ya cargadas (por defecto las del archivo)
+        empleados (list): Empleados con los que se resuelven áreas e ids (por defecto los actuales)
+
+    Returns:
+        dict: actividad_id -> set de ids de empleados ausentes
+    """
+    invitaciones = cargar_invitaciones() if invitaciones is None else invitaciones
+    if actividad_id is not None:
+        invitaciones = {actividad_id: invitaciones[actividad_id]} if actividad_id in invitaciones else {}
+    if not invitaciones:
+        return {}
+    indice = listados.indice_empleados() if empleados is None else listados.IndiceEmpleados(empleados)
+    registrados = registrados_por_actividad(invitaciones, registros)
+    return {actividad_id: inv.invitados(indice) - registrados[actividad_id]
+            for actividad_id, inv in invitaciones.items()}
+
+
+def contar_ausentes(actividad_id=None, registros=None, invitaciones=None, empleados=None):
+    """
+    Cantidad de ausencias calculadas por actividad (ver ausentes())
+
+    Returns:
+        dict: actividad_id -> cantidad
+    """
+    return {actividad_id: len(ids)
+            for actividad_id, ids in ausentes(actividad_id, registros, invitaciones, empleados).items()}
+
+
+# ---------------------------------------------------------
+# CONSOLA
+# ---------------------------------------------------------
+
+def pedir_convocados(actividad_id):
+    """
+    Pregunta a quiénes se convoca a una actividad
+
+    Args:
+        actividad_id (int): ID de la actividad
+
+    Returns:
+        Invitacion: Invitación armada (sin guardar) o None si se cancela
+    """
+    print(f"Áreas: {', '.join(listados.indice_empleados().areas())}")
+    areas = [a.strip() for a in input("Áreas convocadas, separadas por coma (Enter = ninguna): ").split(',')
+             if a.strip()]
+    desconocidas = [a for a in areas if codificacion.AREAS.buscar(a) is None]
+    if desconocidas:
+        print(f"⚠ Áreas sin empleados (se omiten): {', '.join(desconocidas)}")
+        areas = [a for a in areas if a not in desconocidas]
+    try:
+        ids = expandir_ids(input("Ids convocados además de las áreas (p. ej. 3,8,10-20; Enter = ninguno): "),
+                           maximo=listados.indice_empleados().mayor_id())
+    except ValueError as e:
+        print(f"✗ {e}")
+        return None
+    if not areas and not ids:
+        print("✗ No se convocó a nadie")
+        return None
+    return Invitacion(actividad_id, areas, ids)
+
+
+def registrar_invitacion_interactiva():
+    """Función interactiva para convocar empleados a una actividad"""
+    print("\n" + "="*60)
+    print("  INVITACIÓN A UNA ACTIVIDAD")
+    print("="*60)
+    try:
+        act_id = input("ID de la actividad: ").strip()
+        if not act_id.isdigit():
+            print("✗ El ID debe ser un número entero")
+            return
+        act = actividad.obtener_actividad_por_id(int(act_id))
+        if act is None:
+            print(f"✗ No existe la actividad {act_id}")
+            return
+        anterior = obtener_invitacion(act.id_actividad)
+        if anterior is not None:
+            print(f"⚠ Ya tiene invitación: {anterior} (la nueva la reemplaza)")
+        invitacion = pedir_convocados(act.id_actividad)
+        if invitacion is not None:
+            guardar_invitacion(invitacion)
+            print(f"  {len(invitacion.invitados())} empleados convocados")
+    except KeyboardInterrupt:
+        print("\n\n✗ Invitación cancelada por el usuario")
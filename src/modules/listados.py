@@ -0,0 +1,733 @@
+"""
+Módulo listados: listados paginados y filtrables de empleados y actividades
+
+Los índices se arman una vez por versión de los datos (se vuelven a armar
+solo si cambia el archivo o la base):
+
+- Empleados: posiciones por área, orden alfabético (global y por área)
+  para filtrar por prefijo del nombre (bisect) y trigramas del nombre
+  para la búsqueda.
+- Actividades: posiciones por tipo, orden por fecha (global y por tipo)
+  para filtrar por rango (bisect) y trigramas del nombre y de la
+  descripción.
+
+Un filtro devuelve una Seleccion (una porción de una lista de posiciones
+ya ordenada); cada página es un corte de esa lista, así mostrar la página
+100 cuesta lo mismo que la 1.
+
+La búsqueda por nombre compara sin mayúsculas ni acentos ('perez'
+encuentra a 'Pérez') y tolera errores de tipeo: cada palabra escrita se
+compara por trigramas con las palabras distintas de los nombres y puntúa
+según la parte de sus trigramas que comparte ('perz' ~ 'pérez'). Una
+palabra que es el comienzo de otra puntúa como coincidencia completa, así
+que sigue sirviendo como "typeahead" ('mar go' encuentra a 'María
+Gómez'). Los resultados se ordenan por puntaje.
+
+Agregar un empleado o una actividad con agregar_empleado/agregar_actividad
+actualiza el índice ya armado en lugar de descartarlo (ver alta()).
+"""
+
+import contextlib
+import heapq
+import os
+import unicodedata
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from itertools import islice, repeat
+
+from . import actividad, almacenamiento, codificacion, empleado
+
+TAMANO_PAGINA = 20
+RESULTADOS_BUSQUEDA = 10
+# Parte mínima de los trigramas de una palabra buscada que debe aparecer en otra
+SIMILITUD_MINIMA = 0.5
+# Peso de una coincidencia en la descripción frente a una en el nombre
+PESO_DESCRIPCION = 0.5
+
+
+def normalizar(texto):
+    """Forma del texto usada para comparar nombres (sin mayúsculas ni acentos)"""
+    if texto.isascii():
+        return texto.lower()
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+def _trigramas_palabra(palabra, completa=True):
+    """Trigramas de '  palabra' (y del espacio final si la palabra está completa)"""
+    relleno = f"  {palabra} " if completa else f"  {palabra}"
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceTrigramas:
+    """
+    Nombres normalizados -> posiciones, palabras -> nombres y trigramas -> palabras
+
+    Los nombres se repiten y sus palabras mucho más: los trigramas se
+    calculan sobre el vocabulario (las palabras distintas), cada palabra
+    guarda los nombres distintos que la contienen y cada nombre las
+    posiciones de los objetos que lo llevan. La búsqueda puntúa nombres
+    distintos y solo expande a posiciones los mejores.
+    """
+
+    def __init__(self, nombres):
+        """
+        Args:
+            nombres (list): Nombres en el orden de las posiciones
+        """
+        self.posiciones = {}
+        self.por_palabra = {}
+        self.por_trigrama = {}
+        self._claves = {}
+        # Vocabulario ordenado para las coincidencias por prefijo (se ordena al final)
+        self.vocabulario = None
+        for posicion, nombre in enumerate(nombres):
+            self.agregar(posicion, nombre)
+        self.vocabulario = sorted(self.por_palabra)
+
+    def clave(self, nombre):
+        """Nombre normalizado (se normaliza una vez por nombre distinto)"""
+        clave = self._claves.get(nombre)
+        if clave is None:
+            clave = self._claves[nombre] = normalizar(nombre)
+        return clave
+
+    def agregar(self, posicion, nombre):
+        """
+        Indexa un nombre nuevo
+
+        Args:
+            posicion (int): Posición del objeto en la lista indexada (creciente)
+            nombre (str): Nombre a indexar
+        """
+        clave = self.clave(nombre)
+        posiciones = self.posiciones.get(clave)
+        if posiciones is None:
+            posiciones = self.posiciones[clave] = []
+            for palabra in set(clave.split()):
+                con_palabra = self.por_palabra.get(palabra)
+                if con_palabra is None:
+                    con_palabra = self.por_palabra[palabra] = []
+                    for trigrama in _trigramas_palabra(palabra):
+                        self.por_trigrama.setdefault(trigrama, set()).add(palabra)
+                    if self.vocabulario is not None:
+                        insort(self.vocabulario, palabra)
+                con_palabra.append(clave)
+        posiciones.append(posicion)
+
+    def similares(self, buscada, minimo=SIMILITUD_MINIMA):
+        """
+        Palabras del vocabulario parecidas a una palabra buscada
+
+        Las que empiezan con la buscada puntúan 1. Las demás puntúan según
+        la parte de los trigramas de la buscada (sin el espacio final, como
+        si estuviera incompleta) que tienen, con un trigrama de más en el
+        divisor para que no lleguen a 1. Con menos de tres letras solo
+        cuentan los prefijos.
+
+        Args:
+            buscada (str): Palabra ya normalizada
+            minimo (float): Puntaje mínimo para incluir una palabra
+
+        Returns:
+            dict: palabra -> puntaje (0-1]
+        """
+        inicio = bisect_left(self.vocabulario, buscada)
+        fin = bisect_left(self.vocabulario, buscada + '\U0010ffff', inicio)
+        resultado = dict.fromkeys(self.vocabulario[inicio:fin], 1.0)
+        if len(buscada) < 3:
+            return resultado
+        trigramas = _trigramas_palabra(buscada, completa=False)
+        compartidos = Counter()
+        for trigrama in trigramas:
+            compartidos.update(self.por_trigrama.get(trigrama, ()))
+        necesarios = minimo * (len(trigramas) + 1)
+        for palabra, cantidad in compartidos.items():
+            if cantidad >= necesarios and palabra not in resultado:
+                resultado[palabra] = cantidad / (len(trigramas) + 1)
+        return resultado
+
+    def puntajes(self, texto, limite=None, minimo=SIMILITUD_MINIMA):
+        """
+        Puntaje de cada nombre distinto que se parece al texto
+
+        Todas las palabras del texto deben parecerse a alguna palabra del
+        nombre; el puntaje del nombre es el promedio del mejor puntaje de
+        cada palabra buscada.
+
+        Args:
+            texto (str): Una o más palabras (completas o no, con errores o no)
+            limite (int): Con una sola palabra, dejar de sumar nombres cuando
+                ya cubren esta cantidad de posiciones (None = todos)
+            minimo (float): Puntaje mínimo de cada palabra buscada
+
+        Returns:
+            dict: nombre normalizado -> puntaje (0-1]; sus posiciones están
+            en self.posiciones
+        """
+        buscadas = normalizar(texto).split()
+        if not buscadas:
+            return {}
+        similares = [self.similares(buscada, minimo) for buscada in buscadas]
+        if len(buscadas) == 1:
+            resultado = {}
+            cubiertas = 0
+            # Mejores palabras primero (a igual puntaje, en orden alfabético)
+            for palabra, puntaje in sorted(similares[0].items(), key=lambda x: (-x[1], x[0])):
+                for clave in self.por_palabra[palabra]:
+                    if clave not in resultado:
+                        resultado[clave] = puntaje
+                        cubiertas += len(self.posiciones[clave])
+                if limite is not None and cubiertas >= limite:
+                    break
+            return resultado
+
+        # Se parte de la palabra buscada con menos nombres candidatos, de
+        # sus mejores palabras a las peores, y las demás se verifican sobre
+        # las palabras de cada candidato
+        i = min(range(len(buscadas)),
+                key=lambda j: sum(len(self.por_palabra[palabra]) for palabra in similares[j]))
+        otras = similares[:i] + similares[i + 1:]
+        resultado = {}
+        vistos = set()
+        # Los `limite` mejores puntajes encontrados (uno por posición)
+        mejores = []
+        for palabra, puntaje_palabra in sorted(similares[i].items(), key=lambda x: (-x[1], x[0])):
+            # Lo máximo que puede sumar un candidato de esta palabra en adelante
+            if limite is not None and len(mejores) >= limite and \
+                    (puntaje_palabra + len(otras)) / len(buscadas) <= mejores[0]:
+                break
+            for clave in self.por_palabra[palabra]:
+                if clave in vistos:
+                    continue
+                vistos.add(clave)
+                puntaje = puntaje_palabra
+                palabras = clave.split()
+                for parecidas in otras:
+                    mejor = max(map(parecidas.get, palabras, repeat(0)))
+                    if not mejor:
+                        break
+                    puntaje += mejor
+                else:
+                    puntaje /= len(buscadas)
+                    resultado[clave] = puntaje
+                    if limite is not None:
+                        for _ in range(min(len(self.posiciones[clave]), limite)):
+                            if len(mejores) < limite:
+                                heapq.heappush(mejores, puntaje)
+                            elif puntaje > mejores[0]:
+                                heapq.heapreplace(mejores, puntaje)
+        return resultado
+
+    def por_posicion(self, puntajes):
+        """
+        Expande los puntajes de nombres a las posiciones que los llevan
+
+        Args:
+            puntajes (dict): nombre normalizado -> puntaje (ver puntajes())
+
+        Returns:
+            dict: posición -> puntaje
+        """
+        resultado = {}
+        for clave, puntaje in puntajes.items():
+            resultado.update(dict.fromkeys(self.posiciones[clave], puntaje))
+        return resultado
+
+    def mejores(self, texto, limite):
+        """
+        Posiciones de los nombres más parecidos al texto
+
+        Args:
+            texto (str): Una o más palabras
+            limite (int): Posiciones máximas
+
+        Returns:
+            list: Posiciones de mayor a menor puntaje (a igual puntaje, en orden)
+        """
+        niveles = {}
+        for clave, puntaje in self.puntajes(texto, limite).items():
+            niveles.setdefault(puntaje, []).append(self.posiciones[clave])
+        resultado = []
+        for puntaje in sorted(niveles, reverse=True):
+            # Las posiciones de cada nombre están en orden: basta mezclarlas
+            resultado.extend(islice(heapq.merge(*niveles[puntaje]), limite - len(resultado)))
+            if len(resultado) >= limite:
+                break
+        return resultado
+
+
+class Seleccion:
+    """Porción [inicio, fin) de una lista de posiciones, paginable sin copiarla"""
+
+    def __init__(self, posiciones, inicio=0, fin=None):
+        self.posiciones = posiciones
+        self.inicio = inicio
+        self.fin = len(posiciones) if fin is None else fin
+
+    def __len__(self):
+        return max(0, self.fin - self.inicio)
+
+    def __iter__(self):
+        return iter(self.posiciones[self.inicio:self.fin])
+
+    def corte(self, desde, hasta):
+        desde = self.inicio + max(0, desde)
+        return self.posiciones[desde:min(self.inicio + hasta, self.fin)]
+
+
+class Pagina:
+    """Una página de un listado"""
+
+    def __init__(self, elementos, numero, tamano, total):
+        """
+        Args:
+            elementos (list): Objetos de la página
+            numero (int): Número de página (desde 1)
+            tamano (int): Elementos por página
+            total (int): Elementos de todo el listado
+        """
+        self.elementos = elementos
+        self.numero = numero
+        self.tamano = tamano
+        self.total = total
+
+    @property
+    def total_paginas(self):
+        return max(1, -(-self.total // self.tamano))
+
+    @property
+    def desde(self):
+        """Número del primer elemento de la página (desde 1)"""
+        return (self.numero - 1) * self.tamano + 1 if self.elementos else 0
+
+    @property
+    def hasta(self):
+        return self.desde + len(self.elementos) - 1 if self.elementos else 0
+
+    def pie(self):
+        """Texto 'Página x de y (a-b de n)'"""
+        return (f"Página {self.numero} de {self.total_paginas} "
+                f"({self.desde}-{self.hasta} de {self.total})")
+
+
+def paginar(objetos, seleccion, numero=1, tamano=TAMANO_PAGINA):
+    """
+    Arma una página de una selección
+
+    Args:
+        objetos (list): Lista completa indexada
+        seleccion (Seleccion): Posiciones filtradas y ordenadas
+        numero (int): Página pedida (se ajusta al rango válido)
+        tamano (int): Elementos por página
+
+    Returns:
+        Pagina: Página con los objetos correspondientes
+    """
+    total = len(seleccion)
+    numero = min(max(1, numero), max(1, -(-total // tamano)))
+    desde = (numero - 1) * tamano
+    return Pagina([objetos[p] for p in seleccion.corte(desde, desde + tamano)], numero, tamano, total)
+
+
+def _mejores(puntajes, limite, desempate):
+    """
+    Las posiciones de mayor puntaje
+
+    Args:
+        puntajes (dict): posición -> puntaje
+        limite (int): Posiciones máximas
+        desempate (callable): Clave para ordenar posiciones de igual puntaje
+
+    Returns:
+        list: Posiciones de mayor a menor puntaje
+    """
+    return heapq.nsmallest(limite, puntajes, key=lambda p: (-puntajes[p], desempate(p)))
+
+
+# ---------------------------------------------------------
+# EMPLEADOS
+# ---------------------------------------------------------
+
+class IndiceEmpleados:
+    """Índices de filtrado y búsqueda sobre la lista de empleados"""
+
+    def __init__(self, empleados):
+        """
+        Args:
+            empleados (list): Empleados en orden de registro
+        """
+        self.empleados = empleados
+        self.por_area = {}
+        for posicion, emp in enumerate(empleados):
+            self.por_area.setdefault(emp.codigo_area, []).append(posicion)
+        self.trigramas = IndiceTrigramas([emp.nombre for emp in empleados])
+        claves = [self.trigramas.clave(emp.nombre) for emp in empleados]
+        self.orden_nombre = sorted(range(len(empleados)), key=claves.__getitem__)
+        self.claves_nombre = [claves[p] for p in self.orden_nombre]
+        # Por área, (posiciones, claves) en orden de nombre: área + prefijo es un corte con bisect
+        self.nombres_por_area = {}
+        for posicion, clave in zip(self.orden_nombre, self.claves_nombre):
+            orden, claves_area = self.nombres_por_area.setdefault(empleados[posicion].codigo_area, ([], []))
+            orden.append(posicion)
+            claves_area.append(clave)
+
+    def agregar(self, emp):
+        """
+        Incorpora un empleado recién registrado sin rearmar el índice
+
+        Args:
+            emp (Empleado): Empleado agregado al final de los datos
+        """
+        posicion = len(self.empleados)
+        self.empleados.append(emp)
+        self.por_area.setdefault(emp.codigo_area, []).append(posicion)
+        self.trigramas.agregar(posicion, emp.nombre)
+        clave = self.trigramas.clave(emp.nombre)
+        for orden, claves in ((self.orden_nombre, self.claves_nombre),
+                              self.nombres_por_area.setdefault(emp.codigo_area, ([], []))):
+            lugar = bisect_right(claves, clave)
+            claves.insert(lugar, clave)
+            orden.insert(lugar, posicion)
+
+    def mayor_id(self):
+        """Id de empleado más alto (0 si no hay empleados)"""
+        return max((emp.id_empleado for emp in self.empleados), default=0)
+
+    def areas(self):
+        """Áreas con al menos un empleado, en orden alfabético"""
+        return sorted(codificacion.AREAS.etiqueta(codigo) for codigo in self.por_area)
+
+    def filtrar(self, area=None, prefijo=None):
+        """
+        Empleados de un área y/o cuyo nombre empieza con un prefijo
+
+        Args:
+            area (str): Área exacta (None = todas)
+            prefijo (str): Comienzo del nombre, sin distinguir mayúsculas (None = todos)
+
+        Returns:
+            Seleccion: Posiciones en orden de registro (alfabético si hay prefijo)
+        """
+        orden, claves = self.orden_nombre, self.claves_nombre
+        if area:
+            codigo = codificacion.AREAS.buscar(area)
+            if not prefijo:
+                return Seleccion(self.por_area.get(codigo, []))
+            orden, claves = self.nombres_por_area.get(codigo, ([], []))
+        if not prefijo:
+            return Seleccion(range(len(self.empleados)))
+        clave = normalizar(prefijo)
+        return Seleccion(orden, bisect_left(claves, clave), bisect_right(claves, clave + '\U0010ffff'))
+
+    def pagina(self, numero=1, tamano=TAMANO_PAGINA, area=None, prefijo=None):
+        """
+        Página del listado filtrado
+
+        Returns:
+            Pagina: Empleados de la página
+        """
+        return paginar(self.empleados, self.filtrar(area, prefijo), numero, tamano)
+
+    def buscar(self, texto, limite=RESULTADOS_BUSQUEDA):
+        """
+        Búsqueda aproximada por nombre, sin mayúsculas ni acentos
+
+        Args:
+            texto (str): Texto escrito hasta ahora
+            limite (int): Resultados máximos
+
+        Returns:
+            list: Empleados que coinciden, los más parecidos primero (a igual
+            puntaje, en orden de registro)
+        """
+        return [self.empleados[p] for p in self.trigramas.mejores(texto, limite)]
+
+
+# ---------------------------------------------------------
+# ACTIVIDADES
+# ---------------------------------------------------------
+
+class IndiceActividades:
+    """Índices de filtrado y búsqueda sobre la lista de actividades"""
+
+    def __init__(self, actividades):
+        """
+        Args:
+            actividades (list): Actividades en orden de registro
+        """
+        self.actividades = actividades
+        self.por_tipo = {}
+        # id -> posición de la primera actividad con ese id
+        self.por_id = {}
+        for posicion, act in enumerate(actividades):
+            self.por_tipo.setdefault(act.codigo_tipo, []).append(posicion)
+            self.por_id.setdefault(act.id_actividad, posicion)
+        self.orden_fecha = sorted(range(len(actividades)), key=lambda p: actividades[p].fecha)
+        self.fechas = [actividades[p].fecha for p in self.orden_fecha]
+        # Por tipo sin distinguir mayúsculas: posiciones en orden de registro y
+        # (posiciones, fechas) en orden de fecha, así tipo + rango es un corte con bisect
+        self.de_tipo = {}
+        for posicion, act in enumerate(actividades):
+            self.de_tipo.setdefault(act.tipo.lower(), []).append(posicion)
+        self.fechas_por_tipo = {}
+        for posicion, fecha in zip(self.orden_fecha, self.fechas):
+            orden, fechas = self.fechas_por_tipo.setdefault(actividades[posicion].tipo.lower(), ([], []))
+            orden.append(posicion)
+            fechas.append(fecha)
+        self.trigramas = IndiceTrigramas([act.nombre for act in actividades])
+        self.trigramas_descripcion = IndiceTrigramas([act.descripcion for act in actividades])
+
+    def agregar(self, act):
+        """
+        Incorpora una actividad recién registrada sin rearmar el índice
+
+        Args:
+            act (Actividad): Actividad agregada al final de los datos
+        """
+        posicion = len(self.actividades)
+        self.actividades.append(act)
+        self.por_tipo.setdefault(act.codigo_tipo, []).append(posicion)
+        self.por_id.setdefault(act.id_actividad, posicion)
+        self.de_tipo.setdefault(act.tipo.lower(), []).append(posicion)
+        for orden, fechas in ((self.orden_fecha, self.fechas),
+                              self.fechas_por_tipo.setdefault(act.tipo.lower(), ([], []))):
+            lugar = bisect_right(fechas, act.fecha)
+            fechas.insert(lugar, act.fecha)
+            orden.insert(lugar, posicion)
+        self.trigramas.agregar(posicion, act.nombre)
+        self.trigramas_descripcion.agregar(posicion, act.descripcion)
+
+    def obtener(self, id_actividad):
+        """
+        Busca una actividad por id (si el id se repite, vale la primera)
+
+        Args:
+            id_actividad (int): Id buscado
+
+        Returns:
+            Actividad: Actividad encontrada o None
+        """
+        posicion = self.por_id.get(id_actividad)
+        return None if posicion is None else self.actividades[posicion]
+
+    def mayor_id(self):
+        """Id de actividad más alto (0 si no hay actividades)"""
+        return max((act.id_actividad for act in self.actividades), default=0)
+
+    def tipos(self):
+        """Tipos con al menos una actividad, en orden alfabético"""
+        return sorted(codificacion.TIPOS.etiqueta(codigo) for codigo in self.por_tipo)
+
+    def filtrar(self, tipo=None, desde=None, hasta=None):
+        """
+        Actividades de un tipo y/o dentro de un rango de fechas
+
+        Args:
+            tipo (str): Tipo exacto, sin distinguir mayúsculas (None = todos)
+            desde (str | date): Fecha inicial inclusive (None = sin límite)
+            hasta (str | date): Fecha final inclusive (None = sin límite)
+
+        Returns:
+            Seleccion: Posiciones en orden de registro (por fecha si hay rango)
+        """
+        con_rango = desde is not None or hasta is not None
+        orden, fechas = self.orden_fecha, self.fechas
+        if tipo:
+            if not con_rango:
+                return Seleccion(self.de_tipo.get(tipo.lower(), []))
+            orden, fechas = self.fechas_por_tipo.get(tipo.lower(), ([], []))
+        elif not con_rango:
+            return Seleccion(range(len(self.actividades)))
+        inicio = bisect_left(fechas, actividad.parsear_fecha(desde)) if desde is not None else 0
+        fin = bisect_right(fechas, actividad.parsear_fecha(hasta)) if hasta is not None else len(fechas)
+        return Seleccion(orden, inicio, fin)
+
+    def pagina(self, numero=1, tamano=TAMANO_PAGINA, tipo=None, desde=None, hasta=None):
+        """
+        Página del listado filtrado
+
+        Returns:
+            Pagina: Actividades de la página
+        """
+        return paginar(self.actividades, self.filtrar(tipo, desde, hasta), numero, tamano)
+
+    def buscar(self, texto, limite=RESULTADOS_BUSQUEDA):
+        """
+        Búsqueda aproximada por nombre y descripción, sin mayúsculas ni acentos
+
+        Una coincidencia en la descripción vale PESO_DESCRIPCION de una en
+        el nombre.
+
+        Args:
+            texto (str): Texto escrito hasta ahora
+            limite (int): Resultados máximos
+
+        Returns:
+            list: Actividades que coinciden, las más parecidas primero (a
+            igual puntaje, las más recientes)
+        """
+        descripcion = self.trigramas_descripcion
+        puntajes = {p: puntaje * PESO_DESCRIPCION
+                    for p, puntaje in descripcion.por_posicion(descripcion.puntajes(texto)).items()}
+        for p, puntaje in self.trigramas.por_posicion(self.trigramas.puntajes(texto)).items():
+            if puntaje > puntajes.get(p, 0):
+                puntajes[p] = puntaje
+        actividades = self.actividades
+        return [actividades[p] for p in _mejores(puntajes, limite, lambda p: -actividades[p].fecha.toordinal())]
+
+
+# ---------------------------------------------------------
+# ÍNDICES COMPARTIDOS
+# ---------------------------------------------------------
+
+_indices = {}
+
+
+def firma_datos(nombre_archivo):
+    """
+    Identifica la versión de los datos: backend activo y estado de sus archivos
+
+    Args:
+        nombre_archivo (str): Archivo con el backend de texto ('empleados.txt', ...)
+
+    Returns:
+        tuple: Firma comparable con ==, o None si el backend no tiene archivos
+    """
+    backend = almacenamiento.obtener_backend()
+    if backend is None:
+        rutas = [os.path.join('src/data', nombre_archivo)]
+    elif isinstance(backend, almacenamiento.BackendSQLite):
+        rutas = [backend.ruta, backend.ruta + '-wal']
+    elif isinstance(backend, almacenamiento.BackendTexto):
+        rutas = [os.path.join(backend.carpeta, nombre_archivo)]
+    else:
+        return None
+    estado = []
+    for ruta in rutas:
+        try:
+            st = os.stat(ruta)
+            estado.append((ruta, st.st_ino, st.st_size, st.st_mtime_ns))
+        except OSError:
+            estado.append((ruta, None))
+    return id(backend), tuple(estado)
+
+
+def _indice(nombre, nombre_archivo, construir):
+    firma = firma_datos(nombre_archivo)
+    guardado = _indices.get(nombre)
+    if firma is None or guardado is None or guardado[0] != firma:
+        guardado = _indices[nombre] = (firma, construir())
+    return guardado[1]
+
+
+def indice_empleados():
+    """
+    Índice de los empleados actuales (se vuelve a armar si cambiaron los datos)
+
+    Returns:
+        IndiceEmpleados: Índice compartido
+    """
+    return _indice('empleados', 'empleados.txt',
+                   lambda: IndiceEmpleados(empleado.cargar_empleados()))
+
+
+def indice_actividades():
+    """
+    Índice de las actividades actuales (se vuelve a armar si cambiaron los datos)
+
+    Returns:
+        IndiceActividades: Índice compartido
+    """
+    return _indice('actividades', 'actividades.txt',
+                   lambda: IndiceActividades(actividad.cargar_actividades()))
+
+
+# nombre del índice -> archivo de datos del backend de texto
+_ARCHIVOS = {'empleados': 'empleados.txt', 'actividades': 'actividades.txt'}
+
+
+@contextlib.contextmanager
+def alta(nombre, objeto, archivo):
+    """
+    Mantiene al día el índice compartido alrededor de una escritura
+
+    Si el índice estaba al día antes de escribir, al terminar sin errores
+    se le agrega el objeto y se toma la nueva versión de los datos como
+    propia; si no lo estaba (o se escribe en otro archivo), se deja como
+    está y se rearma en la próxima consulta.
+
+    Args:
+        nombre (str): 'empleados' o 'actividades'
+        objeto: Empleado o Actividad que se va a agregar
+        archivo (str): Archivo en el que escribe el backend de texto
+    """
+    nombre_archivo = _ARCHIVOS[nombre]
+    guardado = _indices.get(nombre)
+    al_dia = (guardado is not None and guardado[0] is not None
+              and guardado[0] == firma_datos(nombre_archivo)
+              and (almacenamiento.obtener_backend() is not None
+                   or os.path.normpath(archivo) == os.path.normpath(os.path.join('src/data', nombre_archivo))))
+    yield
+    if al_dia and _indices.get(nombre) is guardado:
+        guardado[1].agregar(objeto)
+        _indices[nombre] = (firma_datos(nombre_archivo), guardado[1])
+
+
+# ---------------------------------------------------------
+# NAVEGACIÓN EN CONSOLA
+# ---------------------------------------------------------
+
+def navegar(mostrar, pedir_filtros, buscar):
+    """
+    Recorre un listado página por página desde la consola
+
+    Args:
+        mostrar (callable): mostrar(numero, filtros) imprime la página y devuelve la Pagina
+        pedir_filtros (callable): Pregunta los filtros y devuelve un dict ({} = sin filtros)
+        buscar (callable): buscar(texto) imprime los resultados de una búsqueda por nombre
+    """
+    filtros = {}
+    numero = 1
+    while True:
+        pagina = mostrar(numero, filtros)
+        if pagina is None:
+            return
+        print("[Enter] siguiente  [a] anterior  [número] ir a la página  "
+              "[f] filtrar  [b] buscar por nombre  [0] volver")
+        opcion = input("> ").strip().lower()
+        if opcion == '0':
+            return
+        if opcion == '':
+            if pagina.numero >= pagina.total_paginas:
+                return
+            numero = pagina.numero + 1
+        elif opcion == 'a':
+            numero = max(1, pagina.numero - 1)
+        elif opcion.isdigit():
+            numero = int(opcion)
+        elif opcion == 'f':
+            filtros = pedir_filtros()
+            numero = 1
+        elif opcion == 'b':
+            texto = input("Nombre (una o más palabras, completas o no): ").strip()
+            if texto:
+                buscar(texto)
+                input("\nPresione Enter para volver al listado...")
+        else:
+            print("✗ Opción no válida")
+
+
+def fecha_opcional(texto):
+    """
+    Convierte una fecha escrita por el usuario (vacía = sin límite)
+
+    Returns:
+        date: Fecha o None
+
+    Raises:
+        ValueError: Si la fecha no es válida
+    """
+    texto = texto.strip()
+    return actividad.parsear_fecha(texto) if texto else None
+
@@ -0,0 +1,276 @@
+"""
+Módulo de mantenimiento: compactación y migración de los datos (fuera de línea)
+
+- compactar_carpeta: recorre cada archivo de texto, deja una sola línea por
+  clave primaria (gana la última escrita), aparta las líneas inválidas en un
+  archivo de cuarentena y reescribe el archivo de forma atómica.
+- convertir: copia los datos entre backends ('texto:<carpeta>' y
+  'sqlite:<ruta.db>'); el destino se arma aparte y reemplaza al anterior.
+
+Pensado para ejecutarse con el sistema detenido:
+
+    PYTHONPATH=src python -m modules.mantenimiento compactar --carpeta src/data
+    PYTHONPATH=src python -m modules.mantenimiento convertir texto:src/data sqlite:src/data/work_comfort.db
+"""
+
+import os
+
+from . import actividad, almacenamiento, diagnostico, empleado, registro
+
+# Tamaño del buffer de lectura y escritura de los archivos de datos
+TAMANO_BUFFER = 1 << 20
+
+ARCHIVOS = {
+    'empleados': 'empleados.txt',
+    'actividades': 'actividades.txt',
+    'participacion': 'participacion.txt',
+}
+
+
+def _clase(entidad):
+    """Clase cuyo from_string lee las líneas de la entidad"""
+    return {'empleados': empleado.Empleado,
+            'actividades': actividad.Actividad,
+            'participacion': registro.Registro}[entidad]
+
+
+def _clave(entidad, obj):
+    """Clave primaria de un objeto de la entidad"""
+    if entidad == 'empleados':
+        return obj.id_empleado
+    if entidad == 'actividades':
+        return obj.id_actividad
+    return (obj.empleado_id, obj.actividad_id)
+
+
+def _escribir_atomico(ruta, lineas):
+    """
+    Escribe un archivo completo sin dejarlo a medias ante una falla
+
+    Las líneas van a un archivo temporal en la misma carpeta, que luego
+    reemplaza al original con os.replace (atómico en el mismo disco).
+
+    Args:
+        ruta (str): Archivo a reemplazar
+        lineas (iterable): Líneas con su salto de línea
+
+    Returns:
+        int: Bytes escritos
+    """
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8', buffering=TAMANO_BUFFER) as f:
+        f.writelines(lineas)
+        f.flush()
+        os.fsync(f.fileno())
+        escritos = f.tell()
+    os.replace(temporal, ruta)
+    return escritos
+
+
+def leer_deduplicado(ruta, entidad, archivo_cuarentena=None):
+    """
+    Lee un archivo de texto dejando el último objeto de cada clave
+
+    Args:
+        ruta (str): Archivo de datos
+        entidad (str): 'empleados', 'actividades' o 'participacion'
+        archivo_cuarentena (str): Archivo donde anexar las líneas inválidas (opcional)
+
+    Returns:
+        tuple: (dict clave -> objeto en orden de última escritura, dict de conteos)
+    """
+    from_string = _clase(entidad).from_string
+    objetos = {}
+    conteo = {'lineas': 0, 'validas': 0, 'duplicadas': 0, 'invalidas': 0}
+    invalidas = []
+
+    if not os.path.exists(ruta):
+        diagnostico.archivo_inexistente(ruta)
+        return objetos, conteo
+
+    with diagnostico.sesion_carga(ruta), \
+            open(ruta, 'r', encoding='utf-8', buffering=TAMANO_BUFFER) as f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            conteo['lineas'] += 1
+            try:
+                obj = from_string(linea)
+            except diagnostico.ErrorDeParseo:
+                # En modo estricto la línea también va a cuarentena
+                obj = None
+            if obj is None:
+                conteo['invalidas'] += 1
+                invalidas.append(linea if linea.endswith('\n') else linea + '\n')
+                continue
+            conteo['validas'] += 1
+            clave = _clave(entidad, obj)
+            # Sacar la versión anterior para que la nueva quede en su posición
+            if objetos.pop(clave, None) is not None:
+                conteo['duplicadas'] += 1
+            objetos[clave] = obj
+
+    if invalidas and archivo_cuarentena:
+        os.makedirs(os.path.dirname(archivo_cuarentena) or '.', exist_ok=True)
+        with open(archivo_cuarentena, 'a', encoding='utf-8') as f:
+            f.writelines(invalidas)
+
+    return objetos, conteo
+
+
+def compactar_archivo(ruta, entidad, archivo_cuarentena=None):
+    """
+    Deduplica un archivo de datos y lo reescribe de forma atómica
+
+    Args:
+        ruta (str): Archivo de datos
+        entidad (str): 'empleados', 'actividades' o 'participacion'
+        archivo_cuarentena (str): Destino de las líneas inválidas
+            (por defecto <ruta>.cuarentena)
+
+    Returns:
+        dict: Conteos de líneas leídas, válidas, duplicadas, inválidas y escritas
+    """
+    if archivo_cuarentena is None:
+        archivo_cuarentena = ruta + '.cuarentena'
+    objetos, conteo = leer_deduplicado(ruta, entidad, archivo_cuarentena)
+    conteo['escritas'] = len(objetos)
+
+    # Solo se reescribe si hay algo que limpiar
+    if conteo['duplicadas'] or conteo['invalidas']:
+        _escribir_atomico(ruta, (obj.to_string() + '\n' for obj in objetos.values()))
+    return conteo
+
+
+def compactar_carpeta(carpeta='src/data'):
+    """
+    Compacta los tres archivos de datos de una carpeta
+
+    Si cambia participacion.txt se descarta el rollup guardado en la misma
+    carpeta, porque su offset ya no corresponde al archivo.
+
+    Args:
+        carpeta (str): Carpeta con empleados.txt, actividades.txt y participacion.txt
+
+    Returns:
+        dict: Conteos por entidad (ver compactar_archivo)
+    """
+    resultados = {}
+    for entidad, nombre in ARCHIVOS.items():
+        ruta = os.path.join(carpeta, nombre)
+        conteo = compactar_archivo(ruta, entidad)
+        resultados[entidad] = conteo
+        print(f"✓ {nombre}: {conteo['lineas']} líneas, {conteo['escritas']} escritas "
+              f"({conteo['duplicadas']} duplicadas, {conteo['invalidas']} inválidas)")
+        if conteo['invalidas']:
+            print(f"⚠ Líneas inválidas apartadas en {ruta}.cuarentena")
+
+    participacion = resultados['participacion']
+    rollup = os.path.join(carpeta, 'rollups.json')
+    if (participacion['duplicadas'] or participacion['invalidas']) and os.path.exists(rollup):
+        os.remove(rollup)
+    return resultados
+
+
+def _leer_origen(origen, entidad, resultados):
+    """Recorre los objetos de una entidad del backend de origen"""
+    if isinstance(origen, almacenamiento.BackendTexto):
+        # Los archivos de texto pueden tener duplicados e inválidos: se limpian al
+        # leer, sin tocar el origen (compactar_carpeta aparta las inválidas)
+        objetos, resultados[entidad] = leer_deduplicado(origen.rutas[entidad], entidad)
+        return objetos.values()
+    iteradores = {'empleados': origen.iterar_empleados,
+                  'actividades': origen.iterar_actividades,
+                  'participacion': origen.iterar_registros}
+    return iteradores[entidad]()
+
+
+def _convertir_a_texto(origen, destino, resultados):
+    for entidad in ARCHIVOS:
+        objetos = _leer_origen(origen, entidad, resultados)
+        escritos = _escribir_atomico(destino.rutas[entidad],
+                                     (obj.to_string() + '\n' for obj in objetos))
+        print(f"✓ {destino.rutas[entidad]}: {escritos} bytes")
+
+
+def _convertir_a_sqlite(origen, destino, resultados):
+    # La base nueva se arma en un archivo aparte y reemplaza a la anterior al final
+    destino.cerrar()
+    temporal = destino.ruta + '.tmp'
+    for sufijo in ('', '-wal', '-shm'):
+        if os.path.exists(temporal + sufijo):
+            os.remove(temporal + sufijo)
+
+    nuevo = almacenamiento.BackendSQLite(temporal)
+    nuevo.importar(_leer_origen(origen, 'empleados', resultados),
+                   _leer_origen(origen, 'actividades', resultados),
+                   _leer_origen(origen, 'participacion', resultados))
+    # Al cerrar la última conexión SQLite vuelca el WAL en el archivo principal
+    nuevo.cerrar()
+
+    for sufijo in ('-wal', '-shm'):
+        if os.path.exists(destino.ruta + sufijo):
+            os.remove(destino.ruta + sufijo)
+    os.replace(temporal, destino.ruta)
+    print(f"✓ {destino.ruta}: {os.path.getsize(destino.ruta)} bytes")
+
+
+def convertir(especificacion_origen, especificacion_destino):
+    """
+    Copia todos los datos de un backend a otro
+
+    El destino queda con el mismo contenido que el origen (se reemplaza, no
+    se mezcla). Desde texto se aplica la misma deduplicación que en
+    compactar_archivo y las líneas inválidas se omiten.
+
+    Args:
+        especificacion_origen (str): 'texto:<carpeta>' o 'sqlite:<ruta.db>'
+        especificacion_destino (str): 'texto:<carpeta>' o 'sqlite:<ruta.db>'
+
+    Returns:
+        dict: Conteos por entidad leída desde texto (vacío si el origen es SQLite)
+
+    Raises:
+        ValueError: Si origen y destino son el mismo o el backend no existe
+    """
+    origen = almacenamiento.crear_backend(especificacion_origen)
+    destino = almacenamiento.crear_backend(especificacion_destino)
+    ruta_origen = getattr(origen, 'ruta', getattr(origen, 'carpeta', None))
+    ruta_destino = getattr(destino, 'ruta', getattr(destino, 'carpeta', None))
+    if type(origen) is type(destino) and os.path.abspath(ruta_origen) == os.path.abspath(ruta_destino):
+        raise ValueError("El origen y el destino son el mismo; use compactar")
+
+    resultados = {}
+    if isinstance(destino, almacenamiento.BackendSQLite):
+        _convertir_a_sqlite(origen, destino, resultados)
+    else:
+        _convertir_a_texto(origen, destino, resultados)
+
+    if isinstance(origen, almacenamiento.BackendSQLite):
+        origen.cerrar()
+    for entidad, conteo in resultados.items():
+        if conteo['duplicadas'] or conteo['invalidas']:
+            print(f"⚠ {entidad}: {conteo['duplicadas']} duplicadas descartadas, "
+                  f"{conteo['invalidas']} inválidas omitidas")
+    return resultados
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mantenimiento de los datos de Work Comfort")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p_compactar = comandos.add_parser('compactar', help="Deduplica y limpia los archivos de texto")
+    p_compactar.add_argument('--carpeta', default='src/data')
+
+    p_convertir = comandos.add_parser('convertir', help="Copia los datos entre backends")
+    p_convertir.add_argument('origen', help="texto:<carpeta> o sqlite:<ruta.db>")
+    p_convertir.add_argument('destino', help="texto:<carpeta> o sqlite:<ruta.db>")
+
+    args = parser.parse_args()
+    if args.comando == 'compactar':
+        compactar_carpeta(args.carpeta)
+    else:
+        convertir(args.origen, args.destino)
@@ -0,0 +1,328 @@
+"""
+Módulo mapa_bits: conjuntos de enteros como mapas de bits comprimidos
+
+Un MapaBits guarda un conjunto de enteros no negativos (índices densos de
+empleado) al estilo Roaring: los 16 bits altos eligen un bloque y cada
+bloque guarda los 16 bits bajos según su densidad:
+
+- hasta MAXIMO_ARREGLO valores: lista ordenada;
+- más: un int de Python usado como conjunto de bits (bit i = valor i).
+
+Unión, intersección y diferencia trabajan bloque a bloque; entre dos
+bloques de bits son una sola operación de int (&, |, & ~) que Python hace
+en C sobre 8 KB. Cada resultado vuelve a la representación que le
+corresponde por su tamaño, así dos conjuntos iguales tienen siempre los
+mismos bloques y se comparan con ==.
+
+Los mapas no se modifican después de armados, así que cada uno recuerda
+la versión en bits de sus bloques de lista la primera vez que una unión o
+una diferencia la necesita: la siguiente consulta sobre los mismos mapas
+(p. ej. los asistentes de cada actividad) ya es solo operaciones de int.
+"""
+
+from bisect import bisect_left
+from itertools import compress, groupby
+
+BITS_BLOQUE = 16
+TAMANO_BLOQUE = 1 << BITS_BLOQUE
+MASCARA_BLOQUE = TAMANO_BLOQUE - 1
+# Más valores que esto en un bloque ocupan menos como bits (8 KB) que como lista
+MAXIMO_ARREGLO = 4096
+
+if hasattr(int, 'bit_count'):
+    _contar_bits = int.bit_count
+else:  # Python < 3.10
+    def _contar_bits(bits):
+        return bin(bits).count('1')
+
+# '0'/'1' de bin() -> bytes 0/1 para itertools.compress
+_CEROS_UNOS = str.maketrans('01', '\x00\x01')
+
+
+def _a_bits(bloque):
+    """Bloque (lista o bits) como int de bits"""
+    if type(bloque) is not list:
+        return bloque
+    datos = bytearray(TAMANO_BLOQUE // 8)
+    for valor in bloque:
+        datos[valor >> 3] |= 1 << (valor & 7)
+    return int.from_bytes(datos, 'little')
+
+
+def _a_lista(bloque):
+    """Bloque (lista o bits) como lista ordenada de valores"""
+    if type(bloque) is list:
+        return bloque
+    marcas = bin(bloque)[:1:-1].translate(_CEROS_UNOS).encode('ascii')
+    return list(compress(range(len(marcas)), marcas))
+
+
+def _normalizar(bloque):
+    """Representación según el tamaño; None si el bloque quedó vacío"""
+    if type(bloque) is list:
+        if len(bloque) > MAXIMO_ARREGLO:
+            return _a_bits(bloque)
+        return bloque or None
+    cantidad = _contar_bits(bloque)
+    if cantidad > MAXIMO_ARREGLO:
+        return bloque
+    return _a_lista(bloque) if cantidad else None
+
+
+def _filtrar(lista, bits, presentes):
+    """Valores de la lista que están (o no) en el bloque de bits"""
+    datos = bits.to_bytes(TAMANO_BLOQUE // 8, 'little')
+    return [v for v in lista if bool(datos[v >> 3] >> (v & 7) & 1) is presentes]
+
+
+def _interseccion(a, b):
+    if type(a) is list:
+        if type(b) is list:
+            if len(a) > len(b):
+                a, b = b, a
+            conjunto = set(b)
+            return [v for v in a if v in conjunto] or None
+        return _filtrar(a, b, True) or None
+    if type(b) is list:
+        return _filtrar(b, a, True) or None
+    return _normalizar(a & b)
+
+
+def _diferencia(a, b):
+    if type(a) is list:
+        if type(b) is list:
+            conjunto = set(b)
+            return [v for v in a if v not in conjunto] or None
+        return _filtrar(a, b, False) or None
+    return _normalizar(a & ~_a_bits(b))
+
+
+def _cantidad(bloque):
+    return len(bloque) if type(bloque) is list else _contar_bits(bloque)
+
+
+class MapaBits:
+    """Conjunto de enteros no negativos en bloques de lista o de bits"""
+
+    __slots__ = ('bloques', '_como_bits')
+
+    def __init__(self, valores=()):
+        """
+        Args:
+            valores (iterable): Enteros no negativos, en cualquier orden y con repetidos
+        """
+        self.bloques = MapaBits.desde_ordenados(sorted(set(valores))).bloques
+        self._como_bits = None
+
+    @classmethod
+    def _de_bloques(cls, bloques):
+        mapa = cls.__new__(cls)
+        mapa.bloques = bloques
+        mapa._como_bits = None
+        return mapa
+
+    def _bits(self, clave):
+        """Bloque de la clave como int de bits (recordado si era una lista)"""
+        bloque = self.bloques[clave]
+        if type(bloque) is not list:
+            return bloque
+        if self._como_bits is None:
+            self._como_bits = {}
+        bits = self._como_bits.get(clave)
+        if bits is None:
+            bits = self._como_bits[clave] = _a_bits(bloque)
+        return bits
+
+    @classmethod
+    def desde_ordenados(cls, valores):
+        """
+        Crea el mapa a partir de valores ordenados y sin repetir (sin verificarlo)
+
+        Args:
+            valores (iterable): Enteros no negativos crecientes
+
+        Returns:
+            MapaBits: Mapa con esos valores
+        """
+        bloques = {}
+        for clave, grupo in groupby(valores, lambda v: v >> BITS_BLOQUE):
+            bloques[clave] = _normalizar([v & MASCARA_BLOQUE for v in grupo])
+        return cls._de_bloques(bloques)
+
+    @classmethod
+    def desde_bloques(cls, bloques):
+        """
+        Crea el mapa a partir de bloques ya armados
+
+        Args:
+            bloques (dict): clave alta -> lista ordenada de valores bajos o int de bits
+
+        Returns:
+            MapaBits: Mapa con los bloques normalizados (se omiten los vacíos)
+        """
+        normalizados = {}
+        for clave, bloque in bloques.items():
+            bloque = _normalizar(bloque)
+            if bloque is not None:
+                normalizados[clave] = bloque
+        return cls._de_bloques(normalizados)
+
+    @classmethod
+    def rango(cls, fin):
+        """
+        Mapa con todos los valores de 0 a fin - 1
+
+        Args:
+            fin (int): Primer valor que no se incluye
+
+        Returns:
+            MapaBits: Mapa completo
+        """
+        bloques = {}
+        for clave in range(-(-fin // TAMANO_BLOQUE)):
+            ultimo = min(TAMANO_BLOQUE, fin - (clave << BITS_BLOQUE))
+            bloques[clave] = _normalizar((1 << ultimo) - 1)
+        return cls._de_bloques(bloques)
+
+    # --- Consultas ---
+
+    def __len__(self):
+        return sum(map(_cantidad, self.bloques.values()))
+
+    def contar(self):
+        """Cantidad de valores (igual que len)"""
+        return len(self)
+
+    def __bool__(self):
+        return bool(self.bloques)
+
+    def __contains__(self, valor):
+        bloque = self.bloques.get(valor >> BITS_BLOQUE)
+        if bloque is None:
+            return False
+        bajo = valor & MASCARA_BLOQUE
+        if type(bloque) is list:
+            i = bisect_left(bloque, bajo)
+            return i < len(bloque) and bloque[i] == bajo
+        return bool(bloque >> bajo & 1)
+
+    def __iter__(self):
+        """Valores en orden creciente"""
+        for clave in sorted(self.bloques):
+            base = clave << BITS_BLOQUE
+            for bajo in _a_lista(self.bloques[clave]):
+                yield base + bajo
+
+    def __eq__(self, otro):
+        return isinstance(otro, MapaBits) and self.bloques == otro.bloques
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"MapaBits({len(self)} valores, {len(self.bloques)} bloques)"
+
+    # --- Operaciones de conjuntos ---
+
+    def union(self, otro):
+        """Valores que están en alguno de los dos mapas"""
+        return MapaBits.union_de((self, otro))
+
+    def interseccion(self, otro):
+        """Valores que están en los dos mapas"""
+        if len(self.bloques) > len(otro.bloques):
+            self, otro = otro, self
+        bloques = {}
+        for clave, bloque in self.bloques.items():
+            ajeno = otro.bloques.get(clave)
+            if ajeno is not None:
+                resultado = _interseccion(bloque, ajeno)
+                if resultado is not None:
+                    bloques[clave] = resultado
+        return MapaBits._de_bloques(bloques)
+
+    def diferencia(self, otro):
+        """Valores de este mapa que no están en el otro"""
+        bloques = {}
+        for clave, bloque in self.bloques.items():
+            ajeno = otro.bloques.get(clave)
+            if ajeno is None:
+                resultado = bloque
+            elif type(bloque) is list:
+                resultado = _diferencia(bloque, ajeno)
+            else:
+                resultado = _normalizar(bloque & ~otro._bits(clave))
+            if resultado is not None:
+                bloques[clave] = resultado
+        return MapaBits._de_bloques(bloques)
+
+    __or__ = union
+    __and__ = interseccion
+    __sub__ = diferencia
+
+    def contar_interseccion(self, otro):
+        """
+        Cantidad de valores en común, sin armar el mapa de la intersección
+
+        Returns:
+            int: len(self & otro)
+        """
+        total = 0
+        for clave, bloque in self.bloques.items():
+            ajeno = otro.bloques.get(clave)
+            if ajeno is None:
+                continue
+            if type(bloque) is list or type(ajeno) is list:
+                total += _cantidad(_interseccion(bloque, ajeno) or [])
+            else:
+                total += _contar_bits(bloque & ajeno)
+        return total
+
+    @staticmethod
+    def union_de(mapas):
+        """
+        Unión de muchos mapas, bloque a bloque en una sola pasada
+
+        Args:
+            mapas (iterable): Mapas a unir
+
+        Returns:
+            MapaBits: Valores que están en alguno
+        """
+        por_clave = {}
+        for mapa in mapas:
+            for clave in mapa.bloques:
+                por_clave.setdefault(clave, []).append(mapa)
+        bloques = {}
+        for clave, con_clave in por_clave.items():
+            lista = [mapa.bloques[clave] for mapa in con_clave]
+            if len(lista) == 1:
+                bloques[clave] = lista[0]
+                continue
+            if (all(type(b) is list for b in lista)
+                    and sum(map(len, lista)) <= MAXIMO_ARREGLO):
+                bloques[clave] = sorted(set().union(*lista))
+                continue
+            bits = 0
+            for mapa in con_clave:
+                bits |= mapa._bits(clave)
+            bloques[clave] = _normalizar(bits)
+        return MapaBits._de_bloques(bloques)
+
+    @staticmethod
+    def interseccion_de(mapas):
+        """
+        Intersección de muchos mapas, empezando por el más chico
+
+        Args:
+            mapas (iterable): Mapas a intersecar (al menos uno)
+
+        Returns:
+            MapaBits: Valores que están en todos
+        """
+        mapas = sorted(mapas, key=len)
+        resultado = mapas[0]
+        for mapa in mapas[1:]:
+            if not resultado:
+                break
+            resultado = resultado & mapa
+        return resultado
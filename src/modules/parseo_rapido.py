@@ -0,0 +1,192 @@
+"""
+Módulo parseo_rapido: conversión por lotes de las líneas de los archivos de datos
+
+Los from_string de Empleado, Actividad y Registro convierten una línea
+por llamada, cada una con su strip, su split y su bloque try/except. Acá
+el archivo se lee en bloques grandes y cada lote de líneas se convierte
+de una vez: se verifica con str.count que todas tengan la cantidad de
+campos esperada, se parte el lote completo por '|' y cada columna se
+convierte con map(int, ...) y se arman los objetos con map(Clase, ...).
+
+Si algo del lote no cumple el formato, el lote se divide en partes de
+LOTE_MINIMO líneas y las que siguen fallando pasan por from_string línea
+a línea, que informa cada línea inválida igual que antes.
+
+Solo los registros de participación tienen conversión por lotes. En
+empleados y actividades casi todo el tiempo se va en armar los objetos
+(con sus códigos de área, cargo, tipo y fecha) y por lotes no se ganaba
+nada medible, así que esas entidades siguen línea a línea.
+
+Mientras se arman los objetos de un lote se pausa el recolector de
+ciclos: con cientos de miles de objetos nuevos se dispararía decenas de
+veces sin encontrar nada que liberar (los objetos no forman ciclos).
+"""
+
+import contextlib
+import gc
+from itertools import repeat
+
+from . import actividad, diagnostico, empleado, instrumentacion, registro
+
+# Caracteres leídos por bloque
+TAMANO_BLOQUE = 1 << 20
+# Líneas por debajo de las cuales un lote con errores se procesa línea a línea
+LOTE_MINIMO = 512
+# Valores de una columna que se miran para decidir si conviene memorizar la conversión
+MUESTRA_REPETIDOS = 4096
+
+
+@contextlib.contextmanager
+def sin_recolector():
+    """Pausa el recolector de ciclos (si estaba activo) durante el bloque"""
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def _campos(lineas, separadores):
+    """Parte el lote por '|' si todas las líneas tienen `separadores` separadores"""
+    if set(map(str.count, lineas, repeat('|'))) != {separadores}:
+        raise ValueError("Cantidad de campos distinta en el lote")
+    return '|'.join(lineas).split('|')
+
+
+def _convertir_columna(columna, convertir):
+    """
+    Aplica convertir a cada valor; si hay pocos valores distintos, una vez por valor
+
+    Los ids de actividad y las calificaciones se repiten mucho: una búsqueda
+    en diccionario cuesta menos que volver a convertir. Se decide con una
+    muestra para no armar el conjunto de una columna casi sin repetidos
+    (los ids de empleado).
+    """
+    muestra = columna[:MUESTRA_REPETIDOS]
+    if len(set(muestra)) * 64 > len(muestra):
+        return map(convertir, columna)
+    return map({texto: convertir(texto) for texto in set(columna)}.__getitem__, columna)
+
+
+# Otras grafías ('true', 'FALSE', ...) pasan por from_string
+_ASISTIO = {'True': True, 'False': False}
+
+
+def _registros(lineas):
+    campos = _campos(lineas, 3)
+    return list(map(registro.Registro,
+                    _convertir_columna(campos[0::4], int), _convertir_columna(campos[1::4], int),
+                    map(_ASISTIO.__getitem__, campos[2::4]), _convertir_columna(campos[3::4], int)))
+
+
+# entidad -> (conversión por lotes o None, clase con from_string)
+CONVERSORES = {
+    'registro': (_registros, lambda: registro.Registro),
+    'empleado': (None, lambda: empleado.Empleado),
+    'actividad': (None, lambda: actividad.Actividad),
+}
+
+
+def _linea_a_linea(lineas, clase):
+    """Ruta con validación: from_string informa cada línea inválida"""
+    objetos = []
+    for linea in lineas:
+        if linea.strip():
+            objeto = clase.from_string(linea)
+            if objeto:
+                objetos.append(objeto)
+    return objetos
+
+
+def convertir_lineas(lineas, entidad):
+    """
+    Convierte líneas (sin el salto final) en objetos
+
+    Las líneas vacías se omiten. Las inválidas se informan a diagnostico
+    (dentro de la sesión de carga activa) y se omiten.
+
+    Args:
+        lineas (list): Líneas del archivo
+        entidad (str): 'registro', 'empleado' o 'actividad'
+
+    Returns:
+        list: Objetos en el orden de las líneas
+    """
+    rapido, clase = CONVERSORES[entidad]
+    lineas = list(filter(None, lineas))
+    if not lineas:
+        return []
+    if rapido is None:
+        return _linea_a_linea(lineas, clase())
+    try:
+        with sin_recolector():
+            objetos = rapido(lineas)
+    except (ValueError, TypeError, KeyError):
+        if len(lineas) <= LOTE_MINIMO:
+            return _linea_a_linea(lineas, clase())
+        objetos = []
+        for inicio in range(0, len(lineas), LOTE_MINIMO):
+            objetos.extend(convertir_lineas(lineas[inicio:inicio + LOTE_MINIMO], entidad))
+        return objetos
+    instrumentacion.contar(f'parseo_rapido.{entidad}', filas=len(objetos))
+    return objetos
+
+
+def convertir_texto(texto, entidad):
+    """
+    Convierte un texto con varias líneas en objetos (ver convertir_lineas)
+
+    Args:
+        texto (str): Contenido leído del archivo
+        entidad (str): 'registro', 'empleado' o 'actividad'
+
+    Returns:
+        list: Objetos en el orden de las líneas
+    """
+    return convertir_lineas(texto.split('\n'), entidad)
+
+
+def leer(f, entidad, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Lee un archivo abierto en modo texto por bloques y convierte sus líneas
+
+    Args:
+        f: Archivo abierto en modo texto
+        entidad (str): 'registro', 'empleado' o 'actividad'
+        tamano_bloque (int): Caracteres leídos por bloque
+
+    Returns:
+        list: Objetos de todas las líneas válidas
+    """
+    objetos = []
+    resto = ''
+    # Con el recolector activo entre bloques se recorrería la lista creciente de objetos
+    with sin_recolector():
+        while True:
+            bloque = f.read(tamano_bloque)
+            if not bloque:
+                break
+            bloque = resto + bloque
+            corte = bloque.rfind('\n') + 1
+            resto = bloque[corte:]
+            objetos.extend(convertir_lineas(bloque[:corte].split('\n'), entidad))
+        if resto:
+            objetos.extend(convertir_lineas([resto], entidad))
+    return objetos
+
+
+def leer_archivo(archivo, entidad):
+    """
+    Lee un archivo de datos completo dentro de una sesión de carga
+
+    Args:
+        archivo (str): Ruta del archivo
+        entidad (str): 'registro', 'empleado' o 'actividad'
+
+    Returns:
+        list: Objetos de todas las líneas válidas
+    """
+    with diagnostico.sesion_carga(archivo), open(archivo, 'r', encoding='utf-8') as f:
+        return leer(f, entidad)
@@ -0,0 +1,356 @@
+"""
+Módulo planilla: registro de la participación de toda una actividad
+
+Registrar una actividad con 300 asistentes no debería requerir 300 pasadas
+por registrar_participacion_interactiva (cada una vuelve a leer todos los
+registros para buscar duplicados). La planilla parte de los empleados que
+se esperaban en la actividad (los de una o más áreas, una lista de ids o
+todos), trae una sola vez los registros que ya tiene la actividad y lleva
+las marcas en memoria: el duplicado de cada empleado es una búsqueda en un
+diccionario. Al guardar, todas las filas nuevas o modificadas se escriben
+juntas con registro.registrar_participaciones (una transacción con SQLite,
+una sola escritura con texto).
+
+Si los esperados salen de una invitación (modules/invitacion.py), las
+ausencias de los invitados no se guardan como filas: se calculan al armar
+estadísticas y reportes.
+
+Comandos de la consola (los ids aceptan listas y rangos: 3,8,10-20):
+
+    s [ids]          asistieron (sin ids: todos los que falta marcar)
+    n [ids]          no asistieron (sin ids: todos los que falta marcar)
+    c <1-5> [ids]    calificación (sin ids: asistentes sin calificación)
+    v                ver la planilla
+    g                guardar
+    0                cancelar
+"""
+
+from . import actividad, empleado, invitacion, listados, registro
+
+
+class Planilla:
+    """Marcas de asistencia y calificación de los empleados esperados en una actividad"""
+
+    def __init__(self, actividad_id, empleados, existentes=(), invitados=()):
+        """
+        Args:
+            actividad_id (int): ID de la actividad
+            empleados (list): Empleados esperados, en el orden a mostrar
+            existentes (list): Registros que la actividad ya tiene
+            invitados (set): Ids con invitación guardada: sus ausencias se calculan
+        """
+        self.actividad_id = actividad_id
+        self.invitados = set(invitados)
+        self.empleados = list(empleados)
+        self.ids = {emp.id_empleado for emp in self.empleados}
+        self.anteriores = {r.empleado_id: r for r in existentes if r.empleado_id in self.ids}
+        # empleado_id -> (asistio, calificacion); los ya registrados empiezan con su estado
+        self.marcas = {id_empleado: (r.asistio, r.calificacion) for id_empleado, r in self.anteriores.items()}
+
+    def _filtrar(self, ids):
+        """Separa los ids de la planilla de los que no están en ella"""
+        fuera = [i for i in ids if i not in self.ids]
+        return [i for i in ids if i in self.ids], fuera
+
+    def sin_marcar(self):
+        """Ids de los empleados sin asistencia marcada, en orden"""
+        return [emp.id_empleado for emp in self.empleados if emp.id_empleado not in self.marcas]
+
+    def sin_calificacion(self):
+        """Ids de los asistentes que todavía no tienen calificación, en orden"""
+        return [emp.id_empleado for emp in self.empleados
+                if self.marcas.get(emp.id_empleado, (False, 0)) == (True, 0)]
+
+    def marcar(self, ids, asistio):
+        """
+        Marca la asistencia de varios empleados
+
+        Un asistente que ya tenía calificación la conserva; quien no asistió
+        queda con calificación 0.
+
+        Args:
+            ids (list): Ids a marcar
+            asistio (bool): True si asistieron
+
+        Returns:
+            list: Ids que no están en la planilla (no se marcan)
+        """
+        ids, fuera = self._filtrar(ids)
+        for id_empleado in ids:
+            anterior = self.marcas.get(id_empleado, (False, 0))
+            self.marcas[id_empleado] = (True, anterior[1]) if asistio else (False, 0)
+        return fuera
+
+    def calificar(self, ids, calificacion):
+        """
+        Asigna una calificación (y marca la asistencia) a varios empleados
+
+        Args:
+            ids (list): Ids a calificar
+            calificacion (int): Calificación de 1 a 5
+
+        Returns:
+            list: Ids que no están en la planilla (no se califican)
+
+        Raises:
+            ValueError: Si la calificación no está entre 1 y 5
+        """
+        if not 1 <= calificacion <= 5:
+            raise ValueError("La calificación debe ser un número entre 1 y 5")
+        ids, fuera = self._filtrar(ids)
+        for id_empleado in ids:
+            self.marcas[id_empleado] = (True, calificacion)
+        return fuera
+
+    def registros(self):
+        """
+        Registros a guardar: las marcas nuevas o distintas de lo ya registrado
+
+        Returns:
+            list: Objetos Registro en el orden de la planilla
+        """
+        resultado = []
+        for emp in self.empleados:
+            marca = self.marcas.get(emp.id_empleado)
+            anterior = self.anteriores.get(emp.id_empleado)
+            if marca is None or (anterior is not None and marca == (anterior.asistio, anterior.calificacion)):
+                continue
+            if self._ausencia_calculada(emp.id_empleado):
+                continue
+            resultado.append(registro.Registro(emp.id_empleado, self.actividad_id, *marca))
+        return resultado
+
+    def _ausencia_calculada(self, id_empleado):
+        """Invitado marcado como ausente y sin registro: no hace falta guardar la fila"""
+        return (id_empleado in self.invitados and id_empleado not in self.anteriores
+                and self.marcas.get(id_empleado) == (False, 0))
+
+    def ausencias_calculadas(self):
+        """Cantidad de ausencias que quedan cubiertas por la invitación"""
+        return sum(1 for emp in self.empleados if self._ausencia_calculada(emp.id_empleado))
+
+    def reemplazos(self):
+        """Cantidad de registros existentes que se modificarían al guardar"""
+        return sum(1 for r in self.registros() if r.empleado_id in self.anteriores)
+
+    def estado(self, id_empleado):
+        """Texto del estado de un empleado en la planilla"""
+        marca = self.marcas.get(id_empleado)
+        if marca is None:
+            return "— (ausente si no se marca)" if id_empleado in self.invitados else "—"
+        asistio, calificacion = marca
+        texto = (f"Asistió ({calificacion}/5)" if calificacion else "Asistió (sin calificar)") if asistio \
+            else "No asistió"
+        anterior = self.anteriores.get(id_empleado)
+        if anterior is not None:
+            texto += " [registrado]" if marca == (anterior.asistio, anterior.calificacion) else " [modificado]"
+        elif self._ausencia_calculada(id_empleado):
+            texto += " [calculada]"
+        return texto
+
+    def mostrar(self):
+        """Imprime la planilla y un resumen de las marcas"""
+        print(f"\n{'ID':>6}  {'Nombre':<30} {'Área':<20} Estado")
+        print("-" * 80)
+        for emp in self.empleados:
+            print(f"{emp.id_empleado:>6}  {emp.nombre[:30]:<30} {emp.area[:20]:<20} {self.estado(emp.id_empleado)}")
+        print("-" * 80)
+        asistentes = sum(1 for asistio, _ in self.marcas.values() if asistio)
+        print(f"{len(self.empleados)} esperados: {asistentes} asistieron, "
+              f"{len(self.marcas) - asistentes} no asistieron, {len(self.sin_marcar())} sin marcar, "
+              f"{len(self.sin_calificacion())} asistentes sin calificación")
+
+
+# ---------------------------------------------------------
+# EMPLEADOS ESPERADOS
+# ---------------------------------------------------------
+
+def esperados_por_area(areas):
+    """
+    Empleados de una o más áreas
+
+    Args:
+        areas (list): Nombres de área (exactos)
+
+    Returns:
+        list: Empleados en orden de registro
+    """
+    indice = listados.indice_empleados()
+    posiciones = set()
+    for area in areas:
+        posiciones.update(indice.filtrar(area=area))
+    return [indice.empleados[p] for p in sorted(posiciones)]
+
+
+def esperados_por_ids(ids):
+    """
+    Empleados de una lista de invitados
+
+    Args:
+        ids (list): Ids de empleado
+
+    Returns:
+        tuple: (empleados encontrados, ids inexistentes)
+    """
+    encontrados, inexistentes = [], []
+    for id_empleado in ids:
+        emp = empleado.obtener_empleado_por_id(id_empleado)
+        if emp is None:
+            inexistentes.append(id_empleado)
+        else:
+            encontrados.append(emp)
+    return encontrados, inexistentes
+
+
+def _empleados_de(ids):
+    """Empleados con esos ids, en orden de registro"""
+    return [emp for emp in listados.indice_empleados().empleados if emp.id_empleado in ids]
+
+
+def _pedir_esperados(actividad_id):
+    """
+    Pregunta de dónde salen los empleados esperados
+
+    Returns:
+        tuple: (empleados esperados, ids con invitación guardada) o None para cancelar
+    """
+    guardada = invitacion.obtener_invitacion(actividad_id)
+    print("\n¿Quiénes estaban convocados?")
+    print("  1. Empleados de una o más áreas")
+    print("  2. Lista de ids (invitados)")
+    print("  3. Todos los empleados")
+    if guardada is not None:
+        print(f"  4. Invitación guardada ({guardada})")
+    opcion = input("Seleccione una opción: ").strip()
+    if opcion == '4' and guardada is not None:
+        invitados = guardada.invitados()
+        return _empleados_de(invitados), invitados
+    if opcion == '3':
+        return list(listados.indice_empleados().empleados), set()
+    if opcion == '1':
+        print(f"Áreas: {', '.join(listados.indice_empleados().areas())}")
+        areas = [a.strip() for a in input("Áreas separadas por coma: ").split(',') if a.strip()]
+        nueva = invitacion.Invitacion(actividad_id, areas=areas)
+        esperados = esperados_por_area(areas)
+    elif opcion == '2':
+        try:
+            ids = invitacion.expandir_ids(input("Ids (p. ej. 3,8,10-20): "),
+                                          maximo=listados.indice_empleados().mayor_id())
+        except ValueError as e:
+            print(f"✗ {e}")
+            return None
+        esperados, inexistentes = esperados_por_ids(ids)
+        if inexistentes:
+            print(f"⚠ Ids sin empleado (se omiten): {', '.join(map(str, inexistentes))}")
+        nueva = invitacion.Invitacion(actividad_id, ids=[emp.id_empleado for emp in esperados])
+    else:
+        print("✗ Opción no válida")
+        return None
+    invitados = set()
+    if esperados and input("¿Guardar como invitación de la actividad? Las ausencias se calcularán "
+                           "sin guardar filas (s/n): ").strip().lower() == 's':
+        invitacion.guardar_invitacion(nueva)
+        invitados = {emp.id_empleado for emp in esperados}
+    return esperados, invitados
+
+
+def _aplicar(planilla, comando):
+    """Aplica un comando s/n/c a la planilla e informa el resultado"""
+    accion, _, resto = comando.partition(' ')
+    if accion == 'c':
+        nota, _, resto = resto.strip().partition(' ')
+        if not nota.isdigit():
+            raise ValueError("Indique la calificación: c <1-5> [ids]")
+        ids = (invitacion.expandir_ids(resto, maximo=max(planilla.ids, default=0)) if resto.strip()
+               else planilla.sin_calificacion())
+        fuera = planilla.calificar(ids, int(nota))
+    else:
+        ids = (invitacion.expandir_ids(resto, maximo=max(planilla.ids, default=0)) if resto.strip()
+               else planilla.sin_marcar())
+        fuera = planilla.marcar(ids, accion == 's')
+    if fuera:
+        print(f"⚠ No están en la planilla: {', '.join(map(str, fuera))}")
+    print(f"✓ {len(ids) - len(fuera)} empleados actualizados")
+
+
+def _guardar(planilla):
+    """Valida y guarda la planilla (True si se guardó o no había cambios)"""
+    pendientes = planilla.sin_calificacion()
+    if pendientes:
+        print(f"✗ {len(pendientes)} asistentes sin calificación (use 'c <1-5>')")
+        return False
+    sin_marcar = [i for i in planilla.sin_marcar() if i not in planilla.invitados]
+    if sin_marcar and input(f"⚠ {len(sin_marcar)} empleados sin marcar no se registrarán. "
+                            f"¿Continuar? (s/n): ").strip().lower() != 's':
+        return False
+    reemplazos = planilla.reemplazos()
+    if reemplazos and input(f"⚠ Se reemplazarán {reemplazos} registros existentes. "
+                            f"¿Continuar? (s/n): ").strip().lower() != 's':
+        return False
+    registros = planilla.registros()
+    calculadas = planilla.ausencias_calculadas() + sum(
+        1 for i in planilla.sin_marcar() if i in planilla.invitados and i not in planilla.anteriores)
+    if calculadas:
+        print(f"  {calculadas} ausencias de invitados se calculan sin guardar filas")
+    if not registros:
+        print("Sin cambios para guardar")
+        return True
+    try:
+        guardados, _ = registro.registrar_participaciones(registros)
+    except Exception as e:
+        print(f"✗ Error al guardar la planilla: {e}")
+        return False
+    print(f"✓ {len(guardados)} participaciones registradas")
+    return True
+
+
+def registrar_planilla_interactiva():
+    """Registra desde consola la asistencia de todos los convocados a una actividad"""
+    print("\n" + "="*60)
+    print("  PLANILLA DE PARTICIPACIÓN")
+    print("="*60)
+
+    try:
+        act_id = input("ID de la actividad: ").strip()
+        if not act_id.isdigit():
+            print("✗ El ID debe ser un número entero")
+            return
+        act = actividad.obtener_actividad_por_id(int(act_id))
+        if act is None:
+            print(f"✗ No existe la actividad {act_id}")
+            return
+        print(f"Actividad: {act}")
+
+        elegidos = _pedir_esperados(act.id_actividad)
+        if elegidos is None:
+            return
+        esperados, invitados = elegidos
+        if not esperados:
+            print("✗ No hay empleados convocados")
+            return
+
+        planilla = Planilla(act.id_actividad, esperados,
+                            registro.obtener_registros_actividad(act.id_actividad), invitados)
+        planilla.mostrar()
+        while True:
+            print("\n[s ids] asistieron  [n ids] no asistieron  [c 1-5 ids] calificación  "
+                  "(sin ids: los pendientes)  [v] ver  [g] guardar  [0] cancelar")
+            comando = input("> ").strip().lower()
+            if comando == '0':
+                print("✗ Planilla descartada")
+                return
+            if comando == 'v':
+                planilla.mostrar()
+            elif comando == 'g':
+                if _guardar(planilla):
+                    return
+            elif comando.partition(' ')[0] in ('s', 'n', 'c'):
+                try:
+                    _aplicar(planilla, comando)
+                except ValueError as e:
+                    print(f"✗ {e}")
+            else:
+                print("✗ Comando no válido")
+
+    except KeyboardInterrupt:
+        print("\n\n✗ Planilla cancelada por el usuario")
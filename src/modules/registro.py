@@ -5,8 +5,14 @@ Responsable: Persona 3
 
 import os
 
+from . import almacenamiento, cambios, diagnostico, instantanea, instrumentacion, invitacion, parseo_rapido, vectorizado
+from .histograma import HistogramaCalificaciones
+
 class Registro:
     """Clase que representa la participación de un empleado en una actividad"""
+
+    # Sin __dict__ por instancia: hay millones de registros en memoria
+    __slots__ = ('empleado_id', 'actividad_id', 'asistio', 'calificacion')
     
     def __init__(self, empleado_id, actividad_id, asistio, calificacion=0):
         """
@@ -28,6 +34,7 @@ class Registro:
         return f"{self.empleado_id}|{self.actividad_id}|{self.asistio}|{self.calificacion}"
     
     @staticmethod
+    @instrumentacion.medir(filas=instrumentacion.una_fila)
     def from_string(linea):
         """
         Crea un objeto Registro desde una línea de texto
@@ -50,7 +57,7 @@ class Registro:
             
             return Registro(empleado_id, actividad_id, asistio, calificacion)
         except Exception as e:
-            print(f"Error al leer registro: {e}")
+            diagnostico.error_parseo('registro', linea, e)
             return None
     
     def __str__(self):
@@ -60,50 +67,154 @@ class Registro:
         return f"Empleado {self.empleado_id} - Actividad {self.actividad_id}: {estado} {calif}"
 
 
+def _confirmar_sobrescritura(registro):
+    """Pregunta si se reemplaza un registro existente del mismo empleado y actividad"""
+    print(f"⚠ Ya existe un registro para el empleado {registro.empleado_id} en la actividad {registro.actividad_id}")
+    respuesta = input("¿Desea sobrescribirlo? (s/n): ")
+    if respuesta.lower() != 's':
+        print("✗ Registro cancelado")
+        return False
+    return True
+
+
 def registrar_participacion(registro, archivo='src/data/participacion.txt'):
     """
     Registra la participación de un empleado en una actividad
     
     Args:
         registro (Registro): Objeto registro a guardar
-        archivo (str): Ruta del archivo de participación
+        archivo (str): Ruta del archivo de participación (backend de texto)
     """
     try:
+        backend = almacenamiento.obtener_backend()
+        if backend is not None:
+            # El backend resuelve el duplicado con su índice (empleado, actividad)
+            anterior = backend.obtener_registro(registro.empleado_id, registro.actividad_id)
+            if anterior is not None:
+                if not _confirmar_sobrescritura(registro):
+                    return
+            backend.guardar_registro(registro)
+            cambios.publicar('registro', 'update' if anterior else 'insert', anterior, registro)
+            print(f"✓ Participación registrada exitosamente")
+            return
+        
         # Crear directorio si no existe
         os.makedirs(os.path.dirname(archivo), exist_ok=True)
         
         # Validar si ya existe un registro para este empleado y actividad
         registros = cargar_registros(archivo)
-        existe = any(r.empleado_id == registro.empleado_id and 
-                    r.actividad_id == registro.actividad_id 
-                    for r in registros)
+        anterior = next((r for r in registros if r.empleado_id == registro.empleado_id and
+                         r.actividad_id == registro.actividad_id), None)
         
-        if existe:
-            print(f"⚠ Ya existe un registro para el empleado {registro.empleado_id} en la actividad {registro.actividad_id}")
-            respuesta = input("¿Desea sobrescribirlo? (s/n): ")
-            if respuesta.lower() != 's':
-                print("✗ Registro cancelado")
+        if anterior is not None:
+            if not _confirmar_sobrescritura(registro):
                 return
             # Eliminar el registro existente
             registros = [r for r in registros if not (r.empleado_id == registro.empleado_id and 
                                                       r.actividad_id == registro.actividad_id)]
-            # Reescribir archivo
-            with open(archivo, 'w', encoding='utf-8') as f:
+            # Reescribir en un archivo nuevo: el cambio de inodo avisa a los
+            # lectores incrementales (series, vectorizado) que no solo se agregaron líneas
+            temporal = archivo + '.tmp'
+            with open(temporal, 'w', encoding='utf-8') as f:
                 for r in registros:
                     f.write(r.to_string() + '\n')
+            os.replace(temporal, archivo)
         
         # Agregar nuevo registro
         with open(archivo, 'a', encoding='utf-8') as f:
             f.write(registro.to_string() + '\n')
+        cambios.publicar('registro', 'update' if anterior else 'insert', anterior, registro)
         print(f"✓ Participación registrada exitosamente")
         
     except Exception as e:
         print(f"✗ Error al guardar participación: {e}")
 
 
+def registrar_participaciones(registros, sobrescribir=True, archivo='src/data/participacion.txt'):
+    """
+    Registra varias participaciones en una sola escritura
+
+    Los registros existentes se buscan una sola vez (por actividad con
+    base de datos, leyendo el archivo una vez con texto) y los duplicados
+    se resuelven en memoria. Con SQLite todo va en una transacción; con
+    texto es un único anexado, o una reescritura atómica del archivo si
+    hay registros que reemplazar.
+
+    Args:
+        registros (list): Registros a guardar (si un par se repite, vale el último)
+        sobrescribir (bool): Reemplazar los registros existentes del mismo
+            empleado y actividad (False = omitirlos)
+        archivo (str): Ruta del archivo de participación (backend de texto)
+
+    Returns:
+        tuple: (registros guardados, registros omitidos por existir)
+    """
+    nuevos = {(r.empleado_id, r.actividad_id): r for r in registros}
+    if not nuevos:
+        return [], []
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        anteriores = {}
+        for actividad_id in {a for _, a in nuevos}:
+            anteriores.update(((r.empleado_id, r.actividad_id), r)
+                              for r in backend.obtener_registros_actividad(actividad_id))
+    else:
+        existentes = cargar_registros(archivo)
+        anteriores = {(r.empleado_id, r.actividad_id): r for r in existentes
+                      if (r.empleado_id, r.actividad_id) in nuevos}
+
+    omitidos = []
+    if not sobrescribir:
+        omitidos = [r for clave, r in nuevos.items() if clave in anteriores]
+        nuevos = {clave: r for clave, r in nuevos.items() if clave not in anteriores}
+    guardar = list(nuevos.values())
+    if not guardar:
+        return [], omitidos
+
+    if backend is not None:
+        backend.guardar_registros(guardar)
+    elif any(clave in anteriores for clave in nuevos):
+        # Reescritura atómica: o quedan todos los cambios o ninguno
+        restantes = [r for r in existentes if (r.empleado_id, r.actividad_id) not in nuevos]
+        temporal = archivo + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            f.writelines(r.to_string() + '\n' for r in restantes + guardar)
+        os.replace(temporal, archivo)
+    else:
+        os.makedirs(os.path.dirname(archivo), exist_ok=True)
+        with open(archivo, 'a', encoding='utf-8') as f:
+            f.writelines(r.to_string() + '\n' for r in guardar)
+
+    if cambios.activo():
+        cambios.publicar_eventos([
+            cambios.crear_evento('registro', 'update' if clave in anteriores else 'insert',
+                                 anteriores.get(clave), r)
+            for clave, r in nuevos.items()])
+    return guardar, omitidos
+
+
+@instrumentacion.medir()
 def cargar_registros(archivo='src/data/participacion.txt'):
     """
-    Carga todos los registros desde el archivo
+    Carga todos los registros desde el backend activo (por defecto el archivo)
+    
+    Args:
+        archivo (str): Ruta del archivo de participación (backend de texto)
+        
+    Returns:
+        list: Lista de objetos Registro
+    """
+    backend = almacenamiento.obtener_backend()
+    if backend is not None:
+        return backend.cargar_registros()
+    # Instantánea del arranque más las líneas agregadas después
+    registros = instantanea.registros(archivo)
+    return registros if registros is not None else leer_registros_texto(archivo)
+
+
+def leer_registros_texto(archivo='src/data/participacion.txt'):
+    """
+    Lee todos los registros de un archivo de texto
     
     Args:
         archivo (str): Ruta del archivo de participación
@@ -114,67 +225,123 @@ def cargar_registros(archivo='src/data/participacion.txt'):
     registros = []
     try:
         if not os.path.exists(archivo):
-            print(f"⚠ El archivo {archivo} no existe. Se creará al agregar registros.")
+            diagnostico.archivo_inexistente(archivo)
             return registros
         
-        with open(archivo, 'r', encoding='utf-8') as f:
-            for linea in f:
-                if linea.strip():  # Ignorar líneas vacías
-                    reg = Registro.from_string(linea)
-                    if reg:
-                        registros.append(reg)
+        instrumentacion.contar('registro.cargar_registros', bytes_leidos=os.path.getsize(archivo))
+        # Conversión por lotes; las líneas inválidas pasan por Registro.from_string
+        registros = parseo_rapido.leer_archivo(archivo, 'registro')
+    except diagnostico.ErrorDeParseo:
+        raise
     except Exception as e:
-        print(f"✗ Error al cargar registros: {e}")
+        diagnostico.logger.error("Error al cargar %s: %s", archivo, e)
     
     return registros
 
 
-def calcular_estadisticas(registros=None, actividad_id=None):
+@instrumentacion.medir(filas=lambda stats: stats['total_registros'])
+def calcular_estadisticas(registros=None, actividad_id=None, invitaciones=None, empleados=None):
     """
     Calcula estadísticas de participación y satisfacción
     
     Args:
         registros (list): Lista de registros (si es None, los carga del archivo)
         actividad_id (int): ID de actividad específica (None para todas)
+        invitaciones (dict): Invitaciones de esos registros (por defecto las del backend activo)
+        empleados (list): Empleados de esos registros (por defecto los actuales)
         
     Returns:
         dict: Diccionario con estadísticas calculadas
     """
+    # Invitados sin registro: ausencias que no se guardan como filas
+    ausencias_calculadas = sum(invitacion.contar_ausentes(actividad_id, registros, invitaciones,
+                                                          empleados).values())
+
     if registros is None:
-        registros = cargar_registros()
+        backend = almacenamiento.obtener_backend()
+        if backend is not None:
+            stats = _estadisticas_desde_backend(backend, actividad_id)
+        else:
+            # Columnas leídas del archivo y reutilizadas mientras no cambie
+            stats = vectorizado.estadisticas(vectorizado.tabla_de_archivo(), actividad_id)
+        return sumar_ausencias(stats, ausencias_calculadas)
     
     # Filtrar por actividad si se especifica
     if actividad_id is not None:
         registros = [r for r in registros if r.actividad_id == actividad_id]
     
-    if not registros:
+    # Calcular métricas
+    asistencias = sum(1 for r in registros if r.asistio)
+    
+    # Distribución de las calificaciones de quienes asistieron
+    histograma = HistogramaCalificaciones.desde_valores(
+        r.calificacion for r in registros if r.asistio and r.calificacion > 0)
+    
+    return sumar_ausencias(armar_estadisticas(len(registros), asistencias, histograma),
+                           ausencias_calculadas)
+
+
+def armar_estadisticas(total, asistencias, histograma):
+    """
+    Arma el diccionario de estadísticas a partir de los conteos
+    
+    Args:
+        total (int): Total de registros
+        asistencias (int): Registros con asistencia
+        histograma (HistogramaCalificaciones): Calificaciones de quienes asistieron
+        
+    Returns:
+        dict: Totales, tasa de participación, satisfacción promedio,
+            histograma {calificacion: cantidad}, mediana, p25, p75 y
+            desviación estándar de las calificaciones
+    """
+    if not total:
         return {
             'total_registros': 0,
             'asistencias': 0,
             'ausencias': 0,
             'tasa_participacion': 0.0,
             'satisfaccion_promedio': 0.0,
-            'calificaciones': []
+            'histograma': HistogramaCalificaciones().to_dict(),
+            **HistogramaCalificaciones().resumen()
         }
     
-    # Calcular métricas
-    asistencias = sum(1 for r in registros if r.asistio)
-    ausencias = len(registros) - asistencias
-    tasa_participacion = (asistencias / len(registros)) * 100 if registros else 0
-    
-    # Calificaciones de quienes asistieron
-    calificaciones = [r.calificacion for r in registros if r.asistio and r.calificacion > 0]
-    satisfaccion_promedio = sum(calificaciones) / len(calificaciones) if calificaciones else 0
-    
     return {
-        'total_registros': len(registros),
+        'total_registros': total,
         'asistencias': asistencias,
-        'ausencias': ausencias,
-        'tasa_participacion': round(tasa_participacion, 2),
-        'satisfaccion_promedio': round(satisfaccion_promedio, 2),
-        'calificaciones': calificaciones
+        'ausencias': total - asistencias,
+        'tasa_participacion': round((asistencias / total) * 100, 2),
+        'satisfaccion_promedio': round(histograma.media(), 2),
+        'histograma': histograma.to_dict(),
+        **histograma.resumen()
     }
 
+
+def sumar_ausencias(stats, ausencias_calculadas):
+    """
+    Agrega a las estadísticas las ausencias calculadas de los invitados
+    
+    Args:
+        stats (dict): Estadísticas de armar_estadisticas
+        ausencias_calculadas (int): Invitados sin registro (ver invitacion.ausentes)
+        
+    Returns:
+        dict: Las mismas estadísticas con total, ausencias y tasa recalculados
+    """
+    stats['ausencias_calculadas'] = ausencias_calculadas
+    if ausencias_calculadas:
+        stats['total_registros'] += ausencias_calculadas
+        stats['ausencias'] += ausencias_calculadas
+        stats['tasa_participacion'] = round((stats['asistencias'] / stats['total_registros']) * 100, 2)
+    return stats
+
+
+def _estadisticas_desde_backend(backend, actividad_id):
+    """Estadísticas a partir de conteos agrupados, sin traer los registros"""
+    total, asistencias, por_calificacion = backend.contar_participacion(actividad_id)
+    return armar_estadisticas(total, asistencias, HistogramaCalificaciones.desde_conteos(por_calificacion))
+
+
 def obtener_participantes_actividad(actividad_id, registros=None):
     """
     Obtiene los IDs de empleados que participaron en una actividad
@@ -187,6 +354,9 @@ def obtener_participantes_actividad(actividad_id, registros=None):
         list: Lista de IDs de empleados que asistieron
     """
     if registros is None:
+        backend = almacenamiento.obtener_backend()
+        if backend is not None:
+            return backend.obtener_participantes_actividad(actividad_id)
         registros = cargar_registros()
     
     participantes = [r.empleado_id for r in registros 
@@ -195,6 +365,26 @@ def obtener_participantes_actividad(actividad_id, registros=None):
     return participantes
 
 
+def obtener_registros_actividad(actividad_id, registros=None):
+    """
+    Obtiene los registros (asistencias y ausencias) de una actividad
+
+    Args:
+        actividad_id (int): ID de la actividad
+        registros (list): Lista de registros (opcional)
+
+    Returns:
+        list: Registros de la actividad
+    """
+    if registros is None:
+        backend = almacenamiento.obtener_backend()
+        if backend is not None:
+            return backend.obtener_registros_actividad(actividad_id)
+        registros = cargar_registros()
+
+    return [r for r in registros if r.actividad_id == actividad_id]
+
+
 def obtener_actividades_empleado(empleado_id, registros=None):
     """
     Obtiene las actividades en las que participó un empleado
@@ -207,6 +397,9 @@ def obtener_actividades_empleado(empleado_id, registros=None):
         list: Lista de IDs de actividades donde asistió
     """
     if registros is None:
+        backend = almacenamiento.obtener_backend()
+        if backend is not None:
+            return backend.obtener_actividades_empleado(empleado_id)
         registros = cargar_registros()
     
     actividades = [r.actividad_id for r in registros 
@@ -230,9 +423,13 @@ def mostrar_estadisticas_generales():
     print("="*60)
     print(f"Total de registros:        {stats['total_registros']}")
     print(f"Asistencias:               {stats['asistencias']}")
-    print(f"Ausencias:                 {stats['ausencias']}")
+    print(f"Ausencias:                 {stats['ausencias']}"
+          + (f" ({stats['ausencias_calculadas']} de invitados sin registro)" if stats['ausencias_calculadas'] else ""))
     print(f"Tasa de participación:     {stats['tasa_participacion']}%")
     print(f"Satisfacción promedio:     {stats['satisfaccion_promedio']}/5")
+    print(f"Mediana (p25 - p75):       {stats['mediana']} ({stats['p25']} - {stats['p75']})")
+    print(f"Desviación estándar:       {stats['desviacion_estandar']}")
+    print("Distribución:              " + "  ".join(f"{c}★ {n}" for c, n in stats['histograma'].items()))
     print("="*60)
 
 
@@ -2,51 +2,78 @@ import csv
 import os
 from datetime import datetime
 
+from . import cubo, instrumentacion, invitacion, vectorizado
+
+# Encabezados de los reportes CSV (compartidos con reporte_sql)
+COLUMNAS_REPORTE_GENERAL = [
+    'ID_Actividad','Nombre_Actividad','Fecha','Tipo',
+    'Asistencias','Total_Registros','Tasa_Participacion','Satisfaccion_Promedio'
+]
+COLUMNAS_REPORTE_POR_AREA = [
+    'Area','Total_Empleados','Empleados_Activos',
+    'Total_Participaciones','Promedio_Por_Empleado','Satisfaccion_Promedio'
+]
+COLUMNAS_REPORTE_DETALLADO = [
+    'ID_Empleado','Nombre','Area','Cargo','ID_Actividad',
+    'Actividad','Fecha','Tipo','Asistencia','Calificacion'
+]
+
+
+def _una_por_id(actividades):
+    """Una actividad por id: los conteos por actividad no se suman una vez por cada copia"""
+    return list({act.id_actividad: act for act in actividades}.values())
+
+
 # ---------------------------------------------------------
 # REPORTE GENERAL: Muestra resultado global por actividad
 # ---------------------------------------------------------
+@instrumentacion.medir()
 def generar_reporte_general(empleados, actividades, registros, 
-                           archivo='src/data/reportes/reporte_general.csv'):
+                           archivo='src/data/reportes/reporte_general.csv', invitaciones=None):
     try:
         os.makedirs(os.path.dirname(archivo), exist_ok=True)
-        datos_reporte = []
-
-        # Recorre todas las actividades y calcula métricas generales
-        for actividad in actividades:
-            registros_act = [r for r in registros if r.actividad_id == actividad.id_actividad]
-            total_registros = len(registros_act)
-            asistencias = sum(1 for r in registros_act if r.asistio)
-
-            # Calcula satisfacción solo de quienes asistieron y calificaron
-            calificaciones = [r.calificacion for r in registros_act if r.asistio and r.calificacion > 0]
-            satisfaccion_promedio = round(sum(calificaciones) / len(calificaciones), 2) if calificaciones else 0
-
-            # % de participación
-            tasa_participacion = round((asistencias / total_registros * 100), 2) if total_registros > 0 else 0
-
-            # Datos del reporte por actividad
-            datos_reporte.append([
-                actividad.id_actividad,
-                actividad.nombre,
-                actividad.fecha,
-                actividad.tipo,
-                asistencias,
-                total_registros,
-                f"{tasa_participacion}%",
-                f"{satisfaccion_promedio}/5"
-            ])
+        with instrumentacion.etapa('reporte.general.agregacion') as etapa:
+            # Conteos de todas las actividades en una sola pasada por los registros
+            conteos = {id_actividad: medidas for id_actividad, *medidas in cubo.consultar(
+                empleados, _una_por_id(actividades), registros, ('actividad',),
+                ('asistencias', 'registros', 'tasa_participacion', 'satisfaccion_promedio'),
+                incluir_vacios=True)}
+            # Ausencias de los invitados entre estos empleados (invitaciones por defecto: las del backend)
+            ausencias_calculadas = invitacion.contar_ausentes(registros=registros, invitaciones=invitaciones,
+                                                              empleados=empleados)
+            datos_reporte = []
+
+            # Una fila por actividad (también por cada copia de un id repetido), en el orden de la lista
+            for actividad in actividades:
+                id_actividad = actividad.id_actividad
+                asistencias, total_registros, tasa_participacion, satisfaccion_promedio = conteos[id_actividad]
+                # Los invitados sin registro cuentan como ausencias
+                faltan = ausencias_calculadas.get(id_actividad, 0)
+                if faltan:
+                    total_registros += faltan
+                    tasa_participacion = round((asistencias / total_registros * 100), 2)
+                datos_reporte.append([
+                    id_actividad,
+                    actividad.nombre,
+                    actividad.fecha,
+                    actividad.tipo,
+                    asistencias,
+                    total_registros,
+                    f"{tasa_participacion}%",
+                    f"{satisfaccion_promedio}/5"
+                ])
+            etapa.contar(filas=len(registros))
 
         # Encabezados del CSV
-        columnas = [
-            'ID_Actividad','Nombre_Actividad','Fecha','Tipo',
-            'Asistencias','Total_Registros','Tasa_Participacion','Satisfaccion_Promedio'
-        ]
+        columnas = COLUMNAS_REPORTE_GENERAL
 
         # Exporta archivo CSV
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(columnas)
-            writer.writerows(datos_reporte)
+        with instrumentacion.etapa('reporte.general.escritura') as etapa:
+            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(columnas)
+                writer.writerows(datos_reporte)
+                etapa.contar(filas=len(datos_reporte), bytes_escritos=f.tell())
 
         print(f"\n✓ Reporte general generado: {archivo}")
         return True
@@ -58,6 +85,7 @@ def generar_reporte_general(empleados, actividades, registros,
 # ---------------------------------------------------------
 # REPORTE POR ÁREA: Muestra participación por cada área
 # ---------------------------------------------------------
+@instrumentacion.medir()
 def generar_reporte_por_area(empleados, actividades, registros,
                              archivo='src/data/reportes/reporte_por_area.csv'):
     """
@@ -66,51 +94,37 @@ def generar_reporte_por_area(empleados, actividades, registros,
     """
     try:
         os.makedirs(os.path.dirname(archivo), exist_ok=True)
-        areas_dict = {}
-
-        # Agrupa datos por área
-        for empleado in empleados:
-            area = empleado.area
-            if area not in areas_dict:
-                areas_dict[area] = {'empleados': [], 'participaciones': [], 'calificaciones': []}
-
-            areas_dict[area]['empleados'].append(empleado.id_empleado)
-
-            # Registros del empleado
-            participaciones_emp = [r for r in registros if r.empleado_id == empleado.id_empleado and r.asistio]
-            areas_dict[area]['participaciones'].extend(participaciones_emp)
-
-            # Calificaciones válidas
-            calificaciones_emp = [r.calificacion for r in participaciones_emp if r.calificacion > 0]
-            areas_dict[area]['calificaciones'].extend(calificaciones_emp)
-
-        # Prepara datos finales del reporte por área
-        datos_reporte = []
-        for area, datos in areas_dict.items():
-            total_empleados = len(datos['empleados'])
-            total_participaciones = len(datos['participaciones'])
-            empleados_activos = len(set(p.empleado_id for p in datos['participaciones']))  # Empleados que sí participaron
-            satisfaccion = round(sum(datos['calificaciones']) / len(datos['calificaciones']), 2) if datos['calificaciones'] else 0
-            promedio_participaciones = round(total_participaciones / total_empleados, 2) if total_empleados > 0 else 0
-
-            datos_reporte.append([
-                area, total_empleados, empleados_activos, total_participaciones,
-                promedio_participaciones, f"{satisfaccion}/5"
-            ])
+        with instrumentacion.etapa('reporte.por_area.agregacion') as etapa:
+            # Agrupa por área (por código) las asistencias de cada empleado en una sola pasada
+            filas = cubo.consultar(empleados, actividades, registros, ('area',),
+                                   ('empleados', 'empleados_activos', 'asistencias', 'satisfaccion_promedio'),
+                                   incluir_vacios=True)
+
+            # Prepara datos finales del reporte por área
+            datos_reporte = []
+            for area, total_empleados, empleados_activos, total_participaciones, satisfaccion in filas:
+                promedio_participaciones = round(total_participaciones / total_empleados, 2) if total_empleados > 0 else 0
+
+                datos_reporte.append([
+                    area, total_empleados, empleados_activos, total_participaciones,
+                    promedio_participaciones, f"{satisfaccion}/5"
+                ])
+            etapa.contar(filas=len(registros))
 
         # Ordena áreas de mayor a menor participación
-        datos_reporte.sort(key=lambda x: x[3], reverse=True)
+        with instrumentacion.etapa('reporte.por_area.ordenamiento') as etapa:
+            datos_reporte.sort(key=lambda x: x[3], reverse=True)
+            etapa.contar(filas=len(datos_reporte))
 
-        columnas = [
-            'Area','Total_Empleados','Empleados_Activos',
-            'Total_Participaciones','Promedio_Por_Empleado','Satisfaccion_Promedio'
-        ]
+        columnas = COLUMNAS_REPORTE_POR_AREA
 
         # Exporta a CSV
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(columnas)
-            writer.writerows(datos_reporte)
+        with instrumentacion.etapa('reporte.por_area.escritura') as etapa:
+            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(columnas)
+                writer.writerows(datos_reporte)
+                etapa.contar(filas=len(datos_reporte), bytes_escritos=f.tell())
 
         print(f"\n✓ Reporte por área generado: {archivo}")
         return True
@@ -123,6 +137,7 @@ def generar_reporte_por_area(empleados, actividades, registros,
 # ---------------------------------------------------------
 # REPORTE DETALLADO: Cada registro individual
 # ---------------------------------------------------------
+@instrumentacion.medir()
 def generar_reporte_detallado(empleados, actividades, registros,
                               archivo='src/data/reportes/reporte_detallado.csv'):
     """
@@ -132,40 +147,43 @@ def generar_reporte_detallado(empleados, actividades, registros,
     try:
         os.makedirs(os.path.dirname(archivo), exist_ok=True)
 
-        # Diccionarios para acceder rápido por ID
-        empleados_dict = {emp.id_empleado: emp for emp in empleados}
-        actividades_dict = {act.id_actividad: act for act in actividades}
+        with instrumentacion.etapa('reporte.detallado.cruce') as etapa:
+            # Diccionarios para acceder rápido por ID
+            empleados_dict = {emp.id_empleado: emp for emp in empleados}
+            actividades_dict = {act.id_actividad: act for act in actividades}
 
-        datos_reporte = []
+            datos_reporte = []
 
-        # Crea un registro detallado por cada asistencia
-        for registro in registros:
-            empleado = empleados_dict.get(registro.empleado_id)
-            actividad = actividades_dict.get(registro.actividad_id)
+            # Crea un registro detallado por cada asistencia
+            for registro in registros:
+                empleado = empleados_dict.get(registro.empleado_id)
+                actividad = actividades_dict.get(registro.actividad_id)
 
-            if empleado and actividad:
-                estado = "Asistió" if registro.asistio else "No asistió"
-                calificacion = f"{registro.calificacion}/5" if registro.asistio else "N/A"
+                if empleado and actividad:
+                    estado = "Asistió" if registro.asistio else "No asistió"
+                    calificacion = f"{registro.calificacion}/5" if registro.asistio else "N/A"
 
-                datos_reporte.append([
-                    registro.empleado_id, empleado.nombre, empleado.area, empleado.cargo,
-                    registro.actividad_id, actividad.nombre, actividad.fecha, actividad.tipo,
-                    estado, calificacion
-                ])
+                    datos_reporte.append([
+                        registro.empleado_id, empleado.nombre, empleado.area, empleado.cargo,
+                        registro.actividad_id, actividad.nombre, actividad.fecha, actividad.tipo,
+                        estado, calificacion
+                    ])
+            etapa.contar(filas=len(registros))
 
         # Ordenado por fecha y luego por nombre
-        datos_reporte.sort(key=lambda x: (x[6], x[1]))
+        with instrumentacion.etapa('reporte.detallado.ordenamiento') as etapa:
+            datos_reporte.sort(key=lambda x: (x[6], x[1]))
+            etapa.contar(filas=len(datos_reporte))
 
-        columnas = [
-            'ID_Empleado','Nombre','Area','Cargo','ID_Actividad',
-            'Actividad','Fecha','Tipo','Asistencia','Calificacion'
-        ]
+        columnas = COLUMNAS_REPORTE_DETALLADO
 
         # Exporta a CSV
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(columnas)
-            writer.writerows(datos_reporte)
+        with instrumentacion.etapa('reporte.detallado.escritura') as etapa:
+            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(columnas)
+                writer.writerows(datos_reporte)
+                etapa.contar(filas=len(datos_reporte), bytes_escritos=f.tell())
 
         print(f"\n✓ Reporte detallado generado: {archivo}")
         return True
@@ -198,16 +216,19 @@ def generar_todos_los_reportes(empleados, actividades, registros):
 # ---------------------------------------------------------
 # EXPORTACIÓN GENÉRICA A CSV PARA FUTUROS REPORTES
 # ---------------------------------------------------------
+@instrumentacion.medir()
 def exportar_csv_generico(datos, columnas, archivo, descripcion="CSV"):
     """
     Función reutilizable para exportar cualquier tipo de reporte a CSV.
     """
     try:
         os.makedirs(os.path.dirname(archivo), exist_ok=True)
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(columnas)
-            writer.writerows(datos)
+        with instrumentacion.etapa('reporte.exportar_csv_generico.escritura') as etapa:
+            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(columnas)
+                writer.writerows(datos)
+                etapa.contar(filas=len(datos), bytes_escritos=f.tell())
 
         print(f"✓ {descripcion} exportado: {archivo}")
         return True
@@ -219,8 +240,9 @@ def exportar_csv_generico(datos, columnas, archivo, descripcion="CSV"):
 # ---------------------------------------------------------
 # RESUMEN EJECUTIVO: Vista rápida con indicadores clave
 # ---------------------------------------------------------
+@instrumentacion.medir()
 def generar_resumen_ejecutivo(empleados, actividades, registros,
-                              archivo='src/data/reportes/resumen_ejecutivo.csv'):
+                              archivo='src/data/reportes/resumen_ejecutivo.csv', invitaciones=None):
     """
     Muestra datos clave del programa: asistencia, participación,
     satisfacción y actividad con más participación.
@@ -228,26 +250,33 @@ def generar_resumen_ejecutivo(empleados, actividades, registros,
     try:
         os.makedirs(os.path.dirname(archivo), exist_ok=True)
 
-        total_empleados = len(empleados)
-        total_actividades = len(actividades)
-        total_registros = len(registros)
-        total_asistencias = sum(1 for r in registros if r.asistio)
-
-        # Porcentaje de participación
-        tasa_participacion = round((total_asistencias / total_registros * 100), 2) if total_registros > 0 else 0
-
-        # Calificación promedio solo de asistentes
-        calificaciones = [r.calificacion for r in registros if r.asistio and r.calificacion > 0]
-        satisfaccion_global = round(sum(calificaciones) / len(calificaciones), 2) if calificaciones else 0
-
-        empleados_activos = len(set(r.empleado_id for r in registros if r.asistio))
-
-        # Actividad con mayor asistencia
-        actividades_participacion = {
-            actividad.nombre: sum(1 for r in registros if r.actividad_id == actividad.id_actividad and r.asistio)
-            for actividad in actividades
-        }
-        actividad_top = max(actividades_participacion, key=actividades_participacion.get) if actividades_participacion else "N/A"
+        with instrumentacion.etapa('reporte.resumen.agregacion') as etapa:
+            total_empleados = len(empleados)
+            total_actividades = len(actividades)
+            tabla = vectorizado.TablaParticipacion.desde_registros(registros)
+
+            # Totales globales: una sola celda sin dimensiones
+            [[total_registros, total_asistencias, tasa_participacion, satisfaccion_global,
+              empleados_activos]] = cubo.consultar(
+                empleados, actividades, tabla, (),
+                ('registros', 'asistencias', 'tasa_participacion', 'satisfaccion_promedio', 'empleados_activos'),
+                incluir_vacios=True)
+            faltan = sum(invitacion.contar_ausentes(registros=tabla, invitaciones=invitaciones,
+                                                    empleados=empleados).values())
+            if faltan:
+                total_registros += faltan
+                tasa_participacion = round((total_asistencias / total_registros * 100), 2)
+
+            # Actividad con mayor asistencia
+            asistencias_por_actividad = dict(cubo.consultar(empleados, _una_por_id(actividades), tabla,
+                                                            ('actividad',), ('asistencias',),
+                                                            incluir_vacios=True))
+            actividades_participacion = {
+                actividad.nombre: asistencias_por_actividad[actividad.id_actividad]
+                for actividad in actividades
+            }
+            actividad_top = max(actividades_participacion, key=actividades_participacion.get) if actividades_participacion else "N/A"
+            etapa.contar(filas=len(registros))
 
         # Datos finales del resumen
         datos_reporte = [
@@ -264,9 +293,11 @@ def generar_resumen_ejecutivo(empleados, actividades, registros,
             ['Actividad destacada', actividad_top]
         ]
 
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerows(datos_reporte)
+        with instrumentacion.etapa('reporte.resumen.escritura') as etapa:
+            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerows(datos_reporte)
+                etapa.contar(filas=len(datos_reporte), bytes_escritos=f.tell())
 
         print(f"\n✓ Resumen ejecutivo generado: {archivo}")
         return True
@@ -275,6 +306,59 @@ def generar_resumen_ejecutivo(empleados, actividades, registros,
         return False
 
 
+# ---------------------------------------------------------
+# REPORTE POR PERIODO: Serie de tiempo desde los agregados
+# ---------------------------------------------------------
+@instrumentacion.medir()
+def generar_reporte_por_periodo(rollup, granularidad='mes', desde=None, hasta=None,
+                                archivo='src/data/reportes/reporte_por_periodo.csv'):
+    """
+    Exporta la participación por periodo, área y tipo de actividad.
+    Se calcula sobre las tablas de agregados, sin recorrer los registros.
+    """
+    columnas = [
+        'Periodo', 'Area', 'Tipo', 'Total_Registros', 'Asistencias',
+        'Tasa_Participacion', 'Satisfaccion_Promedio'
+    ]
+    datos_reporte = [
+        [periodo, area, tipo, total, asistencias, f"{tasa}%", f"{satisfaccion}/5"]
+        for periodo, area, tipo, total, asistencias, tasa, satisfaccion
+        in rollup.consultar(granularidad, desde, hasta)
+    ]
+    return exportar_csv_generico(datos_reporte, columnas, archivo,
+                                 f"Reporte por periodo ({granularidad})")
+
+
+# ---------------------------------------------------------
+# REPORTE CRUZADO: Dimensiones y medidas a elección
+# ---------------------------------------------------------
+@instrumentacion.medir()
+def generar_reporte_cruzado(empleados, actividades, registros, dimensiones,
+                            medidas=cubo.MEDIDAS_POR_DEFECTO, columna=None,
+                            archivo='src/data/reportes/reporte_cruzado.csv'):
+    """
+    Exporta una tabla cruzada, por ejemplo participación por área,
+    tipo de actividad y mes. Con `columna` los valores de esa dimensión
+    pasan a ser columnas y se muestra solo la primera medida.
+    """
+    try:
+        with instrumentacion.etapa('reporte.cruzado.agregacion') as etapa:
+            filas = cubo.consultar(empleados, actividades, registros, dimensiones, medidas)
+            etapa.contar(filas=len(registros))
+
+        if columna:
+            encabezados, datos_reporte = cubo.pivotar(filas, dimensiones, columna, medidas[0], medidas)
+        else:
+            encabezados = cubo.columnas(dimensiones, medidas)
+            datos_reporte = sorted(filas, key=lambda fila: fila[:len(dimensiones)])
+    except ValueError as e:
+        print(f"\n✗ Error al generar reporte cruzado: {e}")
+        return False
+
+    return exportar_csv_generico(datos_reporte, encabezados, archivo,
+                                 f"Reporte cruzado ({' × '.join(dimensiones)})")
+
+
 # ---------------------------------------------------------
 # BLOQUE PARA PRUEBAS DIRECTAS DEL MÓDULO
 # ---------------------------------------------------------
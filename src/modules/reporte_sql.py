@@ -0,0 +1,314 @@
+"""
+Reportes CSV calculados dentro de la base de datos (backend SQLite)
+
+Cada generar_*_sql produce el mismo archivo que su versión en reporte.py,
+pero los conteos y promedios se resuelven con GROUP BY y las filas se
+escriben por lotes desde el cursor, sin cargar los registros en Python.
+"""
+
+import csv
+import os
+from datetime import datetime
+
+from . import almacenamiento, instrumentacion, invitacion
+from .reporte import (COLUMNAS_REPORTE_DETALLADO, COLUMNAS_REPORTE_GENERAL,
+                      COLUMNAS_REPORTE_POR_AREA)
+
+TAMANO_LOTE = 10_000
+
+
+def backend_sql():
+    """
+    Devuelve el backend activo si admite reportes en SQL
+
+    Returns:
+        BackendSQLite: Backend activo o None si se usan otros backends
+    """
+    backend = almacenamiento.obtener_backend()
+    return backend if isinstance(backend, almacenamiento.BackendSQLite) else None
+
+
+def _lotes(cursor):
+    """Recorre un cursor en lotes de TAMANO_LOTE filas"""
+    while True:
+        lote = cursor.fetchmany(TAMANO_LOTE)
+        if not lote:
+            return
+        yield lote
+
+
+def _escribir_csv(archivo, columnas, lotes, etapa, convertir=None):
+    """
+    Escribe el encabezado y las filas lote por lote
+
+    Args:
+        archivo (str): Ruta del CSV
+        columnas (list): Encabezados (None para omitirlos)
+        lotes (iterable): Lotes de filas (ver _lotes)
+        etapa (Etapa): Etapa de instrumentación donde sumar filas y bytes
+        convertir (callable): Transforma cada fila antes de escribirla (opcional)
+    """
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if columnas:
+            writer.writerow(columnas)
+        for lote in lotes:
+            writer.writerows(map(convertir, lote) if convertir else lote)
+            etapa.contar(filas=len(lote))
+        etapa.contar(bytes_escritos=f.tell())
+
+
+# ---------------------------------------------------------
+# REPORTE GENERAL: Métricas por actividad agrupadas en SQL
+# ---------------------------------------------------------
+SQL_REPORTE_GENERAL = """
+WITH agregados AS (
+    SELECT actividad_id,
+           COUNT(*) AS total,
+           SUM(asistio) AS asistencias,
+           SUM(CASE WHEN asistio AND calificacion > 0 THEN calificacion ELSE 0 END) AS suma,
+           SUM(CASE WHEN asistio AND calificacion > 0 THEN 1 ELSE 0 END) AS calificados
+    FROM participacion
+    GROUP BY actividad_id
+)
+SELECT a.id, a.nombre, a.fecha, a.tipo,
+       COALESCE(g.asistencias, 0), COALESCE(g.total, 0),
+       COALESCE(g.suma, 0), COALESCE(g.calificados, 0)
+FROM actividades a
+LEFT JOIN agregados g ON g.actividad_id = a.id
+ORDER BY a.rowid
+"""
+
+
+def _fila_general(fila, ausencias_calculadas=None):
+    id_act, nombre, fecha, tipo, asistencias, total, suma, calificados = fila
+    # Los invitados sin registro cuentan como ausencias
+    total += (ausencias_calculadas or {}).get(id_act, 0)
+    satisfaccion_promedio = round(suma / calificados, 2) if calificados else 0
+    tasa_participacion = round((asistencias / total * 100), 2) if total > 0 else 0
+    return [id_act, nombre, fecha, tipo, asistencias, total,
+            f"{tasa_participacion}%", f"{satisfaccion_promedio}/5"]
+
+
+@instrumentacion.medir()
+def generar_reporte_general_sql(backend, archivo='src/data/reportes/reporte_general.csv'):
+    """
+    Genera el reporte general con los agregados calculados por la base de datos
+
+    Args:
+        backend (BackendSQLite): Backend con los datos
+        archivo (str): Ruta del CSV a generar
+
+    Returns:
+        bool: True si el reporte se generó correctamente
+    """
+    try:
+        with instrumentacion.etapa('reporte_sql.general') as etapa:
+            ausencias_calculadas = invitacion.contar_ausentes(registros=backend,
+                                                              empleados=backend.cargar_empleados())
+            cursor = backend.conexion().execute(SQL_REPORTE_GENERAL)
+            _escribir_csv(archivo, COLUMNAS_REPORTE_GENERAL, _lotes(cursor), etapa,
+                          lambda fila: _fila_general(fila, ausencias_calculadas))
+
+        print(f"\n✓ Reporte general generado: {archivo}")
+        return True
+    except Exception as e:
+        print(f"\n✗ Error al generar reporte general: {e}")
+        return False
+
+
+# ---------------------------------------------------------
+# REPORTE POR ÁREA: Participación agrupada por área en SQL
+# ---------------------------------------------------------
+SQL_REPORTE_POR_AREA = """
+WITH por_area AS (
+    SELECT area, COUNT(*) AS total_empleados, MIN(rowid) AS orden
+    FROM empleados
+    GROUP BY area
+),
+participaciones AS (
+    SELECT e.area,
+           COUNT(*) AS total,
+           COUNT(DISTINCT p.empleado_id) AS activos,
+           SUM(CASE WHEN p.calificacion > 0 THEN p.calificacion ELSE 0 END) AS suma,
+           SUM(CASE WHEN p.calificacion > 0 THEN 1 ELSE 0 END) AS calificados
+    FROM participacion p
+    JOIN empleados e ON e.id = p.empleado_id
+    WHERE p.asistio
+    GROUP BY e.area
+)
+SELECT a.area, a.total_empleados, COALESCE(p.activos, 0), COALESCE(p.total, 0),
+       COALESCE(p.suma, 0), COALESCE(p.calificados, 0)
+FROM por_area a
+LEFT JOIN participaciones p ON p.area = a.area
+ORDER BY a.orden
+"""
+
+
+@instrumentacion.medir()
+def generar_reporte_por_area_sql(backend, archivo='src/data/reportes/reporte_por_area.csv'):
+    """
+    Genera el reporte por área con los agregados calculados por la base de datos
+
+    Args:
+        backend (BackendSQLite): Backend con los datos
+        archivo (str): Ruta del CSV a generar
+
+    Returns:
+        bool: True si el reporte se generó correctamente
+    """
+    try:
+        with instrumentacion.etapa('reporte_sql.por_area') as etapa:
+            datos_reporte = []
+            for area, total_empleados, activos, total, suma, calificados in \
+                    backend.conexion().execute(SQL_REPORTE_POR_AREA):
+                satisfaccion = round(suma / calificados, 2) if calificados else 0
+                promedio = round(total / total_empleados, 2) if total_empleados > 0 else 0
+                datos_reporte.append([area, total_empleados, activos, total, promedio, f"{satisfaccion}/5"])
+
+            # Mismo criterio que reporte.py: mayor participación primero, orden estable
+            datos_reporte.sort(key=lambda x: x[3], reverse=True)
+            _escribir_csv(archivo, COLUMNAS_REPORTE_POR_AREA, [datos_reporte], etapa)
+
+        print(f"\n✓ Reporte por área generado: {archivo}")
+        return True
+    except Exception as e:
+        print(f"\n✗ Error al generar reporte por área: {e}")
+        return False
+
+
+# ---------------------------------------------------------
+# REPORTE DETALLADO: Cruce y orden resueltos en SQL
+# ---------------------------------------------------------
+SQL_REPORTE_DETALLADO = """
+SELECT p.empleado_id, e.nombre, e.area, e.cargo,
+       p.actividad_id, a.nombre, a.fecha, a.tipo,
+       p.asistio, p.calificacion
+FROM participacion p
+JOIN empleados e ON e.id = p.empleado_id
+JOIN actividades a ON a.id = p.actividad_id
+ORDER BY a.fecha, e.nombre, p.rowid
+"""
+
+
+def _fila_detallada(fila):
+    *inicio, asistio, calificacion = fila
+    if asistio:
+        return inicio + ["Asistió", f"{calificacion}/5"]
+    return inicio + ["No asistió", "N/A"]
+
+
+@instrumentacion.medir()
+def generar_reporte_detallado_sql(backend, archivo='src/data/reportes/reporte_detallado.csv'):
+    """
+    Genera el reporte detallado ordenado por la base de datos y escrito por lotes
+
+    Args:
+        backend (BackendSQLite): Backend con los datos
+        archivo (str): Ruta del CSV a generar
+
+    Returns:
+        bool: True si el reporte se generó correctamente
+    """
+    try:
+        with instrumentacion.etapa('reporte_sql.detallado') as etapa:
+            cursor = backend.conexion().execute(SQL_REPORTE_DETALLADO)
+            _escribir_csv(archivo, COLUMNAS_REPORTE_DETALLADO, _lotes(cursor), etapa, _fila_detallada)
+
+        print(f"\n✓ Reporte detallado generado: {archivo}")
+        return True
+    except Exception as e:
+        print(f"\n✗ Error al generar reporte detallado: {e}")
+        return False
+
+
+# ---------------------------------------------------------
+# RESUMEN EJECUTIVO: Indicadores clave con una consulta por métrica
+# ---------------------------------------------------------
+SQL_RESUMEN_TOTALES = """
+SELECT (SELECT COUNT(*) FROM empleados),
+       (SELECT COUNT(*) FROM actividades),
+       COUNT(*),
+       COALESCE(SUM(asistio), 0),
+       COALESCE(SUM(CASE WHEN asistio AND calificacion > 0 THEN calificacion ELSE 0 END), 0),
+       COALESCE(SUM(CASE WHEN asistio AND calificacion > 0 THEN 1 ELSE 0 END), 0),
+       COUNT(DISTINCT CASE WHEN asistio THEN empleado_id END)
+FROM participacion
+"""
+
+SQL_RESUMEN_ASISTENCIA_POR_ACTIVIDAD = """
+SELECT a.nombre, COALESCE(g.asistencias, 0)
+FROM actividades a
+LEFT JOIN (SELECT actividad_id, SUM(asistio) AS asistencias
+           FROM participacion GROUP BY actividad_id) g ON g.actividad_id = a.id
+ORDER BY a.rowid
+"""
+
+
+@instrumentacion.medir()
+def generar_resumen_ejecutivo_sql(backend, archivo='src/data/reportes/resumen_ejecutivo.csv'):
+    """
+    Genera el resumen ejecutivo con los indicadores calculados por la base de datos
+
+    Args:
+        backend (BackendSQLite): Backend con los datos
+        archivo (str): Ruta del CSV a generar
+
+    Returns:
+        bool: True si el reporte se generó correctamente
+    """
+    try:
+        with instrumentacion.etapa('reporte_sql.resumen') as etapa:
+            con = backend.conexion()
+            (total_empleados, total_actividades, total_registros, total_asistencias,
+             suma, calificados, empleados_activos) = con.execute(SQL_RESUMEN_TOTALES).fetchone()
+            total_registros += sum(invitacion.contar_ausentes(registros=backend,
+                                                              empleados=backend.cargar_empleados()).values())
+
+            tasa_participacion = round((total_asistencias / total_registros * 100), 2) if total_registros > 0 else 0
+            satisfaccion_global = round(suma / calificados, 2) if calificados else 0
+
+            # Igual que reporte.py: las actividades con el mismo nombre se agrupan (gana la última)
+            actividades_participacion = dict(con.execute(SQL_RESUMEN_ASISTENCIA_POR_ACTIVIDAD))
+            actividad_top = max(actividades_participacion, key=actividades_participacion.get) if actividades_participacion else "N/A"
+
+            datos_reporte = [
+                ['Métrica', 'Valor'],
+                ['Fecha', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
+                ['Total empleados', total_empleados],
+                ['Total actividades', total_actividades],
+                ['Total registros', total_registros],
+                ['Total asistencias', total_asistencias],
+                ['Participación global', f"{tasa_participacion}%"],
+                ['Satisfacción global', f"{satisfaccion_global}/5"],
+                ['Empleados activos', empleados_activos],
+                ['% Activos', f"{round((empleados_activos / total_empleados * 100), 2)}%" if total_empleados else "0%"],
+                ['Actividad destacada', actividad_top]
+            ]
+            _escribir_csv(archivo, None, [datos_reporte], etapa)
+
+        print(f"\n✓ Resumen ejecutivo generado: {archivo}")
+        return True
+    except Exception as e:
+        print(f"\n✗ Error al generar resumen ejecutivo: {e}")
+        return False
+
+
+# ---------------------------------------------------------
+# GENERA TODOS LOS REPORTES
+# ---------------------------------------------------------
+def generar_todos_los_reportes_sql(backend):
+    """
+    Ejecuta los 3 reportes principales sobre la base de datos.
+    """
+    print("\n" + "="*60)
+    print("  GENERANDO TODOS LOS REPORTES")
+    print("="*60)
+
+    exito_general = generar_reporte_general_sql(backend)
+    exito_area = generar_reporte_por_area_sql(backend)
+    exito_detallado = generar_reporte_detallado_sql(backend)
+
+    total_exitosos = sum([exito_general, exito_area, exito_detallado])
+    print(f"\n✓ Reportes generados: {total_exitosos}/3")
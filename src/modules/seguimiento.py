@@ -0,0 +1,160 @@
+"""
+Módulo seguimiento: lectura incremental de archivos que solo crecen
+
+participacion.txt se modifica agregando líneas al final. Un
+LectorIncremental recuerda hasta qué byte leyó y, en la siguiente
+lectura, procesa solo las líneas completas agregadas desde entonces.
+
+Para detectar que el archivo fue truncado o reescrito (por ejemplo al
+compactarlo) guarda también el inodo y un checksum de los primeros y
+últimos bytes ya leídos; si algo no coincide, vuelve a leer desde el
+principio e informa el reinicio para que quien lo usa descarte lo que
+había acumulado.
+"""
+
+import hashlib
+import os
+
+from . import diagnostico, instrumentacion, parseo_rapido
+
+# Bytes del principio y del final de lo leído que entran en el checksum
+VENTANA = 4096
+
+
+class LectorIncremental:
+    """
+    Lector de las líneas nuevas de un archivo de texto
+
+    Args:
+        archivo (str): Ruta del archivo a seguir
+        parsear (callable): Convierte una línea en objeto (None si es inválida);
+            por defecto los registros se convierten por lotes con parseo_rapido
+    """
+
+    def __init__(self, archivo='src/data/participacion.txt', parsear=None):
+        self.archivo = archivo
+        self.parsear = parsear
+        self.offset = 0
+        self.inodo = None
+        self.checksum = None
+
+    def estado(self):
+        """
+        Punto de control serializable en JSON
+
+        Returns:
+            dict: offset, inodo y checksum de lo leído
+        """
+        return {'offset': self.offset, 'inodo': self.inodo, 'checksum': self.checksum}
+
+    @classmethod
+    def desde_estado(cls, archivo, estado, parsear=None):
+        """
+        Retoma la lectura desde un punto de control guardado
+
+        Args:
+            archivo (str): Ruta del archivo a seguir
+            estado (dict): Resultado de estado() (None o vacío = desde el principio)
+            parsear (callable): Ver LectorIncremental
+
+        Returns:
+            LectorIncremental: Lector posicionado en el punto de control
+        """
+        lector = cls(archivo, parsear)
+        if estado:
+            lector.offset = estado.get('offset', 0)
+            lector.inodo = estado.get('inodo')
+            lector.checksum = estado.get('checksum')
+        return lector
+
+    def reiniciar(self):
+        """Vuelve al principio del archivo"""
+        self.offset = 0
+        self.inodo = None
+        self.checksum = None
+
+    def _checksum(self, f, offset):
+        """SHA-1 de los primeros y los últimos VENTANA bytes antes de offset"""
+        h = hashlib.sha1()
+        f.seek(0)
+        h.update(f.read(min(VENTANA, offset)))
+        if offset > VENTANA:
+            f.seek(max(VENTANA, offset - VENTANA))
+            h.update(f.read(offset - max(VENTANA, offset - VENTANA)))
+        return h.hexdigest()
+
+    def _reescrito(self, f, st):
+        """El archivo ya no empieza con lo que se leyó antes"""
+        if st.st_size < self.offset or (self.inodo is not None and st.st_ino != self.inodo):
+            return True
+        return self._checksum(f, self.offset) != self.checksum
+
+    def leer_texto(self):
+        """
+        Lee el texto de las líneas completas agregadas desde la última lectura
+
+        Una línea sin salto final (a medio escribir) se deja para la próxima vez.
+
+        Returns:
+            tuple: (texto nuevo, True si se reinició desde el principio)
+        """
+        try:
+            f = open(self.archivo, 'rb')
+        except FileNotFoundError:
+            reinicio = self.offset > 0
+            self.reiniciar()
+            return '', reinicio
+
+        with f:
+            st = os.fstat(f.fileno())
+            reinicio = False
+            if self.offset and self._reescrito(f, st):
+                diagnostico.logger.info("%s fue reescrito: se vuelve a leer desde el principio",
+                                        self.archivo)
+                self.reiniciar()
+                reinicio = True
+            if st.st_size == self.offset:
+                return '', reinicio
+
+            f.seek(self.offset)
+            datos = f.read(st.st_size - self.offset)
+            fin = datos.rfind(b'\n') + 1
+            if not fin:
+                return '', reinicio
+
+            self.offset += fin
+            self.inodo = st.st_ino
+            self.checksum = self._checksum(f, self.offset)
+
+        instrumentacion.contar('seguimiento.leer_texto', bytes_leidos=fin)
+        return datos[:fin].decode('utf-8'), reinicio
+
+    def leer_lineas(self):
+        """
+        Lee las líneas completas agregadas desde la última lectura
+
+        Returns:
+            tuple: (lista de líneas, True si se reinició desde el principio)
+        """
+        texto, reinicio = self.leer_texto()
+        return texto.splitlines(), reinicio
+
+    def leer(self):
+        """
+        Lee y convierte las líneas nuevas (las inválidas se informan y se omiten)
+
+        Returns:
+            tuple: (lista de objetos nuevos, True si se reinició desde el principio)
+        """
+        lineas, reinicio = self.leer_lineas()
+        nuevos = []
+        if lineas:
+            with diagnostico.sesion_carga(self.archivo):
+                if self.parsear is None:
+                    return parseo_rapido.convertir_lineas(lineas, 'registro'), reinicio
+                for linea in lineas:
+                    if linea.strip():
+                        objeto = self.parsear(linea)
+                        if objeto:
+                            nuevos.append(objeto)
+        return nuevos, reinicio
@@ -0,0 +1,328 @@
+"""
+Módulo de series de tiempo: tablas de agregados (rollups) de participación
+por día, semana, mes y trimestre, cruzadas por área y tipo de actividad.
+
+Con archivos de texto los agregados se actualizan leyendo solo las líneas
+nuevas de participacion.txt; con otro backend (SQLite) no hay archivo que
+seguir y se arman desde sus registros (ver obtener_rollup).
+"""
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+from . import almacenamiento, diagnostico, seguimiento
+from .registro import Registro
+
+GRANULARIDADES = ('dia', 'semana', 'mes', 'trimestre')
+SIN_AREA = 'Sin área'
+# Registros que se guardan a la espera de su actividad o del área de su empleado
+MAXIMO_PENDIENTES = 100_000
+
+
+def clave_periodo(fecha, granularidad):
+    """
+    Calcula la clave del periodo al que pertenece una fecha
+
+    Las claves se ordenan lexicográficamente igual que cronológicamente:
+    dia 'YYYY-MM-DD', semana ISO 'YYYY-Www', mes 'YYYY-MM', trimestre 'YYYY-Tn'.
+
+    Args:
+        fecha (date): Fecha a clasificar
+        granularidad (str): Una de GRANULARIDADES
+
+    Returns:
+        str: Clave del periodo
+    """
+    if granularidad == 'dia':
+        return fecha.isoformat()
+    if granularidad == 'semana':
+        anio, semana, _ = fecha.isocalendar()
+        return f"{anio}-W{semana:02d}"
+    if granularidad == 'mes':
+        return f"{fecha.year}-{fecha.month:02d}"
+    if granularidad == 'trimestre':
+        return f"{fecha.year}-T{(fecha.month - 1) // 3 + 1}"
+    raise ValueError(f"Granularidad desconocida: {granularidad}")
+
+
+class RollupParticipacion:
+    """
+    Tablas materializadas de participación por periodo × área × tipo
+
+    Cada celda acumula [registros, asistencias, suma_calificaciones, n_calificaciones],
+    de modo que la tasa y la satisfacción se derivan sin volver a los registros.
+    """
+
+    def __init__(self):
+        # granularidad -> periodo -> (area, tipo) -> [registros, asistencias, suma, n]
+        self.tablas = {g: {} for g in GRANULARIDADES}
+        # Calendario: actividad_id -> (claves de periodo por granularidad, tipo)
+        self.calendario = {}
+        # Área de cada empleado
+        self.areas = {}
+        # Registros cuya actividad aún no está en el calendario
+        self.pendientes = []
+        # empleado_id -> registros contados en SIN_AREA, para reasignarlos cuando aparezca
+        self.sin_area = {}
+        self.cantidad_sin_area = 0
+        # Registros sin actividad descartados por superar MAXIMO_PENDIENTES
+        self.descartados = 0
+        # Punto de control de participacion.txt (ver seguimiento.LectorIncremental)
+        self.seguimiento = {}
+
+    def agregar_actividad(self, actividad):
+        """
+        Incorpora una actividad al calendario y aplica registros pendientes
+
+        Args:
+            actividad (Actividad): Actividad a incorporar
+        """
+        claves = {g: clave_periodo(actividad.fecha, g) for g in GRANULARIDADES}
+        self.calendario[actividad.id_actividad] = (claves, actividad.tipo)
+
+        if self.pendientes:
+            pendientes, self.pendientes = self.pendientes, []
+            for reg in pendientes:
+                self.agregar_registro(reg)
+
+    def agregar_empleado(self, empleado):
+        """
+        Registra el área de un empleado para clasificar sus registros
+
+        Los registros que ya se habían contado en SIN_AREA porque el empleado
+        aún no existía pasan a su área.
+
+        Args:
+            empleado (Empleado): Empleado a incorporar
+        """
+        self.areas[empleado.id_empleado] = empleado.area
+        registros = self.sin_area.pop(empleado.id_empleado, None)
+        if not registros:
+            return
+        self.cantidad_sin_area -= len(registros)
+        for reg in registros:
+            entrada = self.calendario.get(reg.actividad_id)
+            if entrada is None:
+                continue
+            claves, tipo = entrada
+            self._sumar(reg, claves, (SIN_AREA, tipo), -1)
+            self._sumar(reg, claves, (empleado.area, tipo), 1)
+
+    def agregar_registro(self, registro):
+        """
+        Suma un registro de participación a todas las granularidades
+
+        Args:
+            registro (Registro): Registro a incorporar
+        """
+        entrada = self.calendario.get(registro.actividad_id)
+        if entrada is None:
+            if len(self.pendientes) < MAXIMO_PENDIENTES:
+                self.pendientes.append(registro)
+            else:
+                self.descartados += 1
+            return
+
+        claves, tipo = entrada
+        area = self.areas.get(registro.empleado_id)
+        if area is None:
+            area = SIN_AREA
+            # Pasado el límite se sigue contando en SIN_AREA pero ya no se podrá reasignar
+            if self.cantidad_sin_area < MAXIMO_PENDIENTES:
+                self.sin_area.setdefault(registro.empleado_id, []).append(registro)
+                self.cantidad_sin_area += 1
+        self._sumar(registro, claves, (area, tipo), 1)
+
+    def _sumar(self, registro, claves, grupo, signo):
+        """Suma (signo 1) o resta (signo -1) un registro en las celdas de su grupo"""
+        calificado = registro.asistio and registro.calificacion > 0
+        for granularidad, periodo in claves.items():
+            celdas = self.tablas[granularidad].setdefault(periodo, {})
+            celda = celdas.get(grupo)
+            if celda is None:
+                celda = celdas[grupo] = [0, 0, 0, 0]
+            celda[0] += signo
+            if registro.asistio:
+                celda[1] += signo
+            if calificado:
+                celda[2] += signo * registro.calificacion
+                celda[3] += signo
+            if not celda[0]:
+                del celdas[grupo]
+                if not celdas:
+                    del self.tablas[granularidad][periodo]
+
+    def consultar(self, granularidad, desde=None, hasta=None, area=None, tipo=None):
+        """
+        Consulta un rango de periodos directamente sobre las tablas de agregados
+
+        Args:
+            granularidad (str): Una de GRANULARIDADES
+            desde (date): Fecha inicial del rango (opcional)
+            hasta (date): Fecha final del rango (opcional)
+            area (str): Filtrar por área (opcional)
+            tipo (str): Filtrar por tipo de actividad (opcional)
+
+        Returns:
+            list: Filas [periodo, area, tipo, registros, asistencias, tasa, satisfaccion]
+        """
+        tabla = self.tablas[granularidad]
+        periodos = sorted(tabla)
+        inicio = bisect_left(periodos, clave_periodo(desde, granularidad)) if desde else 0
+        fin = bisect_right(periodos, clave_periodo(hasta, granularidad)) if hasta else len(periodos)
+
+        filas = []
+        for periodo in periodos[inicio:fin]:
+            for (area_celda, tipo_celda), (total, asistencias, suma, n) in sorted(tabla[periodo].items()):
+                if area is not None and area_celda != area:
+                    continue
+                if tipo is not None and tipo_celda != tipo:
+                    continue
+                tasa = round(asistencias / total * 100, 2) if total else 0
+                satisfaccion = round(suma / n, 2) if n else 0
+                filas.append([periodo, area_celda, tipo_celda, total, asistencias, tasa, satisfaccion])
+        return filas
+
+    def reconstruir(self, empleados, actividades, registros):
+        """
+        Arma los agregados desde cero con registros de cualquier origen
+
+        Args:
+            empleados (list): Empleados vigentes
+            actividades (list): Calendario de actividades vigente
+            registros (iterable): Registros de participación (p. ej. backend.iterar_registros())
+        """
+        self.__init__()
+        for act in actividades:
+            self.agregar_actividad(act)
+        for emp in empleados:
+            self.agregar_empleado(emp)
+        for reg in registros:
+            self.agregar_registro(reg)
+        self._informar_descartados()
+
+    def actualizar_desde_archivos(self, empleados, actividades,
+                                  archivo_participacion='src/data/participacion.txt'):
+        """
+        Actualiza los agregados de forma incremental
+
+        Solo se leen las líneas de participación agregadas desde la última
+        actualización. Si el archivo se truncó o se reescribió se
+        reconstruyen las tablas desde cero. Los registros de actividades que
+        no existen esperan hasta MAXIMO_PENDIENTES; los que sobran se
+        descartan y se informan en el log.
+
+        Args:
+            empleados (list): Empleados vigentes
+            actividades (list): Calendario de actividades vigente
+            archivo_participacion (str): Ruta del archivo de participación
+        """
+        if not os.path.exists(archivo_participacion):
+            return
+        lector = seguimiento.LectorIncremental.desde_estado(archivo_participacion, self.seguimiento)
+        nuevos, reinicio = lector.leer()
+        if reinicio:
+            self.__init__()
+        self.seguimiento = lector.estado()
+
+        # Primero el calendario: reasignar los registros SIN_AREA necesita sus periodos
+        for act in actividades:
+            if act.id_actividad not in self.calendario:
+                self.agregar_actividad(act)
+        for emp in empleados:
+            self.agregar_empleado(emp)
+        for reg in nuevos:
+            self.agregar_registro(reg)
+        self._informar_descartados()
+
+    def _informar_descartados(self):
+        """Informa en el log los registros descartados por superar MAXIMO_PENDIENTES"""
+        if self.descartados:
+            diagnostico.logger.warning("%d registros de actividades inexistentes descartados "
+                                       "(más de %d en espera)", self.descartados, MAXIMO_PENDIENTES)
+            self.descartados = 0
+
+    def guardar(self, archivo='src/data/rollups.json'):
+        """Persiste las tablas de agregados en un archivo JSON"""
+        os.makedirs(os.path.dirname(archivo), exist_ok=True)
+        estado = {
+            'seguimiento': self.seguimiento,
+            'tablas': {
+                g: {p: [[a, t, *celda] for (a, t), celda in celdas.items()]
+                    for p, celdas in tabla.items()}
+                for g, tabla in self.tablas.items()
+            },
+            'pendientes': [r.to_string() for r in self.pendientes],
+            'sin_area': [r.to_string() for regs in self.sin_area.values() for r in regs],
+        }
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False)
+
+    @staticmethod
+    def cargar(archivo='src/data/rollups.json'):
+        """
+        Carga tablas de agregados persistidas previamente
+
+        Args:
+            archivo (str): Ruta del archivo JSON de agregados
+
+        Returns:
+            RollupParticipacion: Agregados cargados (vacíos si no hay archivo)
+        """
+        rollup = RollupParticipacion()
+        if not os.path.exists(archivo):
+            return rollup
+        try:
+            with open(archivo, 'r', encoding='utf-8') as f:
+                estado = json.load(f)
+            rollup.seguimiento = estado['seguimiento']
+            for g, tabla in estado['tablas'].items():
+                rollup.tablas[g] = {
+                    p: {(a, t): celda for a, t, *celda in filas}
+                    for p, filas in tabla.items()
+                }
+            rollup.pendientes = [r for r in map(Registro.from_string, estado['pendientes']) if r]
+            for reg in filter(None, map(Registro.from_string, estado['sin_area'])):
+                rollup.sin_area.setdefault(reg.empleado_id, []).append(reg)
+                rollup.cantidad_sin_area += 1
+        except (ValueError, KeyError, TypeError):
+            # Archivo corrupto o de otra versión: se reconstruye desde cero
+            return RollupParticipacion()
+        return rollup
+
+
+def obtener_rollup(empleados, actividades, archivo_participacion=None, archivo_rollup=None):
+    """
+    Devuelve los agregados al día, incorporando solo los registros nuevos
+
+    Sin rutas se usan las del backend activo: la carpeta del backend de
+    texto, o los registros de la base con otro backend (en ese caso los
+    agregados se arman completos y no se persisten).
+
+    Args:
+        empleados (list): Lista de empleados
+        actividades (list): Lista de actividades
+        archivo_participacion (str): Ruta del archivo de participación
+        archivo_rollup (str): Ruta del archivo JSON de agregados
+
+    Returns:
+        RollupParticipacion: Agregados actualizados y persistidos
+    """
+    if archivo_participacion is None:
+        backend = almacenamiento.obtener_backend()
+        carpeta = 'src/data'
+        if isinstance(backend, almacenamiento.BackendTexto):
+            carpeta = backend.carpeta
+        elif backend is not None:
+            rollup = RollupParticipacion()
+            rollup.reconstruir(empleados, actividades, backend.iterar_registros())
+            return rollup
+        archivo_participacion = os.path.join(carpeta, 'participacion.txt')
+        archivo_rollup = archivo_rollup or os.path.join(carpeta, 'rollups.json')
+    archivo_rollup = archivo_rollup or 'src/data/rollups.json'
+    rollup = RollupParticipacion.cargar(archivo_rollup)
+    previo = (rollup.seguimiento, len(rollup.pendientes), rollup.cantidad_sin_area)
+    rollup.actualizar_desde_archivos(empleados, actividades, archivo_participacion)
+    if (rollup.seguimiento, len(rollup.pendientes), rollup.cantidad_sin_area) != previo:
+        rollup.guardar(archivo_rollup)
+    return rollup
@@ -0,0 +1,564 @@
+"""
+Módulo servidor HTTP: API de solo lectura para tableros de la intranet
+
+Expone empleados, actividades, estadísticas y reportes como JSON (o CSV)
+usando solo la biblioteca estándar. Cada respuesta se calcula una vez por
+versión de los datos (tamaño y fecha de modificación de los archivos) y
+se guarda en memoria con su ETag y su versión comprimida con gzip (que
+lleva su propio ETag, terminado en '-gz'). La caché de respuestas guarda
+las MAXIMO_RESPUESTAS usadas más recientemente y se vacía cuando cambian
+los datos. Con
+archivos de texto, cuando participacion.txt crece solo se leen las
+líneas nuevas (modules/seguimiento.py).
+
+Rutas:
+    GET /api/salud
+    GET /api/empleados
+    GET /api/actividades
+    GET /api/estadisticas[?actividad_id=N]
+    GET /api/histogramas[?por=actividad|area|tipo]
+    GET /api/reportes/<general|por_area|detallado|resumen>[.csv]
+    GET /api/reportes/periodo[.csv][?granularidad=mes&desde=AAAA-MM&hasta=AAAA-MM]
+
+Uso (desde la raíz del proyecto):
+    PYTHONPATH=src python -m modules.servidor_http --puerto 8080
+"""
+
+import contextlib
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import (actividad, almacenamiento, diagnostico, empleado, invitacion, registro,
+               reporte, reporte_sql, seguimiento, series, vectorizado)
+
+# Respuestas más chicas que esto no se comprimen
+MINIMO_GZIP = 512
+
+# Respuestas distintas (ruta + parámetros) guardadas en la caché a la vez
+MAXIMO_RESPUESTAS = 256
+
+# Reporte -> (función en memoria, función SQL, nombre del CSV)
+REPORTES = {
+    'general': (reporte.generar_reporte_general,
+                reporte_sql.generar_reporte_general_sql, 'reporte_general.csv'),
+    'por_area': (reporte.generar_reporte_por_area,
+                 reporte_sql.generar_reporte_por_area_sql, 'reporte_por_area.csv'),
+    'detallado': (reporte.generar_reporte_detallado,
+                  reporte_sql.generar_reporte_detallado_sql, 'reporte_detallado.csv'),
+    'resumen': (reporte.generar_resumen_ejecutivo,
+                reporte_sql.generar_resumen_ejecutivo_sql, 'resumen_ejecutivo.csv'),
+}
+
+# Reportes en memoria que suman las ausencias calculadas de las invitaciones
+REPORTES_CON_AUSENCIAS = ('general', 'resumen')
+
+# Parámetros de consulta que distinguen respuestas en la caché
+PARAMETROS = ('actividad_id', 'granularidad', 'desde', 'hasta', 'por')
+
+COLUMNAS_REPORTE_PERIODO = ['Periodo', 'Area', 'Tipo', 'Total_Registros', 'Asistencias',
+                            'Tasa_Participacion', 'Satisfaccion_Promedio']
+
+
+class ErrorHTTP(Exception):
+    """Error que se responde al cliente con su código de estado"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class Recurso:
+    """Respuesta ya serializada, lista para enviarse muchas veces"""
+
+    __slots__ = ('cuerpo', 'tipo', 'etag', 'etag_gzip', '_comprimido')
+
+    def __init__(self, cuerpo, tipo):
+        self.cuerpo = cuerpo
+        self.tipo = tipo
+        self.etag = '"' + hashlib.sha1(cuerpo).hexdigest()[:20] + '"'
+        # Otro cuerpo, otro validador: gzip e identidad no comparten ETag
+        self.etag_gzip = self.etag[:-1] + '-gz"'
+        self._comprimido = None
+
+    def comprimido(self):
+        """Cuerpo en gzip (se comprime la primera vez que se pide)"""
+        if self._comprimido is None:
+            self._comprimido = gzip.compress(self.cuerpo, compresslevel=6)
+        return self._comprimido
+
+
+def _json(datos):
+    return Recurso(json.dumps(datos, ensure_ascii=False).encode('utf-8'),
+                   'application/json; charset=utf-8')
+
+
+def _csv(columnas, filas):
+    salida = io.StringIO()
+    writer = csv.writer(salida)
+    if columnas:
+        writer.writerow(columnas)
+    writer.writerows(filas)
+    return Recurso(salida.getvalue().encode('utf-8'), 'text/csv; charset=utf-8')
+
+
+def _coincide_etag(encabezado, etag):
+    """
+    Indica si If-None-Match nombra el ETag (comparación débil, como pide HTTP)
+
+    Args:
+        encabezado (str): Valor de If-None-Match o None
+        etag (str): ETag de la respuesta que se enviaría
+
+    Returns:
+        bool: True si el cliente ya tiene esa respuesta
+    """
+    if not encabezado:
+        return False
+    for valor in encabezado.split(','):
+        valor = valor.strip()
+        if valor.startswith('W/'):
+            valor = valor[2:]
+        if valor == '*' or valor == etag:
+            return True
+    return False
+
+
+def _mes(parametros, nombre, fin=False):
+    """
+    Parámetro AAAA-MM de la consulta como fecha
+
+    Args:
+        parametros (dict): Parámetros de la consulta
+        nombre (str): 'desde' o 'hasta'
+        fin (bool): Devolver el último día del mes en lugar del primero
+
+    Returns:
+        date: Primer (o último) día del mes, o None si no se indicó
+
+    Raises:
+        ErrorHTTP: 400 si el valor no es un mes válido
+    """
+    valor = parametros.get(nombre)
+    if not valor:
+        return None
+    try:
+        anio, mes = valor.split('-')
+        if len(anio) != 4 or len(mes) != 2:
+            raise ValueError(valor)
+        primero = date(int(anio), int(mes), 1)
+    except ValueError:
+        raise ErrorHTTP(400, f"{nombre} debe tener el formato AAAA-MM") from None
+    if not fin:
+        return primero
+    return (primero.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+class ServidorLectura:
+    """
+    Lógica de la API: rutas, datos y caché por versión de los archivos
+
+    Args:
+        carpeta (str): Carpeta de los archivos de texto (backend por defecto)
+    """
+
+    def __init__(self, carpeta='src/data'):
+        self.carpeta = carpeta
+        self.rutas = {
+            'empleados': os.path.join(carpeta, 'empleados.txt'),
+            'actividades': os.path.join(carpeta, 'actividades.txt'),
+            'participacion': os.path.join(carpeta, 'participacion.txt'),
+            # Las invitaciones cambian las ausencias calculadas de las estadísticas
+            'invitaciones': os.path.join(carpeta, 'invitaciones.txt'),
+        }
+        self._cache = {}
+        # Respuestas por (ruta, parámetros), de la menos a la más usada; solo de una versión
+        self._respuestas = OrderedDict()
+        self._version_respuestas = None
+        self._lock_respuestas = threading.Lock()
+        # Backend de texto: la participación se sigue desde el último byte leído
+        self._lector = seguimiento.LectorIncremental(self.rutas['participacion'])
+        self._registros = []
+        self._rollup = None
+        # Reentrante: calcular un reporte puede pedir las listas de datos
+        self._lock = threading.RLock()
+        # Los reportes se generan con las funciones de reporte.py en una carpeta propia
+        self._temporal = tempfile.mkdtemp(prefix='wc_http_')
+
+    def cerrar(self):
+        """Borra los archivos temporales del servidor"""
+        shutil.rmtree(self._temporal, ignore_errors=True)
+
+    # --- Versión de los datos ---
+
+    def version_datos(self):
+        """
+        Identifica el estado actual de los datos sin leerlos
+
+        Returns:
+            tuple: (tamaño, fecha de modificación) de cada archivo de datos
+        """
+        backend = almacenamiento.obtener_backend()
+        if isinstance(backend, almacenamiento.BackendSQLite):
+            rutas = (backend.ruta, backend.ruta + '-wal', invitacion.ruta_invitaciones())
+        else:
+            rutas = self.rutas.values()
+        version = []
+        for ruta in rutas:
+            try:
+                st = os.stat(ruta)
+                version.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    def _en_cache(self, clave, version, calcular):
+        """
+        Devuelve el valor de la caché o lo calcula si cambió la versión
+
+        Los cálculos se hacen de a uno: con muchas peticiones simultáneas
+        tras un cambio en los datos, el reporte se genera una sola vez.
+        """
+        entrada = self._cache.get(clave)
+        if entrada is not None and entrada[0] == version:
+            return entrada[1]
+        with self._lock:
+            entrada = self._cache.get(clave)
+            if entrada is not None and entrada[0] == version:
+                return entrada[1]
+            valor = calcular()
+            self._cache[clave] = (version, valor)
+            return valor
+
+    def _datos(self, version):
+        """Listas de empleados, actividades y registros de la versión actual"""
+        def cargar():
+            # Con archivos de texto cada lista depende solo de su archivo
+            por_archivo = almacenamiento.obtener_backend() is None
+            return (self._en_cache('empleados', version[0] if por_archivo else version,
+                                   lambda: empleado.cargar_empleados(self.rutas['empleados'])),
+                    self._en_cache('actividades', version[1] if por_archivo else version,
+                                   lambda: actividad.cargar_actividades(self.rutas['actividades'])),
+                    self._registros_al_dia())
+        return self._en_cache('datos', version, cargar)
+
+    def _invitaciones(self, version):
+        """Invitaciones de la carpeta del servidor"""
+        return self._en_cache('invitaciones', version,
+                              lambda: invitacion.cargar_invitaciones(self.rutas['invitaciones']))
+
+    def _registros_al_dia(self):
+        """
+        Registros de participación incorporando solo las líneas nuevas
+
+        Con el backend de texto se leen los bytes agregados desde la
+        última vez; si el archivo se reescribió se vuelve a leer completo.
+        """
+        if almacenamiento.obtener_backend() is not None:
+            return registro.cargar_registros(self.rutas['participacion'])
+        nuevos, reinicio = self._lector.leer()
+        if reinicio:
+            self._registros = nuevos
+        elif nuevos:
+            # Lista nueva: las versiones anteriores en caché no cambian
+            self._registros = self._registros + nuevos
+        return self._registros
+
+    def _tabla(self, version):
+        """Participación en columnas (incremental con el backend de texto)"""
+        if almacenamiento.obtener_backend() is not None:
+            _, _, registros = self._datos(version)
+            return vectorizado.TablaParticipacion.desde_registros(registros)
+        return vectorizado.tabla_de_archivo(self.rutas['participacion'])
+
+    # --- Recursos ---
+
+    def obtener(self, ruta, consulta):
+        """
+        Resuelve una ruta de la API
+
+        Args:
+            ruta (str): Ruta pedida (sin la consulta)
+            consulta (dict): Parámetros de la consulta (parse_qs)
+
+        Returns:
+            Recurso: Respuesta serializada
+
+        Raises:
+            ErrorHTTP: Si la ruta no existe o los parámetros son inválidos
+        """
+        if ruta == '/api/salud':
+            return _json({'estado': 'ok'})
+
+        version = self.version_datos()
+        parametros = tuple((k, consulta[k][-1]) for k in PARAMETROS if k in consulta)
+        clave = (ruta, parametros)
+        recurso = self._respuesta_guardada(clave, version)
+        if recurso is not None:
+            return recurso
+        with self._lock:
+            recurso = self._respuesta_guardada(clave, version)
+            if recurso is None:
+                recurso = self._calcular(ruta, dict(parametros), version)
+                self._guardar_respuesta(clave, version, recurso)
+            return recurso
+
+    def _respuesta_guardada(self, clave, version):
+        """Respuesta en caché para la versión dada (la marca como usada) o None"""
+        with self._lock_respuestas:
+            if version != self._version_respuestas:
+                return None
+            recurso = self._respuestas.get(clave)
+            if recurso is not None:
+                self._respuestas.move_to_end(clave)
+            return recurso
+
+    def _guardar_respuesta(self, clave, version, recurso):
+        """
+        Guarda una respuesta descartando las de otras versiones y las menos usadas
+
+        Las claves llevan los valores de la consulta tal como llegan, así que
+        sin límite cualquier cliente podría hacer crecer la caché sin fin.
+        """
+        with self._lock_respuestas:
+            if version != self._version_respuestas:
+                self._respuestas.clear()
+                self._version_respuestas = version
+            self._respuestas[clave] = recurso
+            while len(self._respuestas) > MAXIMO_RESPUESTAS:
+                self._respuestas.popitem(last=False)
+
+    def _calcular(self, ruta, parametros, version):
+        if ruta == '/api/empleados':
+            empleados, _, _ = self._datos(version)
+            return _json([{'id': e.id_empleado, 'nombre': e.nombre, 'area': e.area,
+                           'cargo': e.cargo} for e in empleados])
+
+        if ruta == '/api/actividades':
+            _, actividades, _ = self._datos(version)
+            return _json([{'id': a.id_actividad, 'nombre': a.nombre, 'fecha': a.fecha.isoformat(),
+                           'tipo': a.tipo, 'descripcion': a.descripcion} for a in actividades])
+
+        if ruta == '/api/estadisticas':
+            actividad_id = parametros.get('actividad_id')
+            if actividad_id is not None and not actividad_id.isdigit():
+                raise ErrorHTTP(400, "actividad_id debe ser un número entero")
+            if isinstance(almacenamiento.obtener_backend(), almacenamiento.BackendSQLite):
+                stats = registro.calcular_estadisticas(
+                    actividad_id=int(actividad_id) if actividad_id else None)
+            else:
+                empleados, _, _ = self._datos(version)
+                tabla = self._tabla(version)
+                actividad_id = int(actividad_id) if actividad_id else None
+                ausencias = invitacion.contar_ausentes(actividad_id, tabla, self._invitaciones(version),
+                                                       empleados)
+                stats = registro.sumar_ausencias(vectorizado.estadisticas(tabla, actividad_id),
+                                                 sum(ausencias.values()))
+            return _json(stats)
+
+        if ruta == '/api/histogramas':
+            return self._histogramas(parametros.get('por', 'actividad'), version)
+
+        if ruta.startswith('/api/reportes/'):
+            nombre = ruta[len('/api/reportes/'):]
+            formato = 'json'
+            if nombre.endswith('.csv'):
+                nombre, formato = nombre[:-len('.csv')], 'csv'
+            if nombre == 'periodo':
+                return self._reporte_periodo(parametros, formato, version)
+            if nombre in REPORTES:
+                return self._reporte(nombre, formato, version)
+
+        raise ErrorHTTP(404, f"Ruta desconocida: {ruta}")
+
+    def _histogramas(self, por, version):
+        if por not in ('actividad', 'area', 'tipo'):
+            raise ErrorHTTP(400, "por debe ser actividad, area o tipo")
+        empleados, actividades, _ = self._datos(version)
+        tabla = self._tabla(version)
+        if por == 'actividad':
+            histogramas = vectorizado.histogramas_por_actividad(tabla)
+        elif por == 'area':
+            histogramas = vectorizado.histogramas_por_area(empleados, tabla)
+        else:
+            histogramas = vectorizado.histogramas_por_tipo(actividades, tabla)
+        return _json({str(clave): {'histograma': h.to_dict(), 'total': h.total,
+                                   'media': round(h.media(), 2), **h.resumen()}
+                      for clave, h in histogramas.items()})
+
+    def _reporte(self, nombre, formato, version):
+        en_memoria, en_sql, archivo = REPORTES[nombre]
+        archivo = os.path.join(self._temporal, archivo)
+
+        # Las funciones de reporte informan por consola; en el servidor se silencian
+        with contextlib.redirect_stdout(io.StringIO()):
+            backend = reporte_sql.backend_sql()
+            if backend is not None:
+                exito = en_sql(backend, archivo)
+            else:
+                opciones = ({'invitaciones': self._invitaciones(version)}
+                            if nombre in REPORTES_CON_AUSENCIAS else {})
+                exito = en_memoria(*self._datos(version), archivo, **opciones)
+        if not exito:
+            raise ErrorHTTP(500, f"No se pudo generar el reporte {nombre}")
+
+        with open(archivo, 'rb') as f:
+            cuerpo = f.read()
+        if formato == 'csv':
+            return Recurso(cuerpo, 'text/csv; charset=utf-8')
+
+        filas = list(csv.reader(io.StringIO(cuerpo.decode('utf-8'))))
+        if nombre == 'resumen':
+            # Filas Métrica,Valor -> objeto
+            return _json(dict(filas[1:]))
+        columnas = filas[0] if filas else []
+        return _json([dict(zip(columnas, fila)) for fila in filas[1:]])
+
+    def _reporte_periodo(self, parametros, formato, version):
+        granularidad = parametros.get('granularidad', 'mes')
+        if granularidad not in series.GRANULARIDADES:
+            raise ErrorHTTP(400, f"granularidad debe ser una de: {', '.join(series.GRANULARIDADES)}")
+        desde, hasta = _mes(parametros, 'desde'), _mes(parametros, 'hasta', fin=True)
+        empleados, actividades, _ = self._datos(version)
+        rollup = self._en_cache('rollup', version, lambda: self._rollup_al_dia(empleados, actividades))
+        filas = [[periodo, area, tipo, total, asistencias, f"{tasa}%", f"{satisfaccion}/5"]
+                 for periodo, area, tipo, total, asistencias, tasa, satisfaccion
+                 in rollup.consultar(granularidad, desde, hasta)]
+        if formato == 'csv':
+            return _csv(COLUMNAS_REPORTE_PERIODO, filas)
+        return _json([dict(zip(COLUMNAS_REPORTE_PERIODO, fila)) for fila in filas])
+
+
+    def _rollup_al_dia(self, empleados, actividades):
+        """Agregados por periodo en memoria, actualizados con los registros nuevos"""
+        backend = almacenamiento.obtener_backend()
+        if isinstance(backend, almacenamiento.BackendSQLite):
+            # Sin archivo que seguir: se arman desde la base (la caché los guarda por versión)
+            rollup = series.RollupParticipacion()
+            rollup.reconstruir(empleados, actividades, backend.iterar_registros())
+            return rollup
+        archivo_rollup = os.path.join(self.carpeta, 'rollups.json')
+        if self._rollup is None:
+            self._rollup = series.obtener_rollup(empleados, actividades, self.rutas['participacion'],
+                                                 archivo_rollup)
+            return self._rollup
+        rollup = self._rollup
+        previo = (rollup.seguimiento, len(rollup.pendientes), rollup.cantidad_sin_area)
+        rollup.actualizar_desde_archivos(empleados, actividades, self.rutas['participacion'])
+        if (rollup.seguimiento, len(rollup.pendientes), rollup.cantidad_sin_area) != previo:
+            rollup.guardar(archivo_rollup)
+        return rollup
+
+
+class ManejadorAPI(BaseHTTPRequestHandler):
+    """Atiende las peticiones HTTP usando el ServidorLectura del servidor"""
+
+    # HTTP/1.1 mantiene la conexión abierta entre peticiones del mismo cliente
+    protocol_version = 'HTTP/1.1'
+    server_version = 'WorkComfort/1.0'
+    # Encabezados y cuerpo salen en escrituras separadas: sin Nagle no esperan el ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._responder(enviar_cuerpo=True)
+
+    def do_HEAD(self):
+        self._responder(enviar_cuerpo=False)
+
+    def _responder(self, enviar_cuerpo):
+        partes = urlsplit(self.path)
+        try:
+            recurso = self.server.api.obtener(partes.path.rstrip('/') or '/', parse_qs(partes.query))
+        except ErrorHTTP as e:
+            self._enviar(e.estado, _json({'error': str(e)}), enviar_cuerpo)
+            return
+        except Exception as e:
+            diagnostico.logger.exception("Error en %s: %s", self.path, e)
+            self._enviar(500, _json({'error': 'Error interno'}), enviar_cuerpo)
+            return
+
+        comprimir = self._comprimir(recurso)
+        etag = recurso.etag_gzip if comprimir else recurso.etag
+        if _coincide_etag(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._enviar(200, recurso, enviar_cuerpo)
+
+    def _comprimir(self, recurso):
+        """True si la respuesta se envía en gzip a este cliente"""
+        return len(recurso.cuerpo) >= MINIMO_GZIP and 'gzip' in self.headers.get('Accept-Encoding', '')
+
+    def _enviar(self, estado, recurso, enviar_cuerpo):
+        comprimir = self._comprimir(recurso)
+        cuerpo = recurso.comprimido() if comprimir else recurso.cuerpo
+
+        self.send_response(estado)
+        self.send_header('Content-Type', recurso.tipo)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.send_header('ETag', recurso.etag_gzip if comprimir else recurso.etag)
+        # Los clientes pueden guardar la respuesta pero deben revalidarla con el ETag
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if comprimir:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        if enviar_cuerpo:
+            self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        # Sin registro por petición en consola; el log queda en diagnóstico
+        diagnostico.logger.debug("%s - %s", self.address_string(), formato % args)
+
+
+def crear_servidor(host='127.0.0.1', puerto=8080, carpeta='src/data'):
+    """
+    Crea el servidor HTTP (un hilo por conexión)
+
+    Args:
+        host (str): Dirección donde escuchar
+        puerto (int): Puerto TCP (0 elige uno libre)
+        carpeta (str): Carpeta de los archivos de datos
+
+    Returns:
+        ThreadingHTTPServer: Servidor listo para serve_forever()
+    """
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorAPI)
+    servidor.daemon_threads = True
+    servidor.api = ServidorLectura(carpeta)
+    return servidor
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="API HTTP de solo lectura de Work Comfort")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8080)
+    parser.add_argument('--carpeta', default='src/data')
+    args = parser.parse_args()
+
+    almacenamiento.configurar_desde_entorno()
+    diagnostico.configurar_registro()
+    servidor = crear_servidor(args.host, args.puerto, args.carpeta)
+    print(f"✓ API disponible en http://{args.host}:{servidor.server_port}/api/")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor detenido")
+    finally:
+        servidor.server_close()
+        servidor.api.cerrar()
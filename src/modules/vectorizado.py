@@ -0,0 +1,459 @@
+"""
+Módulo vectorizado: agregados de participación por columnas
+
+La participación se guarda como cuatro columnas (empleado, actividad,
+asistió, calificación). Si NumPy está instalado las columnas son arreglos
+int32/bool/uint8 y los conteos por actividad o por empleado se hacen con
+np.bincount; si no, se usan listas y un solo recorrido con diccionarios.
+Ambos caminos devuelven exactamente los mismos números (sumas enteras y
+la misma división y redondeo que registro.py y reporte.py). Las
+calificaciones se agrupan en histogramas combinables (modules/histograma.py)
+y las áreas y tipos se agrupan por su código (modules/codificacion.py).
+"""
+
+import os
+import warnings
+
+from . import codificacion, diagnostico, instantanea, parseo_rapido, registro, seguimiento
+from .histograma import HistogramaCalificaciones
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+# Tablas leídas de archivo: ruta -> (lector incremental, tabla)
+_tablas_archivo = {}
+
+
+def disponible():
+    """Indica si se usa NumPy para los agregados"""
+    return np is not None
+
+
+class TablaParticipacion:
+    """
+    Registros de participación en columnas
+
+    Args:
+        empleado_id: Ids de empleado (arreglo int32 o lista)
+        actividad_id: Ids de actividad (arreglo int32 o lista)
+        asistio: Asistencias (arreglo bool o lista)
+        calificacion: Calificaciones (arreglo uint8 o lista)
+    """
+
+    def __init__(self, empleado_id, actividad_id, asistio, calificacion):
+        self.empleado_id = empleado_id
+        self.actividad_id = actividad_id
+        self.asistio = asistio
+        self.calificacion = calificacion
+
+    def __len__(self):
+        return len(self.empleado_id)
+
+    @classmethod
+    def desde_registros(cls, registros):
+        """
+        Crea la tabla a partir de objetos Registro
+
+        Args:
+            registros (list): Lista de registros
+
+        Returns:
+            TablaParticipacion: Tabla con las cuatro columnas
+        """
+        empleados = [r.empleado_id for r in registros]
+        actividades = [r.actividad_id for r in registros]
+        asistio = [r.asistio for r in registros]
+        calificaciones = [r.calificacion for r in registros]
+        if np is None:
+            return cls(empleados, actividades, asistio, calificaciones)
+        try:
+            return cls(np.array(empleados, dtype=np.int32), np.array(actividades, dtype=np.int32),
+                       np.array(asistio, dtype=bool), _columna_calificacion(calificaciones))
+        except OverflowError:
+            # Ids fuera de int32: se usan enteros de 64 bits
+            return cls(np.array(empleados, dtype=np.int64), np.array(actividades, dtype=np.int64),
+                       np.array(asistio, dtype=bool), np.array(calificaciones, dtype=np.int64))
+
+    @classmethod
+    def desde_archivo(cls, archivo='src/data/participacion.txt'):
+        """
+        Lee participacion.txt directamente en columnas
+
+        Con NumPy todo el archivo se convierte en números de una vez
+        (np.fromstring). Si alguna línea no tiene el formato canónico
+        (id|id|True/False|calificacion) se usa el cargador normal, que
+        informa las líneas inválidas.
+
+        Args:
+            archivo (str): Ruta del archivo de participación
+
+        Returns:
+            TablaParticipacion: Tabla con las cuatro columnas
+        """
+        if np is not None and os.path.exists(archivo):
+            with open(archivo, 'r', encoding='utf-8') as f:
+                return cls.desde_texto(f.read(), archivo)
+        return cls.desde_registros(registro.leer_registros_texto(archivo))
+
+    @classmethod
+    def desde_texto(cls, texto, archivo='src/data/participacion.txt'):
+        """
+        Convierte líneas de participación (texto ya leído) en columnas
+
+        Args:
+            texto (str): Líneas id|id|True/False|calificacion
+            archivo (str): Archivo de origen (para informar líneas inválidas)
+
+        Returns:
+            TablaParticipacion: Tabla con las cuatro columnas
+        """
+        if np is not None:
+            numeros = _numeros_canonicos(texto)
+            if numeros is not None:
+                return cls(_columna_id(numeros[:, 0]), _columna_id(numeros[:, 1]),
+                           numeros[:, 2] == 1, _columna_calificacion(numeros[:, 3]))
+        with diagnostico.sesion_carga(archivo):
+            registros = parseo_rapido.convertir_texto(texto, 'registro')
+        return cls.desde_registros(registros)
+
+    def concatenar(self, otra):
+        """
+        Tabla con las filas de esta seguidas de las de otra
+
+        Args:
+            otra (TablaParticipacion): Filas a agregar al final
+
+        Returns:
+            TablaParticipacion: Tabla nueva (esta no se modifica)
+        """
+        if not len(otra):
+            return self
+        if np is None:
+            return TablaParticipacion(self.empleado_id + otra.empleado_id, self.actividad_id + otra.actividad_id,
+                                      self.asistio + otra.asistio, self.calificacion + otra.calificacion)
+        return TablaParticipacion(*(np.concatenate((a, b)) for a, b in (
+            (self.empleado_id, otra.empleado_id), (self.actividad_id, otra.actividad_id),
+            (self.asistio, otra.asistio), (self.calificacion, otra.calificacion))))
+
+
+def _numeros_canonicos(texto):
+    """
+    Convierte el texto de participación en una matriz de N x 5 enteros
+
+    Cada línea termina en un -1 de control: si alguna tiene más o menos
+    campos, o un campo no numérico, la matriz no cuadra y se devuelve None.
+    La asistencia solo se acepta escrita 'True' o 'False' (como la escribe
+    to_string): esas palabras pasan a -2 y -3, y un texto con '-' va por
+    la ruta línea a línea, así un '1' o '0' en esa columna no se confunde
+    con ellas. La columna vuelve como 1 (asistió) o 0.
+    """
+    cuerpo = texto.rstrip('\n')
+    if not cuerpo or '\n\n' in cuerpo or ' ' in cuerpo or '\r' in cuerpo or '-' in cuerpo:
+        return None
+    cuerpo = (cuerpo.replace('|True|', '|-2|').replace('|False|', '|-3|')
+              .replace('|', ' ').replace('\n', ' -1 ') + ' -1')
+    with warnings.catch_warnings():
+        # Un campo no numérico corta la lectura con un aviso: se trata como error
+        warnings.simplefilter('error')
+        try:
+            numeros = np.fromstring(cuerpo, dtype=np.int64, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return None
+    lineas = cuerpo.count(' -1')
+    if len(numeros) != 5 * lineas:
+        return None
+    numeros = numeros.reshape(lineas, 5)
+    if (not (numeros[:, 4] == -1).all() or not np.isin(numeros[:, 2], (-2, -3)).all()
+            or (numeros[:, [0, 1, 3]] < 0).any()):
+        return None
+    numeros[:, 2] = numeros[:, 2] == -2
+    return numeros
+
+
+def _columna_id(valores):
+    """int32 si todos los ids caben, int64 si no"""
+    if len(valores) and (valores.min() < np.iinfo(np.int32).min or valores.max() > np.iinfo(np.int32).max):
+        return valores
+    return valores.astype(np.int32)
+
+
+def _columna_calificacion(valores):
+    """uint8 si todas las calificaciones caben, int64 si no"""
+    columna = np.asarray(valores, dtype=np.int64)
+    if len(columna) and (columna.min() < 0 or columna.max() > 255):
+        return columna
+    return columna.astype(np.uint8)
+
+
+def tabla_de_archivo(archivo='src/data/participacion.txt'):
+    """
+    Tabla del archivo, al día con las líneas agregadas desde la última lectura
+
+    Solo se convierten las líneas nuevas (seguimiento.LectorIncremental);
+    si el archivo se reescribió se vuelve a leer completo. La primera vez
+    se parte de la instantánea del arranque, si hay una para el archivo.
+
+    Args:
+        archivo (str): Ruta del archivo de participación
+
+    Returns:
+        TablaParticipacion: Tabla con las cuatro columnas
+    """
+    if not os.path.exists(archivo):
+        _tablas_archivo.pop(archivo, None)
+        return TablaParticipacion.desde_archivo(archivo)
+    lector, tabla = (_tablas_archivo.get(archivo) or instantanea.tabla(archivo)
+                     or (seguimiento.LectorIncremental(archivo), None))
+    texto, reinicio = lector.leer_texto()
+    if tabla is None or reinicio:
+        tabla = TablaParticipacion.desde_texto(texto, archivo)
+    elif texto:
+        tabla = tabla.concatenar(TablaParticipacion.desde_texto(texto, archivo))
+    _tablas_archivo[archivo] = (lector, tabla)
+    return tabla
+
+
+def punto_de_control(archivo='src/data/participacion.txt'):
+    """
+    Hasta dónde llega la tabla en memoria del archivo (ver tabla_de_archivo)
+
+    Returns:
+        dict: Estado de su LectorIncremental o None si no se leyó el archivo
+    """
+    guardado = _tablas_archivo.get(archivo)
+    return guardado[0].estado() if guardado else None
+
+
+def olvidar_tabla(archivo='src/data/participacion.txt'):
+    """Descarta la tabla en memoria del archivo: la próxima lectura empieza de cero"""
+    _tablas_archivo.pop(archivo, None)
+
+
+def _como_tabla(datos):
+    """Acepta una TablaParticipacion o una lista de registros"""
+    return datos if isinstance(datos, TablaParticipacion) else TablaParticipacion.desde_registros(datos)
+
+
+# ---------------------------------------------------------
+# AGREGADOS
+# ---------------------------------------------------------
+def agregados_por_actividad(datos):
+    """
+    Conteos de participación por actividad
+
+    Args:
+        datos: TablaParticipacion o lista de registros
+
+    Returns:
+        dict: actividad_id -> (total_registros, asistencias, suma_calificaciones, calificados)
+            (solo cuentan las calificaciones > 0 de quienes asistieron)
+    """
+    tabla = _como_tabla(datos)
+    if np is None:
+        agregados = {}
+        for act, asistio, calif in zip(tabla.actividad_id, tabla.asistio, tabla.calificacion):
+            fila = agregados.get(act)
+            if fila is None:
+                fila = agregados[act] = [0, 0, 0, 0]
+            fila[0] += 1
+            if asistio:
+                fila[1] += 1
+                if calif > 0:
+                    fila[2] += calif
+                    fila[3] += 1
+        return {act: tuple(fila) for act, fila in agregados.items()}
+
+    ids, codigos = np.unique(tabla.actividad_id, return_inverse=True)
+    calificados = tabla.asistio & (tabla.calificacion > 0)
+    n = len(ids)
+    total = np.bincount(codigos, minlength=n)
+    asistencias = np.bincount(codigos, weights=tabla.asistio, minlength=n).astype(np.int64)
+    suma = np.bincount(codigos, weights=np.where(calificados, tabla.calificacion, 0),
+                       minlength=n).astype(np.int64)
+    cantidad = np.bincount(codigos, weights=calificados, minlength=n).astype(np.int64)
+    return dict(zip(ids.tolist(), zip(total.tolist(), asistencias.tolist(),
+                                      suma.tolist(), cantidad.tolist())))
+
+
+def agregados_por_empleado(datos):
+    """
+    Asistencias por empleado
+
+    Args:
+        datos: TablaParticipacion o lista de registros
+
+    Returns:
+        dict: empleado_id -> (asistencias, suma_calificaciones, calificados),
+            solo empleados con al menos una asistencia
+    """
+    tabla = _como_tabla(datos)
+    if np is None:
+        agregados = {}
+        for emp, asistio, calif in zip(tabla.empleado_id, tabla.asistio, tabla.calificacion):
+            if not asistio:
+                continue
+            fila = agregados.get(emp)
+            if fila is None:
+                fila = agregados[emp] = [0, 0, 0]
+            fila[0] += 1
+            if calif > 0:
+                fila[1] += calif
+                fila[2] += 1
+        return {emp: tuple(fila) for emp, fila in agregados.items()}
+
+    empleados = tabla.empleado_id[tabla.asistio]
+    calificaciones = tabla.calificacion[tabla.asistio]
+    ids, codigos = np.unique(empleados, return_inverse=True)
+    calificados = calificaciones > 0
+    n = len(ids)
+    asistencias = np.bincount(codigos, minlength=n)
+    suma = np.bincount(codigos, weights=np.where(calificados, calificaciones, 0),
+                       minlength=n).astype(np.int64)
+    cantidad = np.bincount(codigos, weights=calificados, minlength=n).astype(np.int64)
+    return dict(zip(ids.tolist(), zip(asistencias.tolist(), suma.tolist(), cantidad.tolist())))
+
+
+def estadisticas(datos, actividad_id=None):
+    """
+    Mismo resultado que registro.calcular_estadisticas, por columnas
+
+    Args:
+        datos: TablaParticipacion o lista de registros
+        actividad_id (int): ID de actividad específica (None para todas)
+
+    Returns:
+        dict: Diccionario con estadísticas calculadas
+    """
+    tabla = _como_tabla(datos)
+    if np is None:
+        filas = zip(tabla.actividad_id, tabla.asistio, tabla.calificacion)
+        if actividad_id is not None:
+            filas = ((a, asistio, c) for a, asistio, c in filas if a == actividad_id)
+        total = asistencias = 0
+        por_valor = {}
+        for _, asistio, calif in filas:
+            total += 1
+            if asistio:
+                asistencias += 1
+                if calif > 0:
+                    por_valor[calif] = por_valor.get(calif, 0) + 1
+    else:
+        asistio, calif = tabla.asistio, tabla.calificacion
+        if actividad_id is not None:
+            mascara = tabla.actividad_id == actividad_id
+            asistio, calif = asistio[mascara], calif[mascara]
+        total = len(asistio)
+        asistencias = int(np.count_nonzero(asistio))
+        por_valor = _conteo_por_valor(calif[asistio & (calif > 0)])
+
+    return registro.armar_estadisticas(total, asistencias,
+                                       HistogramaCalificaciones.desde_conteos(por_valor))
+
+
+def _conteo_por_valor(calificaciones):
+    """{calificacion: cantidad} de un arreglo de calificaciones > 0"""
+    conteos = np.bincount(calificaciones.astype(np.int64))
+    return {valor: n for valor, n in enumerate(conteos.tolist()) if n}
+
+
+# ---------------------------------------------------------
+# HISTOGRAMAS POR GRUPO
+# ---------------------------------------------------------
+def _histogramas_por_clave(claves, asistio, calificacion):
+    """
+    Histograma de calificaciones de quienes asistieron, por cada clave
+
+    Con NumPy cada par (clave, calificación) se cuenta con un solo
+    np.bincount sobre clave * ancho + calificación.
+    """
+    if np is None:
+        por_clave = {}
+        for clave, asistio_r, calif in zip(claves, asistio, calificacion):
+            if asistio_r and calif > 0:
+                conteo = por_clave.setdefault(clave, {})
+                conteo[calif] = conteo.get(calif, 0) + 1
+        return {clave: HistogramaCalificaciones.desde_conteos(conteo)
+                for clave, conteo in por_clave.items()}
+
+    calificados = asistio & (calificacion > 0)
+    claves = claves[calificados]
+    valores = calificacion[calificados].astype(np.int64)
+    if not len(valores):
+        return {}
+    ids, codigos = np.unique(claves, return_inverse=True)
+    ancho = int(valores.max()) + 1
+    matriz = np.bincount(codigos.astype(np.int64) * ancho + valores,
+                         minlength=len(ids) * ancho).reshape(len(ids), ancho)
+    return {clave: HistogramaCalificaciones.desde_conteos(
+                {valor: n for valor, n in enumerate(fila) if n})
+            for clave, fila in zip(ids.tolist(), matriz.tolist())}
+
+
+def histogramas_por_actividad(datos):
+    """
+    Distribución de calificaciones de cada actividad
+
+    Args:
+        datos: TablaParticipacion o lista de registros
+
+    Returns:
+        dict: actividad_id -> HistogramaCalificaciones (solo actividades con calificaciones)
+    """
+    tabla = _como_tabla(datos)
+    return _histogramas_por_clave(tabla.actividad_id, tabla.asistio, tabla.calificacion)
+
+
+def histogramas_por_empleado(datos):
+    """
+    Distribución de las calificaciones que dio cada empleado
+
+    Args:
+        datos: TablaParticipacion o lista de registros
+
+    Returns:
+        dict: empleado_id -> HistogramaCalificaciones (solo empleados con calificaciones)
+    """
+    tabla = _como_tabla(datos)
+    return _histogramas_por_clave(tabla.empleado_id, tabla.asistio, tabla.calificacion)
+
+
+def _combinar_por_grupo(histogramas, grupo_de):
+    """Suma los histogramas de cada id en el grupo que le corresponde"""
+    por_grupo = {}
+    for id_, histograma in histogramas.items():
+        grupo = grupo_de.get(id_)
+        if grupo is not None:
+            por_grupo.setdefault(grupo, HistogramaCalificaciones()).combinar(histograma)
+    return por_grupo
+
+
+def histogramas_por_area(empleados, datos):
+    """
+    Distribución de calificaciones de cada área (según el área del empleado)
+
+    Args:
+        empleados (list): Lista de empleados
+        datos: TablaParticipacion o lista de registros
+
+    Returns:
+        dict: area -> HistogramaCalificaciones
+    """
+    area_de = {emp.id_empleado: emp.codigo_area for emp in empleados}
+    return codificacion.AREAS.decodificar(_combinar_por_grupo(histogramas_por_empleado(datos), area_de))
+
+
+def histogramas_por_tipo(actividades, datos):
+    """
+    Distribución de calificaciones de cada tipo de actividad
+
+    Args:
+        actividades (list): Lista de actividades
+        datos: TablaParticipacion o lista de registros
+
+    Returns:
+        dict: tipo -> HistogramaCalificaciones
+    """
+    tipo_de = {act.id_actividad: act.codigo_tipo for act in actividades}
+    return codificacion.TIPOS.decodificar(_combinar_por_grupo(histogramas_por_actividad(datos), tipo_de))